@@ -0,0 +1,99 @@
+"""
+Benchmark: time to the first token of `ocht ask` vs. the import cost of the text UI.
+
+Starts a local stand-in for Ollama's /api/chat that answers immediately and a
+temporary database configured for it (direct Ollama backend), then runs
+`python -m ocht.cli ask` N times and measures the time from process start to
+the first byte on stdout. For comparison it measures how long a process needs
+to only import the chat UI (ocht.tui.app), which every chat paid before the
+first request was sent.
+
+Usage:
+    python benchmarks/bench_headless_startup.py [--runs 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SETUP = """
+from ocht.core.db import get_session
+from ocht.core.migration import ensure_schema
+from ocht.repositories.llm_provider_config import create_llm_provider_config
+from ocht.repositories.model import create_model
+from ocht.repositories.setting import create_setting
+
+ensure_schema()
+with get_session() as db:
+    provider = create_llm_provider_config(db, "Ollama", "", "{endpoint}")
+    create_model(db, "bench", provider.prov_id)
+    create_setting(db, "current_provider_id", str(provider.prov_id))
+    create_setting(db, "current_model_name", "bench")
+    create_setting(db, "ollama.backend", "direct")
+"""
+
+
+class OllamaStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        lines = [{"message": {"role": "assistant", "content": "Hello"}, "done": False},
+                 {"message": {"role": "assistant", "content": ""}, "done": True, "done_reason": "stop"}]
+        payload = "".join(json.dumps(line) + "\n" for line in lines).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _first_byte_ms(command, env) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, env=env)
+    process.stdout.read(1)
+    elapsed = time.perf_counter() - started
+    process.stdout.read()
+    process.wait()
+    return elapsed * 1000
+
+
+def run(runs: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{Path(tmp) / 'ocht.db'}"}
+        subprocess.run([sys.executable, "-c", SETUP.format(endpoint=endpoint)], env=env, check=True)
+
+        variants = (
+            ("ocht ask (first token)", [sys.executable, "-m", "ocht.cli", "ask", "Hi"]),
+            ("import chat UI only", [sys.executable, "-c", "import ocht.tui.app; print('.')"]),
+        )
+        print(f"{'process':<24} {'median ms':>10} {'min ms':>8}")
+        for label, command in variants:
+            timings = [_first_byte_ms(command, env) for _ in range(runs)]
+            print(f"{label:<24} {statistics.median(timings):>10.0f} {min(timings):>8.0f}")
+    server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Process starts per variant")
+    args = parser.parse_args()
+    run(args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: indexed name/workspace lookups vs. full table scans.
+
+Fills a temporary SQLite database with N workspaces, providers and settings and
+measures the time per lookup for the indexed repository queries used by the
+uniqueness checks and workspace settings, compared to the previous approach of
+loading every row and comparing in Python. The indexed lookups should stay
+roughly constant while the scans grow linearly with N.
+
+Usage:
+    python benchmarks/bench_indexed_lookups.py [--sizes 1000 10000 50000] [--repeat 200]
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine
+
+from ocht.core.models import LLMProviderConfig, Setting, Workspace
+from ocht.repositories.llm_provider_config import get_all_llm_provider_configs, get_llm_provider_config_by_name
+from ocht.repositories.setting import get_all_settings, get_settings_by_workspace
+from ocht.repositories.workspace import get_all_workspaces, get_workspace_by_name
+
+
+def _fill(engine, size: int) -> None:
+    now = datetime.now()
+    with engine.begin() as connection:
+        connection.execute(insert(LLMProviderConfig), [
+            {"prov_name": f"Provider {i}", "prov_api_key": "none", "prov_created_at": now, "prov_updated_at": now}
+            for i in range(size)
+        ])
+        connection.execute(insert(Workspace), [
+            {"work_name": f"Workspace {i}", "work_default_model": "1", "work_created_at": now, "work_updated_at": now}
+            for i in range(size)
+        ])
+        connection.execute(insert(Setting), [
+            {"setting_key": f"key_{i}", "setting_value": "value",
+             "setting_workspace_id": (i % 100) + 1 if i % 2 else None,
+             "setting_created_at": now, "setting_updated_at": now}
+            for i in range(size)
+        ])
+
+
+def _per_call_us(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(sizes, repeat: int) -> None:
+    print(f"{'rows':>8} {'lookup':<28} {'indexed µs':>12} {'scan µs':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            SQLModel.metadata.create_all(engine)
+            _fill(engine, size)
+            name = f"workspace {size // 2}"
+            scan_repeat = max(1, repeat // 20)
+
+            with Session(engine) as db:
+                cases = [
+                    ("workspace name (unique)",
+                     lambda: get_workspace_by_name(db, name),
+                     lambda: [w for w in get_all_workspaces(db) if w.work_name.lower() == name]),
+                    ("provider name (unique)",
+                     lambda: get_llm_provider_config_by_name(db, "provider 1"),
+                     lambda: [p for p in get_all_llm_provider_configs(db) if p.prov_name.lower() == "provider 1"]),
+                    ("settings of workspace 7",
+                     lambda: get_settings_by_workspace(db, 7),
+                     lambda: [s for s in get_all_settings(db) if s.setting_workspace_id == 7]),
+                ]
+                for label, indexed, scan in cases:
+                    db.expunge_all()
+                    indexed_us = _per_call_us(indexed, repeat)
+                    db.expunge_all()
+                    scan_us = _per_call_us(scan, scan_repeat)
+                    print(f"{size:>8} {label:<28} {indexed_us:>12.1f} {scan_us:>12.1f}")
+            engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=200, help="Lookups per indexed measurement")
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: inline message texts vs. compressed message bodies.
+
+Fills two temporary SQLite databases with the same N messages, a mix of short
+chat turns and large code dumps/model outputs. One stores every text inline in
+msg_content, the other moves large texts into compressed MessageBody rows like
+repositories/message.py does. Reports the file size and the read latency of a
+scan over the message rows (no content), of loading the newest branch with
+its texts and of reading every text.
+
+Usage:
+    python benchmarks/bench_message_compression.py [--messages 20000] [--large-share 0.2] [--large-size 12000]
+"""
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import insert, select, text
+from sqlmodel import Session, SQLModel, create_engine
+
+from ocht.core.compression import DEFAULT_CODEC, compress_if_large
+from ocht.core.models import Message, MessageBody, Workspace
+from ocht.repositories.message import get_branch, get_messages_by_workspace
+
+BRANCH_LENGTH = 100
+
+WORDS = ("the", "model", "returns", "a", "list", "of", "tokens", "for", "each", "request", "and", "cache")
+CODE_LINES = (
+    "def handle(request):", "    payload = json.loads(request.body)", "    for item in payload['items']:",
+    "        total += item['price'] * item['quantity']", "    return Response(status=200, body=total)",
+    "class Repository:", "    def __init__(self, session):", "        self.session = session",
+)
+
+
+def _text(rng: random.Random, large: bool, large_size: int) -> str:
+    if not large:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 60)))
+    lines = []
+    while sum(len(line) + 1 for line in lines) < large_size:
+        lines.append(f"{rng.choice(CODE_LINES)}  # {rng.randint(0, 10_000)}")
+    return "\n".join(lines)
+
+
+def _fill(engine, texts, compress: bool) -> None:
+    now = datetime.now()
+    messages, bodies = [], []
+    for i, content in enumerate(texts):
+        # Conversations of BRANCH_LENGTH messages, each one a chain from its root
+        depth = i % BRANCH_LENGTH
+        path = "".join(f"{message_id:010d}/" for message_id in range(i + 1 - depth, i + 1))
+        row = {"msg_id": i + 1, "msg_workspace_id": 1, "msg_role": "user" if i % 2 == 0 else "assistant",
+               "msg_content": content, "msg_parent_id": i if depth else None, "msg_path": path,
+               "msg_depth": depth, "msg_created_at": now, "msg_body_id": None}
+        compressed = compress_if_large(content) if compress else None
+        if compressed is not None:
+            codec, data = compressed
+            bodies.append({"body_id": len(bodies) + 1, "body_codec": codec, "body_size": len(content),
+                           "body_data": data})
+            row["msg_content"], row["msg_body_id"] = "", len(bodies)
+        messages.append(row)
+    with engine.begin() as connection:
+        connection.execute(insert(Workspace), [{"work_id": 1, "work_name": "Bench", "work_default_model": "1",
+                                                "work_created_at": now, "work_updated_at": now}])
+        if bodies:
+            connection.execute(insert(MessageBody), bodies)
+        for start in range(0, len(messages), 5_000):
+            connection.execute(insert(Message), messages[start:start + 5_000])
+        connection.execute(text("ANALYZE"))
+
+
+def _timed(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(message_count: int, large_share: float, large_size: int) -> None:
+    rng = random.Random(42)
+    texts = [_text(rng, rng.random() < large_share, large_size) for _ in range(message_count)]
+
+    print(f"{message_count} messages, {large_share:.0%} large (~{large_size} chars), codec {DEFAULT_CODEC}")
+    print(f"{'storage':<12} {'file MB':>8} {'scan ms':>9} {'branch ms':>10} {'all texts ms':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, compress in (("inline", False), ("compressed", True)):
+            database = Path(tmp) / f"{label}.db"
+            engine = create_engine(f"sqlite:///{database}")
+            SQLModel.metadata.create_all(engine)
+            _fill(engine, texts, compress)
+
+            with Session(engine) as db:
+                scan = _timed(lambda: db.exec(select(Message.msg_id, Message.msg_depth, Message.msg_partial)).all())
+                branch = _timed(lambda: [m.content for m in get_branch(db, message_count)])
+                all_texts = _timed(lambda: [m.content for m in get_messages_by_workspace(db, 1)], repeat=2)
+            engine.dispose()
+            size = database.stat().st_size / 1e6
+            print(f"{label:<12} {size:>8.1f} {scan:>9.2f} {branch:>10.2f} {all_texts:>13.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--large-share", type=float, default=0.2, help="Share of large messages")
+    parser.add_argument("--large-size", type=int, default=12_000, help="Characters per large message")
+    args = parser.parse_args()
+    run(args.messages, args.large_share, args.large_size)
+
+
+if __name__ == "__main__":
+    main()
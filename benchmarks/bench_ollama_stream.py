@@ -0,0 +1,98 @@
+"""
+Benchmark: per-chunk overhead of the direct Ollama adapter vs. the LangChain path.
+
+Starts a local stand-in for Ollama's /api/chat that streams N NDJSON chunks as
+fast as possible, then streams the same response through OllamaAdapter
+(ChatOllama.astream) and OllamaDirectAdapter (httpx + NDJSON). Since the server
+does no inference, the time per chunk is the client-side overhead of each
+adapter; the direct adapter should be several times cheaper per chunk.
+
+Usage:
+    python benchmarks/bench_ollama_stream.py [--chunks 2000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ocht.adapters.ollama import OllamaAdapter
+from ocht.adapters.ollama_direct import OllamaDirectAdapter
+
+
+def _make_handler(chunks: int):
+    class OllamaStandIn(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            model = body["model"]
+            lines = [
+                json.dumps({"model": model, "created_at": "2025-01-01T00:00:00Z",
+                            "message": {"role": "assistant", "content": f"tok{i} "}, "done": False})
+                for i in range(chunks)
+            ]
+            lines.append(json.dumps({
+                "model": model, "created_at": "2025-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": ""}, "done": True, "done_reason": "stop",
+                "prompt_eval_count": 10, "prompt_eval_duration": 1_000_000,
+                "eval_count": chunks, "eval_duration": 1_000_000_000, "total_duration": 1_100_000_000,
+            }))
+            payload = ("\n".join(lines) + "\n").encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return OllamaStandIn
+
+
+async def _stream_us_per_chunk(adapter, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        adapter.load_history([])
+        start = time.perf_counter()
+        count = 0
+        async for _chunk in adapter.send_prompt_stream("benchmark"):
+            count += 1
+        timings.append((time.perf_counter() - start) / count * 1e6)
+    return statistics.median(timings)
+
+
+async def _run(base_url: str, repeat: int) -> None:
+    adapters = [
+        ("langchain (ChatOllama)", OllamaAdapter(model="bench", base_url=base_url)),
+        ("direct (httpx NDJSON)", OllamaDirectAdapter(model="bench", base_url=base_url)),
+    ]
+    results = {}
+    for label, adapter in adapters:
+        await _stream_us_per_chunk(adapter, 1)  # Warm-up: connection, imports
+        results[label] = await _stream_us_per_chunk(adapter, repeat)
+        print(f"{label:<24} {results[label]:>10.1f} µs/chunk")
+    langchain_us, direct_us = results.values()
+    print(f"{'speedup':<24} {langchain_us / direct_us:>10.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000, help="Chunks per streamed response")
+    parser.add_argument("--repeat", type=int, default=5, help="Streamed responses per adapter")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(args.chunks))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(_run(f"http://127.0.0.1:{server.server_port}", args.repeat))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
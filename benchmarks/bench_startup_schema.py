@@ -0,0 +1,58 @@
+"""
+Benchmark: schema setup at startup, create_all vs. the stored revision check.
+
+Creates a database at the current schema, then simulates N starts. Each start
+creates a fresh engine (like a new process) and runs either init_db
+(SQLModel.metadata.create_all, which introspects every table) or
+ensure_schema (one query for the stored Alembic revision). Reports the median
+and p95 per start and the number of SQL statements sent to SQLite.
+
+Usage:
+    python benchmarks/bench_startup_schema.py [--starts 50]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlmodel import create_engine
+
+from ocht.core.db import init_db
+from ocht.core.migration import ensure_schema
+
+
+def _start(url: str, setup) -> tuple:
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    statements = []
+    # sqlite3's trace callback also sees the table checks of create_all, which bypass SQLAlchemy's events
+    event.listen(engine, "connect", lambda connection, _: connection.set_trace_callback(statements.append))
+    started = time.perf_counter()
+    setup(engine)
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed * 1000, len(statements)
+
+
+def run(starts: int) -> None:
+    print(f"{'startup':<22} {'median ms':>10} {'p95 ms':>8} {'statements':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'ocht.db'}"
+        _start(url, ensure_schema)
+
+        for label, setup in (("create_all (init_db)", init_db), ("revision check", ensure_schema)):
+            timings, statements = zip(*(_start(url, setup) for _ in range(starts)))
+            p95 = sorted(timings)[int(0.95 * (len(timings) - 1))]
+            print(f"{label:<22} {statistics.median(timings):>10.2f} {p95:>8.2f} {statements[-1]:>11}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--starts", type=int, default=50, help="Simulated starts per variant")
+    args = parser.parse_args()
+    run(args.starts)
+
+
+if __name__ == "__main__":
+    main()
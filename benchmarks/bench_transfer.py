@@ -0,0 +1,95 @@
+"""
+Benchmark: streaming export/import vs. loading the whole history.
+
+Fills a temporary SQLite database with N messages and measures time and peak
+Python memory (tracemalloc) of the streaming JSONL export and import, compared
+to the naive approach of loading all messages and dumping them as one JSON
+document. The streaming peak should stay flat while the naive one grows with N.
+
+Usage:
+    python benchmarks/bench_transfer.py [--sizes 10000 50000] [--content-size 1000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from ocht.core.models import Message, Workspace
+
+
+def _fill(engine, size: int, content_size: int) -> None:
+    now = datetime.now()
+    content = "x" * content_size
+    with engine.begin() as connection:
+        connection.execute(insert(Workspace), [
+            {"work_id": 1, "work_name": "Bench", "work_default_model": "1", "work_created_at": now,
+             "work_updated_at": now}
+        ])
+        for start in range(0, size, 10_000):
+            connection.execute(insert(Message), [
+                {"msg_id": i + 1, "msg_workspace_id": 1, "msg_role": "user" if i % 2 == 0 else "assistant",
+                 "msg_content": content, "msg_parent_id": i or None, "msg_depth": i, "msg_created_at": now}
+                for i in range(start, min(size, start + 10_000))
+            ])
+
+
+def _measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def run(sizes, content_size: int) -> None:
+    # Imported after DATABASE_URL is set per run
+    from ocht.services.transfer import export_data, import_data
+
+    print(f"{'messages':>9} {'step':<18} {'seconds':>9} {'peak MB':>9}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "source.db"
+            engine = create_engine(f"sqlite:///{source}")
+            SQLModel.metadata.create_all(engine)
+            _fill(engine, size, content_size)
+            export_path = str(Path(tmp) / "export.jsonl")
+
+            def naive_export():
+                with Session(engine) as db:
+                    rows = [message.model_dump(mode="json") for message in db.exec(select(Message)).all()]
+                with open(Path(tmp) / "naive.json", "w", encoding="utf-8") as stream:
+                    json.dump(rows, stream)
+
+            os.environ["DATABASE_URL"] = f"sqlite:///{source}"
+            steps = [("naive export", naive_export), ("streaming export", lambda: export_data(export_path))]
+            for label, func in steps:
+                _, seconds, peak = _measure(func)
+                print(f"{size:>9} {label:<18} {seconds:>9.2f} {peak:>9.1f}")
+
+            target = Path(tmp) / "target.db"
+            SQLModel.metadata.create_all(create_engine(f"sqlite:///{target}"))
+            os.environ["DATABASE_URL"] = f"sqlite:///{target}"
+            _, seconds, peak = _measure(lambda: import_data(export_path))
+            print(f"{size:>9} {'streaming import':<18} {seconds:>9.2f} {peak:>9.1f}")
+            engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--content-size", type=int, default=1_000, help="Characters per message")
+    args = parser.parse_args()
+    run(args.sizes, args.content_size)
+
+
+if __name__ == "__main__":
+    main()
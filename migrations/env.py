@@ -7,7 +7,7 @@ from sqlalchemy import pool
 from alembic import context
 
 from sqlmodel import SQLModel
-from ocht.core.models import Workspace, Message, PromptTemplate, Setting, Model, LLMProviderConfig
+from ocht.core.models import Workspace, Message, MessageBody, PromptTemplate, Setting, Model, LLMProviderConfig, RequestMetric
 target_metadata = SQLModel.metadata
 
 # this is the Alembic Config object, which provides
@@ -64,6 +64,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # ocht.core.migration passes its own connection, so it migrates the database of its engine
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
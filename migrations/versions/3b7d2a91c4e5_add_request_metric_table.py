@@ -0,0 +1,52 @@
+"""Add request metric table
+
+Revision ID: 3b7d2a91c4e5
+Revises: f608934696fd
+Create Date: 2026-10-19 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d2a91c4e5'
+down_revision: Union[str, None] = 'f608934696fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('requestmetric',
+    sa.Column('metric_id', sa.Integer(), nullable=False),
+    sa.Column('metric_created_at', sa.DateTime(), nullable=False),
+    sa.Column('metric_provider_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('metric_model_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('metric_method', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('metric_context_ms', sa.Float(), nullable=True),
+    sa.Column('metric_summary_ms', sa.Float(), nullable=True),
+    sa.Column('metric_ttft_ms', sa.Float(), nullable=True),
+    sa.Column('metric_total_ms', sa.Float(), nullable=True),
+    sa.Column('metric_chunk_count', sa.Integer(), nullable=False),
+    sa.Column('metric_output_tokens', sa.Integer(), nullable=False),
+    sa.Column('metric_tokens_per_second', sa.Float(), nullable=True),
+    sa.Column('metric_prompt_eval_count', sa.Integer(), nullable=True),
+    sa.Column('metric_prompt_eval_duration_ms', sa.Float(), nullable=True),
+    sa.Column('metric_eval_count', sa.Integer(), nullable=True),
+    sa.Column('metric_eval_duration_ms', sa.Float(), nullable=True),
+    sa.Column('metric_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.PrimaryKeyConstraint('metric_id')
+    )
+    op.create_index(op.f('ix_requestmetric_metric_created_at'), 'requestmetric', ['metric_created_at'], unique=False)
+    op.create_index(op.f('ix_requestmetric_metric_model_name'), 'requestmetric', ['metric_model_name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_requestmetric_metric_model_name'), table_name='requestmetric')
+    op.drop_index(op.f('ix_requestmetric_metric_created_at'), table_name='requestmetric')
+    op.drop_table('requestmetric')
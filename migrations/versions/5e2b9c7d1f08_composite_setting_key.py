@@ -0,0 +1,78 @@
+"""Make setting key unique per scope (composite primary key)
+
+Revision ID: 5e2b9c7d1f08
+Revises: 8c1f4e2a9d37
+Create Date: 2026-10-19 14:21:45.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b9c7d1f08'
+down_revision: Union[str, None] = '8c1f4e2a9d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# setting_workspace_id of global settings (ocht.core.models.GLOBAL_SCOPE_ID)
+GLOBAL_SCOPE_ID = 0
+
+_COLUMNS = "setting_key, setting_value, setting_workspace_id, setting_created_at, setting_updated_at"
+
+
+def _create_setting_table(name: str, composite_key: bool) -> None:
+    if composite_key:
+        op.create_table(name,
+        sa.Column('setting_key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('setting_value', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('setting_workspace_id', sa.Integer(), nullable=False),
+        sa.Column('setting_created_at', sa.DateTime(), nullable=False),
+        sa.Column('setting_updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('setting_key', 'setting_workspace_id')
+        )
+    else:
+        op.create_table(name,
+        sa.Column('setting_key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('setting_value', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('setting_workspace_id', sa.Integer(), nullable=True),
+        sa.Column('setting_created_at', sa.DateTime(), nullable=False),
+        sa.Column('setting_updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['setting_workspace_id'], ['workspace.work_id'], ),
+        sa.PrimaryKeyConstraint('setting_key')
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _create_setting_table('setting_new', composite_key=True)
+    op.execute(
+        f"INSERT INTO setting_new ({_COLUMNS}) "
+        f"SELECT setting_key, setting_value, COALESCE(setting_workspace_id, {GLOBAL_SCOPE_ID}), "
+        f"setting_created_at, setting_updated_at FROM setting"
+    )
+    op.drop_index(op.f('ix_setting_setting_workspace_id'), table_name='setting')
+    op.drop_table('setting')
+    op.rename_table('setting_new', 'setting')
+    op.create_index(op.f('ix_setting_setting_workspace_id'), 'setting', ['setting_workspace_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Keys are unique again: workspace values are only kept if there is no global value
+    _create_setting_table('setting_old', composite_key=False)
+    op.execute(
+        f"INSERT INTO setting_old ({_COLUMNS}) "
+        f"SELECT setting_key, setting_value, NULLIF(setting_workspace_id, {GLOBAL_SCOPE_ID}), "
+        f"setting_created_at, setting_updated_at FROM setting "
+        f"WHERE setting_workspace_id = {GLOBAL_SCOPE_ID} OR setting_key NOT IN ("
+        f"  SELECT setting_key FROM setting WHERE setting_workspace_id = {GLOBAL_SCOPE_ID}"
+        f") GROUP BY setting_key"
+    )
+    op.drop_index(op.f('ix_setting_setting_workspace_id'), table_name='setting')
+    op.drop_table('setting')
+    op.rename_table('setting_old', 'setting')
+    op.create_index(op.f('ix_setting_setting_workspace_id'), 'setting', ['setting_workspace_id'], unique=False)
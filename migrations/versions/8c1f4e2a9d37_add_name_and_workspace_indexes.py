@@ -0,0 +1,53 @@
+"""Add case-insensitive name indexes and setting workspace index
+
+Revision ID: 8c1f4e2a9d37
+Revises: 3b7d2a91c4e5
+Create Date: 2026-10-19 11:02:17.530911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e2a9d37'
+down_revision: Union[str, None] = '3b7d2a91c4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rename_duplicate_names(table: str, id_column: str, name_column: str) -> None:
+    """Appends the ID to names that differ only in case, so the unique index can be created."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        f"SELECT {id_column}, {name_column} FROM {table} "
+        f"WHERE lower({name_column}) IN ("
+        f"  SELECT lower({name_column}) FROM {table} GROUP BY lower({name_column}) HAVING count(*) > 1"
+        f") ORDER BY {id_column}"
+    )).fetchall()
+    seen = set()
+    for row_id, name in rows:
+        if name.lower() in seen:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET {name_column} = :name WHERE {id_column} = :id"),
+                {"name": f"{name} ({row_id})", "id": row_id},
+            )
+        seen.add(name.lower())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_duplicate_names('workspace', 'work_id', 'work_name')
+    _rename_duplicate_names('llmproviderconfig', 'prov_id', 'prov_name')
+    op.create_index('ix_workspace_work_name_lower', 'workspace', [sa.text('lower(work_name)')], unique=True)
+    op.create_index('ix_llmproviderconfig_prov_name_lower', 'llmproviderconfig', [sa.text('lower(prov_name)')], unique=True)
+    op.create_index(op.f('ix_setting_setting_workspace_id'), 'setting', ['setting_workspace_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_setting_setting_workspace_id'), table_name='setting')
+    op.drop_index('ix_llmproviderconfig_prov_name_lower', table_name='llmproviderconfig')
+    op.drop_index('ix_workspace_work_name_lower', table_name='workspace')
@@ -0,0 +1,42 @@
+"""Add workspace active leaf
+
+Revision ID: 9a5c3e7f1b24
+Revises: e4b8d1a6c392
+Create Date: 2026-10-19 23:12:41.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a5c3e7f1b24'
+down_revision: Union[str, None] = 'e4b8d1a6c392'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Workspace-scoped setting that held the active leaf before this revision
+ACTIVE_LEAF_KEY = 'conversation.active_leaf_id'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('workspace', sa.Column('work_active_leaf_id', sa.Integer(), nullable=True))
+    op.execute(sa.text(
+        "UPDATE workspace SET work_active_leaf_id = (SELECT CAST(setting_value AS INTEGER) FROM setting "
+        "WHERE setting_key = :key AND setting_workspace_id = workspace.work_id)"
+    ).bindparams(key=ACTIVE_LEAF_KEY))
+    op.execute(sa.text("DELETE FROM setting WHERE setting_key = :key").bindparams(key=ACTIVE_LEAF_KEY))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text(
+        "INSERT INTO setting (setting_key, setting_workspace_id, setting_value, setting_created_at, setting_updated_at) "
+        "SELECT :key, work_id, CAST(work_active_leaf_id AS VARCHAR), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM workspace "
+        "WHERE work_active_leaf_id IS NOT NULL"
+    ).bindparams(key=ACTIVE_LEAF_KEY))
+    # Plain ALTER TABLE (SQLite >= 3.35): batch mode would rebuild workspace without ix_workspace_work_name_lower
+    op.drop_column('workspace', 'work_active_leaf_id')
@@ -0,0 +1,70 @@
+"""Add materialized path and depth to messages
+
+Revision ID: a3d6f0c2b817
+Revises: 5e2b9c7d1f08
+Create Date: 2026-10-19 15:48:03.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d6f0c2b817'
+down_revision: Union[str, None] = '5e2b9c7d1f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match ocht.repositories.message.PATH_SEGMENT_WIDTH
+PATH_SEGMENT_WIDTH = 10
+
+
+def _backfill_paths() -> None:
+    """Computes msg_path and msg_depth of existing messages from msg_parent_id."""
+    bind = op.get_bind()
+    parents = dict(bind.execute(sa.text("SELECT msg_id, msg_parent_id FROM message")).fetchall())
+    paths = {}
+
+    def _path(message_id):
+        # Walk up to the first message with a known path, then fill in the paths downwards
+        chain = []
+        current = message_id
+        while current not in paths:
+            parent_id = parents.get(current)
+            if parent_id is None:
+                paths[current] = ""
+                break
+            chain.append(current)
+            current = parent_id
+        for node in reversed(chain):
+            parent_id = parents[node]
+            paths[node] = f"{paths[parent_id]}{parent_id:0{PATH_SEGMENT_WIDTH}d}/"
+        return paths[message_id]
+
+    for message_id in parents:
+        path = _path(message_id)
+        if path:
+            bind.execute(
+                sa.text("UPDATE message SET msg_path = :path, msg_depth = :depth WHERE msg_id = :id"),
+                {"path": path, "depth": path.count("/"), "id": message_id},
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('message', sa.Column('msg_path', sqlmodel.sql.sqltypes.AutoString(), nullable=False, server_default=''))
+    op.add_column('message', sa.Column('msg_depth', sa.Integer(), nullable=False, server_default='0'))
+    _backfill_paths()
+    op.create_index(op.f('ix_message_msg_path'), 'message', ['msg_path'], unique=False)
+    op.create_index(op.f('ix_message_msg_parent_id'), 'message', ['msg_parent_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_message_msg_parent_id'), table_name='message')
+    op.drop_index(op.f('ix_message_msg_path'), table_name='message')
+    op.drop_column('message', 'msg_depth')
+    op.drop_column('message', 'msg_path')
@@ -0,0 +1,28 @@
+"""Add partial flag to messages
+
+Revision ID: c7e19a4d2f60
+Revises: a3d6f0c2b817
+Create Date: 2026-10-19 18:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e19a4d2f60'
+down_revision: Union[str, None] = 'a3d6f0c2b817'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('message', sa.Column('msg_partial', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('message', 'msg_partial')
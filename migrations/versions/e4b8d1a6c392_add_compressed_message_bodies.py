@@ -0,0 +1,102 @@
+"""Add compressed message bodies
+
+Revision ID: e4b8d1a6c392
+Revises: c7e19a4d2f60
+Create Date: 2026-10-19 21:05:17.224816
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8d1a6c392'
+down_revision: Union[str, None] = 'c7e19a4d2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match ocht.core.compression.COMPRESS_MIN_CHARS, MIN_SAVING and ZLIB_LEVEL; existing rows always use
+# zlib, so the database stays readable without the optional zstandard package
+COMPRESS_MIN_CHARS = 2048
+MIN_SAVING = 0.2
+ZLIB_LEVEL = 6
+BATCH_SIZE = 500
+
+
+def _compress_existing_messages() -> None:
+    """Moves large message texts into compressed bodies, one batch per transaction-sized chunk."""
+    bind = op.get_bind()
+    last_id, body_id = 0, bind.execute(sa.text("SELECT coalesce(max(body_id), 0) FROM messagebody")).scalar()
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT msg_id, msg_content FROM message WHERE msg_id > :last_id AND msg_body_id IS NULL "
+                    "AND length(msg_content) >= :min_chars ORDER BY msg_id LIMIT :limit"),
+            {"last_id": last_id, "min_chars": COMPRESS_MIN_CHARS, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            return
+        bodies, messages = [], []
+        for message_id, content in rows:
+            raw = content.encode("utf-8")
+            data = zlib.compress(raw, ZLIB_LEVEL)
+            if len(data) <= len(raw) * (1 - MIN_SAVING):
+                body_id += 1
+                bodies.append({"body_id": body_id, "body_codec": "zlib", "body_size": len(content), "body_data": data})
+                messages.append({"msg_id": message_id, "body_id": body_id})
+        if bodies:
+            bind.execute(
+                sa.text("INSERT INTO messagebody (body_id, body_codec, body_size, body_data) "
+                        "VALUES (:body_id, :body_codec, :body_size, :body_data)"),
+                bodies,
+            )
+            bind.execute(
+                sa.text("UPDATE message SET msg_content = '', msg_body_id = :body_id WHERE msg_id = :msg_id"),
+                messages,
+            )
+        last_id = rows[-1][0]
+
+
+def _restore_message_contents() -> None:
+    """Writes the texts of compressed bodies back into message rows."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT m.msg_id, b.body_codec, b.body_data FROM message m JOIN messagebody b ON b.body_id = m.msg_body_id"
+    ))
+    for message_id, codec, data in rows.fetchall():
+        if codec != "zlib":
+            import zstandard
+            content = zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+        else:
+            content = zlib.decompress(data).decode("utf-8")
+        bind.execute(sa.text("UPDATE message SET msg_content = :content WHERE msg_id = :msg_id"),
+                     {"content": content, "msg_id": message_id})
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('messagebody',
+    sa.Column('body_id', sa.Integer(), nullable=False),
+    sa.Column('body_codec', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('body_size', sa.Integer(), nullable=False),
+    sa.Column('body_data', sa.LargeBinary(), nullable=False),
+    sa.PrimaryKeyConstraint('body_id')
+    )
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite adds a nullable column with REFERENCES in place, batch mode would copy the whole message table
+        op.execute('ALTER TABLE message ADD COLUMN msg_body_id INTEGER REFERENCES messagebody (body_id)')
+    else:
+        op.add_column('message', sa.Column('msg_body_id', sa.Integer(), nullable=True))
+        op.create_foreign_key(None, 'message', 'messagebody', ['msg_body_id'], ['body_id'])
+    _compress_existing_messages()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _restore_message_contents()
+    with op.batch_alter_table('message') as batch_op:
+        batch_op.drop_column('msg_body_id')
+    op.drop_table('messagebody')
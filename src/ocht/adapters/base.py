@@ -1,10 +1,18 @@
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator
+from functools import partial
+from typing import Any, AsyncContextManager, AsyncIterator, Optional, Sequence, Tuple
+from ocht.adapters.scheduler import PRIORITY_INTERACTIVE, PRIORITY_NAMES, PRIORITY_SUMMARY, RequestScheduler, unscheduled
 
 class LLMAdapter(ABC):
     """Einheitliches Interface für alle LLM-Adapter."""
 
+    # Gemeinsamer Scheduler und Endpoint-Schlüssel, gesetzt über attach_scheduler
+    scheduler: Optional[RequestScheduler] = None
+    scheduler_endpoint: Optional[str] = None
+    # Priorität der Modellaufrufe, z.B. PRIORITY_BATCH für /compare
+    request_priority: int = PRIORITY_INTERACTIVE
+
     @abstractmethod
     async def send_prompt_async(self, prompt: str, **kwargs) -> str:
         """
@@ -33,6 +41,78 @@ class LLMAdapter(ABC):
         """
         ...
 
+    def load_history(self, messages: Sequence[Tuple[str, str]]) -> None:
+        """
+        Ersetzt den Gesprächsverlauf, z.B. beim Wechsel auf einen anderen Zweig.
+
+        Args:
+            messages: (role, content) Tupel in zeitlicher Reihenfolge; role ist 'human' oder 'ai'.
+        """
+        raise NotImplementedError(f"{type(self).__name__} unterstützt kein Laden des Verlaufs")
+
+    def attach_scheduler(self, scheduler: RequestScheduler, endpoint: str) -> None:
+        """
+        Verbindet den Adapter mit einem RequestScheduler.
+
+        Modellaufrufe warten dann auf einen freien Slot des Endpoints;
+        Zusammenfassungen der Memory-Strategie laufen mit niedrigerer Priorität.
+
+        Args:
+            scheduler: Der gemeinsame Scheduler (z.B. request_scheduler)
+            endpoint: Schlüssel des Modell-Servers, z.B. die Base-URL
+        """
+        self.scheduler = scheduler
+        self.scheduler_endpoint = endpoint
+        strategy = getattr(self, "memory_strategy", None)
+        if strategy is not None:
+            strategy.request_slot = partial(self.request_slot, PRIORITY_SUMMARY)
+
+    async def prefetch_context(self) -> bool:
+        """
+        Bereitet den Kontext der nächsten Anfrage vor, während der Nutzer tippt.
+
+        Nutzt die Memory-Strategie und den Verlauf des Adapters, falls vorhanden;
+        die nächste Anfrage mit unverändertem Verlauf verwendet das Ergebnis.
+
+        Returns:
+            True, wenn der Kontext vorbereitet wurde.
+        """
+        strategy = getattr(self, "memory_strategy", None)
+        history = getattr(self, "history", None)
+        if strategy is None or history is None or not hasattr(strategy, "prefetch"):
+            return False
+        return await strategy.prefetch(history)
+
+    def request_slot(self, priority: Optional[int] = None) -> AsyncContextManager[None]:
+        """
+        Slot für einen Modellaufruf (``async with self.request_slot(): ...``).
+
+        Ohne Scheduler läuft der Aufruf sofort. Ohne Priorität gilt
+        ``request_priority``. Eine neue Anfrage dieses Adapters ersetzt eine
+        noch wartende Anfrage derselben Priorität.
+        """
+        if self.scheduler is None:
+            return unscheduled()
+        if priority is None:
+            priority = self.request_priority
+        return self.scheduler.slot(self.scheduler_endpoint, priority, key=(id(self), priority))
+
+    def cancel_requests(self, priority: Optional[int] = None, running: bool = True) -> int:
+        """
+        Bricht die wartenden und laufenden Anfragen dieses Adapters beim Scheduler ab.
+
+        Args:
+            priority: Nur Anfragen dieser Priorität; None für alle
+            running: Auch laufende Anfragen abbrechen; False zieht nur wartende zurück
+
+        Returns:
+            Anzahl der abgebrochenen Anfragen.
+        """
+        if self.scheduler is None:
+            return 0
+        priorities = PRIORITY_NAMES if priority is None else (priority,)
+        return sum(self.scheduler.cancel((id(self), key), self.scheduler_endpoint, running) for key in priorities)
+
     def send_prompt(self, prompt: str, **kwargs) -> str:
         """
         Synchroner Wrapper für send_prompt_async.
@@ -0,0 +1,62 @@
+from typing import Any, Optional, Tuple
+
+# Feature flags stored in ContextMessage.features
+FEATURE_CODE = 1
+FEATURE_SUMMARY = 2
+
+
+class ContextMessage:
+    """
+    Compact, immutable record for one message in the memory pipeline.
+
+    Carries everything the memory strategies need (role, content, token count,
+    feature flags and message id) so token estimation and code detection run
+    once per message instead of on every prompt. Conversion to LangChain
+    message objects only happens at the adapter boundary.
+
+    Equality and hashing are based on role and content, so identical messages
+    share cached conversions.
+    """
+
+    __slots__ = ("role", "content", "token_count", "features", "message_id", "_hash")
+
+    def __init__(self, role: str, content: str, token_count: int = 0,
+                 features: int = 0, message_id: Optional[Any] = None):
+        object.__setattr__(self, "role", role)
+        object.__setattr__(self, "content", content)
+        object.__setattr__(self, "token_count", token_count)
+        object.__setattr__(self, "features", features)
+        object.__setattr__(self, "message_id", message_id)
+        object.__setattr__(self, "_hash", hash((role, content)))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ContextMessage is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("ContextMessage is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ContextMessage):
+            return NotImplemented
+        return self._hash == other._hash and self.role == other.role and self.content == other.content
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        preview = self.content if len(self.content) <= 40 else self.content[:37] + "..."
+        return f"ContextMessage(role={self.role!r}, content={preview!r}, tokens={self.token_count})"
+
+    @property
+    def has_code(self) -> bool:
+        """Whether the message contains code."""
+        return bool(self.features & FEATURE_CODE)
+
+    @property
+    def is_summary(self) -> bool:
+        """Whether the message is a generated conversation summary."""
+        return bool(self.features & FEATURE_SUMMARY)
+
+    def as_tuple(self) -> Tuple[str, str]:
+        """Returns the message as (role, content) tuple."""
+        return (self.role, self.content)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.instrumentation import RequestSpan
+
+# Parallel requests by default; local models share one GPU/CPU
+DEFAULT_MAX_CONCURRENCY = 2
+
+
+@dataclass
+class FanOutResult:
+    """
+    Response of one adapter to a fanned-out prompt.
+
+    ``span`` is the RequestSpan of the request if the adapter is instrumented
+    (TTFT, tokens per second, total latency); ``queued_seconds`` is the time
+    spent waiting for a free concurrency slot.
+    """
+    name: str
+    text: str = ""
+    error: Optional[str] = None
+    span: Optional[RequestSpan] = None
+    queued_seconds: float = 0.0
+
+
+async def fan_out(adapters: Mapping[str, LLMAdapter], prompt: str,
+                  max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                  on_chunk: Optional[Callable[[str, str], None]] = None,
+                  **kwargs) -> Dict[str, FanOutResult]:
+    """
+    Streams the same prompt to several adapters concurrently.
+
+    At most ``max_concurrency`` requests run at the same time; the others wait
+    for a slot in the order of ``adapters``. A failing adapter does not stop
+    the others, its error is stored in the result.
+
+    Args:
+        adapters: Name -> adapter (e.g. model name -> InstrumentedAdapter)
+        prompt: The prompt sent to every adapter
+        max_concurrency: Maximum number of parallel requests (at least 1)
+        on_chunk: Called with (name, full text so far) after every chunk
+        **kwargs: Provider-specific parameters passed to send_prompt_stream
+
+    Returns:
+        Dict[str, FanOutResult]: Results in the order of ``adapters``
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = {name: FanOutResult(name=name) for name in adapters}
+
+    async def _run(name: str, adapter: LLMAdapter) -> None:
+        result = results[name]
+        queued_at = time.perf_counter()
+        async with semaphore:
+            result.queued_seconds = time.perf_counter() - queued_at
+            try:
+                async for chunk in adapter.send_prompt_stream(prompt, **kwargs):
+                    result.text += chunk
+                    if on_chunk is not None:
+                        on_chunk(name, result.text)
+            except Exception as e:
+                result.error = str(e) or type(e).__name__
+            result.span = getattr(adapter, "current_span", None)
+
+    await asyncio.gather(*(_run(name, adapter) for name, adapter in adapters.items()))
+    return results
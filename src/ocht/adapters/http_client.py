@@ -0,0 +1,35 @@
+import asyncio
+import weakref
+from typing import Dict
+
+import httpx
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, read=300.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+# Shared clients per event loop and base URL; an httpx.AsyncClient must not
+# be used from another event loop (send_prompt runs its own loop)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Returns the pooled HTTP client for a base URL on the running event loop.
+
+    Adapters talking to the same server (e.g. several sessions or a /compare
+    run) share keep-alive connections instead of opening one per request.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    client = clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(base_url=base_url, timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        clients[base_url] = client
+    return client
+
+
+async def close_async_clients() -> None:
+    """Closes the pooled clients of the running event loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
@@ -0,0 +1,225 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.scheduler import RequestScheduler
+from ocht.core.profiling import get_active_profiler
+
+# Default number of request spans kept in memory
+DEFAULT_RING_SIZE = 256
+# Error recorded for responses stopped before the model finished
+STOPPED_ERROR = "stopped"
+
+
+@dataclass
+class RequestSpan:
+    """
+    Timing span of a single LLM request.
+
+    Durations are in seconds. Ollama-specific counters are None for providers
+    that do not report them.
+    """
+    provider_name: Optional[str] = None
+    model_name: Optional[str] = None
+    method: str = "stream"  # "stream", "async" or a label such as "compare"
+    started_at: datetime = field(default_factory=datetime.now)
+    context_seconds: Optional[float] = None  # Context preparation (memory strategy)
+    summary_seconds: Optional[float] = None  # Summarization part of the context preparation
+    ttft_seconds: Optional[float] = None  # Time to first token
+    total_seconds: Optional[float] = None
+    chunk_count: int = 0
+    output_tokens: int = 0
+    prompt_eval_count: Optional[int] = None
+    prompt_eval_duration_ns: Optional[int] = None
+    eval_count: Optional[int] = None
+    eval_duration_ns: Optional[int] = None
+    error: Optional[str] = None
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self._start
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Generation throughput, preferring the server-side eval timing."""
+        if self.eval_count and self.eval_duration_ns:
+            return self.eval_count / (self.eval_duration_ns / 1e9)
+        return self.live_tokens_per_second
+
+    @property
+    def live_tokens_per_second(self) -> Optional[float]:
+        """Client-side throughput since the first token (usable while streaming)."""
+        if self.ttft_seconds is None or self.output_tokens == 0:
+            return None
+        end = self.total_seconds if self.total_seconds is not None else self.elapsed_seconds
+        generation_seconds = end - self.ttft_seconds
+        if generation_seconds <= 0:
+            return None
+        return self.output_tokens / generation_seconds
+
+
+class MetricsRecorder:
+    """
+    In-memory ring buffer of finished request spans.
+
+    Listeners are called with every recorded span (e.g. to persist it) and
+    must not raise; failures are ignored so metrics never break a chat.
+    """
+
+    def __init__(self, size: int = DEFAULT_RING_SIZE):
+        self._spans: Deque[RequestSpan] = deque(maxlen=size)
+        self._listeners: List[Callable[[RequestSpan], None]] = []
+
+    def record(self, span: RequestSpan) -> None:
+        """Add a finished span and notify listeners."""
+        self._spans.append(span)
+        for listener in list(self._listeners):
+            try:
+                listener(span)
+            except Exception:
+                pass
+
+    def add_listener(self, listener: Callable[[RequestSpan], None]) -> None:
+        """Register a callback for recorded spans."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[RequestSpan], None]) -> None:
+        """Unregister a callback."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def has_listener(self, listener: Callable[[RequestSpan], None]) -> bool:
+        """Check whether a callback is registered."""
+        return listener in self._listeners
+
+    def recent(self, limit: Optional[int] = None) -> List[RequestSpan]:
+        """Return the most recent spans, oldest first."""
+        spans = list(self._spans)
+        return spans[-limit:] if limit else spans
+
+    def last(self) -> Optional[RequestSpan]:
+        """Return the most recent span, if any."""
+        return self._spans[-1] if self._spans else None
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        self._spans.clear()
+
+
+# Global instance
+metrics_recorder = MetricsRecorder()
+
+
+class InstrumentedAdapter(LLMAdapter):
+    """
+    Wraps an LLMAdapter and records a RequestSpan per request.
+
+    The wrapped adapter may expose ``last_context_seconds``,
+    ``last_summary_seconds`` and ``last_response_stats`` (Ollama timing
+    fields); they are copied into the span when present.
+    """
+
+    def __init__(self, inner: LLMAdapter, provider_name: Optional[str] = None,
+                 model_name: Optional[str] = None, recorder: Optional[MetricsRecorder] = None,
+                 span_method: Optional[str] = None):
+        self.inner = inner
+        self.provider_name = provider_name
+        self.model_name = model_name
+        self.recorder = recorder or metrics_recorder
+        # Overrides the method recorded in spans (e.g. "compare" for benchmark requests)
+        self.span_method = span_method
+        self.current_span: Optional[RequestSpan] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Delegate everything else (memory, history, ...) to the wrapped adapter
+        return getattr(self.inner, name)
+
+    def load_history(self, messages: Sequence[Tuple[str, str]]) -> None:
+        self.inner.load_history(messages)
+
+    @property
+    def request_priority(self) -> int:
+        return self.inner.request_priority
+
+    @request_priority.setter
+    def request_priority(self, priority: int) -> None:
+        self.inner.request_priority = priority
+
+    def attach_scheduler(self, scheduler: RequestScheduler, endpoint: str) -> None:
+        self.inner.attach_scheduler(scheduler, endpoint)
+
+    def cancel_requests(self, priority: Optional[int] = None, running: bool = True) -> int:
+        return self.inner.cancel_requests(priority, running)
+
+    async def prefetch_context(self) -> bool:
+        return await self.inner.prefetch_context()
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        span = self._start_span("async")
+        try:
+            response = await self.inner.send_prompt_async(prompt, **kwargs)
+            span.ttft_seconds = span.elapsed_seconds
+            span.chunk_count = 1
+            span.output_tokens = max(1, len(response) // 4) if response else 0
+            return response
+        except BaseException as e:
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            self._finish_span(span)
+
+    async def send_prompt_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        span = self._start_span("stream")
+        chunks = self.inner.send_prompt_stream(prompt, **kwargs)
+        try:
+            async for chunk in chunks:
+                if span.ttft_seconds is None:
+                    span.ttft_seconds = span.elapsed_seconds
+                span.chunk_count += 1
+                span.output_tokens += 1  # Ollama streams roughly one token per chunk
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            # Stopped by the user or a stream guard
+            span.error = STOPPED_ERROR
+            raise
+        except BaseException as e:
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            self._finish_span(span)
+            # Stopping early must reach the wrapped stream, so it closes its HTTP response
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def _start_span(self, method: str) -> RequestSpan:
+        span = RequestSpan(provider_name=self.provider_name, model_name=self.model_name,
+                           method=self.span_method or method)
+        self.current_span = span
+        return span
+
+    def _finish_span(self, span: RequestSpan) -> None:
+        span.total_seconds = span.elapsed_seconds
+        span.context_seconds = getattr(self.inner, "last_context_seconds", None)
+        span.summary_seconds = getattr(self.inner, "last_summary_seconds", None)
+        stats: Dict[str, Any] = getattr(self.inner, "last_response_stats", None) or {}
+        span.prompt_eval_count = stats.get("prompt_eval_count")
+        span.prompt_eval_duration_ns = stats.get("prompt_eval_duration")
+        span.eval_count = stats.get("eval_count")
+        span.eval_duration_ns = stats.get("eval_duration")
+        if span.eval_count:
+            span.output_tokens = span.eval_count
+        self.recorder.record(span)
+        profiler = get_active_profiler()
+        if profiler is not None:
+            # Streaming spans cannot use profile_span, the generator is suspended between chunks
+            profiler.add_span(f"adapter.{span.method}.total", span.total_seconds)
+            if span.ttft_seconds is not None:
+                profiler.add_span(f"adapter.{span.method}.ttft", span.ttft_seconds)
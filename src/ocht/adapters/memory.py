@@ -1,10 +1,26 @@
+import asyncio
 import re
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
-from langchain.memory import ConversationSummaryMemory
-from langchain.schema.language_model import BaseLanguageModel
+from typing import TYPE_CHECKING, Any, AsyncContextManager, Callable, Dict, List, Tuple, Optional, Sequence, Union
+from dataclasses import dataclass, field
+from ocht.adapters.context import ContextMessage, FEATURE_CODE, FEATURE_SUMMARY
+from ocht.adapters.scheduler import unscheduled
+from ocht.core.profiling import profiled
+
+if TYPE_CHECKING:
+    # LangChain is imported on first use: adapters with direct HTTP backends and the
+    # headless CLI only handle ContextMessages and never need it
+    from langchain.memory import ConversationSummaryMemory
+    from langchain.schema import BaseMessage
+    from langchain.schema.language_model import BaseLanguageModel
+
+# History entries accepted by the memory strategies
+HistoryMessage = Union["BaseMessage", ContextMessage]
+# Entries handled by the trimming/packing step
+ContextEntry = Union[ContextMessage, Tuple[str, str]]
+
+SUMMARY_PREFIX = "Previous conversation summary: "
 
 
 @dataclass
@@ -14,16 +30,85 @@ class MemoryConfig:
     recent_messages_count: int = 10
     code_retention_priority: float = 2.0  # Higher = longer retention
     summarization_threshold: int = 20  # Start summarizing after N messages
+    packing_mode: str = "greedy"  # "greedy" (trim oldest) or "optimal" (knapsack packing)
+    packing_time_budget_ms: float = 5.0  # Max time for optimal packing before greedy fallback
+    packing_max_cells: int = 200_000  # Upper bound for the DP table size (items x budget)
+    context_mode: str = "hybrid"  # "hybrid" (rebuild each turn) or "prefix_stable" (append-only)
+    prefetch_slice_ms: float = 2.0  # Max event loop time of one prefetch step before yielding
+    prefetch_budget_ms: float = 50.0  # Max event loop time of one prefetch (0 disables prefetching)
+
+
+@dataclass
+class PrefixCacheStats:
+    """Instrumentation for prefix-stable context construction."""
+    turns: int = 0  # Prompts prepared in prefix-stable mode
+    appended_turns: int = 0  # Turns that reused the previously sent prefix unchanged
+    compactions: int = 0  # Turns that rebuilt the context (summary refresh)
+    last_context_tokens: int = 0  # Estimated tokens of the last prepared context
+    last_reused_tokens: int = 0  # Estimated tokens of the reused prefix in the last turn
+    last_prompt_eval_count: Optional[int] = None  # Prompt tokens Ollama actually evaluated
+    total_prompt_eval_count: int = 0
+    total_context_tokens: int = 0
+    history: List[Dict[str, Any]] = field(default_factory=list)  # Last turns (bounded)
+
+
+@dataclass
+class PrefetchStats:
+    """Instrumentation for idle-time context prefetching."""
+    runs: int = 0  # Prefetches that completed
+    aborted: int = 0  # Prefetches stopped by the event loop time budget
+    hits: int = 0  # Prompts that reused the prefetched context
+    misses: int = 0  # Prompts whose history changed after the prefetch
+    last_loop_seconds: float = 0.0  # Event loop time of the last completed prefetch
+
+
+class _LoopBudget:
+    """
+    Event loop time budget of a background computation.
+
+    Measures CPU time of the loop thread (``time.thread_time``) and yields to
+    the loop whenever a slice is used up, so input handling is never blocked
+    for longer than one slice.
+    """
+
+    def __init__(self, slice_ms: float, budget_ms: float):
+        self.slice_seconds = slice_ms / 1000
+        self.budget_seconds = budget_ms / 1000
+        self.spent = 0.0
+        self._slice_started = time.thread_time()
+
+    async def checkpoint(self) -> bool:
+        """Yields to the event loop if the slice is used up; False once the budget is exhausted."""
+        elapsed = time.thread_time() - self._slice_started
+        if elapsed < self.slice_seconds:
+            return self.spent + elapsed <= self.budget_seconds
+        self.spent += elapsed
+        if self.spent > self.budget_seconds:
+            return False
+        await asyncio.sleep(0)
+        self._slice_started = time.thread_time()
+        return True
+
+    def pause(self) -> None:
+        """Stops measuring, e.g. while waiting for work that runs off the event loop."""
+        self.spent += time.thread_time() - self._slice_started
+
+    def resume(self) -> None:
+        self._slice_started = time.thread_time()
 
 
 class MemoryStrategy(ABC):
     """Abstract base class for memory management strategies."""
     
+    # Maximum number of cached BaseMessage -> ContextMessage conversions
+    CONTEXT_CACHE_SIZE = 2048
+
     def __init__(self, config: Optional[MemoryConfig] = None):
         self.config = config or MemoryConfig()
+        self._context_cache: Dict[Tuple[str, str], ContextMessage] = {}
     
     @abstractmethod
-    async def prepare_context(self, messages: List[BaseMessage], new_prompt: str) -> List[Tuple[str, str]]:
+    async def prepare_context(self, messages: List["BaseMessage"], new_prompt: str) -> List[Tuple[str, str]]:
         """
         Prepare conversation context for LLM call.
         
@@ -37,7 +122,7 @@ class MemoryStrategy(ABC):
         pass
     
     @abstractmethod
-    async def should_summarize(self, messages: List[BaseMessage]) -> bool:
+    async def should_summarize(self, messages: List["BaseMessage"]) -> bool:
         """
         Determine if conversation should be summarized.
         
@@ -49,6 +134,60 @@ class MemoryStrategy(ABC):
         """
         pass
     
+    def to_context_message(self, msg: Union[HistoryMessage, Tuple[str, str]],
+                           message_id: Optional[Any] = None, features: int = 0) -> ContextMessage:
+        """
+        Convert a history message into a ContextMessage.
+
+        Token counts and code detection are computed once per distinct
+        (role, content) pair and cached, so unchanged history costs nothing
+        on the next prompt.
+
+        Args:
+            msg: LangChain message, (role, content) tuple or ContextMessage
+            message_id: Optional id to attach (e.g. the database message id)
+            features: Additional feature flags (e.g. FEATURE_SUMMARY)
+
+        Returns:
+            ContextMessage for the given message
+        """
+        if isinstance(msg, ContextMessage):
+            return msg
+        if isinstance(msg, tuple):
+            role, content = msg
+        else:
+            role, content = self._convert_message_to_tuple(msg)
+            if message_id is None:
+                message_id = getattr(msg, "id", None)
+
+        key = (role, content)
+        cached = self._context_cache.get(key)
+        if cached is None:
+            if self._contains_code(content):
+                features |= FEATURE_CODE
+            cached = ContextMessage(role, content, self._estimate_tokens(content), features)
+            if len(self._context_cache) >= self.CONTEXT_CACHE_SIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._context_cache.pop(next(iter(self._context_cache)))
+            self._context_cache[key] = cached
+        if message_id is None and not features & ~cached.features:
+            return cached
+        return ContextMessage(role, content, cached.token_count, cached.features | features, message_id)
+
+    def _convert_message_to_tuple(self, msg: Any) -> Tuple[str, str]:
+        """Convert LangChain message to (role, content) tuple."""
+        if isinstance(msg, ContextMessage):
+            return msg.as_tuple()
+        from langchain.schema import AIMessage, HumanMessage
+
+        if isinstance(msg, HumanMessage):
+            return ("human", msg.content)
+        elif isinstance(msg, AIMessage):
+            return ("ai", msg.content)
+        else:
+            # SystemMessage and fallback for other message types
+            return ("system", msg.content)
+
     def _estimate_tokens(self, text: str) -> int:
         """
         Improved token estimation that accounts for different text patterns.
@@ -112,23 +251,41 @@ class HybridMemoryStrategy(MemoryStrategy):
     - Prioritize code-containing messages for longer retention
     - Smart summarization of older messages
     - Token-aware context management
+    - Prefetch of the next context while the user types
     """
     
-    def __init__(self, config: Optional[MemoryConfig] = None, llm: Optional[BaseLanguageModel] = None):
+    def __init__(self, config: Optional[MemoryConfig] = None, llm: Optional["BaseLanguageModel"] = None):
         super().__init__(config)
         self._summary_cache: Optional[str] = None
         self._last_summarized_count: int = 0
         self._llm = llm
-        self._summarizer: Optional[ConversationSummaryMemory] = None
+        self._summarizer: Optional["ConversationSummaryMemory"] = None
+        # Prefix-stable mode state: previously sent context (without prompt)
+        self._stable_prefix: List[ContextMessage] = []
+        self._stable_history_len: int = 0
+        self._compaction_requested: bool = False
+        self.prefix_stats = PrefixCacheStats()
+        # Time spent summarizing during the last prepare_context call
+        self.last_summary_seconds: float = 0.0
+        # Request slot for summarization calls (set by LLMAdapter.attach_scheduler)
+        self.request_slot: Callable[[], AsyncContextManager[None]] = unscheduled
+        # Context of the next prompt computed while the user types: (history, context without prompt)
+        self._prefetched: Optional[Tuple[List[ContextMessage], List[ContextMessage]]] = None
+        self.prefetch_stats = PrefetchStats()
+        # Summary being created; outlives a cancelled prefetch, the next prompt waits for it
+        self._summary_lock = asyncio.Lock()
+        self._summary_task: Optional["asyncio.Future[None]"] = None
         
         if llm:
-            self._summarizer = ConversationSummaryMemory(
+            import langchain.memory
+
+            self._summarizer = langchain.memory.ConversationSummaryMemory(
                 llm=llm,
                 return_messages=False,  # We want string summaries
                 max_token_limit=self.config.max_context_tokens // 4  # Reserve 1/4 for summary
             )
     
-    async def prepare_context(self, messages: List[BaseMessage], new_prompt: str) -> List[Tuple[str, str]]:
+    async def prepare_context(self, messages: Sequence[HistoryMessage], new_prompt: str) -> List[Tuple[str, str]]:
         """
         Prepare context using hybrid strategy.
         
@@ -137,92 +294,285 @@ class HybridMemoryStrategy(MemoryStrategy):
         2. For older messages: keep code-heavy ones, summarize others
         3. Ensure total context fits within token limit
         """
+        context = await self.prepare_context_messages(messages, new_prompt)
+        return [msg.as_tuple() for msg in context]
+
+    @profiled("memory.prepare_context")
+    async def prepare_context_messages(self, messages: Sequence[HistoryMessage],
+                                       new_prompt: str) -> List[ContextMessage]:
+        """
+        Prepare context as ContextMessage records.
+
+        Same strategy as prepare_context, but without converting to tuples, so
+        adapters can convert to provider objects at their boundary.
+
+        Args:
+            messages: Historical messages (LangChain messages or ContextMessages)
+            new_prompt: New user prompt to be added
+
+        Returns:
+            List of ContextMessage ready for the adapter
+        """
+        self.last_summary_seconds = 0.0
+        prompt_message = self.to_context_message(("human", new_prompt))
         if not messages:
-            return [("human", new_prompt)]
-        
-        total_messages = len(messages)
-        recent_cutoff = max(0, total_messages - self.config.recent_messages_count)
-        
-        # Split messages into recent and older
-        older_messages = messages[:recent_cutoff]
-        recent_messages = messages[recent_cutoff:]
-        
-        context_tuples = []
-        
-        # Handle older messages with summarization/selection
-        if older_messages:
-            summary_text = await self._get_or_create_summary(older_messages)
-            if summary_text:
-                context_tuples.append(("system", f"Previous conversation summary: {summary_text}"))
-            
-            # Keep important older messages (code-heavy ones)
-            important_older = self._select_important_messages(older_messages)
-            for msg in important_older:
-                role, content = self._convert_message_to_tuple(msg)
-                context_tuples.append((role, content))
-        
-        # Add recent messages (always keep these)
-        for msg in recent_messages:
-            role, content = self._convert_message_to_tuple(msg)
-            context_tuples.append((role, content))
+            if self.config.context_mode == "prefix_stable":
+                self._reset_prefix()
+            return [prompt_message]
+
+        history = [self.to_context_message(msg) for msg in messages]
+        if self.config.context_mode == "prefix_stable":
+            return await self._prepare_prefix_stable(history, prompt_message)
+        return await self._build_context(history, prompt_message)
+
+    async def _build_context(self, history: List[ContextMessage], prompt_message: ContextMessage,
+                             force_summary: bool = False) -> List[ContextMessage]:
+        """Build the hybrid context (summary, important older, recent, prompt)."""
+        prefetched = None if force_summary else self._take_prefetched(history)
+        if prefetched is not None:
+            context = list(prefetched)
+        else:
+            recent_cutoff = max(0, len(history) - self.config.recent_messages_count)
+            context = await self._summarize_older(history[:recent_cutoff], force=force_summary)
+            context.extend(self._select_important_messages(history[:recent_cutoff]))
+            # Add recent messages (always keep these)
+            context.extend(history[recent_cutoff:])
         
         # Add new prompt
-        context_tuples.append(("human", new_prompt))
+        context.append(prompt_message)
         
         # Ensure token limit compliance
-        context_tuples = await self._trim_to_token_limit(context_tuples)
+        if self.config.packing_mode == "optimal":
+            context = await self._pack_to_token_limit(context)
+        else:
+            context = await self._trim_to_token_limit(context)
         
-        return context_tuples
+        return context
     
-    async def should_summarize(self, messages: List[BaseMessage]) -> bool:
+    async def _summarize_older(self, older_messages: List[ContextMessage],
+                               force: bool = False) -> List[ContextMessage]:
+        """Returns the summary message of the older history (empty if there is none)."""
+        if not older_messages:
+            return []
+        summary_text = await self._get_or_create_summary(older_messages, force=force)
+        if not summary_text:
+            return []
+        return [self.to_context_message(("system", f"{SUMMARY_PREFIX}{summary_text}"), features=FEATURE_SUMMARY)]
+
+    async def prefetch(self, messages: Sequence[HistoryMessage]) -> bool:
+        """
+        Precompute the context of the next prompt while the user is typing.
+
+        Converts the history (token counts, code detection), refreshes the
+        summary and selects the important older messages. If the history is
+        unchanged when the prompt arrives, prepare_context_messages only adds
+        the prompt and fits the token limit.
+
+        The work on the event loop yields every ``prefetch_slice_ms`` and gives
+        up after ``prefetch_budget_ms``; a summary by the LLM runs in a thread
+        and does not count. Cancelling the calling task stops the prefetch at
+        the next step; a summary that is already running is finished and used
+        by the next prompt. Only the hybrid context mode is prefetched, the
+        prefix-stable mode already reuses its context between turns.
+
+        Args:
+            messages: Current history of the adapter
+
+        Returns:
+            True if the context was prefetched
+        """
+        if not messages or self.config.context_mode != "hybrid" or self.config.prefetch_budget_ms <= 0:
+            return False
+        self._prefetched = None
+        budget = _LoopBudget(self.config.prefetch_slice_ms, self.config.prefetch_budget_ms)
+
+        # Copy, adapters append to their history list in place
+        history: List[ContextMessage] = []
+        for msg in messages:
+            history.append(self.to_context_message(msg))
+            if not await budget.checkpoint():
+                self.prefetch_stats.aborted += 1
+                return False
+
+        recent_cutoff = max(0, len(history) - self.config.recent_messages_count)
+        older_messages = history[:recent_cutoff]
+        llm_summary = self._summarizer is not None and self._llm is not None
+        if llm_summary:
+            budget.pause()
+        context = await self._summarize_older(older_messages)
+        if llm_summary:
+            budget.resume()
+        if not await budget.checkpoint():
+            self.prefetch_stats.aborted += 1
+            return False
+        context.extend(self._select_important_messages(older_messages))
+        context.extend(history[recent_cutoff:])
+
+        budget.pause()
+        self._prefetched = (history, context)
+        self.prefetch_stats.runs += 1
+        self.prefetch_stats.last_loop_seconds = budget.spent
+        return True
+
+    def _take_prefetched(self, history: List[ContextMessage]) -> Optional[List[ContextMessage]]:
+        """Returns the prefetched context (without prompt) if it was built from this history."""
+        prefetched, self._prefetched = self._prefetched, None
+        if prefetched is None:
+            return None
+        prefetched_history, context = prefetched
+        if prefetched_history != history:
+            self.prefetch_stats.misses += 1
+            return None
+        self.prefetch_stats.hits += 1
+        return context
+
+    async def _prepare_prefix_stable(self, history: List[ContextMessage],
+                                     prompt_message: ContextMessage) -> List[ContextMessage]:
+        """
+        Prepare context that keeps the previously sent prefix byte-identical.
+
+        New history (last prompt and response) is appended to the prefix. The
+        context is only rebuilt (and the summary refreshed) at a compaction
+        boundary: when the appended context exceeds the token limit, the history
+        no longer matches the prefix, or compaction was requested explicitly.
+        This lets the model server reuse its KV cache for the unchanged prefix.
+        """
+        stats = self.prefix_stats
+        stats.turns += 1
+
+        context: Optional[List[ContextMessage]] = None
+        reused_tokens = 0
+        if (self._stable_prefix and not self._compaction_requested
+                and self._history_matches_prefix(history)):
+            candidate = self._stable_prefix + history[self._stable_history_len:] + [prompt_message]
+            if sum(msg.token_count for msg in candidate) <= self.config.max_context_tokens:
+                context = candidate
+                reused_tokens = sum(msg.token_count for msg in self._stable_prefix)
+                stats.appended_turns += 1
+
+        if context is None:
+            self._compaction_requested = False
+            context = await self._build_context(history, prompt_message, force_summary=True)
+            stats.compactions += 1
+
+        self._stable_prefix = context[:-1]
+        self._stable_history_len = len(history)
+
+        context_tokens = sum(msg.token_count for msg in context)
+        stats.last_context_tokens = context_tokens
+        stats.last_reused_tokens = reused_tokens
+        stats.total_context_tokens += context_tokens
+        return context
+
+    def _history_matches_prefix(self, history: List[ContextMessage]) -> bool:
+        """Check that the history still extends the history the prefix was built from."""
+        covered = self._stable_history_len
+        if covered == 0 or len(history) < covered:
+            return False
+        # The prefix ends with the newest history message it was built from
+        return history[covered - 1] == self._stable_prefix[-1]
+
+    def request_compaction(self) -> None:
+        """Rebuild and re-summarize the context on the next prompt (prefix-stable mode)."""
+        self._compaction_requested = True
+
+    def _reset_prefix(self) -> None:
+        """Forget the previously sent prefix."""
+        self._stable_prefix = []
+        self._stable_history_len = 0
+
+    def record_prompt_eval(self, prompt_eval_count: Optional[int]) -> None:
+        """
+        Record the prompt eval count reported by the model server.
+
+        With a warm prefix cache Ollama only evaluates the new tokens, so a
+        prompt eval count well below the context size indicates cache reuse.
+        """
+        if prompt_eval_count is None:
+            return
+        stats = self.prefix_stats
+        stats.last_prompt_eval_count = prompt_eval_count
+        stats.total_prompt_eval_count += prompt_eval_count
+        stats.history.append({
+            "context_tokens": stats.last_context_tokens,
+            "reused_tokens": stats.last_reused_tokens,
+            "prompt_eval_count": prompt_eval_count,
+        })
+        del stats.history[:-50]
+
+    async def should_summarize(self, messages: Sequence[HistoryMessage]) -> bool:
         """Check if summarization should occur based on message count and content."""
         return (
             len(messages) >= self.config.summarization_threshold and
             len(messages) > self._last_summarized_count + 5  # Re-summarize every 5 new messages
         )
     
-    async def _get_or_create_summary(self, messages: List[BaseMessage]) -> Optional[str]:
-        """Get cached summary or create new one if needed."""
-        if await self.should_summarize(messages):
-            if self._summarizer and self._llm:
-                # Use LangChain's summarization
-                try:
-                    # Create a temporary conversation for summarization
-                    for msg in messages:
-                        if isinstance(msg, HumanMessage):
-                            self._summarizer.save_context({"input": msg.content}, {"output": ""})
-                        elif isinstance(msg, AIMessage):
-                            # Find the corresponding human message
-                            prev_human = next((m for m in reversed(messages[:messages.index(msg)]) 
-                                             if isinstance(m, HumanMessage)), None)
-                            if prev_human:
-                                self._summarizer.save_context(
-                                    {"input": prev_human.content}, 
-                                    {"output": msg.content}
-                                )
-                    
-                    # Get the summary
-                    summary_vars = self._summarizer.load_memory_variables({})
-                    self._summary_cache = summary_vars.get("history", "")
-                    
-                except Exception:
-                    # Fallback to simple summary if LangChain summarization fails
-                    self._summary_cache = self._create_simple_summary(messages)
-            else:
-                # Fallback to simple summary
-                self._summary_cache = self._create_simple_summary(messages)
-            
-            self._last_summarized_count = len(messages)
-        
+    @profiled("memory.summary")
+    async def _get_or_create_summary(self, messages: Sequence[HistoryMessage],
+                                     force: bool = False) -> Optional[str]:
+        """
+        Get cached summary or create new one if needed (or forced at a compaction boundary).
+
+        Only one summary is created at a time. The LLM call runs in a thread
+        and cannot be stopped, so a summary is not cancelled with the calling
+        task: after a cancelled prefetch the next call waits for the running
+        summary and reuses it instead of starting a second one.
+        """
+        async with self._summary_lock:
+            if self._summary_task is not None:
+                await asyncio.shield(self._summary_task)
+                self._summary_task = None
+            if (force and len(messages) != self._last_summarized_count) or await self.should_summarize(messages):
+                # Copy, adapters append to their history list in place
+                self._summary_task = asyncio.ensure_future(self._create_summary(list(messages)))
+                await asyncio.shield(self._summary_task)
+                self._summary_task = None
+
         return self._summary_cache
+
+    async def _create_summary(self, messages: List[HistoryMessage]) -> None:
+        """Summarizes the messages into the summary cache."""
+        started = time.perf_counter()
+        if self._summarizer and self._llm:
+            # Use LangChain's summarization off the event loop, in a low-priority request slot
+            try:
+                async with self.request_slot():
+                    self._summary_cache = await asyncio.to_thread(self._summarize_with_llm, messages)
+            except Exception:
+                # Fallback to simple summary if LangChain summarization fails (or was superseded)
+                self._summary_cache = self._create_simple_summary(messages)
+        else:
+            # Fallback to simple summary
+            self._summary_cache = self._create_simple_summary(messages)
+
+        self._last_summarized_count = len(messages)
+        self.last_summary_seconds = time.perf_counter() - started
     
-    def _create_simple_summary(self, messages: List[BaseMessage]) -> str:
+    def _summarize_with_llm(self, messages: Sequence[HistoryMessage]) -> str:
+        """Feeds human/ai pairs into the LangChain summarizer and returns the summary (blocking)."""
+        prev_human: Optional[str] = None
+        for msg in messages:
+            role, content = self._convert_message_to_tuple(msg)
+            if role == "human":
+                self._summarizer.save_context({"input": content}, {"output": ""})
+                prev_human = content
+            elif role == "ai" and prev_human is not None:
+                self._summarizer.save_context(
+                    {"input": prev_human},
+                    {"output": content}
+                )
+
+        summary_vars = self._summarizer.load_memory_variables({})
+        return summary_vars.get("history", "")
+
+    def _create_simple_summary(self, messages: Sequence[HistoryMessage]) -> str:
         """Create a simple summary of messages (placeholder for LangChain integration)."""
         topics = set()
         code_mentions = []
         
         for msg in messages:
-            content = msg.content.lower()
+            context_msg = self.to_context_message(msg)
+            content = context_msg.content.lower()
             
             # Extract potential topics (very basic)
             if 'error' in content or 'bug' in content:
@@ -233,9 +583,9 @@ class HybridMemoryStrategy(MemoryStrategy):
                 topics.add('testing')
             
             # Note code-related discussions
-            if self._contains_code(msg.content):
+            if context_msg.has_code:
                 # Extract function names or class names
-                code_refs = re.findall(r'\b(def|class)\s+(\w+)', msg.content)
+                code_refs = re.findall(r'\b(def|class)\s+(\w+)', context_msg.content)
                 code_mentions.extend([ref[1] for ref in code_refs])
         
         summary_parts = []
@@ -246,19 +596,20 @@ class HybridMemoryStrategy(MemoryStrategy):
         
         return ". ".join(summary_parts) if summary_parts else "General conversation"
     
-    def _select_important_messages(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+    def _select_important_messages(self, messages: Sequence[HistoryMessage]) -> List[HistoryMessage]:
         """Select important messages from older history (prioritize code-containing ones)."""
         scored_messages = []
         
         for msg in messages:
+            context_msg = self.to_context_message(msg)
             score = 0.0
             
             # Higher score for code content
-            if self._contains_code(msg.content):
+            if context_msg.has_code:
                 score += self.config.code_retention_priority
             
             # Higher score for longer, detailed messages
-            score += min(len(msg.content) / 1000, 1.0)
+            score += min(len(context_msg.content) / 1000, 1.0)
             
             # Lower score for very recent messages (they'll be in recent_messages)
             scored_messages.append((score, msg))
@@ -271,38 +622,120 @@ class HybridMemoryStrategy(MemoryStrategy):
         min_score = 0.5 if any(score >= self.config.code_retention_priority for score, _ in scored_messages) else 1.0
         
         return [msg for score, msg in scored_messages[:max_important] if score >= min_score]
+
+    def _entry_parts(self, entry: ContextEntry) -> Tuple[str, str, int]:
+        """Return (role, content, token count) for a context entry."""
+        if isinstance(entry, ContextMessage):
+            return entry.role, entry.content, entry.token_count
+        role, content = entry
+        return role, content, self._estimate_tokens(content)
     
-    async def _trim_to_token_limit(self, context_tuples: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    async def _trim_to_token_limit(self, context: List[ContextEntry]) -> List[ContextEntry]:
         """Ensure context fits within token limit by removing older messages if needed."""
-        total_tokens = sum(self._estimate_tokens(content) for _, content in context_tuples)
+        costs = [self._entry_parts(entry)[2] for entry in context]
         
-        if total_tokens <= self.config.max_context_tokens:
-            return context_tuples
+        if sum(costs) <= self.config.max_context_tokens:
+            return context
         
         # Remove messages from the beginning (after system summary) until we fit
         # Always keep the last message (new prompt)
-        trimmed = context_tuples[-1:]  # Keep new prompt
-        remaining_budget = self.config.max_context_tokens - self._estimate_tokens(context_tuples[-1][1])
+        kept_from = len(context) - 1
+        remaining_budget = self.config.max_context_tokens - costs[-1]
         
         # Add messages from end to beginning until budget exhausted
-        for role, content in reversed(context_tuples[:-1]):
-            token_cost = self._estimate_tokens(content)
-            if remaining_budget >= token_cost:
-                trimmed.insert(0, (role, content))
-                remaining_budget -= token_cost
+        for index in range(len(context) - 2, -1, -1):
+            if remaining_budget >= costs[index]:
+                kept_from = index
+                remaining_budget -= costs[index]
             else:
                 break
         
-        return trimmed
-    
-    def _convert_message_to_tuple(self, msg: BaseMessage) -> Tuple[str, str]:
-        """Convert LangChain message to (role, content) tuple."""
-        if isinstance(msg, HumanMessage):
-            return ("human", msg.content)
-        elif isinstance(msg, AIMessage):
-            return ("ai", msg.content)
-        elif isinstance(msg, SystemMessage):
-            return ("system", msg.content)
-        else:
-            # Fallback for other message types
-            return ("system", msg.content)
\ No newline at end of file
+        return context[kept_from:]
+
+    async def _pack_to_token_limit(self, context: List[ContextEntry]) -> List[ContextEntry]:
+        """
+        Pack context into the token limit by maximizing the total retained score.
+
+        Solves a 0/1 knapsack over all messages except the new prompt, which is
+        always kept. Message order is preserved. If the DP does not finish within
+        ``packing_time_budget_ms`` the greedy-by-density result is used instead.
+        """
+        costs = [self._entry_parts(entry)[2] for entry in context]
+        if sum(costs) <= self.config.max_context_tokens:
+            return context
+
+        budget = self.config.max_context_tokens - costs[-1]
+        candidates = context[:-1]
+        if budget <= 0 or not candidates:
+            return context[-1:]
+
+        scores = [
+            self._score_context_entry(entry, index, len(candidates))
+            for index, entry in enumerate(candidates)
+        ]
+        chosen = self._knapsack_select(costs[:-1], scores, budget)
+        return [entry for index, entry in enumerate(candidates) if index in chosen] + context[-1:]
+
+    def _score_context_entry(self, entry: ContextEntry, position: int, total: int) -> float:
+        """Score a context entry for packing (code, length, recency and summary bonuses)."""
+        context_msg = self.to_context_message(entry)
+        score = 1.0  # Every retained message has some value
+        if context_msg.is_summary or (context_msg.role == "system" and context_msg.content.startswith(SUMMARY_PREFIX)):
+            score += self.config.code_retention_priority
+        if context_msg.has_code:
+            score += self.config.code_retention_priority
+        score += min(len(context_msg.content) / 1000, 1.0)
+        # Newer messages matter more for the immediate turn
+        score += (position + 1) / max(total, 1)
+        return score
+
+    def _knapsack_select(self, costs: List[int], scores: List[float], budget: int) -> set:
+        """
+        Select item indices maximizing total score with total cost <= budget.
+
+        Costs are bucketed (rounded up) so the DP table never exceeds
+        ``packing_max_cells``; rounding up keeps every solution feasible.
+        """
+        greedy = self._greedy_select(costs, scores, budget)
+        deadline = time.perf_counter() + self.config.packing_time_budget_ms / 1000
+
+        item_count = len(costs)
+        scale = max(1, -(-item_count * budget // max(1, self.config.packing_max_cells)))
+        weights = [-(-cost // scale) for cost in costs]
+        capacity = budget // scale
+
+        best = [0.0] * (capacity + 1)
+        taken: List[bytearray] = []
+        for index in range(item_count):
+            if time.perf_counter() > deadline:
+                return greedy
+            weight, score = weights[index], scores[index]
+            row = bytearray(capacity + 1)
+            for remaining in range(capacity, weight - 1, -1):
+                candidate = best[remaining - weight] + score
+                if candidate > best[remaining]:
+                    best[remaining] = candidate
+                    row[remaining] = 1
+            taken.append(row)
+
+        chosen = set()
+        remaining = capacity
+        for index in range(item_count - 1, -1, -1):
+            if taken[index][remaining]:
+                chosen.add(index)
+                remaining -= weights[index]
+
+        greedy_score = sum(scores[index] for index in greedy)
+        dp_score = sum(scores[index] for index in chosen)
+        return chosen if dp_score >= greedy_score else greedy
+
+    def _greedy_select(self, costs: List[int], scores: List[float], budget: int) -> set:
+        """Greedy baseline: take items by score density while they fit."""
+        order = sorted(range(len(costs)), key=lambda index: scores[index] / max(costs[index], 1), reverse=True)
+        chosen = set()
+        remaining = budget
+        for index in order:
+            if costs[index] <= remaining:
+                chosen.add(index)
+                remaining -= costs[index]
+        return chosen
@@ -1,10 +1,15 @@
 import asyncio
-from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
+import time
+from typing import Optional, Dict, Any, AsyncIterator, List, Sequence, Tuple
 from langchain.memory import ConversationSummaryMemory
 from langchain.schema import HumanMessage, AIMessage, SystemMessage, BaseMessage
 from langchain_ollama import ChatOllama
 from ocht.adapters.base import LLMAdapter
+from ocht.adapters.context import ContextMessage
 from ocht.adapters.memory import HybridMemoryStrategy, MemoryConfig
+from ocht.adapters.ollama_direct import OLLAMA_STAT_KEYS
+from ocht.adapters.scheduler import PRIORITY_SUMMARY
+from ocht.core.profiling import profiled
 
 class OllamaAdapter(LLMAdapter):
     """Adapter für lokale Ollama-Modelle über LangChain."""
@@ -18,12 +23,23 @@ class OllamaAdapter(LLMAdapter):
         use_hybrid_memory: bool = True,
         memory_config: Optional[MemoryConfig] = None,
     ):
+        self.base_url = base_url
         self.client = ChatOllama(
             model=model,
             base_url=base_url,
             **(default_params or {})
         )
 
+        # Conversation history as compact records (hybrid memory only)
+        self.history: List[ContextMessage] = []
+        # Cached LangChain conversions for unchanged history
+        self._message_cache: Dict[ContextMessage, BaseMessage] = {}
+        # Ollama stats of the last response (prompt_eval_count, eval_count, ...)
+        self.last_response_stats: Dict[str, Any] = {}
+        # Context preparation timing of the last request (read by InstrumentedAdapter)
+        self.last_context_seconds: Optional[float] = None
+        self.last_summary_seconds: Optional[float] = None
+
         if use_hybrid_memory:
             # Use new HybridMemoryStrategy
             self.memory_strategy = HybridMemoryStrategy(
@@ -47,20 +63,12 @@ class OllamaAdapter(LLMAdapter):
 
     async def send_prompt_async(self, prompt: str, **kwargs) -> str:
         # Geschichte laden und konvertieren
-        if self.memory_strategy:
-            # Use HybridMemoryStrategy
-            memory_vars = self.memory.load_memory_variables({})
-            history_messages = memory_vars.get('history', [])
-            messages = await self.memory_strategy.prepare_context(history_messages, prompt)
-        else:
-            # Legacy method
-            messages = await self._prepare_messages(prompt)
-        
-        # Convert tuples to message objects for LangChain
-        message_objects = self._convert_tuples_to_messages(messages)
+        message_objects = await self._build_message_objects(prompt)
         
         # LLM asynchron aufrufen
-        response = await self.client.ainvoke(message_objects, **kwargs)
+        async with self.request_slot():
+            response = await self.client.ainvoke(message_objects, **kwargs)
+        self._record_response_stats(response.response_metadata)
         
         # Kontext speichern
         await self._save_to_memory(prompt, response.content)
@@ -69,28 +77,65 @@ class OllamaAdapter(LLMAdapter):
 
     async def send_prompt_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
         # Geschichte laden und konvertieren
+        message_objects = await self._build_message_objects(prompt)
+        
+        # Streaming response
+        response_chunks: List[str] = []
+        chunks = self.client.astream(message_objects, **kwargs)
+        try:
+            async with self.request_slot():
+                async for chunk in chunks:
+                    if chunk.content:
+                        response_chunks.append(chunk.content)
+                        yield chunk.content
+                    if chunk.response_metadata.get("done"):
+                        self._record_response_stats(chunk.response_metadata)
+        except Exception:
+            # Fehlgeschlagene Antworten nicht merken; abgebrochene behalten ihren Teiltext
+            response_chunks.clear()
+            raise
+        finally:
+            # Bei vorzeitigem Abbruch den HTTP-Stream sofort schließen
+            await chunks.aclose()
+            # Nach dem Streaming (oder Abbruch) den empfangenen Text speichern
+            if response_chunks:
+                await self._save_to_memory(prompt, "".join(response_chunks))
+
+    def load_history(self, messages: Sequence[Tuple[str, str]]) -> None:
+        """Ersetzt den Verlauf; der Prefix-Cache erkennt den geänderten Verlauf selbst."""
+        if self.memory_strategy:
+            self.history = [self.memory_strategy.to_context_message(message) for message in messages]
+            return
+        self.memory.clear()
+        for (role, content) in messages:
+            if role == "human":
+                self.memory.chat_memory.add_user_message(content)
+            else:
+                self.memory.chat_memory.add_ai_message(content)
+
+    def _record_response_stats(self, metadata: Dict[str, Any]) -> None:
+        """Stores Ollama's timing stats and reports the prompt eval count to the memory strategy."""
+        self.last_response_stats = {key: metadata[key] for key in OLLAMA_STAT_KEYS if key in metadata}
         if self.memory_strategy:
-            # Use HybridMemoryStrategy
-            memory_vars = self.memory.load_memory_variables({})
-            history_messages = memory_vars.get('history', [])
-            messages = await self.memory_strategy.prepare_context(history_messages, prompt)
+            self.memory_strategy.record_prompt_eval(self.last_response_stats.get("prompt_eval_count"))
+
+    @profiled("adapter.build_messages")
+    async def _build_message_objects(self, prompt: str) -> List[BaseMessage]:
+        """Prepares the context and converts it to LangChain messages at the adapter boundary."""
+        self.last_response_stats = {}
+        started = time.perf_counter()
+        if self.memory_strategy:
+            # Use HybridMemoryStrategy on the compact history
+            context = await self.memory_strategy.prepare_context_messages(self.history, prompt)
+            message_objects = self._convert_context_to_messages(context)
+            self.last_summary_seconds = self.memory_strategy.last_summary_seconds
         else:
             # Legacy method
             messages = await self._prepare_messages(prompt)
-        
-        # Convert tuples to message objects for LangChain
-        message_objects = self._convert_tuples_to_messages(messages)
-        
-        # Streaming response
-        full_response = ""
-        async for chunk in self.client.astream(message_objects, **kwargs):
-            if chunk.content:
-                full_response += chunk.content
-                yield chunk.content
-        
-        # Nach dem Streaming den vollständigen Text speichern
-        if full_response:
-            await self._save_to_memory(prompt, full_response)
+            message_objects = self._convert_tuples_to_messages(messages)
+            self.last_summary_seconds = None
+        self.last_context_seconds = time.perf_counter() - started
+        return message_objects
 
     async def _prepare_messages(self, prompt: str) -> list[tuple[str, str]]:
         """Bereitet die Nachrichten-Historie für den LLM-Call vor."""
@@ -103,12 +148,38 @@ class OllamaAdapter(LLMAdapter):
 
     async def _save_to_memory(self, prompt: str, response: str):
         """Speichert den Kontext ins Memory."""
+        if self.memory_strategy:
+            self.history.append(self.memory_strategy.to_context_message(("human", prompt)))
+            self.history.append(self.memory_strategy.to_context_message(("ai", response)))
+            return
         # Memory operations könnten auch async sein - für jetzt sync
-        await asyncio.to_thread(
-            self.memory.save_context,
-            {"input": prompt},
-            {"output": response}
-        )
+        # (ConversationSummaryMemory ruft das LLM für die Zusammenfassung auf)
+        async with self.request_slot(PRIORITY_SUMMARY):
+            await asyncio.to_thread(
+                self.memory.save_context,
+                {"input": prompt},
+                {"output": response}
+            )
+
+    def _convert_context_to_messages(self, context: List[ContextMessage]) -> List[BaseMessage]:
+        """
+        Convert ContextMessages to LangChain message objects.
+
+        Conversions are cached per message, so unchanged history is not
+        re-wrapped on every prompt. The cache only keeps entries of the
+        current context.
+        """
+        cache = self._message_cache
+        converted = {}
+        messages = []
+        for msg in context:
+            message_object = cache.get(msg) or converted.get(msg)
+            if message_object is None:
+                message_object = self._convert_tuples_to_messages([msg.as_tuple()])[0]
+            converted[msg] = message_object
+            messages.append(message_object)
+        self._message_cache = converted
+        return messages
 
     def _convert_tuples_to_messages(self, message_tuples: List[Tuple[str, str]]) -> List[BaseMessage]:
         """Convert list of (role, content) tuples to LangChain message objects."""
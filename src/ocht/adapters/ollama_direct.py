@@ -0,0 +1,144 @@
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.context import ContextMessage
+from ocht.adapters.http_client import get_async_client
+from ocht.adapters.memory import HybridMemoryStrategy, MemoryConfig
+from ocht.core.profiling import profiled
+
+# Timing/usage fields Ollama reports with the final response
+OLLAMA_STAT_KEYS = (
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+    "total_duration",
+    "load_duration",
+)
+
+# Request fields outside of "options"; every other parameter is a model option
+OLLAMA_TOP_LEVEL_PARAMS = frozenset({"keep_alive", "format", "think"})
+
+# Memory roles -> Ollama chat roles
+OLLAMA_ROLES = {"human": "user", "user": "user", "ai": "assistant", "assistant": "assistant"}
+
+
+class OllamaDirectAdapter(LLMAdapter):
+    """
+    Schlanker Adapter für Ollama, der /api/chat direkt über HTTP anspricht.
+
+    Umgeht ChatOllama: Chunks werden inkrementell als NDJSON geparst und als
+    Strings geliefert, ohne LangChain-Messages, Callbacks oder Runnables.
+    Ältere Historie wird gekürzt statt zusammengefasst (kein LangChain-LLM).
+    """
+
+    def __init__(
+        self,
+        model: str = "qwen3:30b-a3b",
+        base_url: str = "http://localhost:11434",
+        default_params: Optional[Dict[str, Any]] = None,
+        memory_config: Optional[MemoryConfig] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.default_params = dict(default_params or {})
+        # Fixed client (e.g. for tests); otherwise the pooled client of the running loop
+        self._client = client
+
+        self.history: List[ContextMessage] = []
+        self.memory_strategy = HybridMemoryStrategy(config=memory_config or MemoryConfig())
+        # Ollama stats of the last response (prompt_eval_count, eval_count, ...)
+        self.last_response_stats: Dict[str, Any] = {}
+        # Context preparation timing of the last request (read by InstrumentedAdapter)
+        self.last_context_seconds: Optional[float] = None
+        self.last_summary_seconds: Optional[float] = None
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        response_chunks = [chunk async for chunk in self._chat(prompt, stream=False, **kwargs)]
+        return "".join(response_chunks)
+
+    async def send_prompt_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        chunks = self._chat(prompt, stream=True, **kwargs)
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            # Close the HTTP response right away when the consumer stops early
+            await chunks.aclose()
+
+    def load_history(self, messages: Sequence[Tuple[str, str]]) -> None:
+        self.history = [self.memory_strategy.to_context_message(message) for message in messages]
+
+    async def _chat(self, prompt: str, stream: bool, **kwargs) -> AsyncIterator[str]:
+        body = self._request_body(await self._build_messages(prompt), stream, **kwargs)
+        client = self._client or get_async_client(self.base_url)
+
+        response_chunks: List[str] = []
+        try:
+            async with self.request_slot(), client.stream("POST", f"{self.base_url}/api/chat", json=body) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    self._raise_for_status(response)
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event.get("error"):
+                        raise RuntimeError(event["error"])
+                    content = (event.get("message") or {}).get("content")
+                    if content:
+                        response_chunks.append(content)
+                        yield content
+                    if event.get("done"):
+                        self._record_response_stats(event)
+        except Exception:
+            # Failed responses are not remembered; stopped ones (cancelled, closed early) keep their partial text
+            response_chunks.clear()
+            raise
+        finally:
+            if response_chunks:
+                self._save_to_history(prompt, "".join(response_chunks))
+
+    def _request_body(self, messages: List[Dict[str, str]], stream: bool, **kwargs) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"model": self.model, "messages": messages, "stream": stream}
+        options: Dict[str, Any] = {}
+        for key, value in {**self.default_params, **kwargs}.items():
+            if key in OLLAMA_TOP_LEVEL_PARAMS:
+                body[key] = value
+            else:
+                options[key] = value
+        if options:
+            body["options"] = options
+        return body
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        try:
+            detail = response.json().get("error") or response.text
+        except ValueError:
+            detail = response.text
+        raise RuntimeError(f"HTTP {response.status_code}: {detail[:200]}")
+
+    def _record_response_stats(self, event: Dict[str, Any]) -> None:
+        """Stores Ollama's timing stats and reports the prompt eval count to the memory strategy."""
+        self.last_response_stats = {key: event[key] for key in OLLAMA_STAT_KEYS if key in event}
+        self.memory_strategy.record_prompt_eval(self.last_response_stats.get("prompt_eval_count"))
+
+    @profiled("adapter.build_messages")
+    async def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Prepares the context and converts it to Ollama chat messages."""
+        self.last_response_stats = {}
+        started = time.perf_counter()
+        context = await self.memory_strategy.prepare_context_messages(self.history, prompt)
+        self.last_summary_seconds = self.memory_strategy.last_summary_seconds
+        self.last_context_seconds = time.perf_counter() - started
+        return [{"role": OLLAMA_ROLES.get(msg.role.lower(), "system"), "content": msg.content} for msg in context]
+
+    def _save_to_history(self, prompt: str, response: str) -> None:
+        self.history.append(self.memory_strategy.to_context_message(("human", prompt)))
+        self.history.append(self.memory_strategy.to_context_message(("ai", response)))
@@ -0,0 +1,190 @@
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.context import ContextMessage
+from ocht.adapters.http_client import get_async_client
+from ocht.adapters.memory import HybridMemoryStrategy, MemoryConfig
+from ocht.core.profiling import profiled
+
+# Request parameters understood by OpenAI-compatible servers; other adapter
+# settings (e.g. Ollama's num_ctx) are not sent, many servers reject unknown keys
+OPENAI_PARAM_KEYS = frozenset({
+    "temperature",
+    "top_p",
+    "max_tokens",
+    "stop",
+    "seed",
+    "presence_penalty",
+    "frequency_penalty",
+})
+
+# Memory roles -> chat completion roles
+OPENAI_ROLES = {"human": "user", "user": "user", "ai": "assistant", "assistant": "assistant"}
+
+SSE_DONE = "[DONE]"
+
+
+async def iter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Parses a server-sent event stream and yields the data of each event.
+
+    Multi-line data fields are joined with newlines; comments and other
+    fields (event, id, retry) are ignored. The stream ends at ``[DONE]``.
+    """
+    data: List[str] = []
+    async for line in lines:
+        if not line:
+            if data:
+                payload = "\n".join(data)
+                data = []
+                if payload == SSE_DONE:
+                    return
+                yield payload
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(":")
+        if name == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data and "\n".join(data) != SSE_DONE:
+        yield "\n".join(data)
+
+
+class OpenAICompatAdapter(LLMAdapter):
+    """
+    Adapter für OpenAI-kompatible Chat-Completion-APIs (OpenAI, vLLM, llama.cpp, LM Studio, ...).
+
+    Spricht /chat/completions direkt über HTTP mit SSE-Streaming, ohne LangChain.
+    Der Verlauf läuft wie beim OllamaAdapter über die HybridMemoryStrategy;
+    ohne LangChain-LLM wird ältere Historie gekürzt statt zusammengefasst.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        base_url: str = "https://api.openai.com/v1",
+        api_key: Optional[str] = None,
+        default_params: Optional[Dict[str, Any]] = None,
+        memory_config: Optional[MemoryConfig] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.default_params = {key: value for key, value in (default_params or {}).items()
+                               if key in OPENAI_PARAM_KEYS}
+        # Fixed client (e.g. for tests); otherwise the pooled client of the running loop
+        self._client = client
+
+        self.history: List[ContextMessage] = []
+        self.memory_strategy = HybridMemoryStrategy(config=memory_config or MemoryConfig())
+        # Usage of the last response in Ollama's field names (read by InstrumentedAdapter)
+        self.last_response_stats: Dict[str, Any] = {}
+        self.last_context_seconds: Optional[float] = None
+        self.last_summary_seconds: Optional[float] = None
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        messages = await self._build_messages(prompt)
+        async with self.request_slot():
+            response = await self._post(self._request_body(messages, stream=False, **kwargs))
+        data = response.json()
+        self._record_usage(data.get("usage"))
+        content = data["choices"][0]["message"].get("content") or ""
+        self._save_to_history(prompt, content)
+        return content
+
+    async def send_prompt_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        messages = await self._build_messages(prompt)
+        body = self._request_body(messages, stream=True, **kwargs)
+        body["stream_options"] = {"include_usage": True}
+
+        response_chunks: List[str] = []
+        try:
+            async with self.request_slot(), \
+                    self._http_client().stream("POST", self._url(), json=body, headers=self._headers()) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    self._raise_for_status(response)
+                async for payload in iter_sse_data(response.aiter_lines()):
+                    event = json.loads(payload)
+                    if event.get("usage"):
+                        self._record_usage(event["usage"])
+                    for choice in event.get("choices") or ():
+                        content = (choice.get("delta") or {}).get("content")
+                        if content:
+                            response_chunks.append(content)
+                            yield content
+        except Exception:
+            # Only a stopped stream keeps its partial text in the history, a failed one is dropped
+            response_chunks.clear()
+            raise
+        finally:
+            if response_chunks:
+                self._save_to_history(prompt, "".join(response_chunks))
+
+    def load_history(self, messages: Sequence[Tuple[str, str]]) -> None:
+        self.history = [self.memory_strategy.to_context_message(message) for message in messages]
+
+    def _http_client(self) -> httpx.AsyncClient:
+        return self._client or get_async_client(self.base_url)
+
+    def _url(self) -> str:
+        # Absolute URL, so a shared client with another base URL works as well
+        return f"{self.base_url}/chat/completions"
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def _request_body(self, messages: List[Dict[str, str]], stream: bool, **kwargs) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"model": self.model, "messages": messages, "stream": stream}
+        body.update(self.default_params)
+        body.update({key: value for key, value in kwargs.items() if key in OPENAI_PARAM_KEYS})
+        return body
+
+    async def _post(self, body: Dict[str, Any]) -> httpx.Response:
+        response = await self._http_client().post(self._url(), json=body, headers=self._headers())
+        self._raise_for_status(response)
+        return response
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.status_code < 400:
+            return
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        # OpenAI nests the message ({"error": {"message": ...}}), other servers send {"error": "..."}
+        error = payload.get("error") if isinstance(payload, dict) else None
+        if isinstance(error, dict):
+            error = error.get("message")
+        detail = str(error) if error else response.text
+        raise RuntimeError(f"HTTP {response.status_code}: {detail[:200]}")
+
+    def _record_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        """Maps the OpenAI usage block onto Ollama's stat names and reports it to the memory strategy."""
+        if not usage:
+            return
+        self.last_response_stats = {
+            "prompt_eval_count": usage.get("prompt_tokens"),
+            "eval_count": usage.get("completion_tokens"),
+        }
+        self.memory_strategy.record_prompt_eval(usage.get("prompt_tokens"))
+
+    @profiled("adapter.build_messages")
+    async def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Prepares the context and converts it to chat completion messages."""
+        self.last_response_stats = {}
+        started = time.perf_counter()
+        context = await self.memory_strategy.prepare_context_messages(self.history, prompt)
+        self.last_summary_seconds = self.memory_strategy.last_summary_seconds
+        self.last_context_seconds = time.perf_counter() - started
+        return [{"role": OPENAI_ROLES.get(msg.role.lower(), "system"), "content": msg.content} for msg in context]
+
+    def _save_to_history(self, prompt: str, response: str) -> None:
+        self.history.append(self.memory_strategy.to_context_message(("human", prompt)))
+        self.history.append(self.memory_strategy.to_context_message(("ai", response)))
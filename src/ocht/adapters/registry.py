@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List, Optional
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.memory import MemoryConfig
+
+# Entry point group for adapter factories of other packages:
+#   [project.entry-points."ocht.adapters"]
+#   myprovider = "mypackage.adapter:create_adapter"
+ENTRY_POINT_GROUP = "ocht.adapters"
+
+# Default endpoints of OpenAI-compatible providers; prov_endpoint overrides them
+OPENAI_COMPAT_ENDPOINTS: Dict[str, Optional[str]] = {
+    "openai": "https://api.openai.com/v1",
+    "chatgpt": "https://api.openai.com/v1",
+    "grok": "https://api.x.ai/v1",
+    "vllm": "http://localhost:8000/v1",
+    "llamacpp": "http://localhost:8080/v1",
+    "lmstudio": "http://localhost:1234/v1",
+    "openai-compatible": None,  # Endpoint required
+}
+
+# Backends of the Ollama adapter: LangChain's ChatOllama (default) or direct HTTP
+OLLAMA_BACKEND_LANGCHAIN = "langchain"
+OLLAMA_BACKEND_DIRECT = "direct"
+OLLAMA_DEFAULT_ENDPOINT = "http://localhost:11434"
+
+
+@dataclass
+class AdapterSpec:
+    """
+    Everything an adapter factory needs to create an adapter.
+
+    Attributes:
+        provider_name: Name of the provider configuration
+        model_name: Name of the model
+        endpoint: Provider endpoint (prov_endpoint), None for the provider default
+        api_key: API key of the provider, None if not set
+        default_params: Adapter parameters (temperature, ...)
+        memory_config: Memory strategy configuration
+        backend: Implementation variant of the provider's adapter (e.g. "direct" for Ollama)
+    """
+    provider_name: str
+    model_name: str
+    endpoint: Optional[str] = None
+    api_key: Optional[str] = None
+    default_params: Optional[Dict[str, Any]] = None
+    memory_config: Optional[MemoryConfig] = None
+    backend: Optional[str] = None
+
+
+AdapterFactory = Callable[[AdapterSpec], LLMAdapter]
+
+_factories: Dict[str, AdapterFactory] = {}
+_entry_points_loaded = False
+
+
+def register_adapter(provider_name: str, factory: AdapterFactory) -> None:
+    """
+    Registers the adapter factory for a provider name (case-insensitive).
+
+    A later registration replaces an earlier one, so built-in adapters can be overridden.
+    """
+    _factories[provider_name.strip().lower()] = factory
+
+
+def unregister_adapter(provider_name: str) -> None:
+    _factories.pop(provider_name.strip().lower(), None)
+
+
+def get_adapter_factory(provider_name: str) -> Optional[AdapterFactory]:
+    """Returns the factory for a provider name, or None if no adapter is registered."""
+    _load_entry_points()
+    return _factories.get(provider_name.strip().lower())
+
+
+def available_adapters() -> List[str]:
+    """Returns the provider names with a registered adapter."""
+    _load_entry_points()
+    return sorted(_factories)
+
+
+def create_adapter(spec: AdapterSpec) -> Optional[LLMAdapter]:
+    """
+    Creates the adapter for a provider.
+
+    Returns:
+        Optional[LLMAdapter]: The adapter, or None if no adapter is registered for the provider
+
+    Raises:
+        ValueError: If the provider configuration is incomplete (e.g. missing endpoint)
+    """
+    factory = get_adapter_factory(spec.provider_name)
+    return factory(spec) if factory is not None else None
+
+
+def _load_entry_points() -> None:
+    """Registers the factories of installed plugins once; built-ins win over plugins of the same name."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name.lower() in _factories:
+            continue
+        try:
+            register_adapter(entry_point.name, entry_point.load())
+        except Exception:
+            # A broken plugin must not prevent the built-in adapters from working
+            continue
+
+
+def _create_ollama_adapter(spec: AdapterSpec) -> LLMAdapter:
+    backend = (spec.backend or OLLAMA_BACKEND_LANGCHAIN).strip().lower()
+    if backend == OLLAMA_BACKEND_DIRECT:
+        from ocht.adapters.ollama_direct import OllamaDirectAdapter
+        return OllamaDirectAdapter(model=spec.model_name, base_url=spec.endpoint or OLLAMA_DEFAULT_ENDPOINT,
+                                   default_params=spec.default_params, memory_config=spec.memory_config)
+    if backend != OLLAMA_BACKEND_LANGCHAIN:
+        raise ValueError(f"Unknown Ollama backend '{spec.backend}'")
+    from ocht.adapters.ollama import OllamaAdapter
+    return OllamaAdapter(model=spec.model_name, base_url=spec.endpoint or OLLAMA_DEFAULT_ENDPOINT,
+                         default_params=spec.default_params, memory_config=spec.memory_config)
+
+
+def _create_openai_compat_adapter(spec: AdapterSpec) -> LLMAdapter:
+    from ocht.adapters.openai_compat import OpenAICompatAdapter
+    endpoint = spec.endpoint or OPENAI_COMPAT_ENDPOINTS.get(spec.provider_name.strip().lower())
+    if not endpoint:
+        raise ValueError(f"Provider '{spec.provider_name}' requires an endpoint")
+    return OpenAICompatAdapter(model=spec.model_name, base_url=endpoint, api_key=spec.api_key,
+                               default_params=spec.default_params, memory_config=spec.memory_config)
+
+
+register_adapter("ollama", _create_ollama_adapter)
+for _name in OPENAI_COMPAT_ENDPOINTS:
+    register_adapter(_name, _create_openai_compat_adapter)
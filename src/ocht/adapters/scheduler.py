@@ -0,0 +1,297 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+# Priority classes, lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_SUMMARY = 1
+PRIORITY_BATCH = 2
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_SUMMARY: "summary",
+    PRIORITY_BATCH: "batch",
+}
+
+# Parallel requests per endpoint; Ollama serves 1-4 requests per model in parallel
+DEFAULT_ENDPOINT_CONCURRENCY = 2
+# Slots per endpoint that only interactive requests may use
+DEFAULT_INTERACTIVE_RESERVE = 1
+
+
+class RequestSuperseded(Exception):
+    """Raised for a queued request that was replaced by a newer request with the same key."""
+
+
+@dataclass
+class EndpointStats:
+    """
+    Queue metrics of one endpoint.
+
+    ``queued`` and ``peak_queued`` count waiting requests, ``wait_seconds`` and
+    ``granted`` are totals per priority class since the scheduler was created.
+    """
+    endpoint: str
+    limit: int
+    interactive_reserve: int
+    running: int = 0
+    queued: Dict[int, int] = field(default_factory=dict)
+    peak_queued: int = 0
+    granted: Dict[int, int] = field(default_factory=dict)
+    wait_seconds: Dict[int, float] = field(default_factory=dict)
+    superseded: int = 0
+    cancelled: int = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(self.queued.values())
+
+    def average_wait(self, priority: int) -> Optional[float]:
+        """Average time requests of a priority class waited for a slot, None if none ran yet."""
+        count = self.granted.get(priority, 0)
+        return self.wait_seconds.get(priority, 0.0) / count if count else None
+
+
+@dataclass(eq=False)
+class _Request:
+    priority: int
+    key: Any
+    future: asyncio.Future
+    task: Optional[asyncio.Task]
+    queued_at: float = field(default_factory=time.perf_counter)
+    granted: bool = False
+
+
+@dataclass
+class _Endpoint:
+    stats: EndpointStats
+    queue: List[Tuple[int, int, _Request]] = field(default_factory=list)
+    running: Set[_Request] = field(default_factory=set)
+
+    @property
+    def background_running(self) -> int:
+        return sum(1 for request in self.running if request.priority != PRIORITY_INTERACTIVE)
+
+
+class RequestScheduler:
+    """
+    Shares the request slots of model servers between sessions, summaries and batch jobs.
+
+    Every endpoint (e.g. one Ollama instance) has a concurrency limit. Waiting
+    requests get a free slot by priority class, then in arrival order, and
+    ``interactive_reserve`` slots are kept free for interactive requests, so a
+    prompt typed by the user is not stuck behind background work.
+
+    A new request with the same key as a queued one supersedes it: the queued
+    request fails with RequestSuperseded. Running requests are only stopped by
+    ``cancel``. The scheduler may be used from several event loops (the
+    synchronous ``send_prompt`` runs its own loop).
+    """
+
+    def __init__(self, default_limit: int = DEFAULT_ENDPOINT_CONCURRENCY,
+                 interactive_reserve: int = DEFAULT_INTERACTIVE_RESERVE):
+        self.default_limit = default_limit
+        self.interactive_reserve = interactive_reserve
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._sequence = itertools.count()
+
+    def configure(self, endpoint: str, limit: Optional[int] = None,
+                  interactive_reserve: Optional[int] = None) -> None:
+        """
+        Sets the concurrency limit and interactive reserve of an endpoint.
+
+        Raises:
+            ValueError: If the limit is below 1 or the reserve is negative
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        if interactive_reserve is not None and interactive_reserve < 0:
+            raise ValueError("interactive_reserve must not be negative")
+        with self._lock:
+            state = self._endpoint(endpoint)
+            if limit is not None:
+                state.stats.limit = limit
+            if interactive_reserve is not None:
+                state.stats.interactive_reserve = interactive_reserve
+            ready = self._dispatch(state)
+        self._wake(endpoint, ready)
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str, priority: int = PRIORITY_INTERACTIVE,
+                   key: Any = None) -> AsyncIterator[None]:
+        """
+        Waits for a free request slot of an endpoint and holds it for the ``async with`` block.
+
+        Args:
+            endpoint: Key of the model server (e.g. its base URL)
+            priority: PRIORITY_INTERACTIVE, PRIORITY_SUMMARY or PRIORITY_BATCH
+            key: Requests with the same key supersede each other while queued
+
+        Raises:
+            RequestSuperseded: If a newer request with the same key arrived while waiting
+        """
+        request = await self._acquire(endpoint, priority, key)
+        try:
+            yield
+        finally:
+            self._release(endpoint, request)
+
+    def cancel(self, key: Any, endpoint: Optional[str] = None, running: bool = True) -> int:
+        """
+        Cancels the queued and running requests with a key.
+
+        Args:
+            key: Key the requests were made with
+            endpoint: Only cancel requests of this endpoint (default: all endpoints)
+            running: Also cancel requests that hold a slot; False only withdraws queued ones
+
+        Returns:
+            int: Number of cancelled requests
+        """
+        if key is None:
+            return 0
+        cancelled: List[_Request] = []
+        with self._lock:
+            for name, state in self._endpoints.items():
+                if endpoint is not None and name != endpoint:
+                    continue
+                for request in self._remove_queued(state, key):
+                    cancelled.append(request)
+                    state.stats.cancelled += 1
+                for request in state.running if running else ():
+                    if request.key == key and request.task is not None:
+                        cancelled.append(request)
+                        state.stats.cancelled += 1
+        for request in cancelled:
+            target = request.task if request.granted else request.future
+            self._call_soon(request, target.cancel)
+        return len(cancelled)
+
+    def stats(self) -> List[EndpointStats]:
+        """Returns a snapshot of the queue metrics of every endpoint."""
+        with self._lock:
+            return [self._snapshot(state) for state in self._endpoints.values()]
+
+    async def _acquire(self, endpoint: str, priority: int, key: Any) -> _Request:
+        request = _Request(priority=priority, key=key, future=asyncio.get_running_loop().create_future(),
+                           task=asyncio.current_task())
+        with self._lock:
+            state = self._endpoint(endpoint)
+            superseded = self._remove_queued(state, key) if key is not None else []
+            state.stats.superseded += len(superseded)
+            heapq.heappush(state.queue, (priority, next(self._sequence), request))
+            ready = self._dispatch(state)
+            state.stats.peak_queued = max(state.stats.peak_queued, len(state.queue))
+        for old in superseded:
+            self._call_soon(old, self._fail, old.future, RequestSuperseded(f"Superseded request {key!r}"))
+        self._wake(endpoint, ready)
+
+        try:
+            await request.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if request.granted:
+                    state.running.discard(request)
+                else:
+                    self._remove_queued(state, request=request)
+                ready = self._dispatch(state)
+            self._wake(endpoint, ready)
+            raise
+        return request
+
+    def _release(self, endpoint: str, request: _Request) -> None:
+        with self._lock:
+            state = self._endpoints[endpoint]
+            state.running.discard(request)
+            ready = self._dispatch(state)
+        self._wake(endpoint, ready)
+
+    def _endpoint(self, endpoint: str) -> _Endpoint:
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            state = _Endpoint(EndpointStats(endpoint=endpoint, limit=self.default_limit,
+                                            interactive_reserve=self.interactive_reserve))
+            self._endpoints[endpoint] = state
+        return state
+
+    @staticmethod
+    def _dispatch(state: _Endpoint) -> List[_Request]:
+        """Grants free slots to the queued requests (caller holds the lock)."""
+        stats = state.stats
+        background_limit = max(1, stats.limit - stats.interactive_reserve)
+        ready = []
+        while state.queue and len(state.running) < stats.limit:
+            request = state.queue[0][2]
+            if request.priority != PRIORITY_INTERACTIVE and state.background_running >= background_limit:
+                # Interactive requests sort first, so nothing else in the queue may run
+                break
+            heapq.heappop(state.queue)
+            request.granted = True
+            state.running.add(request)
+            stats.granted[request.priority] = stats.granted.get(request.priority, 0) + 1
+            stats.wait_seconds[request.priority] = (stats.wait_seconds.get(request.priority, 0.0)
+                                                    + time.perf_counter() - request.queued_at)
+            ready.append(request)
+        return ready
+
+    @staticmethod
+    def _remove_queued(state: _Endpoint, key: Any = None, request: Optional[_Request] = None) -> List[_Request]:
+        """Removes queued requests by key or identity (caller holds the lock)."""
+        removed = [entry[2] for entry in state.queue
+                   if entry[2] is request or (request is None and entry[2].key == key)]
+        if removed:
+            state.queue = [entry for entry in state.queue if entry[2] not in removed]
+            heapq.heapify(state.queue)
+        return removed
+
+    @staticmethod
+    def _snapshot(state: _Endpoint) -> EndpointStats:
+        stats = state.stats
+        queued: Dict[int, int] = {}
+        for priority, _, _ in state.queue:
+            queued[priority] = queued.get(priority, 0) + 1
+        return EndpointStats(
+            endpoint=stats.endpoint, limit=stats.limit, interactive_reserve=stats.interactive_reserve,
+            running=len(state.running), queued=queued, peak_queued=stats.peak_queued,
+            granted=dict(stats.granted), wait_seconds=dict(stats.wait_seconds),
+            superseded=stats.superseded, cancelled=stats.cancelled,
+        )
+
+    def _wake(self, endpoint: str, requests: List[_Request]) -> None:
+        for request in requests:
+            if not self._call_soon(request, self._grant, request.future):
+                # The loop of the waiting request is gone, give the slot back
+                self._release(endpoint, request)
+
+    @staticmethod
+    def _call_soon(request: _Request, callback, *args) -> bool:
+        try:
+            request.future.get_loop().call_soon_threadsafe(callback, *args)
+            return True
+        except RuntimeError:
+            return False
+
+    @staticmethod
+    def _grant(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    @staticmethod
+    def _fail(future: asyncio.Future, error: Exception) -> None:
+        if not future.done():
+            future.set_exception(error)
+
+
+@asynccontextmanager
+async def unscheduled() -> AsyncIterator[None]:
+    """Request slot of adapters without a scheduler: runs immediately."""
+    yield
+
+
+# Global instance shared by all adapters
+request_scheduler = RequestScheduler()
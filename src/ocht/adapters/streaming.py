@@ -0,0 +1,97 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+# Reasons a stream ended before the model finished
+STOP_CANCELLED = "cancelled"
+STOP_MAX_SECONDS = "max_seconds"
+STOP_MAX_TOKENS = "max_tokens"
+
+
+@dataclass
+class StreamLimits:
+    """
+    Guards of a single streamed response; None disables a limit.
+
+    Attributes:
+        max_seconds: Maximum duration of the whole response, including the time to the first token
+        max_tokens: Maximum number of streamed chunks (roughly tokens for Ollama)
+    """
+    max_seconds: Optional[float] = None
+    max_tokens: Optional[int] = None
+
+
+class StreamController:
+    """
+    Consumes an adapter stream that can be stopped early.
+
+    ``stop()`` or an exceeded limit ends the stream right away, even while
+    waiting for the next chunk: the read is interrupted and the adapter
+    stream is closed, which closes the HTTP response so the server stops
+    generating. Adapters remember the partial response in their history.
+    ``stop_reason`` tells why the stream ended early (None if the model finished).
+
+    Chunks are read in the task that consumes the stream, so the request
+    scheduler's slot belongs to that task and ``RequestScheduler.cancel``
+    reaches the adapter stream.
+    """
+
+    def __init__(self, limits: Optional[StreamLimits] = None):
+        self.limits = limits or StreamLimits()
+        self.stop_reason: Optional[str] = None
+        # Task waiting for the next chunk, interrupted by stop()
+        self._reader: Optional[asyncio.Task] = None
+        self._interrupted = False
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_reason is not None
+
+    def stop(self, reason: str = STOP_CANCELLED) -> None:
+        """Ends the stream; the first reason wins."""
+        if self.stop_reason is None:
+            self.stop_reason = reason
+        if self._reader is not None and not self._interrupted:
+            self._interrupted = True
+            self._reader.cancel()
+
+    async def stream(self, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """
+        Yields the chunks of an adapter stream until it ends, is stopped or exceeds a limit.
+
+        Args:
+            chunks: The adapter stream (e.g. ``adapter.send_prompt_stream(prompt)``)
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        deadline = (loop.call_later(self.limits.max_seconds, self.stop, STOP_MAX_SECONDS)
+                    if self.limits.max_seconds else None)
+        iterator = chunks.__aiter__()
+        token_count = 0
+        try:
+            while not self.stopped:
+                self._reader = task
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+                except asyncio.CancelledError:
+                    if not self._interrupted:
+                        raise
+                    # Stopped or out of time: the cancellation only aborted the pending read
+                    uncancel = getattr(task, "uncancel", None)
+                    if uncancel is not None:
+                        uncancel()
+                    return
+                finally:
+                    self._reader = None
+                yield chunk
+                token_count += 1
+                if self.limits.max_tokens and token_count >= self.limits.max_tokens:
+                    self.stop(STOP_MAX_TOKENS)
+        finally:
+            if deadline is not None:
+                deadline.cancel()
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -1,17 +1,39 @@
+import sys
+from contextlib import contextmanager
+
 import click
+# The text UI (Textual) and the model manager (Ollama client) are imported by the commands that
+# need them, so 'ocht ask' and 'ocht chat --plain' start without loading them
 from ocht.services.workspace import create_workspace
-from ocht.services.chat import start_chat
 from ocht.services.config import open_conf, export_conf, import_conf
-from ocht.services.model_manager import list_llm_models, sync_llm_models
-from ocht.core.migration import migrate_to
+from ocht.services.metrics import get_metrics_summary
+from ocht.services.maintenance import format_size, run_maintenance
+from ocht.services.transfer import FORMATS as TRANSFER_FORMATS, TABLES as TRANSFER_TABLES, export_data, import_data
+from ocht.core.migration import ensure_schema, migrate_to
 from ocht.core.version import get_version
+from ocht.core.profiling import PROFILE_MODES, start_profiling, stop_profiling
 
 
 @click.group(invoke_without_command=True)
+@click.option("--profile", type=click.Choice(PROFILE_MODES), default=None,
+              help="Profile the run (cpu: cProfile, alloc: tracemalloc) and write a report file.")
+@click.option("--profile-output", type=click.Path(dir_okay=False), default=None,
+              help="Report file for --profile (default: ocht-profile-<mode>-<timestamp>.txt).")
 @click.pass_context
-def cli(ctx: click.Context):
+def cli(ctx: click.Context, profile, profile_output):
     """Modular Python TUI for controlling LLMs via LangChain."""
+    if profile:
+        start_profiling(profile, profile_output)
+
+        def _write_report():
+            report_path = stop_profiling()
+            if report_path:
+                click.echo(f"Profile report written to {report_path}")
+
+        ctx.call_on_close(_write_report)
     if ctx.invoked_subcommand is None:
+        from ocht.services.chat import start_chat
+
         start_chat()
 
 
@@ -23,9 +45,41 @@ def init(name):
 
 
 @cli.command()
-def chat():
+@click.option("--plain", is_flag=True,
+              help="Line-based chat without the text UI: one prompt per line, answers streamed to stdout.")
+@click.option("--workspace", "workspace_id", type=int, default=None, envvar="OCHT_WORKSPACE",
+              help="With --plain: continue and store the chat in this workspace (ID).")
+def chat(plain, workspace_id):
     """Starts an interactive chat session based on the current workspace."""
-    start_chat()
+    if not plain:
+        from ocht.services.chat import start_chat
+
+        start_chat()
+        return
+    from ocht.services.headless import plain_chat
+
+    try:
+        plain_chat(workspace_id)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command()
+@click.argument("prompt", required=False)
+@click.option("--workspace", "workspace_id", type=int, default=None, envvar="OCHT_WORKSPACE",
+              help="Continue and store the exchange in this workspace (ID).")
+def ask(prompt, workspace_id):
+    """Answers a prompt without the text UI, streamed to stdout (piped stdin is appended to the prompt)."""
+    from ocht.adapters.streaming import STOP_CANCELLED
+    from ocht.services.headless import ask as ask_prompt, build_prompt
+
+    try:
+        reply = ask_prompt(build_prompt(prompt, None if sys.stdin.isatty() else sys.stdin.read()), workspace_id)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    if reply.stop_reason == STOP_CANCELLED:
+        # Interrupted with Ctrl+C (the partial answer is stored)
+        sys.exit(130)
 
 
 @cli.command()
@@ -37,34 +91,154 @@ def config():
 @cli.command()
 @click.argument("datei")
 def export_config(datei):
-    """Exports the current settings as YAML or JSON file."""
-    export_conf(datei)
+    """Exports providers, models and settings as JSON or JSONL file."""
+    ensure_schema()
+    count = export_conf(datei)
+    click.echo(f"{count} records exported to {datei}")
 
 
 @cli.command()
 @click.argument("datei")
 def import_config(datei):
-    """Imports settings from a YAML or JSON file."""
-    import_conf(datei)
+    """Imports providers, models and settings from a JSON or JSONL export."""
+    ensure_schema()
+    _echo_import_summary(import_conf(datei))
+
+
+@contextmanager
+def _progress_bar(label):
+    """Yields a TransferProgress callback that drives a click progress bar."""
+    state = {"bar": None, "done": 0}
+
+    def update(progress):
+        if state["bar"] is None:
+            state["bar"] = click.progressbar(length=progress.total or 0, label=label)
+            state["bar"].__enter__()
+        state["bar"].update(progress.done - state["done"])
+        state["done"] = progress.done
+
+    try:
+        yield update
+    finally:
+        if state["bar"] is not None:
+            state["bar"].__exit__(None, None, None)
+
+
+def _echo_import_summary(summary):
+    inserted = ", ".join(f"{count} {table}s" for table, count in summary.inserted.items() if count)
+    click.echo(f"Imported {inserted or 'nothing'}; {summary.updated} settings updated, {summary.skipped} records skipped")
+
+
+@cli.command("export")
+@click.argument("datei")
+@click.option("--format", "fmt", type=click.Choice(TRANSFER_FORMATS), default=None,
+              help="Output format (default: from the file extension .jsonl, .json or .md, optionally .gz).")
+@click.option("--table", "tables", type=click.Choice(TRANSFER_TABLES), multiple=True,
+              help="Only export this table (repeatable; default: all).")
+@click.option("--workspace", "workspace_id", type=int, default=None, help="Only export this workspace (ID).")
+@click.option("--include-secrets", is_flag=True, help="Include the API keys of the providers.")
+def export_command(datei, fmt, tables, workspace_id, include_secrets):
+    """Exports workspaces, chats and configuration as JSONL, JSON or Markdown."""
+    ensure_schema()
+    try:
+        with _progress_bar("Exporting") as progress:
+            count = export_data(datei, fmt=fmt, tables=tables or TRANSFER_TABLES, workspace_id=workspace_id,
+                                include_secrets=include_secrets, progress=progress)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{count} records exported to {datei}")
+
+
+@cli.command("import")
+@click.argument("datei", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(TRANSFER_FORMATS), default=None,
+              help="Input format (default: from the file extension).")
+@click.option("--merge", is_flag=True,
+              help="Add the chats of existing workspaces to them (e.g. to restore a retention archive).")
+def import_command(datei, fmt, merge):
+    """Imports a JSONL or JSON export (workspaces, chats and configuration)."""
+    ensure_schema()
+    try:
+        with _progress_bar("Importing") as progress:
+            summary = import_data(datei, fmt=fmt, progress=progress, merge=merge)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    _echo_import_summary(summary)
 
 
 @cli.command()
 def list_models():
     """Lists available LLM models via LangChain."""
+    from ocht.services.model_manager import list_llm_models
+
     list_llm_models()
 
 
 @cli.command()
 def sync_models():
     """Synchronizes model metadata from external providers into the database."""
+    from ocht.services.model_manager import sync_llm_models
+
     sync_llm_models()
 
 
-@cli.command()
-@click.argument("zielversion")
+@cli.command(context_settings={"ignore_unknown_options": True})
+@click.argument("zielversion", default="head")
 def migrate(zielversion):
-    """Runs Alembic migrations to the specified target version."""
-    migrate_to(zielversion)
+    """Runs Alembic migrations to the specified target version (default: head, relative: -1)."""
+    try:
+        revision = migrate_to(zielversion)
+    except (ValueError, FileNotFoundError) as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Database schema at revision {revision or 'base'}")
+
+
+@cli.command()
+@click.option("--limit", default=500, show_default=True, help="Number of recent requests to aggregate.")
+@click.option("--model", "model_name", default=None, help="Only show metrics for this model.")
+def stats(limit, model_name):
+    """Shows latency and throughput metrics of recent LLM requests."""
+    ensure_schema()
+    summary = get_metrics_summary(limit=limit, model_name=model_name)
+    if not summary:
+        click.echo("No metrics recorded. Enable them with the setting 'metrics_persist' = true.")
+        return
+
+    def _fmt(value, suffix=""):
+        return f"{value:.1f}{suffix}" if value is not None else "-"
+
+    click.echo(f"{'Model':<30} {'Req':>5} {'Err':>4} {'TTFT p50':>10} {'TTFT p95':>10} "
+               f"{'Total p50':>10} {'tok/s':>7} {'Ctx avg':>9} {'Prompt eval':>12}")
+    for name, data in sorted(summary.items()):
+        click.echo(
+            f"{name[:30]:<30} {data['requests']:>5} {data['errors']:>4} "
+            f"{_fmt(data['ttft_ms_p50'], 'ms'):>10} {_fmt(data['ttft_ms_p95'], 'ms'):>10} "
+            f"{_fmt(data['total_ms_p50'], 'ms'):>10} {_fmt(data['tokens_per_second_avg']):>7} "
+            f"{_fmt(data['context_ms_avg'], 'ms'):>9} {_fmt(data['prompt_eval_ms_p50'], 'ms'):>12}"
+        )
+
+
+@cli.group()
+def db():
+    """Database maintenance."""
+
+
+@db.command()
+@click.option("--full-vacuum", is_flag=True,
+              help="Rebuild the file with VACUUM and switch it to incremental auto-vacuum (needed once for older databases).")
+def maintain(full_vacuum):
+    """Applies retention with archival, frees unused pages and refreshes the query statistics."""
+    ensure_schema()
+    report = run_maintenance(full_vacuum=full_vacuum)
+    for name, count in report.archived.items():
+        click.echo(f"Workspace '{name}': {count} messages removed")
+    for path in report.archive_files:
+        click.echo(f"Archived to {path}")
+    if report.auto_vacuum == "none":
+        click.echo("Auto-vacuum is off for this database, run 'ocht db maintain --full-vacuum' once to enable it.")
+    timings = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in report.timings.items())
+    click.echo(f"Size: {format_size(report.size_before)} -> {format_size(report.size_after)} "
+               f"({report.freed_pages} pages freed) in {report.seconds:.2f}s ({timings})")
 
 
 @cli.command()
@@ -82,7 +256,7 @@ def help(command):
         click.echo(f"Help for {command}")
     else:
         click.echo(
-            "Available commands: init, chat, config, list-models, sync-models, export-config, import-config, migrate, version"
+            "Available commands: init, chat, ask, config, list-models, sync-models, export, import, export-config, import-config, migrate, db, stats, version"
         )
 
 
@@ -0,0 +1,64 @@
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional dependency: pip install ocht[zstd]
+    zstandard = None
+
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+# zstd compresses and decompresses faster at a similar ratio; zlib is always available
+DEFAULT_CODEC = CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+# Message bodies from this length on are stored compressed outside the message row
+COMPRESS_MIN_CHARS = 2048
+# Compressed bodies are only kept if they save at least this fraction of the UTF-8 size
+MIN_SAVING = 0.2
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def compress_text(text: str, codec: str = DEFAULT_CODEC) -> bytes:
+    """
+    Compresses a text as UTF-8.
+
+    Raises:
+        ValueError: If the codec is unknown or not installed
+    """
+    data = text.encode("utf-8")
+    if codec == CODEC_ZLIB:
+        return zlib.compress(data, ZLIB_LEVEL)
+    if codec == CODEC_ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Compression codec '{codec}' is not available")
+
+
+def decompress_text(data: bytes, codec: str) -> str:
+    """
+    Decompresses a text written by compress_text.
+
+    Raises:
+        ValueError: If the codec is unknown or not installed
+    """
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    if codec == CODEC_ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    raise ValueError(f"Compression codec '{codec}' is not available (install ocht[zstd])")
+
+
+def compress_if_large(text: str, codec: str = DEFAULT_CODEC) -> Optional[Tuple[str, bytes]]:
+    """
+    Compresses a text if it is long enough and compresses well.
+
+    Returns:
+        Optional[Tuple[str, bytes]]: (codec, data), or None if the text should stay inline
+    """
+    if len(text) < COMPRESS_MIN_CHARS:
+        return None
+    data = compress_text(text, codec)
+    if len(data) > len(text.encode("utf-8")) * (1 - MIN_SAVING):
+        return None
+    return codec, data
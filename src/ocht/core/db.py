@@ -1,14 +1,27 @@
+import asyncio
+import functools
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Generator
+from typing import Any, Callable, Generator, Optional, TypeVar
 from contextlib import contextmanager
 
 from sqlalchemy.engine import Engine
 from sqlmodel import Session, SQLModel, create_engine
 
+from ocht.core.profiling import profile_span
+
 # Default database path as fallback
 DEFAULT_DB_PATH = "src/ocht/data/ocht.db"
 
+T = TypeVar("T")
+
+# Dedicated thread for blocking database work, so the TUI event loop never waits on SQLite.
+# A single worker also serializes writes, which avoids "database is locked" between our own threads.
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_lock = threading.Lock()
+
 
 def get_database_url() -> str:
     """
@@ -68,6 +81,10 @@ def init_db(engine: Engine = None) -> None:
     """
     if engine is None:
         engine = create_db_engine()
+    if engine.dialect.name == "sqlite":
+        # Only takes effect before the first table exists; lets maintenance free pages without a full VACUUM
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
     SQLModel.metadata.create_all(engine)
 
 
@@ -88,8 +105,39 @@ def get_session(engine: Engine = None) -> Generator[Session, None, None]:
     Yields:
         A SQLModel Session object.
     """
-    if engine is None:
-        engine = create_db_engine()
+    with profile_span("db.session"):
+        if engine is None:
+            engine = create_db_engine()
 
-    with Session(engine) as session:
-        yield session
+        with Session(engine) as session:
+            yield session
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Returns the single-thread executor used for database work."""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is None:
+            _db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocht-db")
+        return _db_executor
+
+
+def submit_to_db_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    """
+    Schedules a blocking database/service call on the DB thread without waiting.
+
+    Returns:
+        A concurrent.futures.Future with the result.
+    """
+    return get_db_executor().submit(func, *args, **kwargs)
+
+
+async def run_in_db_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs a blocking database/service call on the DB thread and awaits its result.
+
+    Example:
+        models = await run_in_db_thread(list_llm_models)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
@@ -0,0 +1,119 @@
+from typing import Callable, FrozenSet, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Characters after which a match counts as the start of a word ("llama3:8b", "my-workspace")
+WORD_SEPARATORS = frozenset(" -_:./")
+
+SCORE_MATCH = 1
+SCORE_PREFIX = 8
+SCORE_SUBSTRING = 4
+SCORE_WORD_START = 3
+SCORE_CONSECUTIVE = 2
+
+
+class _Entry(Generic[T]):
+    """Preprocessed name of one indexed item."""
+
+    __slots__ = ("item", "text", "chars", "position")
+
+    def __init__(self, item: T, text: str, position: int):
+        self.item = item
+        self.text = text
+        self.chars: FrozenSet[str] = frozenset(text)
+        self.position = position
+
+
+def fuzzy_score(query: str, text: str) -> Optional[int]:
+    """
+    Scores how well a query matches a text as a subsequence.
+
+    Both arguments must already be lower case. Prefix and substring matches,
+    matches at word starts and consecutive characters score higher.
+
+    Returns:
+        Optional[int]: The score, or None if the query is no subsequence of the text
+    """
+    if not query:
+        return 0
+
+    score = 0
+    substring_at = text.find(query)
+    if substring_at == 0:
+        score += SCORE_PREFIX
+    elif substring_at > 0:
+        score += SCORE_SUBSTRING
+
+    position = -1
+    for char in query:
+        found = text.find(char, position + 1)
+        if found < 0:
+            return None
+        score += SCORE_MATCH
+        if found == 0 or text[found - 1] in WORD_SEPARATORS:
+            score += SCORE_WORD_START
+        if found == position + 1 and position >= 0:
+            score += SCORE_CONSECUTIVE
+        position = found
+    return score
+
+
+class FuzzyIndex(Generic[T]):
+    """
+    In-memory fuzzy search index over item names.
+
+    Names are lower-cased and reduced to character sets once when the index is
+    built, so most non-matching items are rejected without scoring. Searches
+    that extend the previous query (type-ahead) only rescan the previous
+    matches instead of all items.
+    """
+
+    def __init__(self, items: Iterable[T], key: Callable[[T], str]):
+        """
+        Builds the index.
+
+        Args:
+            items: Items to index, in their default order
+            key: Returns the searchable name of an item
+        """
+        self._entries: List[_Entry[T]] = [
+            _Entry(item, (key(item) or "").lower(), position) for position, item in enumerate(items)
+        ]
+        self._last_query = ""
+        self._last_matches: List[_Entry[T]] = self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[T]:
+        """
+        Returns the items matching a query, best matches first.
+
+        An empty query returns all items in their original order.
+
+        Args:
+            query: Search text (case-insensitive, whitespace is ignored)
+            limit: Maximum number of items to return (default: all)
+        """
+        return [entry.item for _, entry in self._search(query)[:limit]]
+
+    def _search(self, query: str) -> Sequence[Tuple[int, _Entry[T]]]:
+        query = "".join(query.lower().split())
+        if not query:
+            self._last_query, self._last_matches = "", self._entries
+            return [(0, entry) for entry in self._entries]
+
+        candidates = self._last_matches if self._last_query and query.startswith(self._last_query) else self._entries
+        query_chars = frozenset(query)
+        scored = []
+        for entry in candidates:
+            if not query_chars <= entry.chars:
+                continue
+            score = fuzzy_score(query, entry.text)
+            if score is not None:
+                scored.append((score, entry))
+
+        scored.sort(key=lambda match: (-match[0], match[1].position))
+        self._last_query = query
+        self._last_matches = [entry for _, entry in scored]
+        return scored
@@ -1,3 +1,225 @@
-def migrate_to(version: str):
-    """Ruft Alembic auf, um auf die angegebene Version zu migrieren."""
-    pass
\ No newline at end of file
+import warnings
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from ocht.core.db import create_db_engine, get_database_url, init_db
+# Imported from the models module so all tables are registered in SQLModel.metadata
+from ocht.core.models import SQLModel
+
+# Newest revision in migrations/versions. The startup check compares the database against it without
+# loading the migration scripts; tests/migration_tests.py keeps it in sync with the Alembic head.
+SCHEMA_REVISION = "9a5c3e7f1b24"
+# Schema that init_db created before databases stored their revision; such databases are stamped and upgraded
+BASELINE_REVISION = "f608934696fd"
+
+VERSION_TABLE = "alembic_version"
+MIGRATIONS_DIR_NAME = "migrations"
+# Expression indexes (lower(name)) cannot be reflected on SQLite; batch migrations and comparisons skip them
+EXPRESSION_INDEX_WARNING = ".*expression-based index"
+
+
+def get_migrations_dir() -> Optional[Path]:
+    """Returns the Alembic script directory (migrations/ in the project root), or None if it is not available."""
+    for parent in Path(__file__).resolve().parents:
+        candidate = parent / MIGRATIONS_DIR_NAME
+        if (candidate / "env.py").exists():
+            return candidate
+    return None
+
+
+def get_alembic_config(database_url: Optional[str] = None):
+    """
+    Builds an Alembic configuration without alembic.ini.
+
+    Set ``config.attributes["connection"]`` to run the migrations on an open connection.
+
+    Raises:
+        FileNotFoundError: If the migration scripts are not available
+    """
+    # Alembic is only imported when a migration actually runs, not on every start
+    from alembic.config import Config
+
+    directory = get_migrations_dir()
+    if directory is None:
+        raise FileNotFoundError(f"Alembic migrations not found (expected a '{MIGRATIONS_DIR_NAME}' directory)")
+    config = Config()
+    config.set_main_option("script_location", str(directory))
+    config.set_main_option("sqlalchemy.url", (database_url or get_database_url()).replace("%", "%%"))
+    return config
+
+
+def get_current_revision(engine: Optional[Engine] = None) -> Optional[str]:
+    """Returns the schema revision stored in the database (one query), or None if it is not versioned."""
+    engine = engine or create_db_engine()
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text(f"SELECT version_num FROM {VERSION_TABLE}")).scalar()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def migrate_to(version: str = "head", engine: Optional[Engine] = None) -> Optional[str]:
+    """
+    Ruft Alembic auf, um auf die angegebene Version zu migrieren.
+
+    Args:
+        version: Target revision: 'head', 'base', a revision ID (or unique prefix) or relative like '-1'/'+1'
+        engine: Engine of the database to migrate (default: create_db_engine())
+
+    Returns:
+        Optional[str]: The revision of the database after the migration
+
+    Raises:
+        ValueError: If the revision is unknown or the database is not versioned and does not match the models
+    """
+    from alembic import command
+    from alembic.script import ScriptDirectory
+    from alembic.util.exc import CommandError
+
+    engine = engine or create_db_engine()
+    config = get_alembic_config(engine.url.render_as_string(hide_password=False))
+    current = get_current_revision(engine)
+    if current is None and _has_tables(engine):
+        # Created by init_db before migrations were tracked: adopt it if it has a known schema
+        current = _adopt_unversioned(engine)
+        if current is None:
+            raise ValueError("The database has no schema revision and differs from the models; "
+                             "migrate it manually and run 'alembic stamp'")
+
+    try:
+        script = ScriptDirectory.from_config(config)
+        downgrade = version == "base" or version.startswith("-") or _is_ancestor(script, version, current)
+        with engine.begin() as connection, warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message=EXPRESSION_INDEX_WARNING)
+            config.attributes["connection"] = connection
+            if downgrade:
+                command.downgrade(config, version)
+            else:
+                command.upgrade(config, version)
+    except CommandError as e:
+        raise ValueError(str(e)) from e
+    return get_current_revision(engine)
+
+
+def ensure_schema(engine: Optional[Engine] = None) -> bool:
+    """
+    Startup check that brings the schema of the database to SCHEMA_REVISION.
+
+    A current database costs one query for the stored revision; create_all
+    and its introspection of every table are skipped. A new database is
+    created with create_all and stamped, an older revision is migrated with
+    Alembic. Unversioned databases created by earlier versions are stamped
+    at the revision whose schema they have (BASELINE_REVISION or the
+    current one) and upgraded; others get the missing tables and are
+    stamped if they then match the models.
+
+    Args:
+        engine: Engine to use (default: create_db_engine())
+
+    Returns:
+        bool: True if the schema was already current
+    """
+    engine = engine or create_db_engine()
+    current = get_current_revision(engine)
+    if current == SCHEMA_REVISION:
+        return True
+
+    is_new = not _has_tables(engine)
+    if current is None and not is_new:
+        # Adopted before create_all, which would add the new tables but not the new columns
+        current = _adopt_unversioned(engine)
+        if current == SCHEMA_REVISION:
+            return False
+
+    if current is not None and get_migrations_dir() is not None:
+        migrate_to("head", engine)
+        return False
+
+    init_db(engine)
+    if current is None and (is_new or _matches_models(engine)):
+        _stamp(engine)
+    return False
+
+
+def _has_tables(engine: Engine) -> bool:
+    return any(name != VERSION_TABLE for name in inspect(engine).get_table_names())
+
+
+def _adopt_unversioned(engine: Engine) -> Optional[str]:
+    """
+    Stamps an unversioned database whose schema is known.
+
+    Returns:
+        Optional[str]: SCHEMA_REVISION or BASELINE_REVISION, None if the schema matches neither
+    """
+    if _matches_models(engine):
+        _stamp(engine)
+        return SCHEMA_REVISION
+    if get_migrations_dir() is not None and _matches_revision(engine, BASELINE_REVISION):
+        _stamp(engine, BASELINE_REVISION)
+        return BASELINE_REVISION
+    return None
+
+
+def _stamp(engine: Engine, revision: str = SCHEMA_REVISION) -> None:
+    """Stores a revision like 'alembic stamp', without loading the migration scripts."""
+    with engine.begin() as connection:
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} "
+            f"(version_num VARCHAR(32) NOT NULL, CONSTRAINT {VERSION_TABLE}_pkc PRIMARY KEY (version_num))"
+        ))
+        connection.execute(text(f"DELETE FROM {VERSION_TABLE}"))
+        connection.execute(text(f"INSERT INTO {VERSION_TABLE} (version_num) VALUES (:revision)"),
+                           {"revision": revision})
+
+
+def _matches_models(engine: Engine) -> bool:
+    """Checks with Alembic's autogenerate comparison whether the tables match the SQLModel models."""
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+
+    with engine.connect() as connection, warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=EXPRESSION_INDEX_WARNING)
+        return not compare_metadata(MigrationContext.configure(connection), SQLModel.metadata)
+
+
+def _table_columns(connection) -> Dict[str, Tuple[Set[str], Tuple[str, ...]]]:
+    """Column names and primary key of every table except the version table."""
+    inspector = inspect(connection)
+    return {
+        table: ({column["name"] for column in inspector.get_columns(table)},
+                tuple(inspector.get_pk_constraint(table)["constrained_columns"]))
+        for table in inspector.get_table_names() if table != VERSION_TABLE
+    }
+
+
+def _matches_revision(engine: Engine, revision: str) -> bool:
+    """Checks whether the tables have the columns and primary keys that the migrations create up to revision."""
+    from alembic import command
+
+    reference = create_engine("sqlite://")
+    try:
+        config = get_alembic_config("sqlite://")
+        with reference.begin() as connection, warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message=EXPRESSION_INDEX_WARNING)
+            config.attributes["connection"] = connection
+            command.upgrade(config, revision)
+            expected = _table_columns(connection)
+    finally:
+        reference.dispose()
+    with engine.connect() as connection:
+        return _table_columns(connection) == expected
+
+
+def _is_ancestor(script, version: str, current: Optional[str]) -> bool:
+    """True if version is an older revision than current (so reaching it is a downgrade)."""
+    if current is None or version in ("head", "heads") or version.startswith("+"):
+        return False
+    target = script.get_revision(version)
+    if target is None or target.revision == current:
+        return False
+    return any(revision.revision == target.revision for revision in script.iterate_revisions(current, "base"))
@@ -1,6 +1,12 @@
 from datetime import datetime
 from typing import Optional
-from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, func
+from sqlmodel import SQLModel, Field, Relationship
+
+from ocht.core.compression import decompress_text
+
+# setting_workspace_id of global settings; part of the composite primary key, so it cannot be NULL
+GLOBAL_SCOPE_ID = 0
 
 
 class Workspace(SQLModel, table=True):
@@ -14,6 +20,7 @@ class Workspace(SQLModel, table=True):
         work_created_at (datetime): Creation timestamp.
         work_updated_at (datetime): Last update timestamp.
         work_description (Optional[str]): Optional description about the workspace.
+        work_active_leaf_id (Optional[int]): Last message of the active branch, None if the next message starts a new conversation.
     """
     work_id: Optional[int] = Field(default=None, primary_key=True)
     work_name: str
@@ -21,6 +28,8 @@ class Workspace(SQLModel, table=True):
     work_created_at: datetime = Field(default_factory=datetime.now)
     work_updated_at: datetime = Field(default_factory=datetime.now)
     work_description: Optional[str] = None
+    # No foreign key: message already references workspace, and the leaf is checked when it is read
+    work_active_leaf_id: Optional[int] = None
 
 
 class Message(SQLModel, table=True):
@@ -31,12 +40,18 @@ class Message(SQLModel, table=True):
         msg_id (Optional[int]): Primary key of the message.
         msg_workspace_id (int): Foreign key linking to Workspace.work_id.
         msg_role (str): Role of the message (e.g., 'user', 'assistant', 'system').
-        msg_content (str): The text content of the message.
+        msg_content (str): The text content of the message; empty if it is stored in msg_body
+            (read Message.content to get the text in both cases).
         msg_created_at (datetime): Creation timestamp.
         msg_updated_at (Optional[datetime]): Timestamp of last update, if edited.
         msg_parent_id (Optional[int]): Parent message ID for threaded replies.
+        msg_path (str): Materialized path of the ancestor IDs ("0000000001/0000000004/"), empty for
+            root messages; maintained on insert by repositories/message.py.
+        msg_depth (int): Number of ancestors (0 for root messages).
+        msg_partial (bool): True if the response was stopped before the model finished.
         msg_token_count (Optional[int]): Token count of the message.
         msg_metadata (Optional[str]): Additional metadata stored as JSON string.
+        msg_body_id (Optional[int]): Foreign key to the compressed MessageBody of large messages.
     """
     msg_id: Optional[int] = Field(default=None, primary_key=True)
     msg_workspace_id: int = Field(foreign_key="workspace.work_id")
@@ -44,9 +59,41 @@ class Message(SQLModel, table=True):
     msg_content: str
     msg_created_at: datetime = Field(default_factory=datetime.now)
     msg_updated_at: Optional[datetime] = None
-    msg_parent_id: Optional[int] = Field(default=None, foreign_key="message.msg_id")
+    msg_parent_id: Optional[int] = Field(default=None, foreign_key="message.msg_id", index=True)
+    msg_path: str = Field(default="", index=True)
+    msg_depth: int = 0
+    msg_partial: bool = False
     msg_token_count: Optional[int] = None
     msg_metadata: Optional[str] = None
+    msg_body_id: Optional[int] = Field(default=None, foreign_key="messagebody.body_id")
+    # Loaded on access; the repository functions load it explicitly for the messages they return
+    msg_body: Optional["MessageBody"] = Relationship(
+        sa_relationship_kwargs={"lazy": "select", "cascade": "all, delete-orphan", "single_parent": True}
+    )
+
+    @property
+    def content(self) -> str:
+        """The text of the message; a compressed body is only decompressed when this is read."""
+        if self.msg_body is not None:
+            return decompress_text(self.msg_body.body_data, self.msg_body.body_codec)
+        return self.msg_content
+
+
+class MessageBody(SQLModel, table=True):
+    """
+    Compressed content of a large message, stored outside the message row so
+    scans over messages stay small (see ocht.core.compression).
+
+    Attributes:
+        body_id (Optional[int]): Primary key of the body.
+        body_codec (str): Compression codec ('zlib' or 'zstd').
+        body_size (int): Length of the uncompressed text in characters.
+        body_data (bytes): The compressed UTF-8 text.
+    """
+    body_id: Optional[int] = Field(default=None, primary_key=True)
+    body_codec: str
+    body_size: int
+    body_data: bytes
 
 
 class LLMProviderConfig(SQLModel, table=True):
@@ -103,16 +150,20 @@ class Setting(SQLModel, table=True):
     """
     Represents a general key-value setting.
 
+    A key can exist once globally and once per workspace; workspace values
+    override the global one (see services/settings_resolver.py).
+
     Attributes:
-        setting_key (str): Primary key name of the setting.
+        setting_key (str): Name of the setting, first part of the primary key.
         setting_value (str): Value of the setting, stored as a string (use JSON if needed).
-        setting_workspace_id (Optional[int]): Foreign key linking to Workspace.work_id, for workspace-specific settings.
+        setting_workspace_id (int): Workspace.work_id for workspace-specific settings or GLOBAL_SCOPE_ID
+            for global settings; second part of the primary key.
         setting_created_at (datetime): Timestamp when the setting was created.
         setting_updated_at (datetime): Timestamp when the setting was last updated.
     """
     setting_key: str = Field(primary_key=True)
     setting_value: str
-    setting_workspace_id: Optional[int] = Field(default=None, foreign_key="workspace.work_id")
+    setting_workspace_id: int = Field(default=GLOBAL_SCOPE_ID, primary_key=True, index=True)
     setting_created_at: datetime = Field(default_factory=datetime.now)
     setting_updated_at: datetime = Field(default_factory=datetime.now)
 
@@ -135,3 +186,50 @@ class PromptTemplate(SQLModel, table=True):
     templ_text: str
     templ_created_at: datetime = Field(default_factory=datetime.now)
     templ_updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class RequestMetric(SQLModel, table=True):
+    """
+    Represents the timing metrics of a single LLM request.
+
+    Attributes:
+        metric_id (Optional[int]): Primary key of the metric entry.
+        metric_created_at (datetime): Start timestamp of the request.
+        metric_provider_name (Optional[str]): Name of the provider used.
+        metric_model_name (Optional[str]): Name of the model used.
+        metric_method (str): Request method ('stream', 'async' or 'compare' for /compare benchmarks).
+        metric_context_ms (Optional[float]): Context preparation time in milliseconds.
+        metric_summary_ms (Optional[float]): Summarization time in milliseconds.
+        metric_ttft_ms (Optional[float]): Time to first token in milliseconds.
+        metric_total_ms (Optional[float]): Total request time in milliseconds.
+        metric_chunk_count (int): Number of streamed chunks.
+        metric_output_tokens (int): Number of generated tokens.
+        metric_tokens_per_second (Optional[float]): Generation throughput.
+        metric_prompt_eval_count (Optional[int]): Prompt tokens evaluated by the server.
+        metric_prompt_eval_duration_ms (Optional[float]): Server-side prompt evaluation time in milliseconds.
+        metric_eval_count (Optional[int]): Output tokens reported by the server.
+        metric_eval_duration_ms (Optional[float]): Server-side generation time in milliseconds.
+        metric_error (Optional[str]): Error message if the request failed.
+    """
+    metric_id: Optional[int] = Field(default=None, primary_key=True)
+    metric_created_at: datetime = Field(default_factory=datetime.now, index=True)
+    metric_provider_name: Optional[str] = None
+    metric_model_name: Optional[str] = Field(default=None, index=True)
+    metric_method: str = "stream"
+    metric_context_ms: Optional[float] = None
+    metric_summary_ms: Optional[float] = None
+    metric_ttft_ms: Optional[float] = None
+    metric_total_ms: Optional[float] = None
+    metric_chunk_count: int = 0
+    metric_output_tokens: int = 0
+    metric_tokens_per_second: Optional[float] = None
+    metric_prompt_eval_count: Optional[int] = None
+    metric_prompt_eval_duration_ms: Optional[float] = None
+    metric_eval_count: Optional[int] = None
+    metric_eval_duration_ms: Optional[float] = None
+    metric_error: Optional[str] = None
+
+
+# Case-insensitive unique names; also serve the name lookups of the uniqueness checks
+Index("ix_workspace_work_name_lower", func.lower(Workspace.work_name), unique=True)
+Index("ix_llmproviderconfig_prov_name_lower", func.lower(LLMProviderConfig.prov_name), unique=True)
@@ -0,0 +1,283 @@
+import asyncio
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+PROFILE_MODES = ("cpu", "alloc")
+
+# Number of rows in the report sections
+REPORT_TOP_FUNCTIONS = 40
+REPORT_TOP_ALLOCATIONS = 30
+# Stack depth recorded by tracemalloc
+TRACEMALLOC_FRAMES = 10
+
+
+class SpanStats:
+    """Aggregated timings of one named span."""
+
+    __slots__ = ("count", "total_seconds", "max_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+class _NullSpan:
+    """Span used while profiling is disabled; does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.add_span(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Profiler:
+    """
+    Profiling session for the TUI or a CLI command.
+
+    Mode ``cpu`` runs the deterministic cProfile profiler, mode ``alloc``
+    compares tracemalloc snapshots taken at start and stop. In both modes
+    named spans (see ``profile_span``) are aggregated and written to the report.
+    """
+
+    def __init__(self, mode: str, output_path: Optional[str] = None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of: {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.output_path = Path(output_path) if output_path else default_report_path(mode)
+        self.spans: Dict[str, SpanStats] = {}
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._snapshot_start: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+        self._pending: Set[asyncio.Future] = set()
+        self._start = 0.0
+        self.wall_seconds = 0.0
+
+    def start(self) -> None:
+        """Starts the underlying profiler."""
+        self._start = time.perf_counter()
+        if self.mode == "cpu":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_tracemalloc = True
+            self._snapshot_start = tracemalloc.take_snapshot()
+
+    def stop(self) -> Path:
+        """
+        Stops profiling and writes the report.
+
+        Returns:
+            Path of the written report file.
+        """
+        self.wall_seconds = time.perf_counter() - self._start
+        sections: List[str] = []
+        if self.mode == "cpu" and self._cprofile is not None:
+            self._cprofile.disable()
+            sections.append(self._cpu_section())
+        elif self.mode == "alloc" and self._snapshot_start is not None:
+            sections.append(self._alloc_section())
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        sections.insert(0, self._span_section())
+
+        header = (
+            f"OChaT profile report\n"
+            f"Mode: {self.mode}\n"
+            f"Created: {datetime.now().isoformat(timespec='seconds')}\n"
+            f"Wall time: {self.wall_seconds:.3f}s\n"
+        )
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.output_path.write_text(header + "\n" + "\n\n".join(sections) + "\n", encoding="utf-8")
+        return self.output_path
+
+    def add_span(self, name: str, seconds: float) -> None:
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans[name] = SpanStats()
+        stats.add(seconds)
+
+    def _span_section(self) -> str:
+        lines = ["== Spans ==", f"{'Name':<40} {'Count':>7} {'Total ms':>10} {'Avg ms':>9} {'Max ms':>9}"]
+        if not self.spans:
+            lines.append("(no spans recorded)")
+        for name, stats in sorted(self.spans.items(), key=lambda item: item[1].total_seconds, reverse=True):
+            lines.append(
+                f"{name[:40]:<40} {stats.count:>7} {stats.total_seconds * 1000:>10.1f} "
+                f"{stats.avg_seconds * 1000:>9.2f} {stats.max_seconds * 1000:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def _cpu_section(self) -> str:
+        buffer = io.StringIO()
+        stats = pstats.Stats(self._cprofile, stream=buffer)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(REPORT_TOP_FUNCTIONS)
+        return "== CPU (cProfile, sorted by cumulative time) ==\n" + buffer.getvalue().strip()
+
+    def _alloc_section(self) -> str:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            "== Allocations (tracemalloc, growth since start) ==",
+            f"Current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB",
+        ]
+        for stat in snapshot.compare_to(self._snapshot_start, "lineno")[:REPORT_TOP_ALLOCATIONS]:
+            lines.append(str(stat))
+        return "\n".join(lines)
+
+
+# Active profiler; None while profiling is disabled
+_active_profiler: Optional[Profiler] = None
+
+
+def default_report_path(mode: str) -> Path:
+    """Returns the default report file name in the working directory."""
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return Path.cwd() / f"ocht-profile-{mode}-{timestamp}.txt"
+
+
+def start_profiling(mode: str, output_path: Optional[str] = None) -> Profiler:
+    """
+    Starts a global profiling session.
+
+    Args:
+        mode: "cpu" or "alloc".
+        output_path: Optional report path; defaults to ocht-profile-<mode>-<timestamp>.txt.
+
+    Raises:
+        ValueError: If the mode is unknown or profiling is already running.
+    """
+    global _active_profiler
+    if _active_profiler is not None:
+        raise ValueError("Profiling is already running")
+    profiler = Profiler(mode, output_path)
+    profiler.start()
+    _active_profiler = profiler
+    return profiler
+
+
+def stop_profiling() -> Optional[Path]:
+    """Stops the global profiling session and returns the report path."""
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    if profiler is None:
+        return None
+    return profiler.stop()
+
+
+def get_active_profiler() -> Optional[Profiler]:
+    """Returns the running profiler, if any."""
+    return _active_profiler
+
+
+def profile_span(name: str):
+    """
+    Context manager measuring a named span while profiling is enabled.
+
+    Costs a single global lookup when profiling is disabled.
+
+    Example:
+        with profile_span("memory.prepare_context"):
+            ...
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return _NULL_SPAN
+    return _Span(profiler, name)
+
+
+def track_awaitable(name: str, awaitable: Awaitable[Any]) -> None:
+    """
+    Measures the time until an already scheduled awaitable completes.
+
+    Used for work Textual runs asynchronously after a synchronous call, e.g.
+    ``Markdown.update``. Does nothing while profiling is disabled; must be
+    called from a running event loop otherwise.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return
+    started = time.perf_counter()
+
+    async def _wait() -> None:
+        try:
+            await awaitable
+        finally:
+            profiler.add_span(name, time.perf_counter() - started)
+
+    future = asyncio.ensure_future(_wait())
+    profiler._pending.add(future)
+    future.add_done_callback(profiler._pending.discard)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """
+    Decorator wrapping a function or coroutine function in a ``profile_span``.
+
+    Args:
+        name: Span name; defaults to the function's qualified name.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with profile_span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with profile_span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,84 @@
+# Batch access for export/import: keyset pagination and bulk inserts
+from typing import Any, Dict, Iterator, List, Sequence, Type
+
+from sqlalchemy import func, insert, select, tuple_
+from sqlmodel import Session, SQLModel
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_batches(db: Session, model: Type[SQLModel], key_columns: Sequence[Any], *criteria: Any,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields the rows of a table in batches of plain dicts, ordered by the key columns.
+
+    Uses keyset pagination (WHERE key > last key) instead of OFFSET, so every
+    batch starts with an index lookup and only one batch is held in memory,
+    independent of the table size.
+
+    Args:
+        db (Session): The database session.
+        model (Type[SQLModel]): The table model (e.g. Message).
+        key_columns (Sequence): Unique key columns to order and paginate by (e.g. [Message.msg_id]).
+        *criteria: Optional WHERE clauses.
+        batch_size (int, optional): Rows per batch. Default is DEFAULT_BATCH_SIZE.
+
+    Yields:
+        List[Dict[str, Any]]: The next batch of rows, keyed by column name.
+
+    Raises:
+        ValueError: If batch_size is below 1 or no key column is given.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+    if not key_columns:
+        raise ValueError("At least one key column is required.")
+
+    key = tuple_(*key_columns) if len(key_columns) > 1 else key_columns[0]
+    last_key = None
+    while True:
+        statement = select(model.__table__).where(*criteria).order_by(*key_columns).limit(batch_size)
+        if last_key is not None:
+            statement = statement.where(key > (tuple_(*last_key) if len(key_columns) > 1 else last_key[0]))
+        rows = [dict(row._mapping) for row in db.execute(statement)]
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_key = tuple(rows[-1][column.name] for column in key_columns)
+
+
+def count_rows(db: Session, model: Type[SQLModel], *criteria: Any) -> int:
+    """
+    Counts the rows of a table.
+
+    Args:
+        db (Session): The database session.
+        model (Type[SQLModel]): The table model.
+        *criteria: Optional WHERE clauses.
+
+    Returns:
+        int: The number of matching rows.
+    """
+    statement = select(func.count()).select_from(model.__table__).where(*criteria)
+    return db.execute(statement).scalar_one()
+
+
+def insert_rows(db: Session, model: Type[SQLModel], rows: List[Dict[str, Any]]) -> int:
+    """
+    Inserts rows with one executemany statement, without creating ORM objects.
+
+    The caller commits, so several batches can share one transaction.
+
+    Args:
+        db (Session): The database session.
+        model (Type[SQLModel]): The table model.
+        rows (List[Dict[str, Any]]): Column values of the new rows.
+
+    Returns:
+        int: The number of inserted rows.
+    """
+    if rows:
+        db.execute(insert(model.__table__), rows)
+    return len(rows)
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional, Sequence
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 
 from ocht.core.models import LLMProviderConfig
 
@@ -52,14 +52,36 @@ def get_llm_provider_config_by_id(db: Session, config_id: int) -> Optional[LLMPr
     return result.one_or_none()
 
 
-def get_all_llm_provider_configs(db: Session, limit: Optional[int] = None, offset: Optional[int] = 0) -> Sequence[LLMProviderConfig]:
+def get_llm_provider_config_by_name(db: Session, name: str) -> Optional[LLMProviderConfig]:
     """
-    Retrieves all LLM provider configurations with optional limitation and offset.
+    Holt eine LLM Provider Konfiguration nach ihrem Namen (ohne Beachtung der Groß-/Kleinschreibung).
+
+    Nutzt den Unique-Index auf lower(prov_name) statt alle Konfigurationen zu laden.
+
+    Args:
+        db (Session): Die Datenbanksitzung.
+        name (str): Der Name des Providers.
+
+    Returns:
+        Optional[LLMProviderConfig]: Das Konfigurations-Objekt mit dem angegebenen Namen oder None, wenn nicht gefunden.
+    """
+    statement = select(LLMProviderConfig).where(func.lower(LLMProviderConfig.prov_name) == func.lower(name))
+    result = db.exec(statement)
+    return result.first()
+
+
+def get_all_llm_provider_configs(db: Session, limit: Optional[int] = None, offset: Optional[int] = 0,
+                                 name_filter: Optional[str] = None) -> Sequence[LLMProviderConfig]:
+    """
+    Retrieves all LLM provider configurations with optional limitation, offset and name filter.
+
+    Rows are ordered by primary key so that pages are stable.
 
     Args:
         db (Session): The database session.
         limit (Optional[int], optional): The maximum number of configurations to return. Default is None.
         offset (Optional[int], optional): The offset for the query. Default is 0.
+        name_filter (Optional[str], optional): Only return configurations whose provider name contains this text (case-insensitive). Default is None.
 
     Returns:
         list[LLMProviderConfig]: A list of LLM provider configuration objects.
@@ -72,13 +94,35 @@ def get_all_llm_provider_configs(db: Session, limit: Optional[int] = None, offse
     if offset is not None and offset < 0:
         raise ValueError("Offset kann nicht negativ sein.")
 
-    statement = select(LLMProviderConfig)
+    statement = _apply_name_filter(select(LLMProviderConfig), name_filter).order_by(LLMProviderConfig.prov_id)
     if limit is not None:
         statement = statement.limit(limit).offset(offset)
 
     return db.exec(statement).all()
 
 
+def count_llm_provider_configs(db: Session, name_filter: Optional[str] = None) -> int:
+    """
+    Counts configurations, optionally restricted by the same name filter as get_all_llm_provider_configs.
+
+    Args:
+        db (Session): The database session.
+        name_filter (Optional[str], optional): Only count configurations whose provider name contains this text. Default is None.
+
+    Returns:
+        int: Number of matching configurations.
+    """
+    statement = _apply_name_filter(select(func.count()).select_from(LLMProviderConfig), name_filter)
+    return db.exec(statement).one()
+
+
+def _apply_name_filter(statement, name_filter: Optional[str]):
+    """Restricts a statement to rows whose provider name contains the filter text."""
+    if name_filter:
+        statement = statement.where(LLMProviderConfig.prov_name.icontains(name_filter, autoescape=True))
+    return statement
+
+
 def update_llm_provider_config(db: Session, config_id: int, name: Optional[str] = None, api_key: Optional[str] = None,
                                endpoint: Optional[str] = None, default_model: Optional[str] = None) -> Optional[
     LLMProviderConfig]:
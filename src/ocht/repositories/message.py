@@ -1,33 +1,127 @@
 # message.py
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlmodel import Session, select
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import aliased, selectinload
+from sqlmodel import Session, exists, select
 
-from ocht.core.models import Message
+from ocht.core.compression import compress_if_large, decompress_text
+from ocht.core.models import Message, MessageBody
 
+# Width of one zero-padded ID in Message.msg_path, so paths sort like the tree
+PATH_SEGMENT_WIDTH = 10
+PATH_SEPARATOR = "/"
 
-def create_message(db: Session, content: str, workspace_id: int) -> Message:
+
+def child_path(parent: Message) -> str:
+    """Returns the msg_path of a child of the given message."""
+    return f"{parent.msg_path}{parent.msg_id:0{PATH_SEGMENT_WIDTH}d}{PATH_SEPARATOR}"
+
+
+def path_ids(path: str) -> List[int]:
+    """Returns the ancestor IDs stored in a msg_path, root first."""
+    return [int(segment) for segment in path.split(PATH_SEPARATOR) if segment]
+
+
+def shift_path(path: str, offset: int) -> str:
+    """Returns a msg_path with every ancestor ID shifted by offset (e.g. for imported messages)."""
+    return "".join(f"{message_id + offset:0{PATH_SEGMENT_WIDTH}d}{PATH_SEPARATOR}" for message_id in path_ids(path))
+
+
+def set_content(message: Message, content: str) -> None:
+    """
+    Sets the content of a message, compressing large texts into a separate MessageBody.
+
+    Small texts stay inline in msg_content; a replaced body is deleted on commit.
+    """
+    compressed = compress_if_large(content)
+    if compressed is None:
+        message.msg_content, message.msg_body = content, None
+        return
+    codec, data = compressed
+    message.msg_content = ""
+    message.msg_body = MessageBody(body_codec=codec, body_size=len(content), body_data=data)
+
+
+def _load_body(message: Message) -> None:
+    """
+    Loads the body of a refreshed message, so its content can be read after the session is closed.
+
+    Only queries for large messages; for inline ones the relationship is just set to None.
+    """
+    getattr(message, "msg_body")
+
+
+def inline_bodies(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Replaces the body reference of message rows (e.g. from iter_batches) with the decompressed text.
+
+    Args:
+        db (Session): The database session.
+        rows (List[Dict[str, Any]]): Message rows as dicts; changed in place.
+
+    Returns:
+        List[Dict[str, Any]]: The rows with the full text in msg_content and without msg_body_id.
+    """
+    body_ids = [row["msg_body_id"] for row in rows if row.get("msg_body_id") is not None]
+    bodies = {}
+    if body_ids:
+        statement = select(MessageBody.body_id, MessageBody.body_codec, MessageBody.body_data)
+        bodies = {body_id: (codec, data) for body_id, codec, data in
+                  db.exec(statement.where(MessageBody.body_id.in_(body_ids))).all()}
+    for row in rows:
+        body = bodies.get(row.pop("msg_body_id", None))
+        if body is not None:
+            row["msg_content"] = decompress_text(body[1], body[0])
+    return rows
+
+
+def create_message(db: Session, workspace_id: int, role: str, content: str,
+                   parent_id: Optional[int] = None, partial: bool = False) -> Message:
     """
     Creates a new message.
 
+    Path and depth are derived from the parent, so the branch of the new
+    message can later be loaded without walking the parents.
+
     Args:
         db (Session): The database session.
-        content (str): The content of the message.
         workspace_id (int): The ID of the workspace to which the message belongs.
+        role (str): Role of the message ('user', 'assistant', 'system').
+        content (str): The content of the message.
+        parent_id (Optional[int], optional): The ID of the preceding message. Default is None (root).
+        partial (bool, optional): Whether the response was stopped before it was complete. Default is False.
 
     Returns:
         Message: Das erstellte Nachrichten-Objekt.
+
+    Raises:
+        ValueError: If the parent does not exist or belongs to another workspace.
     """
+    path, depth = "", 0
+    if parent_id is not None:
+        parent = get_message_by_id(db, parent_id)
+        if parent is None or parent.msg_workspace_id != workspace_id:
+            raise ValueError(f"Parent message {parent_id} not found in workspace {workspace_id}")
+        path, depth = child_path(parent), parent.msg_depth + 1
+
     message = Message(
-        msg_content=content,
         msg_workspace_id=workspace_id,
+        msg_role=role,
+        msg_content="",
+        msg_parent_id=parent_id,
+        msg_path=path,
+        msg_depth=depth,
+        msg_partial=partial,
         msg_created_at=datetime.now(),
         msg_updated_at=datetime.now()
     )
+    set_content(message, content)
     db.add(message)
     db.commit()
     db.refresh(message)
+    _load_body(message)
     return message
 
 
@@ -35,6 +129,9 @@ def get_message_by_id(db: Session, message_id: int) -> Message:
     """
     Holt eine Nachricht nach ihrer ID.
 
+    Ein komprimierter Inhalt wird mitgeladen, damit Message.content auch
+    nach dem Schließen der Sitzung gelesen werden kann.
+
     Args:
         db (Session): Die Datenbanksitzung.
         message_id (int): Die ID der Nachricht.
@@ -42,7 +139,7 @@ def get_message_by_id(db: Session, message_id: int) -> Message:
     Returns:
         Message: Das Nachrichten-Objekt mit der angegebenen ID.
     """
-    statement = select(Message).where(Message.msg_id == message_id)
+    statement = select(Message).options(selectinload(Message.msg_body)).where(Message.msg_id == message_id)
     result = db.exec(statement)
     return result.one_or_none()
 
@@ -67,6 +164,7 @@ def get_messages_by_workspace(db: Session, workspace_id: int, limit: Optional[in
 
     statement = (
         select(Message)
+        .options(selectinload(Message.msg_body))
         .where(Message.msg_workspace_id == workspace_id)
         .order_by(Message.msg_created_at)
         .offset(offset)
@@ -78,6 +176,93 @@ def get_messages_by_workspace(db: Session, workspace_id: int, limit: Optional[in
     return messages
 
 
+def get_branch(db: Session, leaf_id: int) -> List[Message]:
+    """
+    Retrieves the conversation branch ending at a message, root first.
+
+    Uses the materialized path: one lookup for the leaf and one primary key
+    IN query for all ancestors, independent of the depth of the tree. The
+    compressed bodies are loaded with them (one more query, only if there
+    are any), so the content can be read after the session is closed.
+
+    Args:
+        db (Session): The database session.
+        leaf_id (int): The ID of the last message of the branch.
+
+    Returns:
+        List[Message]: The messages from the root to the leaf, or an empty list if the leaf does not exist.
+    """
+    with_bodies = selectinload(Message.msg_body)
+    leaf = db.exec(select(Message).options(with_bodies).where(Message.msg_id == leaf_id)).one_or_none()
+    if leaf is None:
+        return []
+    ancestor_ids = path_ids(leaf.msg_path)
+    if not ancestor_ids:
+        return [leaf]
+    statement = (
+        select(Message).options(with_bodies).where(Message.msg_id.in_(ancestor_ids)).order_by(Message.msg_depth)
+    )
+    return [*db.exec(statement).all(), leaf]
+
+
+def get_descendants(db: Session, message: Message) -> Sequence[Message]:
+    """
+    Retrieves all messages below a message (all branches forked from it).
+
+    Args:
+        db (Session): The database session.
+        message (Message): The message whose subtree is returned.
+
+    Returns:
+        Sequence[Message]: The descendants in tree order.
+    """
+    prefix = child_path(message)
+    # Range scan on the msg_path index: '0' is the character after the separator '/'
+    statement = (
+        select(Message)
+        .where(Message.msg_path >= prefix, Message.msg_path < prefix[:-1] + "0")
+        .order_by(Message.msg_path, Message.msg_id)
+    )
+    return db.exec(statement).all()
+
+
+def get_children(db: Session, parent_id: int) -> Sequence[Message]:
+    """
+    Retrieves the direct replies to a message.
+
+    Args:
+        db (Session): The database session.
+        parent_id (int): The ID of the parent message.
+
+    Returns:
+        Sequence[Message]: The child messages, oldest first.
+    """
+    statement = select(Message).where(Message.msg_parent_id == parent_id).order_by(Message.msg_id)
+    return db.exec(statement).all()
+
+
+def get_leaf_messages(db: Session, workspace_id: int) -> Sequence[Message]:
+    """
+    Retrieves the last message of every branch in a workspace, with their compressed bodies.
+
+    Args:
+        db (Session): The database session.
+        workspace_id (int): The ID of the workspace.
+
+    Returns:
+        Sequence[Message]: Messages without replies, oldest first.
+    """
+    child = aliased(Message)
+    statement = (
+        select(Message)
+        .options(selectinload(Message.msg_body))
+        .where(Message.msg_workspace_id == workspace_id)
+        .where(~exists().where(child.msg_parent_id == Message.msg_id))
+        .order_by(Message.msg_id)
+    )
+    return db.exec(statement).all()
+
+
 def update_message(db: Session, message_id: int, content: str = None) -> Optional[Message]:
     """
     Updates an existing message.
@@ -95,16 +280,58 @@ def update_message(db: Session, message_id: int, content: str = None) -> Optiona
         return None
 
     if content is not None:
-        message.msg_content = content
+        set_content(message, content)
     message.msg_updated_at = datetime.now()
 
     db.add(message)
     db.commit()
     db.refresh(message)
+    _load_body(message)
 
     return message
 
 
+def delete_messages_before(db: Session, workspace_id: int, before: datetime) -> int:
+    """
+    Deletes all messages of a workspace created before a point in time.
+
+    Replies to a deleted message become new roots: their path and the paths
+    of their descendants are shortened by the removed ancestors. Ancestors are
+    always older than their replies, so a branch is only ever cut at the top.
+
+    Args:
+        db (Session): The database session.
+        workspace_id (int): The ID of the workspace.
+        before (datetime): Messages created before this time are deleted.
+
+    Returns:
+        int: The number of deleted messages.
+    """
+    old = (Message.msg_workspace_id == workspace_id, Message.msg_created_at < before)
+    old_ids = select(Message.msg_id).where(*old)
+    new_roots = db.exec(
+        select(Message)
+        .where(Message.msg_workspace_id == workspace_id, Message.msg_created_at >= before)
+        .where(Message.msg_parent_id.in_(old_ids))
+    ).all()
+
+    for root in new_roots:
+        prefix, cut = child_path(root), len(root.msg_path)
+        db.exec(
+            update(Message)
+            .where(Message.msg_path >= prefix, Message.msg_path < prefix[:-1] + "0")
+            .values(msg_path=func.substr(Message.msg_path, cut + 1), msg_depth=Message.msg_depth - root.msg_depth)
+        )
+        root.msg_parent_id, root.msg_path, root.msg_depth = None, "", 0
+        db.add(root)
+    db.flush()
+
+    db.exec(delete(MessageBody).where(MessageBody.body_id.in_(select(Message.msg_body_id).where(*old))))
+    deleted = db.exec(delete(Message).where(*old)).rowcount
+    db.commit()
+    return deleted
+
+
 def delete_message(db: Session, message_id: int) -> bool:
     """
     Deletes a message.
@@ -119,6 +346,7 @@ def delete_message(db: Session, message_id: int) -> bool:
     message = get_message_by_id(db, message_id)
     if not message:
         return False
+    # get_message_by_id loads the body, so the delete cascade removes it as well
     db.delete(message)
     db.commit()
     return True
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, Sequence
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 
 from ocht.core.models import Model
 
@@ -58,14 +58,18 @@ def get_model_by_name(db: Session, model_name: str) -> Optional[Model]:
     return result.one_or_none()
 
 
-def get_all_models(db: Session, limit: Optional[int] = None, offset: Optional[int] = 0) -> Sequence[Model]:
+def get_all_models(db: Session, limit: Optional[int] = None, offset: Optional[int] = 0,
+                   name_filter: Optional[str] = None) -> Sequence[Model]:
     """
-    Retrieves all models with optional limitation and offset.
+    Retrieves all models with optional limitation, offset and name filter.
+
+    Rows are ordered by primary key so that pages are stable.
 
     Args:
         db (Session): The database session.
         limit (Optional[int], optional): The maximum number of models to return. Default is None.
         offset (Optional[int], optional): The offset for the query. Default is 0.
+        name_filter (Optional[str], optional): Only return models whose model name contains this text (case-insensitive). Default is None.
 
     Returns:
         list[Model]: A list of model objects.
@@ -75,13 +79,35 @@ def get_all_models(db: Session, limit: Optional[int] = None, offset: Optional[in
     if offset is not None and offset < 0:
         raise ValueError("Offset cannot be negative.")
 
-    statement = select(Model)
+    statement = _apply_name_filter(select(Model), name_filter).order_by(Model.model_name)
     if limit is not None:
         statement = statement.limit(limit).offset(offset)
 
     return db.exec(statement).all()
 
 
+def count_models(db: Session, name_filter: Optional[str] = None) -> int:
+    """
+    Counts models, optionally restricted by the same name filter as get_all_models.
+
+    Args:
+        db (Session): The database session.
+        name_filter (Optional[str], optional): Only count models whose model name contains this text. Default is None.
+
+    Returns:
+        int: Number of matching models.
+    """
+    statement = _apply_name_filter(select(func.count()).select_from(Model), name_filter)
+    return db.exec(statement).one()
+
+
+def _apply_name_filter(statement, name_filter: Optional[str]):
+    """Restricts a statement to rows whose model name contains the filter text."""
+    if name_filter:
+        statement = statement.where(Model.model_name.icontains(name_filter, autoescape=True))
+    return statement
+
+
 def update_model(db: Session, model_name: str, new_model_name: Optional[str] = None,
                  model_provider_id: Optional[int] = None, model_description: Optional[str] = None,
                  model_version: Optional[str] = None, model_params: Optional[str] = None,
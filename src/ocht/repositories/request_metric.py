@@ -0,0 +1,72 @@
+# CRUD functions for RequestMetric
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlmodel import Session, select, delete
+
+from ocht.core.models import RequestMetric
+
+
+def create_request_metric(db: Session, metric: RequestMetric) -> RequestMetric:
+    """
+    Stores a new request metric entry.
+
+    Args:
+        db (Session): The database session.
+        metric (RequestMetric): The metric entry to store.
+
+    Returns:
+        RequestMetric: The stored metric entry.
+    """
+    db.add(metric)
+    db.commit()
+    db.refresh(metric)
+    return metric
+
+
+def get_recent_request_metrics(db: Session, limit: Optional[int] = 100,
+                               model_name: Optional[str] = None,
+                               since: Optional[datetime] = None) -> Sequence[RequestMetric]:
+    """
+    Retrieves the most recent request metrics, newest first.
+
+    Args:
+        db (Session): The database session.
+        limit (Optional[int], optional): The maximum number of entries to return. Default is 100.
+        model_name (Optional[str], optional): Only return entries for this model. Default is None.
+        since (Optional[datetime], optional): Only return entries created after this time. Default is None.
+
+    Returns:
+        Sequence[RequestMetric]: A list of metric entries.
+
+    Raises:
+        ValueError: If limit is negative.
+    """
+    if limit is not None and limit < 0:
+        raise ValueError("Limit cannot be negative.")
+
+    statement = select(RequestMetric).order_by(RequestMetric.metric_created_at.desc())
+    if model_name is not None:
+        statement = statement.where(RequestMetric.metric_model_name == model_name)
+    if since is not None:
+        statement = statement.where(RequestMetric.metric_created_at >= since)
+    if limit is not None:
+        statement = statement.limit(limit)
+
+    return db.exec(statement).all()
+
+
+def delete_request_metrics_before(db: Session, before: datetime) -> int:
+    """
+    Deletes all request metrics created before the given time.
+
+    Args:
+        db (Session): The database session.
+        before (datetime): Entries older than this are deleted.
+
+    Returns:
+        int: The number of deleted entries.
+    """
+    result = db.exec(delete(RequestMetric).where(RequestMetric.metric_created_at < before))
+    db.commit()
+    return result.rowcount
@@ -1,12 +1,12 @@
 # CRUD functions for Setting
 from typing import Optional, Sequence
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 
-from ocht.core.models import Setting
+from ocht.core.models import GLOBAL_SCOPE_ID, Setting
 
 
-def create_setting(db: Session, key: str, value: str) -> Setting:
+def create_setting(db: Session, key: str, value: str, workspace_id: int = GLOBAL_SCOPE_ID) -> Setting:
     """
     Creates a new setting.
 
@@ -14,11 +14,12 @@ def create_setting(db: Session, key: str, value: str) -> Setting:
         db (Session): The database session.
         key (str): The key of the setting.
         value (str): The value of the setting.
+        workspace_id (int, optional): Workspace the setting belongs to. Default is GLOBAL_SCOPE_ID (global).
 
     Returns:
         Setting: The newly created setting object.
     """
-    db_setting = Setting(setting_key=key, setting_value=value)
+    db_setting = Setting(setting_key=key, setting_value=value, setting_workspace_id=workspace_id)
     db.add(db_setting)
     db.commit()
     db.refresh(db_setting)
@@ -26,30 +27,54 @@ def create_setting(db: Session, key: str, value: str) -> Setting:
     return db_setting
 
 
-def get_setting_by_key(db: Session, key: str) -> Optional[Setting]:
+def get_setting_by_key(db: Session, key: str, workspace_id: int = GLOBAL_SCOPE_ID) -> Optional[Setting]:
     """
-    Retrieves a setting by its key.
+    Retrieves a setting by its key and scope.
 
     Args:
         db (Session): The database session.
         key (str): The key of the setting.
+        workspace_id (int, optional): Workspace of the setting. Default is GLOBAL_SCOPE_ID (global).
 
     Returns:
         Optional[Setting]: The setting object with the specified key or None if not found.
     """
-    statement = select(Setting).where(Setting.setting_key == key)
+    statement = select(Setting).where(Setting.setting_key == key, Setting.setting_workspace_id == workspace_id)
     result = db.exec(statement)
     return result.one_or_none()
 
 
-def get_all_settings(db: Session, limit: Optional[int] = None, offset: int = 0) -> Sequence[Setting]:
+def get_settings_by_workspace(db: Session, workspace_id: Optional[int]) -> Sequence[Setting]:
     """
-    Retrieves all settings with optional limitation and offset.
+    Retrieves the settings of one workspace, or the global settings.
+
+    Filters on the indexed setting_workspace_id column.
+
+    Args:
+        db (Session): The database session.
+        workspace_id (Optional[int]): The workspace ID, or None for global (non-workspace) settings.
+
+    Returns:
+        Sequence[Setting]: The matching setting objects.
+    """
+    if workspace_id is None:
+        workspace_id = GLOBAL_SCOPE_ID
+    statement = select(Setting).where(Setting.setting_workspace_id == workspace_id)
+    return db.exec(statement).all()
+
+
+def get_all_settings(db: Session, limit: Optional[int] = None, offset: int = 0,
+                     name_filter: Optional[str] = None) -> Sequence[Setting]:
+    """
+    Retrieves all settings with optional limitation, offset and name filter.
+
+    Rows are ordered by primary key so that pages are stable.
 
     Args:
         db (Session): The database session.
         limit (Optional[int], optional): The maximum number of settings to return. Default is None.
         offset (int, optional): The offset for the query. Default is 0.
+        name_filter (Optional[str], optional): Only return settings whose setting key contains this text (case-insensitive). Default is None.
 
     Returns:
         Sequence[Setting]: A list of setting objects.
@@ -59,7 +84,7 @@ def get_all_settings(db: Session, limit: Optional[int] = None, offset: int = 0)
     if offset < 0:
         raise ValueError("Offset cannot be negative.")
 
-    statement = select(Setting).offset(offset)
+    statement = _apply_name_filter(select(Setting), name_filter).order_by(Setting.setting_key, Setting.setting_workspace_id).offset(offset)
     if limit is not None:
         statement = statement.limit(limit)
 
@@ -67,7 +92,30 @@ def get_all_settings(db: Session, limit: Optional[int] = None, offset: int = 0)
     return settings
 
 
-def update_setting(db: Session, setting_key: str, new_key: Optional[str] = None, value: Optional[str] = None) -> Optional[Setting]:
+def count_settings(db: Session, name_filter: Optional[str] = None) -> int:
+    """
+    Counts settings, optionally restricted by the same name filter as get_all_settings.
+
+    Args:
+        db (Session): The database session.
+        name_filter (Optional[str], optional): Only count settings whose setting key contains this text. Default is None.
+
+    Returns:
+        int: Number of matching settings.
+    """
+    statement = _apply_name_filter(select(func.count()).select_from(Setting), name_filter)
+    return db.exec(statement).one()
+
+
+def _apply_name_filter(statement, name_filter: Optional[str]):
+    """Restricts a statement to rows whose setting key contains the filter text."""
+    if name_filter:
+        statement = statement.where(Setting.setting_key.icontains(name_filter, autoescape=True))
+    return statement
+
+
+def update_setting(db: Session, setting_key: str, new_key: Optional[str] = None, value: Optional[str] = None,
+                   workspace_id: int = GLOBAL_SCOPE_ID) -> Optional[Setting]:
     """
     Updates an existing setting.
 
@@ -76,11 +124,12 @@ def update_setting(db: Session, setting_key: str, new_key: Optional[str] = None,
         setting_key (str): The key of the setting to be updated.
         new_key (Optional[str]): New key for the setting. Default is None.
         value (Optional[str]): New value for the setting. Default is None.
+        workspace_id (int, optional): Workspace of the setting. Default is GLOBAL_SCOPE_ID (global).
 
     Returns:
         Optional[Setting]: The updated setting object or None if not found.
     """
-    db_setting = get_setting_by_key(db, setting_key)
+    db_setting = get_setting_by_key(db, setting_key, workspace_id)
     if not db_setting:
         return None
 
@@ -103,18 +152,19 @@ def update_setting(db: Session, setting_key: str, new_key: Optional[str] = None,
         return db_setting
 
 
-def delete_setting(db: Session, setting_key: str) -> bool:
+def delete_setting(db: Session, setting_key: str, workspace_id: int = GLOBAL_SCOPE_ID) -> bool:
     """
     Deletes a setting.
 
     Args:
         db (Session): The database session.
         setting_key (str): The key of the setting to be deleted.
+        workspace_id (int, optional): Workspace of the setting. Default is GLOBAL_SCOPE_ID (global).
 
     Returns:
         bool: True if the deletion was successful, False otherwise.
     """
-    db_setting = get_setting_by_key(db, setting_key)
+    db_setting = get_setting_by_key(db, setting_key, workspace_id)
     if not db_setting:
         return False
 
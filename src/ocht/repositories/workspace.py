@@ -2,9 +2,10 @@
 from datetime import datetime
 from typing import Optional, Sequence
 
-from sqlmodel import Session, select
+from sqlalchemy import delete, update
+from sqlmodel import Session, func, select
 
-from ocht.core.models import Workspace
+from ocht.core.models import Setting, Workspace
 
 
 def create_workspace(db: Session, name: str, default_model: str, description: str = None) -> Workspace:
@@ -49,14 +50,36 @@ def get_workspace_by_id(db: Session, workspace_id: int) -> Workspace:
     return result.one_or_none()
 
 
-def get_all_workspaces(db: Session, limit: Optional[int] = None, offset: Optional[int] = 0) -> Sequence[Workspace]:
+def get_workspace_by_name(db: Session, name: str) -> Optional[Workspace]:
     """
-    Retrieves all workspaces with optional limitation and offset.
+    Retrieves a workspace by its name, ignoring case.
+
+    Uses the unique index on lower(work_name) instead of scanning all workspaces.
+
+    Args:
+        db (Session): The database session.
+        name (str): The name of the workspace.
+
+    Returns:
+        Optional[Workspace]: The workspace object with the specified name or None if not found.
+    """
+    statement = select(Workspace).where(func.lower(Workspace.work_name) == func.lower(name))
+    result = db.exec(statement)
+    return result.first()
+
+
+def get_all_workspaces(db: Session, limit: Optional[int] = None, offset: Optional[int] = 0,
+                       name_filter: Optional[str] = None) -> Sequence[Workspace]:
+    """
+    Retrieves all workspaces with optional limitation, offset and name filter.
+
+    Rows are ordered by primary key so that pages are stable.
 
     Args:
         db (Session): The database session.
         limit (Optional[int], optional): The maximum number of workspaces to return. Default is None.
         offset (Optional[int], optional): The offset for the query. Default is 0.
+        name_filter (Optional[str], optional): Only return workspaces whose workspace name contains this text (case-insensitive). Default is None.
 
     Returns:
         list[Workspace]: A list of workspace objects.
@@ -66,7 +89,7 @@ def get_all_workspaces(db: Session, limit: Optional[int] = None, offset: Optiona
     if offset is not None and offset < 0:
         raise ValueError("Offset kann nicht negativ sein.")
 
-    statement = select(Workspace).offset(offset)
+    statement = _apply_name_filter(select(Workspace), name_filter).order_by(Workspace.work_id).offset(offset)
     if limit is not None:
         statement = statement.limit(limit)
 
@@ -74,6 +97,28 @@ def get_all_workspaces(db: Session, limit: Optional[int] = None, offset: Optiona
     return workspaces
 
 
+def count_workspaces(db: Session, name_filter: Optional[str] = None) -> int:
+    """
+    Counts workspaces, optionally restricted by the same name filter as get_all_workspaces.
+
+    Args:
+        db (Session): The database session.
+        name_filter (Optional[str], optional): Only count workspaces whose workspace name contains this text. Default is None.
+
+    Returns:
+        int: Number of matching workspaces.
+    """
+    statement = _apply_name_filter(select(func.count()).select_from(Workspace), name_filter)
+    return db.exec(statement).one()
+
+
+def _apply_name_filter(statement, name_filter: Optional[str]):
+    """Restricts a statement to rows whose workspace name contains the filter text."""
+    if name_filter:
+        statement = statement.where(Workspace.work_name.icontains(name_filter, autoescape=True))
+    return statement
+
+
 def update_workspace(db: Session, workspace_id: int, name: str = None, default_model: str = None,
                      description: str = None) -> Optional[Workspace]:
     """
@@ -109,9 +154,39 @@ def update_workspace(db: Session, workspace_id: int, name: str = None, default_m
     return workspace
 
 
+def get_workspace_active_leaf(db: Session, workspace_id: int) -> Optional[int]:
+    """
+    Retrieves the last message of the active branch of a workspace.
+
+    Only reads the one column, the workspace itself is not loaded.
+
+    Args:
+        db (Session): The database session.
+        workspace_id (int): The ID of the workspace.
+
+    Returns:
+        Optional[int]: The message ID, or None for a new conversation or an unknown workspace.
+    """
+    statement = select(Workspace.work_active_leaf_id).where(Workspace.work_id == workspace_id)
+    return db.exec(statement).one_or_none()
+
+
+def set_workspace_active_leaf(db: Session, workspace_id: int, leaf_id: Optional[int]) -> None:
+    """
+    Stores the last message of the active branch of a workspace.
+
+    Args:
+        db (Session): The database session.
+        workspace_id (int): The ID of the workspace.
+        leaf_id (Optional[int]): The message ID, None if the next message starts a new conversation.
+    """
+    db.exec(update(Workspace).where(Workspace.work_id == workspace_id).values(work_active_leaf_id=leaf_id))
+    db.commit()
+
+
 def delete_workspace(db: Session, workspace_id: int) -> bool:
     """
-    Deletes a workspace.
+    Deletes a workspace and its workspace-scoped settings.
 
     Args:
         db (Session): The database session.
@@ -123,6 +198,8 @@ def delete_workspace(db: Session, workspace_id: int) -> bool:
     workspace = get_workspace_by_id(db, workspace_id)
     if not workspace:
         return False
+    # Settings reference their scope by ID without a foreign key, so they are removed here
+    db.exec(delete(Setting).where(Setting.setting_workspace_id == workspace_id))
     db.delete(workspace)
     db.commit()
     return True
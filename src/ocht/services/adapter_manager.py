@@ -1,13 +1,47 @@
-from typing import Optional, Dict, Any, TypeVar, Callable
+import json
+from dataclasses import fields
+from typing import Optional, Dict, Any, List, TypeVar, Callable
 from ocht.core.db import get_session
 from ocht.adapters.base import LLMAdapter
-from ocht.adapters.ollama import OllamaAdapter
+from ocht.adapters.memory import MemoryConfig
+from ocht.adapters.instrumentation import InstrumentedAdapter
+from ocht.adapters.registry import AdapterSpec, create_adapter
+from ocht.adapters.scheduler import (
+    DEFAULT_ENDPOINT_CONCURRENCY,
+    DEFAULT_INTERACTIVE_RESERVE,
+    EndpointStats,
+    request_scheduler,
+)
+from ocht.adapters.streaming import StreamLimits
 from ocht.repositories.setting import get_setting_by_key, create_setting, update_setting
-from ocht.repositories.llm_provider_config import get_llm_provider_config_by_id
-from ocht.repositories.model import get_model_by_name
+from ocht.services.cache import (
+    get_cached_model,
+    get_cached_provider,
+    get_cached_setting_value,
+    invalidate_settings,
+)
+from ocht.services.settings_resolver import settings_resolver
 
 T = TypeVar('T')
 
+# Settings with these prefixes configure the adapter ("adapter.temperature")
+# and the memory strategy ("memory.max_context_tokens")
+ADAPTER_PARAM_PREFIX = "adapter."
+MEMORY_CONFIG_PREFIX = "memory."
+
+DEFAULT_ADAPTER_PARAMS: Dict[str, Any] = {"temperature": 0.5}
+
+# "<provider>.backend" selects the adapter implementation ("ollama.backend" = "direct")
+ADAPTER_BACKEND_SUFFIX = ".backend"
+
+# Guards of every streamed response; 0 or missing disables a limit
+STREAM_MAX_SECONDS_KEY = "stream.max_seconds"
+STREAM_MAX_TOKENS_KEY = "stream.max_tokens"
+
+# Request scheduling per model server (see adapters/scheduler.py)
+SCHEDULER_CONCURRENCY_KEY = "scheduler.max_concurrency"
+SCHEDULER_RESERVE_KEY = "scheduler.interactive_reserve"
+
 
 def _with_session(func: Callable) -> T:
     """Helper function to execute database operations with session."""
@@ -15,6 +49,63 @@ def _with_session(func: Callable) -> T:
         return func(db)
 
 
+def _parse_setting_value(value: str) -> Any:
+    """Parses a setting value as JSON (numbers, booleans, lists), otherwise keeps the string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def get_adapter_params() -> Dict[str, Any]:
+    """Returns the default adapter parameters merged with the resolved 'adapter.*' settings."""
+    params = dict(DEFAULT_ADAPTER_PARAMS)
+    for name, value in settings_resolver.get_prefixed(ADAPTER_PARAM_PREFIX).items():
+        params[name] = _parse_setting_value(value)
+    return params
+
+
+def get_memory_config() -> MemoryConfig:
+    """Builds a MemoryConfig from the resolved 'memory.*' settings; invalid values keep the default."""
+    overrides = settings_resolver.get_prefixed(MEMORY_CONFIG_PREFIX)
+    values: Dict[str, Any] = {}
+    for config_field in fields(MemoryConfig):
+        value = overrides.get(config_field.name)
+        if value is None:
+            continue
+        try:
+            values[config_field.name] = type(config_field.default)(value)
+        except ValueError:
+            continue
+    return MemoryConfig(**values)
+
+
+def configure_scheduler(endpoint: str) -> None:
+    """Applies the resolved 'scheduler.*' settings to the request slots of an endpoint."""
+    request_scheduler.configure(
+        endpoint,
+        limit=max(1, settings_resolver.get_int(SCHEDULER_CONCURRENCY_KEY, DEFAULT_ENDPOINT_CONCURRENCY)),
+        interactive_reserve=max(0, settings_resolver.get_int(SCHEDULER_RESERVE_KEY, DEFAULT_INTERACTIVE_RESERVE)),
+    )
+
+
+def get_stream_limits() -> StreamLimits:
+    """Builds the StreamLimits of the next response from the resolved 'stream.*' settings."""
+    try:
+        max_seconds = settings_resolver.get_float(STREAM_MAX_SECONDS_KEY, 0.0)
+        max_tokens = settings_resolver.get_int(STREAM_MAX_TOKENS_KEY, 0)
+    except Exception:
+        # The guards are optional, unreadable settings must not block the response
+        return StreamLimits()
+    return StreamLimits(max_seconds=max_seconds if max_seconds > 0 else None,
+                        max_tokens=max_tokens if max_tokens > 0 else None)
+
+
+def get_queue_stats() -> List[EndpointStats]:
+    """Returns the request queue metrics of every model server."""
+    return request_scheduler.stats()
+
+
 class AdapterManager:
     """Service for managing LLM adapters and their configuration."""
     
@@ -25,6 +116,8 @@ class AdapterManager:
         self._current_adapter: Optional[LLMAdapter] = None
         self._current_provider_id: Optional[int] = None
         self._current_model_name: Optional[str] = None
+        # Stored at adapter creation so get_adapter_info needs no lookup
+        self._current_provider_name: Optional[str] = None
     
     def get_current_adapter(self) -> Optional[LLMAdapter]:
         """Get the currently active adapter."""
@@ -38,53 +131,75 @@ class AdapterManager:
         """Get the currently selected model name."""
         return self._current_model_name
     
-    def load_settings_on_startup(self) -> bool:
+    def load_settings_on_startup(self, default_backend: Optional[str] = None) -> bool:
         """
         Load provider and model settings on app startup.
+
+        Args:
+            default_backend: Adapter backend if the provider has no '<provider>.backend' setting
         
         Returns:
             bool: True if settings were loaded successfully, False if missing
+
+        Raises:
+            ValueError: If the adapter cannot be created from the provider configuration
         """
-        def _load_settings(db):
-            # Load current provider
-            provider_setting = get_setting_by_key(db, self.CURRENT_PROVIDER_KEY)
-            model_setting = get_setting_by_key(db, self.CURRENT_MODEL_KEY)
-            
-            if not provider_setting or not model_setting:
-                return False
-            
-            try:
-                provider_id = int(provider_setting.setting_value)
-                model_name = model_setting.setting_value
-                
-                # Create adapter with loaded settings
-                return self._create_adapter(provider_id, model_name)
-            except (ValueError, Exception):
-                return False
-        
-        return _with_session(_load_settings)
+        # Load current provider (a workspace may override the global selection)
+        provider_value = settings_resolver.get(self.CURRENT_PROVIDER_KEY)
+        model_name = settings_resolver.get(self.CURRENT_MODEL_KEY)
+
+        if not provider_value or not model_name:
+            return False
+
+        try:
+            provider_id = int(provider_value)
+        except ValueError:
+            return False
+
+        # Create adapter with loaded settings
+        return self._create_adapter(provider_id, model_name, default_backend)
     
     def save_current_settings(self) -> None:
         """Save current provider and model to settings."""
         if not self._current_provider_id or not self._current_model_name:
             return
-        
+        self.save_selection(self._current_provider_id, self._current_model_name)
+
+    def save_selection(self, provider_id: int, model_name: str) -> None:
+        """
+        Save a provider and model as the selection restored on the next start.
+
+        Does not change the current adapter, so a chat session can switch its
+        own adapter (see build_adapter) and still be remembered.
+
+        Args:
+            provider_id: ID of the provider
+            model_name: Name of the model
+        """
+        # Skip the write if the stored settings are already current
+        if (get_cached_setting_value(self.CURRENT_PROVIDER_KEY) == str(provider_id)
+                and get_cached_setting_value(self.CURRENT_MODEL_KEY) == model_name):
+            return
+
         def _save_settings(db):
             # Save provider setting
             provider_setting = get_setting_by_key(db, self.CURRENT_PROVIDER_KEY)
             if provider_setting:
-                update_setting(db, self.CURRENT_PROVIDER_KEY, value=str(self._current_provider_id))
+                update_setting(db, self.CURRENT_PROVIDER_KEY, value=str(provider_id))
             else:
-                create_setting(db, self.CURRENT_PROVIDER_KEY, str(self._current_provider_id))
+                create_setting(db, self.CURRENT_PROVIDER_KEY, str(provider_id))
             
             # Save model setting
             model_setting = get_setting_by_key(db, self.CURRENT_MODEL_KEY)
             if model_setting:
-                update_setting(db, self.CURRENT_MODEL_KEY, value=self._current_model_name)
+                update_setting(db, self.CURRENT_MODEL_KEY, value=model_name)
             else:
-                create_setting(db, self.CURRENT_MODEL_KEY, self._current_model_name)
-        
-        _with_session(_save_settings)
+                create_setting(db, self.CURRENT_MODEL_KEY, model_name)
+
+        try:
+            _with_session(_save_settings)
+        finally:
+            invalidate_settings()
     
     def switch_adapter(self, provider_id: int, model_name: str) -> bool:
         """
@@ -96,69 +211,104 @@ class AdapterManager:
             
         Returns:
             bool: True if switch was successful
+
+        Raises:
+            ValueError: If the adapter cannot be created from the provider configuration
         """
         if self._create_adapter(provider_id, model_name):
             self.save_current_settings()
             return True
         return False
     
-    def _create_adapter(self, provider_id: int, model_name: str) -> bool:
+    def build_adapter(self, provider_id: int, model_name: str,
+                      default_backend: Optional[str] = None) -> Optional[LLMAdapter]:
+        """
+        Create a new adapter without changing the current one.
+
+        Every call returns an independent adapter with its own memory, so
+        several chat sessions can use the same model side by side.
+
+        Args:
+            provider_id: ID of the provider configuration
+            model_name: Name of the model
+            default_backend: Adapter backend if the provider has no '<provider>.backend' setting
+                (None: the adapter's own default)
+
+        Returns:
+            Optional[LLMAdapter]: The instrumented adapter, or None if provider or model are unknown
+
+        Raises:
+            ValueError: If the adapter cannot be created from the provider configuration
+                (e.g. a missing endpoint or an unknown backend)
+        """
+        # Get provider configuration
+        provider_config = get_cached_provider(provider_id)
+        if not provider_config:
+            return None
+
+        # Get model configuration
+        model = get_cached_model(model_name)
+        if not model or model.model_provider_id != provider_id:
+            return None
+
+        # Create adapter via the provider registry; its errors are shown to the user
+        try:
+            adapter = create_adapter(AdapterSpec(
+                provider_name=provider_config.prov_name,
+                model_name=model_name,
+                endpoint=provider_config.prov_endpoint,
+                api_key=provider_config.prov_api_key or None,
+                default_params=get_adapter_params(),
+                memory_config=get_memory_config(),
+                backend=settings_resolver.get(provider_config.prov_name.lower() + ADAPTER_BACKEND_SUFFIX,
+                                              default_backend),
+            ))
+        except ValueError:
+            raise
+        except Exception as e:
+            # Plugin factories and missing optional dependencies may raise anything
+            raise ValueError(f"Could not create adapter for '{provider_config.prov_name}': {e}") from e
+        if adapter is None:
+            return None
+
+        # Requests to the same server share its slots (sessions, /compare, summaries)
+        endpoint = getattr(adapter, "base_url", None) or provider_config.prov_name.lower()
+        configure_scheduler(endpoint)
+        adapter.attach_scheduler(request_scheduler, endpoint)
+        return InstrumentedAdapter(adapter, provider_name=provider_config.prov_name, model_name=model_name)
+
+    def _create_adapter(self, provider_id: int, model_name: str, default_backend: Optional[str] = None) -> bool:
         """
         Create and configure adapter based on provider and model.
         
         Args:
             provider_id: ID of the provider configuration
             model_name: Name of the model
+            default_backend: Adapter backend if the provider has no '<provider>.backend' setting
             
         Returns:
             bool: True if adapter was created successfully
+
+        Raises:
+            ValueError: If the adapter cannot be created from the provider configuration
         """
-        def _create(db):
-            # Get provider configuration
-            provider_config = get_llm_provider_config_by_id(db, provider_id)
-            if not provider_config:
-                return False
-            
-            # Get model configuration
-            model = get_model_by_name(db, model_name)
-            if not model or model.model_provider_id != provider_id:
-                return False
-            
-            # Create adapter based on provider type
-            try:
-                if provider_config.prov_name.lower() == "ollama":
-                    self._current_adapter = OllamaAdapter(
-                        model=model_name,
-                        default_params={"temperature": 0.5}
-                    )
-                else:
-                    # TODO: Add support for other providers (OpenAI, Claude, etc.)
-                    return False
-                
-                self._current_provider_id = provider_id
-                self._current_model_name = model_name
-                return True
-                
-            except Exception:
-                return False
-        
-        return _with_session(_create)
+        adapter = self.build_adapter(provider_id, model_name, default_backend)
+        if adapter is None:
+            return False
+
+        self._current_adapter = adapter
+        self._current_provider_id = provider_id
+        self._current_provider_name = adapter.provider_name
+        self._current_model_name = model_name
+        return True
     
     def requires_provider_selection(self) -> bool:
         """Check if provider selection is required (no current settings)."""
-        def _check_provider(db):
-            provider_setting = get_setting_by_key(db, self.CURRENT_PROVIDER_KEY)
-            return provider_setting is None
-        
-        return _with_session(_check_provider)
+        return settings_resolver.get(self.CURRENT_PROVIDER_KEY) is None
     
     def requires_model_selection(self) -> bool:
         """Check if model selection is required (no current settings)."""
-        def _check_model(db):
-            model_setting = get_setting_by_key(db, self.CURRENT_MODEL_KEY)
-            return model_setting is None
-        
-        return _with_session(_check_model)
+        return settings_resolver.get(self.CURRENT_MODEL_KEY) is None
     
     def has_active_chat(self) -> bool:
         """
@@ -169,23 +319,14 @@ class AdapterManager:
         return self._current_adapter is not None
     
     def get_adapter_info(self) -> Dict[str, Any]:
-        """Get information about the current adapter including provider name."""
-        def _get_info(db):
-            provider_name = None
-            if self._current_provider_id:
-                provider_config = get_llm_provider_config_by_id(db, self._current_provider_id)
-                if provider_config:
-                    provider_name = provider_config.prov_name
-            
-            return {
-                "provider_id": self._current_provider_id,
-                "provider_name": provider_name,
-                "model_name": self._current_model_name,
-                "adapter_type": type(self._current_adapter).__name__ if self._current_adapter else None,
-                "is_active": self._current_adapter is not None
-            }
-        
-        return _with_session(_get_info)
+        """Get information about the current adapter including provider name (no database access)."""
+        return {
+            "provider_id": self._current_provider_id,
+            "provider_name": self._current_provider_name,
+            "model_name": self._current_model_name,
+            "adapter_type": type(getattr(self._current_adapter, "inner", self._current_adapter)).__name__ if self._current_adapter else None,
+            "is_active": self._current_adapter is not None
+        }
 
 
 # Global instance
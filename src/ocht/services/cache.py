@@ -0,0 +1,202 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+from ocht.core.db import get_session
+from ocht.core.models import GLOBAL_SCOPE_ID, LLMProviderConfig, Model, Setting
+from ocht.repositories.llm_provider_config import get_all_llm_provider_configs
+from ocht.repositories.model import get_all_models
+from ocht.repositories.setting import get_all_settings
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+# Reload cached tables at least this often, so changes made by another process
+# (e.g. 'ocht sync-models' while the TUI runs) show up eventually. None disables expiry.
+DEFAULT_TTL_SECONDS: Optional[float] = 60.0
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a cache."""
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TableCache(Generic[K, V]):
+    """
+    Read-through cache holding all rows of one table, keyed by their primary key.
+
+    The table is loaded once on first access (one query) and kept until it is
+    invalidated by a service-layer write or the optional TTL expires.
+    Returned rows are detached ORM objects and must be treated as read-only.
+    Listeners are called after every invalidation and reload, so derived data
+    (e.g. the compiled settings of the SettingsResolver) can be dropped.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], List[V]], key: Callable[[V], K],
+                 ttl: Optional[float] = DEFAULT_TTL_SECONDS):
+        self.name = name
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._loader = loader
+        self._key = key
+        self._rows: Optional[Dict[K, V]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[], None]] = []
+
+    def _is_valid(self) -> bool:
+        if self._rows is None:
+            return False
+        return self.ttl is None or time.monotonic() - self._loaded_at < self.ttl
+
+    def _ensure_loaded(self) -> Dict[K, V]:
+        with self._lock:
+            if self._is_valid():
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+                self.stats.loads += 1
+                rows = self._loader()
+                self._rows = {self._key(row): row for row in rows}
+                self._loaded_at = time.monotonic()
+                self._notify()
+            return self._rows
+
+    def expires_at(self) -> Optional[float]:
+        """Returns the time.monotonic() deadline of the loaded rows, or None if they do not expire."""
+        if self.ttl is None or self._rows is None:
+            return None
+        return self._loaded_at + self.ttl
+
+    def all(self) -> List[V]:
+        """Returns all rows in load order."""
+        return list(self._ensure_loaded().values())
+
+    def get(self, key: K) -> Optional[V]:
+        """Returns the row with the given key or None."""
+        return self._ensure_loaded().get(key)
+
+    def invalidate(self) -> None:
+        """Drops the cached rows; the next access reloads the table."""
+        with self._lock:
+            if self._rows is not None:
+                self.stats.invalidations += 1
+            self._rows = None
+            self._notify()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Registers a callback for invalidations and reloads."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        """Unregisters a callback."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+
+def _load(repository_function: Callable) -> Callable[[], List]:
+    """Creates a loader that reads all rows with a repository function."""
+    def _loader():
+        with get_session() as db:
+            return list(repository_function(db))
+    return _loader
+
+
+settings_cache: TableCache[Tuple[str, int], Setting] = TableCache(
+    "settings", _load(get_all_settings), key=lambda setting: (setting.setting_key, setting.setting_workspace_id)
+)
+providers_cache: TableCache[int, LLMProviderConfig] = TableCache(
+    "providers", _load(get_all_llm_provider_configs), key=lambda provider: provider.prov_id
+)
+models_cache: TableCache[str, Model] = TableCache(
+    "models", _load(get_all_models), key=lambda model: model.model_name
+)
+
+_CACHES = (settings_cache, providers_cache, models_cache)
+
+
+# ============================================================================
+# PUBLIC API FUNCTIONS
+# ============================================================================
+
+def get_cached_setting(key: str, workspace_id: int = GLOBAL_SCOPE_ID) -> Optional[Setting]:
+    """Gets a setting by key and scope (default: global) from the cache."""
+    return settings_cache.get((key, workspace_id))
+
+
+def get_cached_setting_value(key: str, default: Optional[str] = None,
+                             workspace_id: int = GLOBAL_SCOPE_ID) -> Optional[str]:
+    """Gets a setting value by key and scope (default: global) from the cache."""
+    setting = settings_cache.get((key, workspace_id))
+    return setting.setting_value if setting else default
+
+
+def get_cached_settings() -> List[Setting]:
+    """Gets all settings from the cache."""
+    return settings_cache.all()
+
+
+def get_cached_provider(provider_id: int) -> Optional[LLMProviderConfig]:
+    """Gets a provider by ID from the cache."""
+    return providers_cache.get(provider_id)
+
+
+def get_cached_providers() -> List[LLMProviderConfig]:
+    """Gets all providers from the cache."""
+    return providers_cache.all()
+
+
+def get_cached_model(model_name: str) -> Optional[Model]:
+    """Gets a model by name from the cache."""
+    return models_cache.get(model_name)
+
+
+def get_cached_models() -> List[Model]:
+    """Gets all models from the cache."""
+    return models_cache.all()
+
+
+def invalidate_settings() -> None:
+    """Invalidates cached settings after a write."""
+    settings_cache.invalidate()
+
+
+def invalidate_providers() -> None:
+    """Invalidates cached providers after a write."""
+    providers_cache.invalidate()
+
+
+def invalidate_models() -> None:
+    """Invalidates cached models after a write."""
+    models_cache.invalidate()
+
+
+def invalidate_all() -> None:
+    """Invalidates all caches."""
+    for cache in _CACHES:
+        cache.invalidate()
+
+
+def set_cache_ttl(ttl: Optional[float]) -> None:
+    """Sets the TTL in seconds for all caches (None disables expiry)."""
+    for cache in _CACHES:
+        cache.ttl = ttl
+
+
+def get_cache_stats() -> Dict[str, CacheStats]:
+    """Returns the hit/miss statistics per cache."""
+    return {cache.name: cache.stats for cache in _CACHES}
@@ -1,9 +1,12 @@
-from ocht.core.db import init_db
+from ocht.core.migration import ensure_schema
+from ocht.services.metrics import configure_metrics_persistence
 from ocht.tui.app import ChatApp
 
 def start_chat():
     """Starts the text UI for the chat."""
-    # Ensure database tables exist
-    init_db()
+    # Create or migrate the schema; a current database only costs one query
+    ensure_schema()
+    # Persist request metrics if enabled via the 'metrics_persist' setting
+    configure_metrics_persistence()
     # Launch the Textual chat application
     ChatApp().run()
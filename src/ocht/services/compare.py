@@ -0,0 +1,82 @@
+from typing import Callable, Dict, List, Optional
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.scheduler import PRIORITY_BATCH
+from ocht.adapters.fanout import DEFAULT_MAX_CONCURRENCY, FanOutResult, fan_out
+from ocht.services.adapter_manager import adapter_manager
+from ocht.services.cache import get_cached_model
+from ocht.services.metrics import persist_spans_in_background
+from ocht.services.settings_resolver import settings_resolver
+
+# Setting limiting the parallel requests of /compare
+COMPARE_CONCURRENCY_KEY = "compare.max_concurrency"
+# Method recorded in the request metrics of compare runs
+COMPARE_METHOD = "compare"
+
+
+def parse_model_list(value: str) -> List[str]:
+    """
+    Parses a comma-separated model list, dropping empty entries and duplicates.
+
+    Raises:
+        ValueError: If fewer than two models are given
+    """
+    models = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    if len(models) < 2:
+        raise ValueError("At least two models are required, e.g. /compare llama3,qwen3 <prompt>")
+    return models
+
+
+def build_compare_adapters(model_names: List[str]) -> Dict[str, LLMAdapter]:
+    """
+    Creates a fresh adapter without history for each model.
+
+    The adapters request their slots at batch priority, so a compare run
+    does not hold up the prompts and summaries of the chat sessions.
+
+    Args:
+        model_names: Names of the models to compare
+
+    Returns:
+        Dict[str, LLMAdapter]: Model name -> adapter
+
+    Raises:
+        ValueError: If a model is unknown or its adapter cannot be created
+    """
+    adapters: Dict[str, LLMAdapter] = {}
+    for model_name in model_names:
+        model = get_cached_model(model_name)
+        if model is None:
+            raise ValueError(f"Model '{model_name}' not found")
+        adapter = adapter_manager.build_adapter(model.model_provider_id, model_name)
+        if adapter is None:
+            raise ValueError(f"Could not create adapter for model '{model_name}'")
+        if hasattr(adapter, "span_method"):
+            adapter.span_method = COMPARE_METHOD
+        adapter.request_priority = PRIORITY_BATCH
+        adapters[model_name] = adapter
+    return adapters
+
+
+def get_compare_concurrency() -> int:
+    """Returns the maximum number of parallel compare requests (setting 'compare.max_concurrency')."""
+    return max(1, settings_resolver.get_int(COMPARE_CONCURRENCY_KEY, DEFAULT_MAX_CONCURRENCY))
+
+
+async def compare_models(adapters: Dict[str, LLMAdapter], prompt: str,
+                         on_chunk: Optional[Callable[[str, str], None]] = None,
+                         max_concurrency: Optional[int] = None) -> Dict[str, FanOutResult]:
+    """
+    Streams a prompt to several models and stores their request metrics.
+
+    Args:
+        adapters: Model name -> adapter (see build_compare_adapters)
+        prompt: The prompt sent to every model
+        on_chunk: Called with (model name, text so far) while streaming
+        max_concurrency: Parallel requests (default: setting 'compare.max_concurrency')
+
+    Returns:
+        Dict[str, FanOutResult]: Model name -> response and timing span
+    """
+    results = await fan_out(adapters, prompt, max_concurrency or get_compare_concurrency(), on_chunk)
+    persist_spans_in_background([result.span for result in results.values() if result.span is not None])
+    return results
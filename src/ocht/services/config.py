@@ -1,13 +1,14 @@
+from ocht.services.transfer import CONFIG_TABLES, ImportSummary, export_data, import_data
 
 
 def open_conf():
     """Opens or loads the configuration (DB or YAML)."""
     pass
 
-def export_conf(path: str):
-    """Exports settings to YAML/JSON."""
-    pass
+def export_conf(path: str) -> int:
+    """Exports providers, models and settings to JSON/JSONL (format by file extension, API keys left empty)."""
+    return export_data(path, tables=CONFIG_TABLES)
 
-def import_conf(path: str):
-    """Imports settings from YAML/JSON."""
-    pass
+def import_conf(path: str) -> ImportSummary:
+    """Imports providers, models and settings from a JSON/JSONL export."""
+    return import_data(path, tables=CONFIG_TABLES)
@@ -0,0 +1,132 @@
+from typing import List, Optional, Tuple, TypeVar, Callable
+from ocht.core.db import get_session
+from ocht.core.models import Message
+from ocht.repositories.message import create_message, get_branch, get_leaf_messages, get_message_by_id
+from ocht.repositories.workspace import get_workspace_active_leaf, set_workspace_active_leaf
+
+T = TypeVar('T')
+
+ROLE_USER = "user"
+ROLE_ASSISTANT = "assistant"
+
+
+def _with_session(func: Callable) -> T:
+    """Helper function to execute database operations with session."""
+    with get_session() as db:
+        return func(db)
+
+
+def _ensure_workspace_message(db, workspace_id: int, message_id: int) -> Message:
+    """Ensures the message exists in the workspace and returns it."""
+    message = get_message_by_id(db, message_id)
+    if message is None or message.msg_workspace_id != workspace_id:
+        raise ValueError(f"Message {message_id} not found in this workspace")
+    return message
+
+
+def get_active_leaf_id(workspace_id: int) -> Optional[int]:
+    """
+    Gets the last message of the active branch of a workspace.
+
+    Returns:
+        Optional[int]: The message ID, or None if the next message starts a new conversation
+    """
+    return _with_session(lambda db: get_workspace_active_leaf(db, workspace_id))
+
+
+def set_active_leaf(workspace_id: int, leaf_id: Optional[int]) -> None:
+    """
+    Switches the active branch of a workspace.
+
+    Args:
+        workspace_id: Workspace ID
+        leaf_id: Message the next reply is appended to (None: start a new conversation)
+
+    Raises:
+        ValueError: If the message does not belong to the workspace
+    """
+    def _set_leaf(db):
+        if leaf_id is not None:
+            _ensure_workspace_message(db, workspace_id, leaf_id)
+        set_workspace_active_leaf(db, workspace_id, leaf_id)
+
+    _with_session(_set_leaf)
+
+
+def load_active_branch(workspace_id: int) -> List[Message]:
+    """
+    Loads the messages of the active branch, root first.
+
+    Returns:
+        List[Message]: The branch, or an empty list for a new conversation
+    """
+    leaf_id = get_active_leaf_id(workspace_id)
+    if leaf_id is None:
+        return []
+    return _with_session(lambda db: get_branch(db, leaf_id))
+
+
+def append_exchange(workspace_id: int, prompt: str, response: str,
+                    partial: bool = False) -> Tuple[Message, Message]:
+    """
+    Stores a prompt and its response at the end of the active branch.
+
+    Args:
+        workspace_id: Workspace ID
+        prompt: The user's prompt
+        response: The assistant's response
+        partial: True if the response was stopped before the model finished
+
+    Returns:
+        Tuple[Message, Message]: The stored user and assistant messages
+    """
+    def _append(db):
+        parent_id = get_workspace_active_leaf(db, workspace_id)
+        # The active leaf may have been deleted in the meantime: start a new root then
+        parent = get_message_by_id(db, parent_id) if parent_id is not None else None
+        user_message = create_message(db, workspace_id, ROLE_USER, prompt,
+                                      parent.msg_id if parent else None)
+        assistant_message = create_message(db, workspace_id, ROLE_ASSISTANT, response, user_message.msg_id,
+                                           partial=partial)
+        set_workspace_active_leaf(db, workspace_id, assistant_message.msg_id)
+        # Reload the attributes expired by the later commits before the session closes
+        db.refresh(user_message)
+        db.refresh(assistant_message)
+        return user_message, assistant_message
+
+    return _with_session(_append)
+
+
+def fork_branch(workspace_id: int, keep: int) -> Optional[int]:
+    """
+    Forks the active branch after its first ``keep`` messages.
+
+    The remaining messages stay stored as their own branch; the next prompt
+    starts a new branch from the kept messages (e.g. to edit or regenerate).
+
+    Args:
+        workspace_id: Workspace ID
+        keep: Number of messages of the active branch to keep (0: start a new conversation)
+
+    Returns:
+        Optional[int]: The new active leaf
+
+    Raises:
+        ValueError: If keep is out of range
+    """
+    branch = load_active_branch(workspace_id)
+    if keep < 0 or keep > len(branch):
+        raise ValueError(f"Fork position must be between 0 and {len(branch)}")
+    leaf_id = branch[keep - 1].msg_id if keep else None
+    set_active_leaf(workspace_id, leaf_id)
+    return leaf_id
+
+
+def list_branches(workspace_id: int) -> List[Message]:
+    """
+    Lists the last message of every branch of a workspace.
+
+    Returns:
+        List[Message]: The leaf messages, oldest first
+    """
+    return _with_session(lambda db: list(get_leaf_messages(db, workspace_id)))
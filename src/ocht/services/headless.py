@@ -0,0 +1,243 @@
+"""
+Chat without the text UI: `ocht ask` and `ocht chat --plain`.
+
+Answers are streamed token by token to a text stream (stdout), so OChaT can be
+used from shell pipelines and scripts. This module must not import Textual or
+LangChain: the chat path only needs the database, the adapter registry and an
+HTTP client, so the first token is not delayed by loading the UI. Ollama is
+therefore reached with the direct backend unless the setting ``ollama.backend``
+selects another one; ``ollama.backend`` = ``langchain`` loads LangChain on the
+first request like in the TUI.
+"""
+import asyncio
+import signal
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, TextIO, TypeVar
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.http_client import close_async_clients
+from ocht.adapters.registry import OLLAMA_BACKEND_DIRECT
+from ocht.adapters.streaming import STOP_MAX_SECONDS, STOP_MAX_TOKENS, StreamController
+from ocht.core.db import get_session
+from ocht.core.migration import ensure_schema
+from ocht.repositories.workspace import get_workspace_by_id
+from ocht.services.adapter_manager import adapter_manager, get_stream_limits
+from ocht.services.conversation import ROLE_USER, append_exchange, load_active_branch
+from ocht.services.metrics import configure_metrics_persistence
+from ocht.services.settings_resolver import settings_resolver
+
+T = TypeVar('T')
+
+EXIT_COMMANDS = ("/bye", "/quit", "/exit")
+PLAIN_PROMPT = "> "
+
+# Written to stderr when an answer ends early, so stdout only carries the answer
+STOP_NOTES = {
+    STOP_MAX_SECONDS: "[stopped: time limit reached (stream.max_seconds)]",
+    STOP_MAX_TOKENS: "[stopped: token limit reached (stream.max_tokens)]",
+}
+STOP_NOTE_DEFAULT = "[stopped]"
+
+
+def _with_session(func: Callable) -> T:
+    """Helper function to execute database operations with session."""
+    with get_session() as db:
+        return func(db)
+
+
+@dataclass
+class Reply:
+    """
+    A streamed answer.
+
+    Attributes:
+        text: The streamed text (the partial text if it was stopped)
+        stop_reason: Why the answer ended early (see adapters/streaming.py), None if the model finished
+    """
+    text: str
+    stop_reason: Optional[str] = None
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_reason is not None
+
+
+def build_prompt(prompt: Optional[str], stdin_text: Optional[str]) -> str:
+    """
+    Combines the prompt argument with text piped into stdin.
+
+    ``git diff | ocht ask "Review this"`` sends the instruction followed by the
+    piped text; without an argument the piped text is the prompt.
+
+    Raises:
+        ValueError: If both are empty
+    """
+    parts = [part.strip() for part in (prompt, stdin_text) if part and part.strip()]
+    if not parts:
+        raise ValueError("No prompt given (pass it as argument or pipe it into stdin)")
+    return "\n\n".join(parts)
+
+
+def open_adapter(workspace_id: Optional[int] = None) -> LLMAdapter:
+    """
+    Prepares the database and the adapter of the selected provider and model.
+
+    With a workspace, its settings override the global ones and the active
+    branch is loaded as history, so the chat continues where it was left in
+    the TUI. Ollama uses the direct backend unless ``ollama.backend`` is set.
+
+    Args:
+        workspace_id: Workspace to continue and store the chat in (None: not stored)
+
+    Raises:
+        ValueError: If the workspace does not exist or no provider/model is selected
+    """
+    # Create or migrate the schema; a current database only costs one query
+    ensure_schema()
+    if workspace_id is not None:
+        if _with_session(lambda db: get_workspace_by_id(db, workspace_id)) is None:
+            raise ValueError(f"Workspace with ID {workspace_id} not found")
+        settings_resolver.set_active_workspace(workspace_id)
+    configure_metrics_persistence()
+
+    if not adapter_manager.load_settings_on_startup(default_backend=OLLAMA_BACKEND_DIRECT):
+        raise ValueError("No provider and model selected; choose them once in the chat UI ('ocht chat')")
+    adapter = adapter_manager.get_current_adapter()
+    if workspace_id is not None:
+        adapter.load_history([
+            ("human" if message.msg_role == ROLE_USER else "ai", message.content)
+            for message in load_active_branch(workspace_id)
+        ])
+    return adapter
+
+
+@contextmanager
+def _stop_on_interrupt(controller: StreamController) -> Iterator[None]:
+    """Ctrl+C stops the answer like /stop in the TUI: the partial answer is kept and stored."""
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGINT, controller.stop)
+    except (NotImplementedError, RuntimeError):
+        # No signal handlers on this platform/thread: Ctrl+C raises KeyboardInterrupt
+        yield
+        return
+    try:
+        yield
+    finally:
+        loop.remove_signal_handler(signal.SIGINT)
+
+
+async def stream_reply(adapter: LLMAdapter, prompt: str, out: TextIO) -> Reply:
+    """
+    Streams the answer to a prompt into a text stream, flushing every chunk.
+
+    The stream.* limits apply like in the TUI.
+
+    Args:
+        adapter: Adapter to ask
+        prompt: The prompt
+        out: Stream the chunks are written to (e.g. sys.stdout)
+
+    Returns:
+        Reply: The streamed text and why it ended early, if it did
+    """
+    controller = StreamController(get_stream_limits())
+    chunks = []
+    with _stop_on_interrupt(controller):
+        async for chunk in controller.stream(adapter.send_prompt_stream(prompt)):
+            chunks.append(chunk)
+            out.write(chunk)
+            out.flush()
+    text = "".join(chunks)
+    if text and not text.endswith("\n"):
+        out.write("\n")
+        out.flush()
+    if controller.stopped:
+        sys.stderr.write(STOP_NOTES.get(controller.stop_reason, STOP_NOTE_DEFAULT) + "\n")
+    return Reply(text, controller.stop_reason)
+
+
+def _store_reply(workspace_id: Optional[int], prompt: str, reply: Reply) -> None:
+    if workspace_id is not None and reply.text:
+        append_exchange(workspace_id, prompt, reply.text, reply.stopped)
+
+
+async def _ask(prompt: str, workspace_id: Optional[int], out: TextIO) -> Reply:
+    try:
+        reply = await stream_reply(open_adapter(workspace_id), prompt, out)
+        _store_reply(workspace_id, prompt, reply)
+        return reply
+    finally:
+        await close_async_clients()
+
+
+def ask(prompt: str, workspace_id: Optional[int] = None, out: Optional[TextIO] = None) -> Reply:
+    """
+    Answers a single prompt, streamed to ``out``.
+
+    Args:
+        prompt: The prompt
+        workspace_id: Workspace to continue and store the exchange in (None: not stored)
+        out: Stream the answer is written to (default: stdout)
+
+    Returns:
+        Reply: The answer
+
+    Raises:
+        ValueError: If the workspace does not exist or no provider/model is selected
+    """
+    return asyncio.run(_ask(prompt, workspace_id, out or sys.stdout))
+
+
+async def _plain_chat(workspace_id: Optional[int], lines: TextIO, out: TextIO, interactive: bool) -> int:
+    adapter = open_adapter(workspace_id)
+    turns = 0
+    try:
+        while True:
+            if interactive:
+                sys.stderr.write(PLAIN_PROMPT)
+                sys.stderr.flush()
+            # Read on the loop thread: nothing else runs between turns, and Ctrl+C ends the chat right away
+            try:
+                line = lines.readline()
+            except KeyboardInterrupt:
+                break
+            if not line:
+                break
+            prompt = line.strip()
+            if not prompt:
+                continue
+            if prompt in EXIT_COMMANDS:
+                break
+            reply = await stream_reply(adapter, prompt, out)
+            _store_reply(workspace_id, prompt, reply)
+            turns += 1
+    finally:
+        await close_async_clients()
+    return turns
+
+
+def plain_chat(workspace_id: Optional[int] = None, lines: Optional[TextIO] = None,
+               out: Optional[TextIO] = None) -> int:
+    """
+    Line-based chat: every line read from ``lines`` is a prompt, answers are streamed to ``out``.
+
+    Ends at the end of input, on /bye, /quit or /exit, or on Ctrl+C at the
+    prompt; Ctrl+C during an answer only stops that answer. The "> " prompt
+    is written to stderr, and only for a terminal, so piped output stays clean.
+
+    Args:
+        workspace_id: Workspace to continue and store the chat in (None: not stored)
+        lines: Input of the prompts (default: stdin)
+        out: Stream the answers are written to (default: stdout)
+
+    Returns:
+        int: Number of answered prompts
+
+    Raises:
+        ValueError: If the workspace does not exist or no provider/model is selected
+    """
+    lines = lines or sys.stdin
+    return asyncio.run(_plain_chat(workspace_id, lines, out or sys.stdout, lines.isatty()))
@@ -0,0 +1,278 @@
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy.engine import Connection, Engine
+
+from ocht.core.db import create_db_engine, get_session
+from ocht.core.models import GLOBAL_SCOPE_ID, Message
+from ocht.repositories.bulk import count_rows
+from ocht.repositories.message import delete_messages_before, get_message_by_id
+from ocht.repositories.setting import create_setting, get_setting_by_key, update_setting
+from ocht.repositories.workspace import get_all_workspaces
+from ocht.services.cache import invalidate_settings
+from ocht.services.conversation import get_active_leaf_id, set_active_leaf
+from ocht.services.settings_resolver import settings_resolver
+from ocht.services.transfer import TABLE_MESSAGE, TABLE_WORKSPACE, export_data
+
+T = TypeVar('T')
+
+# Workspace settings: messages older than this many days are removed (0 or unset: keep forever)
+RETENTION_MAX_AGE_KEY = "retention.max_age_days"
+# Workspace setting: write removed messages to an archive file first (default: true)
+RETENTION_ARCHIVE_KEY = "retention.archive"
+# Global settings: hours between background runs in the TUI (0: off) and time of the last run
+MAINTENANCE_INTERVAL_KEY = "db.maintenance_interval_hours"
+LAST_MAINTENANCE_KEY = "db.last_maintenance"
+DEFAULT_MAINTENANCE_INTERVAL_HOURS = 24.0
+
+# Archives are written next to the SQLite file
+ARCHIVE_DIR_NAME = "archive"
+# Rows sampled per index by ANALYZE, keeps it fast on large tables
+ANALYSIS_LIMIT = 1000
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+@dataclass
+class MaintenanceReport:
+    """Result of a maintenance run."""
+    size_before: int = 0
+    size_after: int = 0
+    archived: Dict[str, int] = field(default_factory=dict)  # workspace name -> removed messages
+    archive_files: List[str] = field(default_factory=list)
+    auto_vacuum: str = "none"
+    freed_pages: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)  # step -> seconds
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.timings.values())
+
+    @property
+    def removed_messages(self) -> int:
+        return sum(self.archived.values())
+
+
+def _with_session(func: Callable) -> T:
+    """Helper function to execute database operations with session."""
+    with get_session() as db:
+        return func(db)
+
+
+def _is_sqlite(engine: Engine) -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def _pragma(connection: Connection, statement: str) -> Optional[int]:
+    value = connection.exec_driver_sql(f"PRAGMA {statement}").scalar()
+    return int(value) if value is not None else None
+
+
+def _database_size(engine: Engine) -> int:
+    """Size of the database in bytes (page count x page size for SQLite, else 0)."""
+    if not _is_sqlite(engine):
+        return 0
+    with engine.connect() as connection:
+        return _pragma(connection, "page_count") * _pragma(connection, "page_size")
+
+
+def get_archive_dir(engine: Optional[Engine] = None) -> Path:
+    """Returns the directory for message archives (next to the SQLite file, else ./archive)."""
+    engine = engine or create_db_engine()
+    database = engine.url.database if _is_sqlite(engine) else None
+    if database and database != ":memory:":
+        return Path(database).resolve().parent / ARCHIVE_DIR_NAME
+    return Path.cwd() / ARCHIVE_DIR_NAME
+
+
+def _retention_cutoff(workspace_id: int, now: datetime) -> Optional[datetime]:
+    """Returns the time before which messages of a workspace are removed, or None to keep them."""
+    value = settings_resolver.values(workspace_id).get(RETENTION_MAX_AGE_KEY)
+    try:
+        days = float(value) if value else 0.0
+    except ValueError:
+        return None
+    return now - timedelta(days=days) if days > 0 else None
+
+
+def _should_archive(workspace_id: int) -> bool:
+    value = settings_resolver.values(workspace_id).get(RETENTION_ARCHIVE_KEY)
+    return value is None or value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def apply_retention(now: Optional[datetime] = None, archive_dir: Optional[Path] = None,
+                    report: Optional[MaintenanceReport] = None) -> MaintenanceReport:
+    """
+    Removes messages older than the retention period of their workspace.
+
+    Before removing, the messages are exported with their workspace to a
+    compressed JSONL archive per workspace, which ``ocht import --merge`` restores
+    into the workspace.
+    Replies to removed messages become new conversation roots.
+
+    Args:
+        now: Reference time (default: now)
+        archive_dir: Directory for the archives (default: next to the database)
+        report: Report to add the results to
+
+    Returns:
+        MaintenanceReport: Removed messages per workspace and written archives
+    """
+    now = now or datetime.now()
+    report = report or MaintenanceReport()
+    workspaces = _with_session(lambda db: [(w.work_id, w.work_name) for w in get_all_workspaces(db)])
+
+    for workspace_id, name in workspaces:
+        cutoff = _retention_cutoff(workspace_id, now)
+        if cutoff is None:
+            continue
+        old = (Message.msg_workspace_id == workspace_id, Message.msg_created_at < cutoff)
+        if not _with_session(lambda db: count_rows(db, Message, *old)):
+            continue
+
+        if _should_archive(workspace_id):
+            target = archive_dir or get_archive_dir()
+            target.mkdir(parents=True, exist_ok=True)
+            path = target / f"workspace-{workspace_id}-{now:%Y%m%d-%H%M%S}.jsonl.gz"
+            export_data(str(path), tables=(TABLE_WORKSPACE, TABLE_MESSAGE), workspace_id=workspace_id,
+                        messages_before=cutoff)
+            report.archive_files.append(str(path))
+
+        report.archived[name] = _with_session(lambda db: delete_messages_before(db, workspace_id, cutoff))
+
+        # The active branch ends at its newest message, so it is gone completely if its leaf is
+        leaf_id = get_active_leaf_id(workspace_id)
+        if leaf_id is not None and _with_session(lambda db: get_message_by_id(db, leaf_id)) is None:
+            set_active_leaf(workspace_id, None)
+    return report
+
+
+def compact_database(full_vacuum: bool = False, report: Optional[MaintenanceReport] = None,
+                     engine: Optional[Engine] = None) -> MaintenanceReport:
+    """
+    Returns free pages to the file system and refreshes the query planner statistics.
+
+    Databases created by init_db use incremental auto-vacuum, which frees
+    pages in place without rewriting the file. Older databases need one
+    ``full_vacuum`` run that switches the mode and rebuilds the file; this
+    blocks other writers while it runs.
+
+    Args:
+        full_vacuum: Rebuild the file with VACUUM (also enables incremental auto-vacuum)
+        report: Report to add the results to
+        engine: Engine to use (default: create_db_engine())
+
+    Returns:
+        MaintenanceReport: Auto-vacuum mode and freed pages
+    """
+    report = report or MaintenanceReport()
+    engine = engine or create_db_engine()
+    if not _is_sqlite(engine):
+        return report
+
+    # VACUUM and the auto_vacuum switch cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        started = time.perf_counter()
+        mode = _pragma(connection, "auto_vacuum")
+        pages_before = _pragma(connection, "page_count")
+        if full_vacuum:
+            connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.exec_driver_sql("VACUUM")
+            mode = _pragma(connection, "auto_vacuum")
+        elif mode == 2:
+            # sqlite3's execute() steps the pragma only once (one page), executescript() runs it to the end
+            connection.connection.dbapi_connection.executescript("PRAGMA incremental_vacuum")
+        report.freed_pages = max(0, pages_before - _pragma(connection, "page_count"))
+        report.auto_vacuum = AUTO_VACUUM_MODES.get(mode, str(mode))
+        report.timings["vacuum"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        connection.exec_driver_sql(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        connection.exec_driver_sql("ANALYZE")
+        connection.exec_driver_sql("PRAGMA optimize")
+        report.timings["analyze"] = time.perf_counter() - started
+    return report
+
+
+def run_maintenance(full_vacuum: bool = False, now: Optional[datetime] = None,
+                    archive_dir: Optional[Path] = None) -> MaintenanceReport:
+    """
+    Runs retention/archival, vacuum and ANALYZE and records the time of the run.
+
+    Args:
+        full_vacuum: Rebuild the file with VACUUM instead of the incremental vacuum
+        now: Reference time for the retention (default: now)
+        archive_dir: Directory for the archives (default: next to the database)
+
+    Returns:
+        MaintenanceReport: Sizes, removed messages, archives and timings
+    """
+    now = now or datetime.now()
+    engine = create_db_engine()
+    report = MaintenanceReport(size_before=_database_size(engine))
+
+    started = time.perf_counter()
+    apply_retention(now, archive_dir, report)
+    report.timings["retention"] = time.perf_counter() - started
+
+    compact_database(full_vacuum, report, engine)
+    report.size_after = _database_size(engine)
+    _store_last_run(now)
+    engine.dispose()
+    return report
+
+
+def _store_last_run(now: datetime) -> None:
+    def _store(db):
+        value = now.isoformat(timespec="seconds")
+        if get_setting_by_key(db, LAST_MAINTENANCE_KEY):
+            update_setting(db, LAST_MAINTENANCE_KEY, value=value)
+        else:
+            create_setting(db, LAST_MAINTENANCE_KEY, value)
+
+    try:
+        _with_session(_store)
+    finally:
+        invalidate_settings()
+
+
+def is_maintenance_due(now: Optional[datetime] = None) -> bool:
+    """Checks whether the background maintenance interval has passed since the last run."""
+    values = settings_resolver.values(GLOBAL_SCOPE_ID)
+    try:
+        hours = float(values.get(MAINTENANCE_INTERVAL_KEY, DEFAULT_MAINTENANCE_INTERVAL_HOURS))
+    except ValueError:
+        hours = DEFAULT_MAINTENANCE_INTERVAL_HOURS
+    if hours <= 0:
+        return False
+    try:
+        last_run = datetime.fromisoformat(values.get(LAST_MAINTENANCE_KEY, ""))
+    except ValueError:
+        return True
+    return (now or datetime.now()) - last_run >= timedelta(hours=hours)
+
+
+def run_scheduled_maintenance() -> Optional[MaintenanceReport]:
+    """
+    Runs the maintenance if it is due (background task of the TUI, runs in the DB thread).
+
+    Returns:
+        Optional[MaintenanceReport]: The report, or None if nothing was due
+    """
+    if not is_maintenance_due():
+        return None
+    return run_maintenance()
+
+
+def format_size(size: int) -> str:
+    """Formats a byte count for reports (e.g. '1.5 MB')."""
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
@@ -0,0 +1,190 @@
+from statistics import median
+from typing import List, Optional, Dict, Any, TypeVar, Callable
+from ocht.core.db import get_session, submit_to_db_thread
+from ocht.core.models import RequestMetric
+from ocht.adapters.instrumentation import RequestSpan, metrics_recorder
+from ocht.repositories.request_metric import create_request_metric, get_recent_request_metrics
+from ocht.services.settings_resolver import settings_resolver
+
+T = TypeVar('T')
+
+METRICS_PERSIST_KEY = "metrics_persist"
+
+
+def _with_session(func: Callable) -> T:
+    """Helper function to execute database operations with session."""
+    with get_session() as db:
+        return func(db)
+
+
+def _to_ms(seconds: Optional[float]) -> Optional[float]:
+    """Converts seconds to milliseconds, keeping None."""
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+def _ns_to_ms(nanoseconds: Optional[int]) -> Optional[float]:
+    """Converts the nanosecond durations reported by Ollama to milliseconds, keeping None."""
+    return nanoseconds / 1e6 if nanoseconds else None
+
+
+def span_to_metric(span: RequestSpan) -> RequestMetric:
+    """Converts an in-memory RequestSpan into a RequestMetric row."""
+    return RequestMetric(
+        metric_created_at=span.started_at,
+        metric_provider_name=span.provider_name,
+        metric_model_name=span.model_name,
+        metric_method=span.method,
+        metric_context_ms=_to_ms(span.context_seconds),
+        metric_summary_ms=_to_ms(span.summary_seconds),
+        metric_ttft_ms=_to_ms(span.ttft_seconds),
+        metric_total_ms=_to_ms(span.total_seconds),
+        metric_chunk_count=span.chunk_count,
+        metric_output_tokens=span.output_tokens,
+        metric_tokens_per_second=span.tokens_per_second,
+        metric_prompt_eval_count=span.prompt_eval_count,
+        metric_prompt_eval_duration_ms=_ns_to_ms(span.prompt_eval_duration_ns),
+        metric_eval_count=span.eval_count,
+        metric_eval_duration_ms=_ns_to_ms(span.eval_duration_ns),
+        metric_error=span.error,
+    )
+
+
+def persist_request_span(span: RequestSpan) -> RequestMetric:
+    """
+    Persists a request span to the metrics table.
+
+    Args:
+        span: The finished request span
+
+    Returns:
+        RequestMetric: The stored metric entry
+    """
+    metric = span_to_metric(span)
+    return _with_session(lambda db: create_request_metric(db, metric))
+
+
+def _persist_in_background(span: RequestSpan) -> None:
+    """Recorder listener that hands the span to the DB thread, so persisting never blocks the event loop."""
+    submit_to_db_thread(persist_request_span, span)
+
+
+def persist_spans_in_background(spans: List[RequestSpan]) -> None:
+    """
+    Persists the spans of an explicit benchmark (e.g. /compare), even if 'metrics_persist' is off.
+
+    Spans are skipped if persistence is enabled, because the recorder listener already stored them.
+    """
+    if metrics_recorder.has_listener(_persist_in_background):
+        return
+    for span in spans:
+        submit_to_db_thread(persist_request_span, span)
+
+
+def set_metrics_persistence(enabled: bool) -> None:
+    """Enables or disables persisting recorded spans to the database."""
+    if enabled:
+        metrics_recorder.add_listener(_persist_in_background)
+    else:
+        metrics_recorder.remove_listener(_persist_in_background)
+
+
+def configure_metrics_persistence() -> bool:
+    """
+    Enables persistence if the 'metrics_persist' setting is true.
+
+    Returns:
+        bool: True if persistence is enabled
+    """
+    enabled = settings_resolver.get_bool(METRICS_PERSIST_KEY)
+    set_metrics_persistence(enabled)
+    return enabled
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of the given values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregates metric rows (dicts with ttft_ms, total_ms, ... keys)."""
+    def _values(key: str) -> List[float]:
+        return [row[key] for row in rows if row.get(key) is not None]
+
+    ttft = _values("ttft_ms")
+    total = _values("total_ms")
+    tps = _values("tokens_per_second")
+    context = _values("context_ms")
+    summary = _values("summary_ms")
+    prompt_eval = _values("prompt_eval_ms")
+    return {
+        'requests': len(rows),
+        'errors': sum(1 for row in rows if row.get("error")),
+        'ttft_ms_p50': median(ttft) if ttft else None,
+        'ttft_ms_p95': _percentile(ttft, 0.95),
+        'total_ms_p50': median(total) if total else None,
+        'total_ms_p95': _percentile(total, 0.95),
+        'tokens_per_second_avg': sum(tps) / len(tps) if tps else None,
+        'context_ms_avg': sum(context) / len(context) if context else None,
+        'prompt_eval_ms_p50': median(prompt_eval) if prompt_eval else None,
+        'summary_ms_total': sum(summary) if summary else None,
+        'output_tokens_total': sum(row.get("output_tokens") or 0 for row in rows),
+    }
+
+
+def get_metrics_summary(limit: int = 500, model_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Gets aggregated metrics per model from the persisted metrics table.
+
+    Args:
+        limit: Number of most recent requests to aggregate
+        model_name: Optional model filter
+
+    Returns:
+        Dict: Model name -> aggregated metrics
+    """
+    def _get_summary(db):
+        metrics = get_recent_request_metrics(db, limit=limit, model_name=model_name)
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for metric in metrics:
+            grouped.setdefault(metric.metric_model_name or "unknown", []).append({
+                'ttft_ms': metric.metric_ttft_ms,
+                'total_ms': metric.metric_total_ms,
+                'tokens_per_second': metric.metric_tokens_per_second,
+                'context_ms': metric.metric_context_ms,
+                'summary_ms': metric.metric_summary_ms,
+                'prompt_eval_ms': metric.metric_prompt_eval_duration_ms,
+                'output_tokens': metric.metric_output_tokens,
+                'error': metric.metric_error,
+            })
+        return {name: _summarize(rows) for name, rows in grouped.items()}
+
+    return _with_session(_get_summary)
+
+
+def get_live_metrics_summary(limit: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Gets aggregated metrics per model from the in-memory ring buffer.
+
+    Args:
+        limit: Number of most recent spans to aggregate (None for all)
+
+    Returns:
+        Dict: Model name -> aggregated metrics
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for span in metrics_recorder.recent(limit):
+        grouped.setdefault(span.model_name or "unknown", []).append({
+            'ttft_ms': _to_ms(span.ttft_seconds),
+            'total_ms': _to_ms(span.total_seconds),
+            'tokens_per_second': span.tokens_per_second,
+            'context_ms': _to_ms(span.context_seconds),
+            'summary_ms': _to_ms(span.summary_seconds),
+            'prompt_eval_ms': _ns_to_ms(span.prompt_eval_duration_ns),
+            'output_tokens': span.output_tokens,
+            'error': span.error,
+        })
+    return {name: _summarize(rows) for name, rows in grouped.items()}
@@ -0,0 +1,252 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import ollama
+
+from ocht.adapters.http_client import get_async_client
+from ocht.core.db import run_in_db_thread
+from ocht.services.model_manager import prepare_model_download, mark_model_available
+
+# Download states
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+STATE_CANCELLED = "cancelled"
+FINISHED_STATES = (STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+
+DEFAULT_MAX_CONCURRENT = 2
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_DELAY = 2.0  # Seconds, doubled per attempt
+
+
+@dataclass
+class LayerProgress:
+    """Progress of one layer (blob) of a model download."""
+    digest: str
+    completed: int = 0
+    total: int = 0
+
+
+@dataclass
+class DownloadProgress:
+    """Progress of a model download, aggregated over all layers."""
+    model_name: str
+    state: str = STATE_QUEUED
+    status: str = ""  # Last status message from Ollama (e.g. "pulling manifest")
+    layers: Dict[str, LayerProgress] = field(default_factory=dict)
+    attempts: int = 0
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def completed(self) -> int:
+        return sum(layer.completed for layer in self.layers.values())
+
+    @property
+    def total(self) -> int:
+        return sum(layer.total for layer in self.layers.values())
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Completed fraction (0..1) or None while the size is unknown."""
+        total = self.total
+        if not total:
+            return None
+        return min(1.0, self.completed / total)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+
+PullFunction = Callable[[str, str], AsyncIterator[Any]]
+ProgressListener = Callable[[DownloadProgress], None]
+
+
+async def _ollama_pull(endpoint: str, model_name: str) -> AsyncIterator[Any]:
+    """
+    Streams progress updates from Ollama's /api/pull endpoint.
+
+    Uses the pooled HTTP client of the running loop instead of an
+    ollama.AsyncClient per download, which would leave its connection pool open.
+
+    Raises:
+        ollama.ResponseError: If Ollama rejects the pull (unknown model, ...)
+    """
+    base_url = endpoint.rstrip("/")
+    client = get_async_client(base_url)
+    async with client.stream("POST", f"{base_url}/api/pull", json={"model": model_name, "stream": True}) as response:
+        if response.status_code >= 400:
+            await response.aread()
+            try:
+                detail = response.json().get("error") or response.text
+            except ValueError:
+                detail = response.text
+            raise ollama.ResponseError(detail, response.status_code)
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event.get("error"):
+                raise ollama.ResponseError(event["error"])
+            yield ollama.ProgressResponse(**event)
+
+
+class ModelDownloadManager:
+    """
+    Runs Ollama model downloads as asyncio tasks without blocking the TUI.
+
+    Downloads stream per-layer progress from the pull API, can be cancelled,
+    run concurrently (limited by ``max_concurrent``) and retry with backoff
+    after interruptions. Retries resume where they stopped because Ollama
+    keeps already downloaded layers. On success the model is marked
+    available in the database (via the DB thread).
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_retries: int = DEFAULT_MAX_RETRIES,
+                 retry_delay: float = DEFAULT_RETRY_DELAY, pull: Optional[PullFunction] = None):
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._pull = pull or _ollama_pull
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, DownloadProgress] = {}
+        self._listeners: List[ProgressListener] = []
+
+    def start(self, model_name: str) -> asyncio.Task:
+        """
+        Starts (or joins) the download of a model.
+
+        Must be called from a running event loop. A running download of the
+        same model is reused instead of starting a second one.
+
+        Args:
+            model_name: Name of the model to download
+
+        Returns:
+            asyncio.Task: Task resolving to the final DownloadProgress
+        """
+        task = self._tasks.get(model_name)
+        if task and not task.done():
+            return task
+
+        self._progress[model_name] = DownloadProgress(model_name=model_name)
+        task = asyncio.get_running_loop().create_task(self._run(model_name))
+        self._tasks[model_name] = task
+        task.add_done_callback(lambda done: self._forget_task(model_name, done))
+        return task
+
+    async def download(self, model_name: str) -> DownloadProgress:
+        """Starts a download and waits for it to finish."""
+        return await asyncio.shield(self.start(model_name))
+
+    def cancel(self, model_name: str) -> bool:
+        """
+        Cancels a running or queued download.
+
+        Returns:
+            bool: True if a download was cancelled
+        """
+        task = self._tasks.get(model_name)
+        if not task or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def get_progress(self, model_name: str) -> Optional[DownloadProgress]:
+        """Returns the progress of the last download of a model."""
+        return self._progress.get(model_name)
+
+    def active_downloads(self) -> List[DownloadProgress]:
+        """Returns all queued or running downloads."""
+        return [progress for progress in self._progress.values() if not progress.is_finished]
+
+    def all_downloads(self) -> List[DownloadProgress]:
+        """Returns all downloads of this session, including finished ones."""
+        return list(self._progress.values())
+
+    def clear_finished(self) -> None:
+        """Forgets finished downloads."""
+        self._progress = {name: p for name, p in self._progress.items() if not p.is_finished}
+
+    def add_listener(self, listener: ProgressListener) -> None:
+        """Registers a callback for state changes (queued, running, done, failed, cancelled)."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: ProgressListener) -> None:
+        """Unregisters a callback."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _forget_task(self, model_name: str, task: asyncio.Task) -> None:
+        if self._tasks.get(model_name) is task:
+            del self._tasks[model_name]
+
+    def _set_state(self, progress: DownloadProgress, state: str, error: Optional[str] = None) -> None:
+        progress.state = state
+        progress.error = error
+        if state in FINISHED_STATES:
+            progress.finished_at = time.monotonic()
+        for listener in list(self._listeners):
+            try:
+                listener(progress)
+            except Exception:
+                pass
+
+    async def _run(self, model_name: str) -> DownloadProgress:
+        progress = self._progress[model_name]
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        try:
+            download = await run_in_db_thread(prepare_model_download, model_name)
+            async with self._semaphore:
+                self._set_state(progress, STATE_RUNNING)
+                await self._pull_with_retries(download['endpoint'], download['model_name'], progress)
+            await run_in_db_thread(mark_model_available, download['model_name'])
+            self._set_state(progress, STATE_DONE)
+        except asyncio.CancelledError:
+            self._set_state(progress, STATE_CANCELLED)
+            raise
+        except Exception as e:
+            self._set_state(progress, STATE_FAILED, str(e) or type(e).__name__)
+        return progress
+
+    async def _pull_with_retries(self, endpoint: str, model_name: str, progress: DownloadProgress) -> None:
+        while True:
+            progress.attempts += 1
+            try:
+                async for update in self._pull(endpoint, model_name):
+                    self._apply_update(progress, update)
+                return
+            except ollama.ResponseError:
+                # Server-side errors (unknown model, ...) do not get better with retries
+                raise
+            except Exception:
+                if progress.attempts > self.max_retries:
+                    raise
+                progress.status = f"retrying ({progress.attempts}/{self.max_retries})"
+                await asyncio.sleep(self.retry_delay * 2 ** (progress.attempts - 1))
+
+    @staticmethod
+    def _apply_update(progress: DownloadProgress, update: Any) -> None:
+        status = getattr(update, "status", None)
+        if status:
+            progress.status = status
+        digest = getattr(update, "digest", None)
+        if digest:
+            layer = progress.layers.get(digest)
+            if layer is None:
+                layer = progress.layers[digest] = LayerProgress(digest=digest)
+            layer.total = getattr(update, "total", None) or layer.total
+            layer.completed = getattr(update, "completed", None) or layer.completed
+
+
+# Global instance
+model_download_manager = ModelDownloadManager()
@@ -1,19 +1,20 @@
+import ollama
 import requests
-import subprocess
 from datetime import datetime
-from typing import List, Optional, Dict, Any, TypeVar, Callable
-from sqlmodel import select
+from typing import List, Optional, Dict, Any, Tuple, TypeVar, Callable
 from ocht.core.db import get_session
 from ocht.repositories.model import (
-    get_all_models,
     create_model,
     get_model_by_name,
     update_model,
     delete_model,
-    get_models_by_provider
+    get_models_by_provider,
+    get_all_models,
+    count_models
 )
 from ocht.repositories.llm_provider_config import get_all_llm_provider_configs, get_llm_provider_config_by_id
 from ocht.core.models import Model, LLMProviderConfig
+from ocht.services.cache import get_cached_models, get_cached_providers, invalidate_models
 
 T = TypeVar('T')
 
@@ -28,6 +29,14 @@ def _with_session(func: Callable) -> T:
         return func(db)
 
 
+def _write_with_session(func: Callable) -> T:
+    """Helper function to execute write operations with session and invalidate the cached models."""
+    try:
+        return _with_session(func)
+    finally:
+        invalidate_models()
+
+
 def _validate_model_name(name: str) -> str:
     """Validates and normalizes model name."""
     if not name or not name.strip():
@@ -64,7 +73,7 @@ def _ensure_provider_exists(db, provider_id: int) -> LLMProviderConfig:
 
 def list_llm_models() -> List[Model]:
     """Reads available models from DB/Cache and returns them."""
-    return _with_session(get_all_models)
+    return get_cached_models()
 
 
 def get_models_with_provider_info() -> List[Dict[str, Any]]:
@@ -73,23 +82,47 @@ def get_models_with_provider_info() -> List[Dict[str, Any]]:
     Returns:
         List[Dict]: List of dictionaries with model and provider information
     """
+    # Create provider lookup dictionary
+    provider_lookup = {provider.prov_id: provider.prov_name for provider in get_cached_providers()}
 
-    def _get_models_info(db):
-        models = get_all_models(db)
-        providers = get_all_llm_provider_configs(db)
+    return [
+        {
+            'model': model,
+            'provider_name': provider_lookup.get(model.model_provider_id, f"ID: {model.model_provider_id}")
+        }
+        for model in get_cached_models()
+    ]
+
+
+def get_models_page(offset: int = 0, limit: int = 100,
+                    name_filter: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Gets one page of models with provider information, read from the database.
 
-        # Create provider lookup dictionary
-        provider_lookup = {provider.prov_id: provider.prov_name for provider in providers}
+    Used by the model manager to page and filter large model lists without
+    loading the whole table.
 
-        return [
-            {
-                'model': model,
-                'provider_name': provider_lookup.get(model.model_provider_id, f"ID: {model.model_provider_id}")
-            }
-            for model in models
-        ]
+    Args:
+        offset: Number of matching models to skip
+        limit: Maximum number of models to return
+        name_filter: Optional text the model name must contain (case-insensitive)
 
-    return _with_session(_get_models_info)
+    Returns:
+        Tuple[List[Dict], int]: Models with provider information and the total number of matches
+    """
+    def _get_page(db):
+        models = get_all_models(db, limit=limit, offset=offset, name_filter=name_filter)
+        return models, count_models(db, name_filter=name_filter)
+
+    models, total = _with_session(_get_page)
+    provider_lookup = {provider.prov_id: provider.prov_name for provider in get_cached_providers()}
+    return [
+        {
+            'model': model,
+            'provider_name': provider_lookup.get(model.model_provider_id, f"ID: {model.model_provider_id}")
+        }
+        for model in models
+    ], total
 
 
 def get_unavailable_models() -> List[Model]:
@@ -99,11 +132,7 @@ def get_unavailable_models() -> List[Model]:
     Returns:
         List[Model]: List of unavailable models
     """
-    def _get_unavailable(db):
-        statement = select(Model).where(Model.is_available == False)
-        return db.exec(statement).all()
-    
-    return _with_session(_get_unavailable)
+    return [model for model in get_cached_models() if not model.is_available]
 
 
 def create_model_with_validation(name: str, provider_id: int, description: Optional[str] = None,
@@ -136,7 +165,7 @@ def create_model_with_validation(name: str, provider_id: int, description: Optio
             model_params=params
         )
 
-    return _with_session(_create_model)
+    return _write_with_session(_create_model)
 
 
 def update_model_with_validation(old_name: str, new_name: Optional[str] = None,
@@ -181,7 +210,7 @@ def update_model_with_validation(old_name: str, new_name: Optional[str] = None,
             model_params=params
         )
 
-    return _with_session(_update_model)
+    return _write_with_session(_update_model)
 
 
 def delete_model_with_checks(model_name: str) -> bool:
@@ -202,7 +231,7 @@ def delete_model_with_checks(model_name: str) -> bool:
         # For now, we just delete it
         return delete_model(db, validated_name)
 
-    return _with_session(_delete_model)
+    return _write_with_session(_delete_model)
 
 
 # ============================================================================
@@ -225,79 +254,119 @@ def sync_llm_models() -> dict:
                 results['total_processed'] += ollama_result['added'] + ollama_result['skipped']
         return results
 
-    return _with_session(_sync_models)
+    return _write_with_session(_sync_models)
 
 
-def restore_model(model_name: str) -> Dict[str, Any]:
+def prepare_model_download(model_name: str) -> Dict[str, Any]:
     """
-    Restores a deleted Ollama model by downloading it via ollama pull.
-    
+    Validates that a model can be downloaded from Ollama.
+
     Args:
-        model_name: Name of the model to restore
-        
+        model_name: Name of the model to download
+
     Returns:
-        Dict: Result with success status and message
-        
+        Dict: 'model_name', 'endpoint' (Ollama base URL) and 'is_available'
+
     Raises:
         ValueError: If model not found or not an Ollama model
-        RuntimeError: If download fails
     """
     validated_name = _validate_model_name(model_name)
-    
-    def _restore_model(db):
+
+    def _prepare_download(db):
         # Ensure model exists in DB
         model = _ensure_model_exists(db, validated_name)
-        
+
         # Get provider info
         provider = _ensure_provider_exists(db, model.model_provider_id)
-        
+
         # Only support Ollama models for now
         if provider.prov_name.lower() != 'ollama':
-            raise ValueError(f"Model restoration only supported for Ollama models, not {provider.prov_name}")
-        
-        # Check if model is already available
-        if model.is_available:
-            return {
-                'success': True,
-                'message': f"Model '{model_name}' is already available",
-                'action': 'none'
-            }
-        
-        try:
-            # Execute ollama pull command
-            result = subprocess.run(
-                ['ollama', 'pull', validated_name],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-            
-            if result.returncode == 0:
-                # Update model as available
-                update_model(
-                    db=db,
-                    model_name=validated_name,
-                    is_available=True,
-                    last_checked=datetime.now()
-                )
-                
-                return {
-                    'success': True,
-                    'message': f"Model '{model_name}' successfully restored",
-                    'action': 'downloaded',
-                    'output': result.stdout
-                }
-            else:
-                raise RuntimeError(f"Ollama pull failed: {result.stderr}")
-                
-        except subprocess.TimeoutExpired:
-            raise RuntimeError(f"Model download timed out after 5 minutes")
-        except FileNotFoundError:
-            raise RuntimeError("Ollama command not found. Please ensure Ollama is installed and in PATH")
-        except Exception as e:
-            raise RuntimeError(f"Failed to restore model: {str(e)}")
-    
-    return _with_session(_restore_model)
+            raise ValueError(f"Model download only supported for Ollama models, not {provider.prov_name}")
+
+        return {
+            'model_name': validated_name,
+            'endpoint': provider.prov_endpoint or "http://localhost:11434",
+            'is_available': model.is_available
+        }
+
+    return _with_session(_prepare_download)
+
+
+def mark_model_available(model_name: str, is_available: bool = True) -> Optional[Model]:
+    """
+    Updates the availability status of a model after a download.
+
+    Args:
+        model_name: Name of the model
+        is_available: New availability status
+
+    Returns:
+        Optional[Model]: The updated model or None if not found
+    """
+    def _mark_available(db):
+        return update_model(
+            db=db,
+            model_name=model_name,
+            is_available=is_available,
+            last_checked=datetime.now()
+        )
+
+    return _write_with_session(_mark_available)
+
+
+def restore_model(model_name: str,
+                  on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Restores a deleted Ollama model by downloading it via the streaming pull API.
+
+    Blocks until the download finished; the TUI uses the non-blocking
+    ModelDownloadManager instead. Interrupted downloads resume on the next
+    call because Ollama keeps already downloaded layers.
+
+    Args:
+        model_name: Name of the model to restore
+        on_progress: Optional callback receiving each progress update
+            ('status', 'digest', 'completed', 'total')
+
+    Returns:
+        Dict: Result with success status and message
+
+    Raises:
+        ValueError: If model not found or not an Ollama model
+        RuntimeError: If download fails
+    """
+    download = prepare_model_download(model_name)
+
+    # Check if model is already available
+    if download['is_available']:
+        return {
+            'success': True,
+            'message': f"Model '{model_name}' is already available",
+            'action': 'none'
+        }
+
+    try:
+        client = ollama.Client(host=download['endpoint'])
+        last_status = ""
+        for progress in client.pull(download['model_name'], stream=True):
+            last_status = progress.status or last_status
+            if on_progress:
+                on_progress({
+                    'status': progress.status,
+                    'digest': progress.digest,
+                    'completed': progress.completed,
+                    'total': progress.total
+                })
+    except Exception as e:
+        raise RuntimeError(f"Failed to restore model: {str(e)}")
+
+    mark_model_available(download['model_name'])
+    return {
+        'success': True,
+        'message': f"Model '{model_name}' successfully restored",
+        'action': 'downloaded',
+        'output': last_status
+    }
 
 
 # ============================================================================
@@ -1,13 +1,16 @@
-from typing import List, Optional, Dict, Any, TypeVar, Callable
+from typing import List, Optional, Dict, Any, Tuple, TypeVar, Callable
 from ocht.core.db import get_session
 from ocht.repositories.llm_provider_config import (
     get_all_llm_provider_configs,
     create_llm_provider_config,
     update_llm_provider_config,
     delete_llm_provider_config,
-    get_llm_provider_config_by_id
+    get_llm_provider_config_by_id,
+    get_llm_provider_config_by_name,
+    count_llm_provider_configs
 )
 from ocht.core.models import LLMProviderConfig
+from ocht.services.cache import get_cached_providers, invalidate_providers
 
 T = TypeVar('T')
 
@@ -18,6 +21,14 @@ def _with_session(func: Callable) -> T:
         return func(db)
 
 
+def _write_with_session(func: Callable) -> T:
+    """Helper function to execute write operations with session and invalidate the cached providers."""
+    try:
+        return _with_session(func)
+    finally:
+        invalidate_providers()
+
+
 def _validate_provider_name(name: str) -> str:
     """Validates and normalizes provider name."""
     if not name or not name.strip():
@@ -26,12 +37,10 @@ def _validate_provider_name(name: str) -> str:
 
 
 def _check_provider_name_uniqueness(db, name: str, exclude_id: Optional[int] = None) -> None:
-    """Checks if provider name is unique."""
-    existing_providers = get_all_llm_provider_configs(db)
-    for provider in existing_providers:
-        if (provider.prov_name.lower() == name.lower() and
-                provider.prov_id != exclude_id):
-            raise ValueError(f"Provider '{name}' already exists")
+    """Checks if provider name is unique (case-insensitive, indexed lookup)."""
+    existing_provider = get_llm_provider_config_by_name(db, name)
+    if existing_provider and existing_provider.prov_id != exclude_id:
+        raise ValueError(f"Provider '{name}' already exists")
 
 
 def _ensure_provider_exists(db, provider_id: int) -> LLMProviderConfig:
@@ -48,7 +57,7 @@ def get_available_providers() -> List[LLMProviderConfig]:
     Returns:
         List[LLMProviderConfig]: List of available providers
     """
-    return _with_session(get_all_llm_provider_configs)
+    return get_cached_providers()
 
 
 def get_providers_with_info() -> List[Dict[str, Any]]:
@@ -57,19 +66,41 @@ def get_providers_with_info() -> List[Dict[str, Any]]:
     Returns:
         List[Dict]: List of dictionaries with provider information
     """
+    return [
+        {
+            'provider': provider,
+            'model_count': 0,  # Could be extended to show actual model count
+            'status': 'active' if provider.prov_api_key else 'inactive'
+        }
+        for provider in get_cached_providers()
+    ]
+
+
+def get_providers_page(offset: int = 0, limit: int = 100,
+                       name_filter: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Gets one page of providers with additional information, read from the database.
 
-    def _get_providers_info(db):
-        providers = get_all_llm_provider_configs(db)
+    Args:
+        offset: Number of matching providers to skip
+        limit: Maximum number of providers to return
+        name_filter: Optional text the provider name must contain (case-insensitive)
+
+    Returns:
+        Tuple[List[Dict], int]: Provider information and the total number of matches
+    """
+    def _get_page(db):
+        providers = get_all_llm_provider_configs(db, limit=limit, offset=offset, name_filter=name_filter)
         return [
             {
                 'provider': provider,
-                'model_count': 0,  # Could be extended to show actual model count
+                'model_count': 0,
                 'status': 'active' if provider.prov_api_key else 'inactive'
             }
             for provider in providers
-        ]
+        ], count_llm_provider_configs(db, name_filter=name_filter)
 
-    return _with_session(_get_providers_info)
+    return _with_session(_get_page)
 
 
 def create_provider_with_validation(name: str, api_key: Optional[str] = None,
@@ -99,7 +130,7 @@ def create_provider_with_validation(name: str, api_key: Optional[str] = None,
             default_model=default_model
         )
 
-    return _with_session(_create_provider)
+    return _write_with_session(_create_provider)
 
 
 def update_provider_with_validation(provider_id: int, name: Optional[str] = None,
@@ -137,7 +168,7 @@ def update_provider_with_validation(provider_id: int, name: Optional[str] = None
             default_model=default_model
         )
 
-    return _with_session(_update_provider)
+    return _write_with_session(_update_provider)
 
 
 def delete_provider_with_checks(provider_id: int) -> bool:
@@ -155,4 +186,4 @@ def delete_provider_with_checks(provider_id: int) -> bool:
         _ensure_provider_exists(db, provider_id)
         return delete_llm_provider_config(db, provider_id)
 
-    return _with_session(_delete_provider)
\ No newline at end of file
+    return _write_with_session(_delete_provider)
\ No newline at end of file
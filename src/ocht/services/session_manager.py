@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.streaming import StreamController
+
+
+@dataclass
+class ChatSession:
+    """
+    One independent chat: its own adapter (and therefore memory) and workspace.
+
+    Attributes:
+        session_id: Number of the session, unique while the app runs
+        adapter: Adapter of the session, None until a model is selected
+        provider_id: Provider of the adapter
+        model_name: Model of the adapter
+        workspace_id: Workspace the conversation is stored in (None: not stored)
+        busy: True while a response is being generated
+        stream: Controller of the response currently streaming (stops it early), None otherwise
+    """
+    session_id: int
+    adapter: Optional[LLMAdapter] = None
+    provider_id: Optional[int] = None
+    model_name: Optional[str] = None
+    workspace_id: Optional[int] = None
+    busy: bool = False
+    stream: Optional[StreamController] = None
+
+    @property
+    def provider_name(self) -> Optional[str]:
+        return getattr(self.adapter, "provider_name", None)
+
+    @property
+    def title(self) -> str:
+        return f"{self.session_id}: {self.model_name or 'Chat'}"
+
+
+class SessionManager:
+    """
+    Service for running several chat sessions side by side.
+
+    Sessions never share an adapter, so a response streaming in one session
+    does not block or change the conversation of another one.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[int, ChatSession] = {}
+        self._next_id = 1
+        self._active_id: Optional[int] = None
+
+    def create_session(self, adapter: Optional[LLMAdapter] = None, provider_id: Optional[int] = None,
+                       model_name: Optional[str] = None, workspace_id: Optional[int] = None) -> ChatSession:
+        """
+        Creates a session and makes it the active one.
+
+        Args:
+            adapter: Adapter of the session; must not be shared with another session
+                (see AdapterManager.build_adapter)
+            provider_id: Provider of the adapter
+            model_name: Model of the adapter
+            workspace_id: Workspace to store the conversation in (optional)
+
+        Returns:
+            ChatSession: The new session
+        """
+        session = ChatSession(session_id=self._next_id, adapter=adapter, provider_id=provider_id,
+                              model_name=model_name, workspace_id=workspace_id)
+        self._next_id += 1
+        self._sessions[session.session_id] = session
+        self._active_id = session.session_id
+        return session
+
+    def set_adapter(self, session_id: int, adapter: Optional[LLMAdapter],
+                    provider_id: Optional[int] = None, model_name: Optional[str] = None) -> ChatSession:
+        """Assigns an existing adapter (e.g. the one restored from the settings) to a session."""
+        session = self._ensure_session(session_id)
+        session.adapter, session.provider_id, session.model_name = adapter, provider_id, model_name
+        return session
+
+    def close_session(self, session_id: int) -> Optional[ChatSession]:
+        """
+        Removes a session. If it was active, the most recent remaining session becomes active.
+
+        Returns:
+            Optional[ChatSession]: The new active session, or None if no session is left
+        """
+        self._ensure_session(session_id)
+        del self._sessions[session_id]
+        if self._active_id == session_id:
+            self._active_id = max(self._sessions) if self._sessions else None
+        return self.active_session
+
+    def get_session(self, session_id: int) -> Optional[ChatSession]:
+        return self._sessions.get(session_id)
+
+    def list_sessions(self) -> List[ChatSession]:
+        """Returns all sessions in creation order."""
+        return list(self._sessions.values())
+
+    @property
+    def active_session(self) -> Optional[ChatSession]:
+        return self._sessions.get(self._active_id) if self._active_id is not None else None
+
+    def set_active(self, session_id: int) -> ChatSession:
+        """Makes a session the active one (the one receiving input)."""
+        session = self._ensure_session(session_id)
+        self._active_id = session_id
+        return session
+
+    def _ensure_session(self, session_id: int) -> ChatSession:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+        return session
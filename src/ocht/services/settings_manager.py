@@ -1,13 +1,16 @@
-from typing import List, Optional, Dict, Any, TypeVar, Callable
+from typing import List, Optional, Dict, Any, Tuple, TypeVar, Callable
 from ocht.core.db import get_session
 from ocht.repositories.setting import (
-    get_all_settings,
     create_setting,
     update_setting,
     delete_setting,
-    get_setting_by_key
+    get_setting_by_key,
+    get_settings_by_workspace,
+    get_all_settings,
+    count_settings
 )
-from ocht.core.models import Setting
+from ocht.core.models import GLOBAL_SCOPE_ID, Setting
+from ocht.services.cache import get_cached_setting, get_cached_settings, invalidate_settings
 
 T = TypeVar('T')
 
@@ -18,6 +21,14 @@ def _with_session(func: Callable) -> T:
         return func(db)
 
 
+def _write_with_session(func: Callable) -> T:
+    """Helper function to execute write operations with session and invalidate the cached settings."""
+    try:
+        return _with_session(func)
+    finally:
+        invalidate_settings()
+
+
 def _validate_setting_key(key: str) -> str:
     """Validates and normalizes setting key."""
     if not key or not key.strip():
@@ -32,21 +43,32 @@ def _validate_setting_value(value: str) -> str:
     return value.strip()
 
 
-def _check_setting_key_uniqueness(db, key: str, exclude_key: Optional[str] = None) -> None:
-    """Checks if setting key is unique."""
-    existing_setting = get_setting_by_key(db, key)
+def _check_setting_key_uniqueness(db, key: str, exclude_key: Optional[str] = None,
+                                  workspace_id: int = GLOBAL_SCOPE_ID) -> None:
+    """Checks if setting key is unique within its scope."""
+    existing_setting = get_setting_by_key(db, key, workspace_id)
     if existing_setting and key != exclude_key:
         raise ValueError(f"Setting with key '{key}' already exists")
 
 
-def _ensure_setting_exists(db, key: str) -> Setting:
+def _ensure_setting_exists(db, key: str, workspace_id: int = GLOBAL_SCOPE_ID) -> Setting:
     """Ensures setting exists and returns it."""
-    setting = get_setting_by_key(db, key)
+    setting = get_setting_by_key(db, key, workspace_id)
     if not setting:
         raise ValueError(f"Setting with key '{key}' not found")
     return setting
 
 
+def _setting_info(setting: Setting) -> Dict[str, Any]:
+    """Builds the UI information for a setting."""
+    return {
+        'setting': setting,
+        'workspace_scoped': setting.setting_workspace_id != GLOBAL_SCOPE_ID,
+        'key_length': len(setting.setting_key),
+        'value_length': len(setting.setting_value)
+    }
+
+
 def get_all_settings_with_info() -> List[Dict[str, Any]]:
     """
     Gets all settings with additional information for UI display.
@@ -54,43 +76,44 @@ def get_all_settings_with_info() -> List[Dict[str, Any]]:
     Returns:
         List[Dict]: List of dictionaries with setting information
     """
-    def _get_settings_info(db):
-        settings = get_all_settings(db)
-        return [
-            {
-                'setting': setting,
-                'workspace_scoped': setting.setting_workspace_id is not None,
-                'key_length': len(setting.setting_key),
-                'value_length': len(setting.setting_value)
-            }
-            for setting in settings
-        ]
-    
-    return _with_session(_get_settings_info)
+    return [_setting_info(setting) for setting in get_cached_settings()]
+
+
+def get_settings_page(offset: int = 0, limit: int = 100,
+                      name_filter: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Gets one page of settings with additional information, read from the database.
 
+    Args:
+        offset: Number of matching settings to skip
+        limit: Maximum number of settings to return
+        name_filter: Optional text the setting key must contain (case-insensitive)
+
+    Returns:
+        Tuple[List[Dict], int]: Setting information and the total number of matches
+    """
+    def _get_page(db):
+        settings = get_all_settings(db, limit=limit, offset=offset, name_filter=name_filter)
+        return [_setting_info(setting) for setting in settings], count_settings(db, name_filter=name_filter)
+
+    return _with_session(_get_page)
 
-def get_setting_by_key_with_info(key: str) -> Optional[Dict[str, Any]]:
+
+def get_setting_by_key_with_info(key: str, workspace_id: int = GLOBAL_SCOPE_ID) -> Optional[Dict[str, Any]]:
     """
     Gets a specific setting by key with additional information.
     
     Args:
         key: Setting key to retrieve
+        workspace_id: Workspace of the setting (default: global)
         
     Returns:
         Dict with setting information or None if not found
     """
-    def _get_setting_info(db):
-        setting = get_setting_by_key(db, key)
-        if not setting:
-            return None
-        return {
-            'setting': setting,
-            'workspace_scoped': setting.setting_workspace_id is not None,
-            'key_length': len(setting.setting_key),
-            'value_length': len(setting.setting_value)
-        }
-    
-    return _with_session(_get_setting_info)
+    setting = get_cached_setting(key, workspace_id)
+    if not setting:
+        return None
+    return _setting_info(setting)
 
 
 def create_setting_with_validation(key: str, value: str, 
@@ -101,7 +124,7 @@ def create_setting_with_validation(key: str, value: str,
     Args:
         key: Setting key
         value: Setting value
-        workspace_id: Optional workspace ID for workspace-specific settings
+        workspace_id: Optional workspace ID for workspace-specific settings (None: global)
         
     Returns:
         Setting: The created setting
@@ -111,20 +134,23 @@ def create_setting_with_validation(key: str, value: str,
     """
     validated_key = _validate_setting_key(key)
     validated_value = _validate_setting_value(value)
+    scope_id = GLOBAL_SCOPE_ID if workspace_id is None else workspace_id
     
     def _create_setting(db):
-        _check_setting_key_uniqueness(db, validated_key)
+        _check_setting_key_uniqueness(db, validated_key, workspace_id=scope_id)
         return create_setting(
             db=db,
             key=validated_key,
-            value=validated_value
+            value=validated_value,
+            workspace_id=scope_id
         )
     
-    return _with_session(_create_setting)
+    return _write_with_session(_create_setting)
 
 
 def update_setting_with_validation(original_key: str, new_key: Optional[str] = None,
-                                 value: Optional[str] = None) -> Optional[Setting]:
+                                 value: Optional[str] = None,
+                                 workspace_id: int = GLOBAL_SCOPE_ID) -> Optional[Setting]:
     """
     Updates setting with business logic validation.
     
@@ -132,6 +158,7 @@ def update_setting_with_validation(original_key: str, new_key: Optional[str] = N
         original_key: Original setting key
         new_key: New key (optional, None means don't change)
         value: New value (optional, None means don't change)
+        workspace_id: Workspace of the setting (default: global)
         
     Returns:
         Optional[Setting]: The updated setting or None if not found
@@ -140,13 +167,13 @@ def update_setting_with_validation(original_key: str, new_key: Optional[str] = N
         ValueError: On validation errors
     """
     def _update_setting(db):
-        existing_setting = _ensure_setting_exists(db, original_key)
+        _ensure_setting_exists(db, original_key, workspace_id)
         
         validated_new_key = new_key
         if new_key:  # Only validate if new_key is provided (not None)
             validated_new_key = _validate_setting_key(new_key)
             if validated_new_key != original_key:
-                _check_setting_key_uniqueness(db, validated_new_key, original_key)
+                _check_setting_key_uniqueness(db, validated_new_key, original_key, workspace_id)
         
         validated_value = value
         if value:  # Only validate if value is provided (not None)
@@ -156,18 +183,20 @@ def update_setting_with_validation(original_key: str, new_key: Optional[str] = N
             db=db,
             setting_key=original_key,
             new_key=validated_new_key,
-            value=validated_value
+            value=validated_value,
+            workspace_id=workspace_id
         )
     
-    return _with_session(_update_setting)
+    return _write_with_session(_update_setting)
 
 
-def delete_setting_with_checks(key: str) -> bool:
+def delete_setting_with_checks(key: str, workspace_id: int = GLOBAL_SCOPE_ID) -> bool:
     """
     Deletes setting after business logic checks.
     
     Args:
         key: Key of the setting to delete
+        workspace_id: Workspace of the setting (default: global)
         
     Returns:
         bool: True if successfully deleted, False otherwise
@@ -176,10 +205,10 @@ def delete_setting_with_checks(key: str) -> bool:
         ValueError: On validation errors
     """
     def _delete_setting(db):
-        _ensure_setting_exists(db, key)
-        return delete_setting(db, key)
+        _ensure_setting_exists(db, key, workspace_id)
+        return delete_setting(db, key, workspace_id)
     
-    return _with_session(_delete_setting)
+    return _write_with_session(_delete_setting)
 
 
 def get_workspace_settings(workspace_id: int) -> List[Setting]:
@@ -192,11 +221,7 @@ def get_workspace_settings(workspace_id: int) -> List[Setting]:
     Returns:
         List[Setting]: List of workspace-specific settings
     """
-    def _get_workspace_settings(db):
-        all_settings = get_all_settings(db)
-        return [s for s in all_settings if s.setting_workspace_id == workspace_id]
-    
-    return _with_session(_get_workspace_settings)
+    return _with_session(lambda db: list(get_settings_by_workspace(db, workspace_id)))
 
 
 def get_global_settings() -> List[Setting]:
@@ -206,8 +231,4 @@ def get_global_settings() -> List[Setting]:
     Returns:
         List[Setting]: List of global settings
     """
-    def _get_global_settings(db):
-        all_settings = get_all_settings(db)
-        return [s for s in all_settings if s.setting_workspace_id is None]
-    
-    return _with_session(_get_global_settings)
\ No newline at end of file
+    return _with_session(lambda db: list(get_settings_by_workspace(db, None)))
\ No newline at end of file
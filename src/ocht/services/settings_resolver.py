@@ -0,0 +1,161 @@
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+from ocht.core.models import GLOBAL_SCOPE_ID, Setting
+from ocht.services.cache import TableCache, settings_cache
+
+# Scopes in resolution order; later scopes override earlier ones
+SCOPE_GLOBAL = "global"
+SCOPE_WORKSPACE = "workspace"
+SCOPE_SESSION = "session"
+SCOPES = (SCOPE_GLOBAL, SCOPE_WORKSPACE, SCOPE_SESSION)
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+class SettingsResolver:
+    """
+    Resolves settings over the layers global -> workspace -> session.
+
+    The layers are compiled into one flat dict per workspace on first use, so
+    reads on hot paths are plain dict lookups. The compiled dicts are dropped
+    on change events: writes through the settings service (which invalidate
+    the settings cache), cache reloads and session overrides. They also
+    expire with the TTL of the settings cache, so writes of other processes
+    (the CLI, ``ocht import``) become visible like in the cache itself.
+    Session values only live in memory for the running process.
+    """
+
+    def __init__(self, cache: TableCache = settings_cache):
+        self._cache = cache
+        self._active_workspace_id: Optional[int] = None
+        self._session: Dict[str, str] = {}
+        self._compiled: Dict[Optional[int], Dict[str, str]] = {}
+        # time.monotonic() deadline of the compiled dicts (the TTL of the rows they were built from)
+        self._expires_at: Optional[float] = None
+        self._generation = 0
+        self.compile_count = 0
+        cache.add_listener(self.invalidate)
+
+    @property
+    def active_workspace_id(self) -> Optional[int]:
+        return self._active_workspace_id
+
+    def set_active_workspace(self, workspace_id: Optional[int]) -> None:
+        """Selects the workspace whose settings override the global ones (None: globals only)."""
+        self._active_workspace_id = workspace_id
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Returns the resolved value of a setting for the active workspace."""
+        return self._current().get(key, default)
+
+    def get_int(self, key: str, default: int) -> int:
+        """Returns a setting as int; falls back to the default if missing or invalid."""
+        try:
+            return int(self._current()[key])
+        except (KeyError, ValueError):
+            return default
+
+    def get_float(self, key: str, default: float) -> float:
+        """Returns a setting as float; falls back to the default if missing or invalid."""
+        try:
+            return float(self._current()[key])
+        except (KeyError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """Returns a setting as bool ('1', 'true', 'yes', 'on' are true)."""
+        value = self._current().get(key)
+        if value is None:
+            return default
+        return value.strip().lower() in _TRUE_VALUES
+
+    def get_prefixed(self, prefix: str) -> Dict[str, str]:
+        """Returns all resolved settings starting with prefix, with the prefix removed."""
+        return {key[len(prefix):]: value for key, value in self._current().items() if key.startswith(prefix)}
+
+    def values(self, workspace_id: Optional[int] = None) -> Mapping[str, str]:
+        """Returns the compiled settings of a workspace (default: the active one) as read-only mapping."""
+        if workspace_id is None:
+            return MappingProxyType(self._current())
+        return MappingProxyType(self._compiled_for(workspace_id))
+
+    def get_scope(self, key: str) -> Optional[str]:
+        """Returns the scope that provides the resolved value of a setting, or None if unset."""
+        if key in self._session:
+            return SCOPE_SESSION
+        workspace_id = self._active_workspace_id
+        if workspace_id is not None and self._cache.get((key, workspace_id)) is not None:
+            return SCOPE_WORKSPACE
+        if self._cache.get((key, GLOBAL_SCOPE_ID)) is not None:
+            return SCOPE_GLOBAL
+        return None
+
+    def set_session_value(self, key: str, value: str) -> None:
+        """Overrides a setting for the running session only."""
+        self._session[key] = value
+        self.invalidate()
+
+    def clear_session_value(self, key: str) -> bool:
+        """
+        Removes a session override.
+
+        Returns:
+            bool: True if an override was removed
+        """
+        if self._session.pop(key, None) is None:
+            return False
+        self.invalidate()
+        return True
+
+    def clear_session(self) -> None:
+        """Removes all session overrides."""
+        if self._session:
+            self._session.clear()
+            self.invalidate()
+
+    def session_values(self) -> Dict[str, str]:
+        """Returns a copy of the session overrides."""
+        return dict(self._session)
+
+    def invalidate(self) -> None:
+        """Drops the compiled dicts; the next read recompiles them."""
+        self._generation += 1
+        self._compiled = {}
+        self._expires_at = None
+
+    def _current(self) -> Dict[str, str]:
+        return self._compiled_for(self._active_workspace_id)
+
+    def _compiled_for(self, workspace_id: Optional[int]) -> Dict[str, str]:
+        if self._expires_at is not None and time.monotonic() >= self._expires_at:
+            # The rows expired in the cache: reload them on the next read of the table
+            self.invalidate()
+        compiled = self._compiled.get(workspace_id)
+        if compiled is not None:
+            return compiled
+
+        # Retry if the cache was invalidated or reloaded while reading it
+        while True:
+            generation = self._generation
+            rows: List[Setting] = self._cache.all()
+            if generation == self._generation:
+                break
+
+        compiled = {row.setting_key: row.setting_value for row in rows if row.setting_workspace_id == GLOBAL_SCOPE_ID}
+        if workspace_id is not None and workspace_id != GLOBAL_SCOPE_ID:
+            compiled.update(
+                (row.setting_key, row.setting_value) for row in rows if row.setting_workspace_id == workspace_id
+            )
+        compiled.update(self._session)
+        self.compile_count += 1
+
+        if generation == self._generation:
+            self._compiled[workspace_id] = compiled
+            if self._expires_at is None:
+                self._expires_at = self._cache.expires_at()
+        return compiled
+
+
+# Global instance
+settings_resolver = SettingsResolver()
@@ -0,0 +1,654 @@
+import gzip
+import io
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type
+
+from sqlalchemy import DateTime, func, select, tuple_, update
+from sqlmodel import Session, SQLModel
+
+from ocht.core.db import get_session
+from ocht.core.compression import compress_if_large
+from ocht.core.models import GLOBAL_SCOPE_ID, LLMProviderConfig, Message, MessageBody, Model, Setting, Workspace
+from ocht.repositories.bulk import DEFAULT_BATCH_SIZE, count_rows, insert_rows, iter_batches
+from ocht.repositories.message import inline_bodies, shift_path
+from ocht.services.cache import invalidate_all
+
+EXPORT_FORMAT = "ocht-export"
+EXPORT_VERSION = 1
+
+FORMAT_JSONL = "jsonl"
+FORMAT_JSON = "json"
+FORMAT_MARKDOWN = "markdown"
+FORMATS = (FORMAT_JSONL, FORMAT_JSON, FORMAT_MARKDOWN)
+_FORMAT_SUFFIXES = {
+    ".jsonl": FORMAT_JSONL,
+    ".ndjson": FORMAT_JSONL,
+    ".json": FORMAT_JSON,
+    ".md": FORMAT_MARKDOWN,
+    ".markdown": FORMAT_MARKDOWN,
+}
+GZIP_SUFFIX = ".gz"
+
+# Workspace setting that held the active branch in exports written before Workspace.work_active_leaf_id
+LEGACY_ACTIVE_LEAF_KEY = "conversation.active_leaf_id"
+
+# Record types in import order: providers before their models, workspaces before their settings and messages
+TABLE_PROVIDER = "provider"
+TABLE_MODEL = "model"
+TABLE_WORKSPACE = "workspace"
+TABLE_SETTING = "setting"
+TABLE_MESSAGE = "message"
+TABLES = (TABLE_PROVIDER, TABLE_MODEL, TABLE_WORKSPACE, TABLE_SETTING, TABLE_MESSAGE)
+CONFIG_TABLES = (TABLE_PROVIDER, TABLE_MODEL, TABLE_SETTING)
+HEADER_TYPE = "header"
+
+_MODELS: Dict[str, Type[SQLModel]] = {
+    TABLE_PROVIDER: LLMProviderConfig,
+    TABLE_MODEL: Model,
+    TABLE_WORKSPACE: Workspace,
+    TABLE_SETTING: Setting,
+    TABLE_MESSAGE: Message,
+}
+_KEYS = {
+    TABLE_PROVIDER: (LLMProviderConfig.prov_id,),
+    TABLE_MODEL: (Model.model_name,),
+    TABLE_WORKSPACE: (Workspace.work_id,),
+    TABLE_SETTING: (Setting.setting_workspace_id, Setting.setting_key),
+    TABLE_MESSAGE: (Message.msg_id,),
+}
+
+
+@dataclass
+class TransferProgress:
+    """
+    Progress of an export or import.
+
+    Attributes:
+        table: Table of the last processed record
+        records: Records processed so far
+        done: Finished units of work: records on export, bytes read on import
+        total: Total units of work, None if unknown
+    """
+    table: str
+    records: int
+    done: int
+    total: Optional[int]
+
+
+@dataclass
+class ImportSummary:
+    """
+    Result of an import.
+
+    Attributes:
+        inserted: New rows per table
+        updated: Existing settings that got the imported value
+        skipped: Records that were not imported (existing providers and models, workspaces
+            merged into existing ones, settings and messages of workspaces that are not part of the import)
+    """
+    inserted: Dict[str, int] = field(default_factory=lambda: {table: 0 for table in TABLES})
+    updated: int = 0
+    skipped: int = 0
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
+def detect_format(path: str) -> str:
+    """
+    Returns the format for a file name (.jsonl, .json or .md, optionally gzip compressed with .gz).
+
+    Raises:
+        ValueError: If the extension is unknown
+    """
+    name = path.lower().removesuffix(GZIP_SUFFIX)
+    for suffix, fmt in _FORMAT_SUFFIXES.items():
+        if name.endswith(suffix):
+            return fmt
+    raise ValueError(f"Unknown export format of '{path}', use .jsonl, .json or .md")
+
+
+def export_data(path: str, fmt: Optional[str] = None, tables: Sequence[str] = TABLES,
+                workspace_id: Optional[int] = None, include_secrets: bool = False,
+                batch_size: int = DEFAULT_BATCH_SIZE, progress: Optional[ProgressCallback] = None,
+                messages_before: Optional[datetime] = None) -> int:
+    """
+    Exports workspaces, messages and configuration to a file.
+
+    Rows are read in keyset-paginated batches and written one record at a
+    time, so memory use does not grow with the size of the history. The file
+    is written under a temporary name and only replaces ``path`` when complete.
+
+    Args:
+        path: Target file; a .gz suffix compresses it
+        fmt: FORMAT_JSONL, FORMAT_JSON or FORMAT_MARKDOWN; detected from the file name if None
+        tables: Tables to export (see TABLES)
+        workspace_id: Only export this workspace (with the global settings)
+        include_secrets: Export provider API keys; otherwise they are left empty
+        batch_size: Rows per database query
+        progress: Called after every batch with the number of written records
+        messages_before: Only export messages created before this time (e.g. for archives)
+
+    Returns:
+        int: Number of exported records
+
+    Raises:
+        ValueError: If the format, a table or the workspace is unknown
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    unknown_tables = set(tables) - set(TABLES)
+    if unknown_tables:
+        raise ValueError(f"Unknown tables: {', '.join(sorted(unknown_tables))}")
+    selected = [table for table in TABLES if table in tables]
+    criteria = _export_criteria(workspace_id, messages_before)
+
+    temp_path = f"{path}.part"
+    count, table = 0, ""
+    try:
+        with get_session() as db:
+            if workspace_id is not None and not count_rows(db, Workspace, *criteria[TABLE_WORKSPACE]):
+                raise ValueError(f"Workspace {workspace_id} not found")
+            total = sum(count_rows(db, _MODELS[table], *criteria[table]) for table in selected)
+            with _open_text(temp_path, "w", compress=path.lower().endswith(GZIP_SUFFIX)) as stream:
+                writer = _WRITERS[fmt](stream)
+                writer.begin({
+                    "format": EXPORT_FORMAT,
+                    "version": EXPORT_VERSION,
+                    "exported_at": datetime.now().isoformat(timespec="seconds"),
+                    "tables": selected,
+                })
+                records = _iter_records(db, selected, criteria, batch_size, grouped=fmt == FORMAT_MARKDOWN)
+                for table, row in records:
+                    if table == TABLE_PROVIDER and not include_secrets:
+                        row["prov_api_key"] = ""
+                    writer.write(table, row)
+                    count += 1
+                    if progress and count % batch_size == 0:
+                        progress(TransferProgress(table, count, count, total))
+                writer.end()
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    if progress:
+        progress(TransferProgress(table, count, count, count))
+    return count
+
+
+def import_data(path: str, fmt: Optional[str] = None, tables: Sequence[str] = TABLES,
+                batch_size: int = DEFAULT_BATCH_SIZE, progress: Optional[ProgressCallback] = None,
+                merge: bool = False) -> ImportSummary:
+    """
+    Imports a JSONL or JSON export into the database.
+
+    The file is parsed as a stream and rows are inserted in batches within
+    one transaction, so a failed import changes nothing. Imported IDs are
+    shifted past the existing ones, which keeps the message trees intact
+    next to existing data. Providers and models that already exist are kept,
+    settings get the imported value.
+
+    Args:
+        path: Export file; a .gz suffix is decompressed
+        fmt: FORMAT_JSONL or FORMAT_JSON; detected from the file name if None
+        tables: Tables to import (see TABLES), records of other tables are skipped
+        batch_size: Rows per insert statement
+        progress: Called after every batch with the bytes read so far
+        merge: Add the messages of a workspace that already exists (same name) to it, e.g. to restore
+            a retention archive, instead of failing
+
+    Returns:
+        ImportSummary: Inserted, updated and skipped records
+
+    Raises:
+        ValueError: If the file is not a valid export or a workspace of the export already exists (without merge)
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == FORMAT_MARKDOWN:
+        raise ValueError("Markdown exports are transcripts and cannot be imported")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    total = os.path.getsize(path)
+    count, table = 0, ""
+    with open(path, "rb") as raw, get_session() as db:
+        binary = gzip.GzipFile(fileobj=raw) if path.lower().endswith(GZIP_SUFFIX) else raw
+        stream = io.TextIOWrapper(binary, encoding="utf-8")
+        records = _iter_json_lines(stream) if fmt == FORMAT_JSONL else _iter_json_array(stream)
+        _check_header(next(records, None))
+
+        importer = _Importer(db, batch_size, merge)
+        for record in records:
+            table, row = _parse_record(record)
+            if table in tables:
+                importer.add(table, row)
+            else:
+                importer.summary.skipped += 1
+            count += 1
+            if progress and count % batch_size == 0:
+                progress(TransferProgress(table, count, raw.tell(), total))
+        importer.finish()
+        db.commit()
+
+    invalidate_all()
+    if progress:
+        progress(TransferProgress(table, count, total, total))
+    return importer.summary
+
+
+def _export_criteria(workspace_id: Optional[int],
+                     messages_before: Optional[datetime] = None) -> Dict[str, Tuple[Any, ...]]:
+    """WHERE clauses per table for an export of all data or of one workspace."""
+    criteria: Dict[str, Tuple[Any, ...]] = {table: () for table in TABLES}
+    if workspace_id is not None:
+        criteria.update({
+            TABLE_WORKSPACE: (Workspace.work_id == workspace_id,),
+            TABLE_SETTING: (Setting.setting_workspace_id.in_((GLOBAL_SCOPE_ID, workspace_id)),),
+            TABLE_MESSAGE: (Message.msg_workspace_id == workspace_id,),
+        })
+    if messages_before is not None:
+        criteria[TABLE_MESSAGE] += (Message.msg_created_at < messages_before,)
+    return criteria
+
+
+def _iter_rows(db: Session, table: str, criteria: Sequence[Any], batch_size: int) -> Iterator[Dict[str, Any]]:
+    for batch in iter_batches(db, _MODELS[table], _KEYS[table], *criteria, batch_size=batch_size):
+        # Exports always contain the full text, independent of how it is stored
+        yield from inline_bodies(db, batch) if table == TABLE_MESSAGE else batch
+
+
+def _iter_records(db: Session, tables: Sequence[str], criteria: Dict[str, Tuple[Any, ...]],
+                  batch_size: int, grouped: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yields (table, row) for every exported row in import order.
+
+    ``grouped`` puts the messages of each workspace right after it (for
+    transcripts); otherwise messages follow in ID order, which only needs
+    the primary key index.
+    """
+    for table in tables:
+        if grouped and table in (TABLE_WORKSPACE, TABLE_MESSAGE):
+            continue
+        for row in _iter_rows(db, table, criteria[table], batch_size):
+            yield table, row
+    if not grouped or not {TABLE_WORKSPACE, TABLE_MESSAGE} & set(tables):
+        return
+    for workspace in _iter_rows(db, TABLE_WORKSPACE, criteria[TABLE_WORKSPACE], batch_size):
+        if TABLE_WORKSPACE in tables:
+            yield TABLE_WORKSPACE, workspace
+        if TABLE_MESSAGE in tables:
+            message_criteria = (*criteria[TABLE_MESSAGE], Message.msg_workspace_id == workspace["work_id"])
+            for row in _iter_rows(db, TABLE_MESSAGE, message_criteria, batch_size):
+                yield TABLE_MESSAGE, row
+
+
+@contextmanager
+def _open_text(path: str, mode: str, compress: bool = False) -> Iterator[IO[str]]:
+    if compress:
+        with gzip.open(path, mode + "t", encoding="utf-8") as stream:
+            yield stream
+    else:
+        with open(path, mode, encoding="utf-8") as stream:
+            yield stream
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dump_record(record_type: str, data: Dict[str, Any]) -> str:
+    return json.dumps({"type": record_type, "data": data}, ensure_ascii=False, default=_json_default)
+
+
+class _JsonLinesWriter:
+    """One JSON record per line, starting with the header."""
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+
+    def begin(self, header: Dict[str, Any]) -> None:
+        self.write(HEADER_TYPE, header)
+
+    def write(self, table: str, row: Dict[str, Any]) -> None:
+        self.stream.write(_dump_record(table, row) + "\n")
+
+    def end(self) -> None:
+        pass
+
+
+class _JsonWriter(_JsonLinesWriter):
+    """One JSON array of records, starting with the header."""
+
+    def begin(self, header: Dict[str, Any]) -> None:
+        self.stream.write("[\n" + _dump_record(HEADER_TYPE, header))
+
+    def write(self, table: str, row: Dict[str, Any]) -> None:
+        self.stream.write(",\n" + _dump_record(table, row))
+
+    def end(self) -> None:
+        self.stream.write("\n]\n")
+
+
+class _MarkdownWriter:
+    """Readable transcript: configuration as tables, then every workspace with its messages."""
+
+    # Table records: section title and (column title, column name) pairs
+    TABLE_COLUMNS = {
+        TABLE_PROVIDER: ("Providers", [("ID", "prov_id"), ("Name", "prov_name"), ("Endpoint", "prov_endpoint"),
+                                       ("Default model", "prov_default_model")]),
+        TABLE_MODEL: ("Models", [("Name", "model_name"), ("Provider", "model_provider_id"),
+                                 ("Version", "model_version"), ("Available", "is_available")]),
+        TABLE_SETTING: ("Settings", [("Key", "setting_key"), ("Workspace", "setting_workspace_id"),
+                                     ("Value", "setting_value")]),
+    }
+    ROLE_TITLES = {"user": "🧑 User", "assistant": "🤖 Assistant", "system": "⚙️ System"}
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self._table: Optional[str] = None
+        self._workspace_id: Optional[int] = None
+        self._previous_message_id: Optional[int] = None
+
+    def begin(self, header: Dict[str, Any]) -> None:
+        self.stream.write(f"# OChaT export\n\n_Exported {header['exported_at']}_\n")
+
+    def write(self, table: str, row: Dict[str, Any]) -> None:
+        if table in self.TABLE_COLUMNS:
+            self._write_table_row(table, row)
+        elif table == TABLE_WORKSPACE:
+            self._start_workspace(row["work_id"], row["work_name"], row.get("work_description"))
+        else:
+            self._write_message(row)
+        self._table = table
+
+    def end(self) -> None:
+        pass
+
+    def _write_table_row(self, table: str, row: Dict[str, Any]) -> None:
+        title, columns = self.TABLE_COLUMNS[table]
+        if table != self._table:
+            self.stream.write(f"\n## {title}\n\n| {' | '.join(name for name, _ in columns)} |\n"
+                              f"{'|---' * len(columns)}|\n")
+        self.stream.write(f"| {' | '.join(self._cell(row.get(column)) for _, column in columns)} |\n")
+
+    def _start_workspace(self, workspace_id: int, name: str, description: Optional[str] = None) -> None:
+        self.stream.write(f"\n## {name}\n")
+        if description:
+            self.stream.write(f"\n{description}\n")
+        self._workspace_id = workspace_id
+        self._previous_message_id = None
+
+    def _write_message(self, row: Dict[str, Any]) -> None:
+        if row["msg_workspace_id"] != self._workspace_id:
+            # Messages exported without their workspace
+            self._start_workspace(row["msg_workspace_id"], f"Workspace {row['msg_workspace_id']}")
+        title = self.ROLE_TITLES.get(row["msg_role"], row["msg_role"])
+        self.stream.write(f"\n### {title} · #{row['msg_id']} · {row['msg_created_at']:%Y-%m-%d %H:%M}\n\n")
+        parent_id = row.get("msg_parent_id")
+        if parent_id is not None and parent_id != self._previous_message_id:
+            # Forked branch: the message does not continue the one above
+            self.stream.write(f"_↳ reply to #{parent_id}_\n\n")
+        self.stream.write(f"{row['msg_content']}\n")
+        if row.get("msg_partial"):
+            self.stream.write("\n_⏹ Stopped_\n")
+        self._previous_message_id = row["msg_id"]
+
+    @staticmethod
+    def _cell(value: Any) -> str:
+        if value is None:
+            return ""
+        return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+_WRITERS = {
+    FORMAT_JSONL: _JsonLinesWriter,
+    FORMAT_JSON: _JsonWriter,
+    FORMAT_MARKDOWN: _MarkdownWriter,
+}
+
+
+def _iter_json_lines(stream: IO[str]) -> Iterator[Any]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON in line {line_number}: {e}") from e
+
+
+def _iter_json_array(stream: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yields the elements of a top-level JSON array without reading the whole document."""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    expected = "["  # "[", then "value" or "]" after it, then "," or "]"
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer) or expected == "retry":
+            if eof:
+                raise ValueError("Unexpected end of the JSON export")
+            # Grow the read size with the buffered rest, so long records are not parsed over and over
+            chunk = stream.read(max(chunk_size, len(buffer) - position))
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+            expected = "value" if expected == "retry" else expected
+            continue
+
+        char = buffer[position]
+        if expected == "[":
+            if char != "[":
+                raise ValueError("JSON export must be an array of records")
+            position += 1
+            expected = "value or ]"
+        elif char == "]" and expected in ("value or ]", ","):
+            return
+        elif expected == ",":
+            if char != ",":
+                raise ValueError(f"Expected ',' in JSON export, got {char!r}")
+            position += 1
+            expected = "value"
+        else:
+            try:
+                value, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if eof:
+                    raise
+                expected = "retry"
+                continue
+            yield value
+            expected = ","
+
+
+def _check_header(record: Any) -> None:
+    header = record.get("data") if isinstance(record, dict) and record.get("type") == HEADER_TYPE else None
+    if not isinstance(header, dict) or header.get("format") != EXPORT_FORMAT:
+        raise ValueError("File is not an OChaT export")
+    if header.get("version", 0) > EXPORT_VERSION:
+        raise ValueError(f"Export version {header.get('version')} is newer than supported ({EXPORT_VERSION})")
+
+
+def _parse_record(record: Any) -> Tuple[str, Dict[str, Any]]:
+    if not isinstance(record, dict) or record.get("type") not in TABLES or not isinstance(record.get("data"), dict):
+        raise ValueError(f"Invalid export record: {str(record)[:80]}")
+    return record["type"], record["data"]
+
+
+class _Importer:
+    """Maps imported rows onto the target database and inserts them in batches."""
+
+    def __init__(self, db: Session, batch_size: int, merge: bool = False):
+        self.db = db
+        self.batch_size = batch_size
+        self.merge = merge
+        self.summary = ImportSummary()
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_table: Optional[str] = None
+        # Imported IDs are shifted past the existing ones, so references are mapped without lookups
+        self._provider_offset = self._max_id(LLMProviderConfig.prov_id)
+        self._workspace_offset = self._max_id(Workspace.work_id)
+        self._message_offset = self._max_id(Message.msg_id)
+        self._last_body_id = self._max_id(MessageBody.body_id)
+        self._pending_bodies: List[Dict[str, Any]] = []
+        self._provider_ids: Dict[int, int] = {}
+        # Exported workspace ID -> ID in the target database
+        self._workspace_ids: Dict[int, int] = {}
+        self._merged_workspaces: Set[int] = set()
+        self._legacy_leaves: Dict[int, int] = {}
+        self._columns = {table: {column.name: column for column in model.__table__.columns}
+                         for table, model in _MODELS.items()}
+        self._mappers: Dict[str, Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = {
+            TABLE_PROVIDER: self._map_provider,
+            TABLE_MODEL: self._map_model,
+            TABLE_WORKSPACE: self._map_workspace,
+            TABLE_SETTING: self._map_setting,
+            TABLE_MESSAGE: self._map_message,
+        }
+
+    def add(self, table: str, data: Dict[str, Any]) -> None:
+        columns = self._columns[table]
+        row = {name: self._decode(columns[name], value) for name, value in data.items() if name in columns}
+        row = self._mappers[table](row)
+        if row is None:
+            self.summary.skipped += 1
+            return
+        if table != self._pending_table:
+            self.flush()
+            self._pending_table = table
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        if self._pending_table == TABLE_MODEL:
+            rows = self._without_existing_models(rows)
+        elif self._pending_table == TABLE_SETTING:
+            rows = self._update_existing_settings(rows)
+        elif self._pending_bodies:
+            bodies, self._pending_bodies = self._pending_bodies, []
+            insert_rows(self.db, MessageBody, bodies)
+        self.summary.inserted[self._pending_table] += insert_rows(self.db, _MODELS[self._pending_table], rows)
+
+    def finish(self) -> None:
+        """Inserts the remaining rows and stores the active branches of older exports."""
+        self.flush()
+        for workspace_id, leaf_id in self._legacy_leaves.items():
+            self.db.execute(update(Workspace.__table__).where(Workspace.work_id == workspace_id)
+                            .values(work_active_leaf_id=leaf_id))
+
+    def _max_id(self, column: Any) -> int:
+        return self.db.execute(select(func.max(column))).scalar() or 0
+
+    @staticmethod
+    def _decode(column: Any, value: Any) -> Any:
+        if isinstance(value, str) and isinstance(column.type, DateTime):
+            return datetime.fromisoformat(value)
+        return value
+
+    def _map_provider(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        exported_id = row["prov_id"]
+        existing_id = self.db.execute(
+            select(LLMProviderConfig.prov_id)
+            .where(func.lower(LLMProviderConfig.prov_name) == row["prov_name"].lower())
+        ).scalar()
+        if existing_id is not None:
+            # Keep the local provider (and its API key), but attach the imported models to it
+            self._provider_ids[exported_id] = existing_id
+            return None
+        row["prov_id"] = self._provider_ids[exported_id] = exported_id + self._provider_offset
+        return row
+
+    def _map_model(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        provider_id = self._provider_ids.get(row["model_provider_id"])
+        if provider_id is None:
+            return None
+        row["model_provider_id"] = provider_id
+        return row
+
+    def _map_workspace(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        existing_id = self.db.execute(
+            select(Workspace.work_id).where(func.lower(Workspace.work_name) == row["work_name"].lower())
+        ).scalar()
+        if existing_id is not None:
+            if not self.merge:
+                raise ValueError(f"Workspace '{row['work_name']}' already exists")
+            # Keep the local workspace and its active branch, the imported messages become extra branches
+            self._workspace_ids[row["work_id"]] = existing_id
+            self._merged_workspaces.add(existing_id)
+            return None
+        self._workspace_ids[row["work_id"]] = row["work_id"] + self._workspace_offset
+        row["work_id"] += self._workspace_offset
+        # The selected branch refers to a message ID; every row needs the key for executemany
+        leaf_id = row.get("work_active_leaf_id")
+        row["work_active_leaf_id"] = leaf_id + self._message_offset if leaf_id is not None else None
+        return row
+
+    def _map_setting(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        workspace_id = row["setting_workspace_id"]
+        if workspace_id == GLOBAL_SCOPE_ID:
+            return row
+        if workspace_id not in self._workspace_ids:
+            return None
+        row["setting_workspace_id"] = self._workspace_ids[workspace_id]
+        if row["setting_key"] == LEGACY_ACTIVE_LEAF_KEY:
+            # Stored on the workspace once it is inserted
+            if row["setting_value"].isdigit() and row["setting_workspace_id"] not in self._merged_workspaces:
+                self._legacy_leaves[row["setting_workspace_id"]] = int(row["setting_value"]) + self._message_offset
+            return None
+        return row
+
+    def _map_message(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if row["msg_workspace_id"] not in self._workspace_ids:
+            return None
+        offset = self._message_offset
+        row["msg_workspace_id"] = self._workspace_ids[row["msg_workspace_id"]]
+        row["msg_id"] += offset
+        if row.get("msg_parent_id") is not None:
+            row["msg_parent_id"] += offset
+        row["msg_path"] = shift_path(row.get("msg_path", ""), offset)
+        # Every row needs the key, executemany takes the columns from the first row
+        row["msg_body_id"] = None
+        compressed = compress_if_large(row.get("msg_content", ""))
+        if compressed is not None:
+            self._last_body_id += 1
+            codec, data = compressed
+            self._pending_bodies.append({"body_id": self._last_body_id, "body_codec": codec,
+                                         "body_size": len(row["msg_content"]), "body_data": data})
+            row["msg_body_id"], row["msg_content"] = self._last_body_id, ""
+        return row
+
+    def _without_existing_models(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        names = [row["model_name"] for row in rows]
+        existing = set(self.db.execute(select(Model.model_name).where(Model.model_name.in_(names))).scalars())
+        self.summary.skipped += len(existing)
+        return [row for row in rows if row["model_name"] not in existing]
+
+    def _update_existing_settings(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Writes imported values of existing settings and returns the new ones."""
+        keys = [(row["setting_key"], row["setting_workspace_id"]) for row in rows]
+        key_columns = tuple_(Setting.setting_key, Setting.setting_workspace_id)
+        existing = set(self.db.execute(
+            select(Setting.setting_key, Setting.setting_workspace_id).where(key_columns.in_(keys))
+        ).tuples())
+        for row in rows:
+            if (row["setting_key"], row["setting_workspace_id"]) in existing:
+                self.db.execute(
+                    update(Setting.__table__)
+                    .where(Setting.setting_key == row["setting_key"],
+                           Setting.setting_workspace_id == row["setting_workspace_id"])
+                    .values(setting_value=row["setting_value"], setting_updated_at=datetime.now())
+                )
+                self.summary.updated += 1
+        return [row for row in rows if (row["setting_key"], row["setting_workspace_id"]) not in existing]
@@ -1,13 +1,16 @@
-from typing import List, Optional, Dict, Any, TypeVar, Callable
+from typing import List, Optional, Dict, Any, Tuple, TypeVar, Callable
 from ocht.core.db import get_session
 from ocht.repositories.workspace import (
     get_all_workspaces,
     create_workspace,
     update_workspace,
     delete_workspace,
-    get_workspace_by_id
+    get_workspace_by_id,
+    get_workspace_by_name,
+    count_workspaces
 )
 from ocht.core.models import Workspace
+from ocht.services.cache import invalidate_settings
 
 T = TypeVar('T')
 
@@ -26,12 +29,10 @@ def _validate_workspace_name(name: str) -> str:
 
 
 def _check_workspace_name_uniqueness(db, name: str, exclude_id: Optional[int] = None) -> None:
-    """Checks if workspace name is unique."""
-    existing_workspaces = get_all_workspaces(db)
-    for workspace in existing_workspaces:
-        if (workspace.work_name.lower() == name.lower() and
-                workspace.work_id != exclude_id):
-            raise ValueError(f"Workspace '{name}' already exists")
+    """Checks if workspace name is unique (case-insensitive, indexed lookup)."""
+    existing_workspace = get_workspace_by_name(db, name)
+    if existing_workspace and existing_workspace.work_id != exclude_id:
+        raise ValueError(f"Workspace '{name}' already exists")
 
 
 def _ensure_workspace_exists(db, workspace_id: int) -> Workspace:
@@ -72,6 +73,33 @@ def get_workspaces_with_info() -> List[Dict[str, Any]]:
     return _with_session(_get_workspaces_info)
 
 
+def get_workspaces_page(offset: int = 0, limit: int = 100,
+                        name_filter: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Gets one page of workspaces with additional information.
+
+    Args:
+        offset: Number of matching workspaces to skip
+        limit: Maximum number of workspaces to return
+        name_filter: Optional text the workspace name must contain (case-insensitive)
+
+    Returns:
+        Tuple[List[Dict], int]: Workspace information and the total number of matches
+    """
+    def _get_page(db):
+        workspaces = get_all_workspaces(db, limit=limit, offset=offset, name_filter=name_filter)
+        return [
+            {
+                'workspace': workspace,
+                'message_count': 0,
+                'status': 'active' if workspace.work_default_model else 'inactive'
+            }
+            for workspace in workspaces
+        ], count_workspaces(db, name_filter=name_filter)
+
+    return _with_session(_get_page)
+
+
 def create_workspace_with_validation(name: str, default_model: str,
                                      description: Optional[str] = None) -> Workspace:
     """
@@ -153,4 +181,8 @@ def delete_workspace_with_checks(workspace_id: int) -> bool:
         _ensure_workspace_exists(db, workspace_id)
         return delete_workspace(db, workspace_id)
 
-    return _with_session(_delete_workspace)
\ No newline at end of file
+    try:
+        return _with_session(_delete_workspace)
+    finally:
+        # The workspace-scoped settings were deleted with it
+        invalidate_settings()
\ No newline at end of file
@@ -1,7 +1,11 @@
 import asyncio
 import os
+from functools import partial
+from typing import Optional
+from textual import work
+from textual.worker import Worker
 from textual.app import App, ComposeResult
-from textual.widgets import Header, Footer, Input
+from textual.widgets import Header, Footer, Input, TabbedContent, TabPane
 from textual.containers import VerticalScroll, Horizontal
 from ocht.tui.widgets.chat_bubble import ChatBubble
 from ocht.tui.widgets.custom_footer import CustomFooter
@@ -13,7 +17,28 @@ from ocht.tui.screens.settings_manager import SettingsManagerScreen
 from ocht.tui.screens.workspace_manager import WorkspaceManagerScreen
 from ocht.tui.screens.workspace_selector import WorkspaceSelectorModal
 from ocht.tui.widgets.confirmation_dialog import ConfirmationDialog
-from ocht.services.adapter_manager import adapter_manager
+from ocht.tui.widgets.download_progress import DownloadProgressPanel
+from ocht.services.adapter_manager import adapter_manager, get_queue_stats, get_stream_limits
+from ocht.services.cache import get_cache_stats
+from ocht.services.maintenance import run_scheduled_maintenance
+from ocht.services.settings_resolver import settings_resolver
+from ocht.services.session_manager import ChatSession, SessionManager
+from ocht.services.compare import build_compare_adapters, compare_models, parse_model_list
+from ocht.services.conversation import (
+    ROLE_USER,
+    append_exchange,
+    fork_branch,
+    get_active_leaf_id,
+    list_branches,
+    load_active_branch,
+    set_active_leaf,
+)
+from ocht.services.model_download import model_download_manager, DownloadProgress, STATE_DONE, STATE_FAILED
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.scheduler import PRIORITY_INTERACTIVE, PRIORITY_NAMES
+from ocht.adapters.streaming import STOP_MAX_SECONDS, STOP_MAX_TOKENS, StreamController
+from ocht.core.db import run_in_db_thread
+from ocht.core.profiling import profiled
 
 
 class ChatApp(App):
@@ -23,12 +48,20 @@ class ChatApp(App):
 
     CSS_PATH = "styles/app.tcss"
 
+    # Typing pause after which the context of the next prompt is prefetched
+    PREFETCH_IDLE_SECONDS = 0.3
+    # Delay before the scheduled database maintenance, so it never competes with the start
+    MAINTENANCE_DELAY_SECONDS = 60.0
+
     # Configure mouse and input handling to prevent escape sequences
     ENABLE_COMMAND_PALETTE = False
 
     BINDINGS = [
         ("ctrl+c", "quit", "Quit"),
         ("ctrl+l", "clear_chat", "Clear chat"),
+        ("ctrl+t", "new_session", "New chat"),
+        ("ctrl+w", "close_session", "Close chat"),
+        ("ctrl+s", "stop_response", "Stop answer"),
         ("escape", "focus_input", "Focus input"),
         ("ctrl+shift+c", "copy_last_bot_message", "Copy last bot message"),
         ("ctrl+shift+u", "copy_last_user_message", "Copy last user message"),
@@ -42,9 +75,16 @@ class ChatApp(App):
             **kwargs: Arbitrary keyword arguments.
         """
         super().__init__(*args, **kwargs)
-        self.adapter = None
+        self.sessions = SessionManager()
+        self.sessions.create_session()
         self.notifications = []
 
+    @property
+    def adapter(self):
+        """Adapter of the active chat session."""
+        session = self.sessions.active_session
+        return session.adapter if session else None
+
     def compose(self) -> ComposeResult:
         """Compose the UI components.
 
@@ -52,19 +92,48 @@ class ChatApp(App):
             ComposeResult: The result containing the UI components.
         """
         yield Header(show_clock=True)
-        yield VerticalScroll(id="chat-container")
+        with TabbedContent(id="sessions"):
+            for session in self.sessions.list_sessions():
+                yield self._session_pane(session)
+        yield DownloadProgressPanel(id="download-panel")
         yield Input(
             placeholder="💬 Write your message... (ESC to focus)", id="chat-input"
         )
         yield CustomFooter()
 
+    @profiled("tui.on_mount")
     async def on_mount(self) -> None:
         """App start: Focus input and initialize adapter."""
         self.query_one("#chat-input", Input).focus()
-
+        model_download_manager.add_listener(self._on_download_state_changed)
+        # Settings are loaded in the DB thread so the UI renders immediately
+        self._initialize_adapter()
+        self.set_timer(self.MAINTENANCE_DELAY_SECONDS, self._run_scheduled_maintenance)
+
+    @work(exclusive=True, group="db-maintenance", exit_on_error=False)
+    async def _run_scheduled_maintenance(self) -> None:
+        """Runs retention, vacuum and ANALYZE in the DB thread if the maintenance interval has passed."""
+        report = await run_in_db_thread(run_scheduled_maintenance)
+        if report and report.removed_messages:
+            self.notify(f"Database maintenance: {report.removed_messages} old messages archived",
+                        severity="information")
+
+    @work(exclusive=True, group="initialize-adapter")
+    async def _initialize_adapter(self) -> None:
+        """Load provider/model settings off the event loop and start the setup if needed."""
         # Try to load settings on startup
-        if adapter_manager.load_settings_on_startup():
-            self.adapter = adapter_manager.get_current_adapter()
+        try:
+            loaded = await run_in_db_thread(adapter_manager.load_settings_on_startup)
+        except ValueError as e:
+            self._add_message(f"❌ {e}", "bot", "error")
+            loaded = False
+        if loaded:
+            self._set_session_adapter(
+                self.sessions.active_session,
+                adapter_manager.get_current_adapter(),
+                adapter_manager.get_current_provider_id(),
+                adapter_manager.get_current_model_name(),
+            )
             self._update_footer_adapter_info()
             self._add_message(
                 "👋 Hello! I am your AI Assistant. Type `/help` for help.", "bot"
@@ -74,11 +143,11 @@ class ChatApp(App):
             self._add_message("⚙️ Welcome! Let's set up your AI assistant first.", "bot")
 
             # Check what needs to be configured
-            if adapter_manager.requires_provider_selection():
+            if await run_in_db_thread(adapter_manager.requires_provider_selection):
                 await self._show_initial_provider_selection()
-            elif adapter_manager.requires_model_selection():
+            elif await run_in_db_thread(adapter_manager.requires_model_selection):
                 await self._show_initial_model_selection()
-                
+
             # Update footer even if no adapter is configured yet
             self._update_footer_adapter_info()
 
@@ -101,8 +170,32 @@ class ChatApp(App):
 
         if prompt.startswith("/"):
             await self._handle_command(prompt)
-        else:
-            await self._process_prompt(prompt)
+            return
+
+        session = self.sessions.active_session
+        if session.busy:
+            self.notify("This chat is still answering. Open another one with /new or Ctrl+T.", severity="warning")
+            return
+        # One worker per session, so several sessions can stream at the same time
+        session.busy = True
+        self.workers.cancel_group(self, "prefetch-context")
+        self.run_worker(self._process_prompt(prompt, session), group=f"session-{session.session_id}")
+
+    def on_input_changed(self, message: Input.Changed) -> None:
+        """Prefetch the context of the next prompt while the user types."""
+        if message.input.id != "chat-input" or not message.value or message.value.startswith("/"):
+            return
+        session = self.sessions.active_session
+        if session is None or session.busy or session.adapter is None:
+            return
+        self._prefetch_context(session)
+
+    @work(exclusive=True, group="prefetch-context", exit_on_error=False)
+    async def _prefetch_context(self, session: ChatSession) -> None:
+        """Runs after a typing pause; every keystroke cancels and restarts it."""
+        await asyncio.sleep(self.PREFETCH_IDLE_SECONDS)
+        if not session.busy and session.adapter is not None:
+            await session.adapter.prefetch_context()
 
     def _is_mouse_escape_sequence(self, text: str) -> bool:
         """Check if text contains mouse escape sequences or control characters.
@@ -141,6 +234,7 @@ class ChatApp(App):
 
         return False
 
+    @profiled("tui.handle_command")
     async def _handle_command(self, command: str) -> None:
         """Handle chat commands with match statement.
 
@@ -175,7 +269,10 @@ class ChatApp(App):
 
                 def handle_workspace_selection(result):
                     if result:
-                        self.add_note(
+                        # Messages of this chat are stored in the workspace, whose settings override the global ones
+                        self.sessions.active_session.workspace_id = result.work_id
+                        settings_resolver.set_active_workspace(result.work_id)
+                        self._load_active_branch(
                             f"✅ Selected Workspace: {result.work_name} (ID: {result.work_id})"
                         )
 
@@ -186,6 +283,115 @@ class ChatApp(App):
             case "/workspace-manage":
                 await self.push_screen(WorkspaceManagerScreen())
 
+            case "/cache":
+                lines = ["| Cache | Hits | Misses | Loads | Invalidations | Hit rate |",
+                         "|---|---|---|---|---|---|"]
+                for name, stats in get_cache_stats().items():
+                    lines.append(
+                        f"| {name} | {stats.hits} | {stats.misses} | {stats.loads} "
+                        f"| {stats.invalidations} | {stats.hit_rate:.0%} |"
+                    )
+                self._add_message("\n".join(lines), "bot")
+
+            case "/queue":
+                queues = get_queue_stats()
+                if not queues:
+                    self.add_note("No requests scheduled yet.")
+                else:
+                    lines = ["| Server | Running | Limit | Queued | Peak | Wait (interactive) | Wait (summary) | Wait (batch) | Superseded |",
+                             "|---|---|---|---|---|---|---|---|---|"]
+                    for stats in queues:
+                        waits = [stats.average_wait(priority) for priority in PRIORITY_NAMES]
+                        wait_cells = " | ".join(f"{wait * 1000:.0f} ms" if wait is not None else "-" for wait in waits)
+                        lines.append(
+                            f"| {stats.endpoint} | {stats.running} | {stats.limit} | {stats.queue_depth} "
+                            f"| {stats.peak_queued} | {wait_cells} | {stats.superseded} |"
+                        )
+                    self._add_message("\n".join(lines), "bot")
+
+            case "/set":
+                overrides = settings_resolver.session_values()
+                if not overrides:
+                    self.add_note("No session settings. Usage: `/set <key> <value>`")
+                else:
+                    self._add_message(
+                        "\n".join(f"- `{key}` = `{value}`" for key, value in sorted(overrides.items())), "bot"
+                    )
+
+            case _ if command.startswith("/set "):
+                key, _, value = command[len("/set "):].strip().partition(" ")
+                if not key or not value.strip():
+                    self.add_note("Usage: `/set <key> <value>`")
+                    return
+                settings_resolver.set_session_value(key, value.strip())
+                self.add_note(f"✅ Session setting `{key}` = `{value.strip()}` (not saved)")
+
+            case _ if command.startswith("/unset "):
+                key = command[len("/unset "):].strip()
+                if settings_resolver.clear_session_value(key):
+                    self.add_note(f"✅ Session setting `{key}` removed")
+                else:
+                    self.add_note(f"No session setting `{key}`")
+
+            case "/new":
+                await self.action_new_session()
+
+            case "/close":
+                await self.action_close_session()
+
+            case "/sessions":
+                lines = ["| Chat | Provider | Model | Workspace | Status |", "|---|---|---|---|---|"]
+                for session in self.sessions.list_sessions():
+                    status = "answering" if session.busy else "idle"
+                    if session is self.sessions.active_session:
+                        status += " ◀"
+                    lines.append(
+                        f"| {session.session_id} | {session.provider_name or '-'} | {session.model_name or '-'} "
+                        f"| {session.workspace_id or '-'} | {status} |"
+                    )
+                self._add_message("\n".join(lines), "bot")
+
+            case "/stop":
+                self.action_stop_response()
+
+            case "/compare":
+                self.add_note("Usage: `/compare model1,model2,... <prompt>`")
+
+            case _ if command.startswith("/compare "):
+                models, _, prompt = command[len("/compare "):].strip().partition(" ")
+                session = self.sessions.active_session
+                if session.busy:
+                    self.notify("This chat is still answering. Open another one with /new or Ctrl+T.",
+                                severity="warning")
+                    return
+                session.busy = True
+                self.run_worker(self._compare_models(models, prompt.strip(), session),
+                                group=f"session-{session.session_id}")
+
+            case "/branches":
+                await self._list_branches()
+
+            case "/fork":
+                await self._fork_branch(None)
+
+            case _ if command.startswith("/fork "):
+                await self._fork_branch(command[len("/fork "):].strip())
+
+            case _ if command.startswith("/branch "):
+                workspace_id = self._require_workspace()
+                argument = command[len("/branch "):].strip()
+                if workspace_id is None:
+                    return
+                if not argument.isdigit():
+                    self.add_note("Usage: `/branch <id>` (see `/branches`)")
+                    return
+                try:
+                    await run_in_db_thread(set_active_leaf, workspace_id, int(argument))
+                except ValueError as e:
+                    self._add_message(f"❌ {e}", "bot", "error")
+                    return
+                self._load_active_branch(f"✅ Switched to branch {argument}")
+
             case "/help":
                 help_text = """# 🤖 OChaT Help
 
@@ -199,11 +405,25 @@ class ChatApp(App):
 - `/workspace` - Select workspace
 - `/workspace-manage` - Manage workspaces
 - `/settings` - Manage application settings
+- `/cache` - Show cache hit/miss statistics
+- `/queue` - Show request queues and wait times per model server
+- `/new` - Open a new chat tab with the current model (`Ctrl+T`)
+- `/close` - Close the current chat tab (`Ctrl+W`)
+- `/sessions` - List the open chats
+- `/stop` - Stop the current answer and keep the partial text (`Ctrl+S`)
+- `/compare model1,model2,... <prompt>` - Send a prompt to several models and compare speed and answers
+- `/branches` - List the conversation branches of the workspace
+- `/branch <id>` - Switch to another branch
+- `/fork [n]` - Start a new branch after the first n messages (default: before the last prompt)
+- `/set <key> <value>` - Override a setting for this session (`/set` lists overrides)
+- `/unset <key>` - Remove a session override
 - `/help` - Show this help
 
 ## Keyboard shortcuts:
 - `Ctrl+C` - Exit program
 - `Ctrl+L` - Clear chat
+- `Ctrl+T` / `Ctrl+W` - Open / close a chat tab
+- `Ctrl+S` - Stop the current answer
 - `ESC` - Focus input field
 - `Ctrl+Shift+C` - Copy last bot message
 - `Ctrl+Shift+U` - Copy last user message"""
@@ -216,40 +436,61 @@ class ChatApp(App):
                     "error",
                 )
 
-    async def _process_prompt(self, prompt: str) -> None:
+    @profiled("tui.process_prompt")
+    async def _process_prompt(self, prompt: str, session: Optional[ChatSession] = None) -> None:
         """Process the user's prompt with streaming support.
 
         Args:
             prompt (str): The user's input prompt.
+            session (ChatSession, optional): Chat session to answer in. Defaults to the active session.
         """
+        session = session or self.sessions.active_session
+        session.busy = True
+        try:
+            await self._stream_response(prompt, session)
+        finally:
+            session.busy = False
+
+    async def _stream_response(self, prompt: str, session: ChatSession) -> None:
+        """Stream the response of the session's adapter into its chat tab."""
         # Check if adapter is available
-        if not self.adapter:
+        if not session.adapter:
             self._add_message(
                 "❌ Kein Adapter konfiguriert. Bitte wählen Sie zuerst einen Provider und ein Modell.",
                 "bot",
                 "error",
+                session=session,
             )
             return
 
         # Add user message and scroll immediately
-        self._add_message(prompt, "user")
+        self._add_message(prompt, "user", session=session)
 
         # Create streaming bot message bubble with thinking indicator
-        bot_bubble = self._add_message("🤔 Thinking...", "bot", streaming=True)
+        bot_bubble = self._add_message("🤔 Thinking...", "bot", streaming=True, session=session)
         full_response = ""
+        container = self._chat_container(session)
+        # Ctrl+S, /stop and the stream.* limits end the response early
+        controller = StreamController(await run_in_db_thread(get_stream_limits))
+        session.stream = controller
 
         try:
             # Stream the response with live updates
-            async for chunk in self.adapter.send_prompt_stream(prompt):
+            async for chunk in controller.stream(session.adapter.send_prompt_stream(prompt)):
                 full_response += chunk
                 bot_bubble.update_content(full_response)
 
                 # Auto-scroll to keep up with streaming content
-                container = self.query_one("#chat-container", VerticalScroll)
                 container.scroll_end(animate=False)
+                self._update_footer_throughput(streaming=True, session=session)
+
+            if controller.stopped:
+                bot_bubble.update_content(f"{full_response}\n\n{self._stop_note(controller)}".lstrip())
 
             # Finalize the message (remove typing indicator)
             bot_bubble.finalize()
+            self._update_footer_throughput(streaming=False, session=session)
+            await self._store_exchange(prompt, full_response, session, partial=controller.stopped)
 
         except Exception as e:
             # Handle streaming errors gracefully
@@ -261,34 +502,243 @@ class ChatApp(App):
                 await bot_bubble.parent.remove()
 
             error_msg = f"❌ **Error:** {str(e)}\n\nPlease check your configuration."
-            self._add_message(error_msg, "bot", "error")
+            self._add_message(error_msg, "bot", "error", session=session)
 
             # Fallback to async method if streaming fails
             if "stream" in str(e).lower():
                 self.notify("Streaming failed, falling back to standard mode...")
-                await self._process_prompt_fallback(prompt)
+                await self._process_prompt_fallback(prompt, session)
+        finally:
+            session.stream = None
+
+    @staticmethod
+    def _stop_note(controller: StreamController) -> str:
+        """Explain why a response ended early."""
+        if controller.stop_reason == STOP_MAX_SECONDS:
+            return f"⏱ *Stopped after the time limit of {controller.limits.max_seconds:g} s (`stream.max_seconds`)*"
+        if controller.stop_reason == STOP_MAX_TOKENS:
+            return f"✂️ *Stopped at the limit of {controller.limits.max_tokens} tokens (`stream.max_tokens`)*"
+        return "⏹ *Stopped*"
+
+    def action_stop_response(self) -> None:
+        """Stop the answer of the current chat; the partial answer is kept."""
+        session = self.sessions.active_session
+        if not session.busy:
+            self.notify("Nothing to stop", severity="information")
+            return
+        if session.stream is not None:
+            session.stream.stop()
+            if session.adapter is not None:
+                # A prompt still waiting for a model slot gives it up right away
+                session.adapter.cancel_requests(PRIORITY_INTERACTIVE, running=False)
+        else:
+            # Not streaming (/compare, non-streaming fallback): cancel the worker
+            self.workers.cancel_group(self, f"session-{session.session_id}")
 
-    async def _process_prompt_fallback(self, prompt: str) -> None:
+    async def _process_prompt_fallback(self, prompt: str, session: ChatSession) -> None:
         """Fallback method using async send_prompt_async instead of streaming.
 
         Args:
             prompt (str): The user's input prompt.
+            session (ChatSession): Chat session to answer in.
         """
         # Add typing indicator
-        typing_bubble = self._add_message("🤔 *thinking...*", "bot", "typing")
+        typing_bubble = self._add_message("🤔 *thinking...*", "bot", "typing", session=session)
 
         try:
             # Use async method instead of streaming
-            answer = await self.adapter.send_prompt_async(prompt)
+            answer = await session.adapter.send_prompt_async(prompt)
             await typing_bubble.parent.remove()
-            self._add_message(answer, "bot")
+            self._add_message(answer, "bot", session=session)
+            await self._store_exchange(prompt, answer, session)
         except Exception as e:
             await typing_bubble.parent.remove()
             error_msg = f"❌ **Error:** {str(e)}\n\nPlease check your configuration."
-            self._add_message(error_msg, "bot", "error")
+            self._add_message(error_msg, "bot", "error", session=session)
+
+    async def _compare_models(self, models: str, prompt: str, session: ChatSession) -> None:
+        """Stream a prompt to several models side by side and show their timing."""
+        try:
+            try:
+                model_names = parse_model_list(models)
+                if not prompt:
+                    raise ValueError("Usage: `/compare model1,model2,... <prompt>`")
+                adapters = await run_in_db_thread(build_compare_adapters, model_names)
+            except ValueError as e:
+                self._add_message(f"❌ {e}", "bot", "error", session=session)
+                return
+
+            self._add_message(prompt, "user", session=session)
+            container = self._chat_container(session)
+            row = Horizontal(classes="compare-row")
+            await container.mount(row)
+            bubbles = {name: ChatBubble(f"**{name}**\n\n🤔 Thinking...", "bot", streaming=True) for name in model_names}
+            await row.mount_all(bubbles.values())
+            container.scroll_end(animate=False)
+
+            def on_chunk(name: str, text: str) -> None:
+                bubbles[name].update_content(f"**{name}**\n\n{text}")
+                container.scroll_end(animate=False)
+
+            results = await compare_models(adapters, prompt, on_chunk=on_chunk)
+
+            def _fmt(value, suffix=""):
+                return f"{value:.1f}{suffix}" if value is not None else "-"
+
+            lines = ["| Model | TTFT | tok/s | Total | Queued | Status |", "|---|---|---|---|---|---|"]
+            for name, result in results.items():
+                if result.error:
+                    bubbles[name].update_content(f"**{name}**\n\n{result.text}\n\n❌ {result.error}")
+                bubbles[name].finalize()
+                span = result.span
+                lines.append(
+                    f"| {name} | {_fmt(span.ttft_seconds * 1000 if span and span.ttft_seconds else None, ' ms')} "
+                    f"| {_fmt(span.tokens_per_second if span else None)} "
+                    f"| {_fmt(span.total_seconds * 1000 if span and span.total_seconds else None, ' ms')} "
+                    f"| {_fmt(result.queued_seconds * 1000, ' ms')} | {'❌' if result.error else '✅'} |"
+                )
+            self._add_message("\n".join(lines), "bot", session=session)
+        finally:
+            session.busy = False
+
+    def _require_workspace(self) -> Optional[int]:
+        """Returns the workspace of the active chat, or None after telling the user to select one."""
+        workspace_id = self.sessions.active_session.workspace_id
+        if workspace_id is None:
+            self.add_note("Branches are stored per workspace. Select one with `/workspace` first.")
+        return workspace_id
+
+    async def _store_exchange(self, prompt: str, response: str, session: ChatSession,
+                              partial: bool = False) -> None:
+        """Append prompt and response to the active branch of the session's workspace."""
+        workspace_id = session.workspace_id
+        if workspace_id is None or not response:
+            return
+        try:
+            await run_in_db_thread(append_exchange, workspace_id, prompt, response, partial)
+        except Exception as e:
+            self.notify(f"Error saving message: {str(e)}", severity="error")
+
+    @work(exclusive=True, group="load-branch")
+    async def _load_active_branch(self, note: str) -> None:
+        """Show the active branch of the chat's workspace and use it as adapter history."""
+        session = self.sessions.active_session
+        workspace_id = session.workspace_id
+        branch = await run_in_db_thread(load_active_branch, workspace_id) if workspace_id is not None else []
+
+        await self._chat_container(session).remove_children()
+        for message in branch:
+            content = f"{message.content}\n\n⏹ *Stopped*" if message.msg_partial else message.content
+            self._add_message(content, "user" if message.msg_role == ROLE_USER else "bot", session=session)
+        if session.adapter:
+            session.adapter.load_history([
+                ("human" if message.msg_role == ROLE_USER else "ai", message.content) for message in branch
+            ])
+        self._add_message(note, "bot", "success", session=session)
+
+    async def _fork_branch(self, argument: Optional[str]) -> None:
+        """Handle `/fork [n]`: keep the first n messages of the active branch."""
+        workspace_id = self._require_workspace()
+        if workspace_id is None:
+            return
+        try:
+            if argument is None:
+                # Default: drop the last exchange, so the next prompt replaces it
+                branch = await run_in_db_thread(load_active_branch, workspace_id)
+                keep = max(0, len(branch) - 2)
+            elif argument.isdigit():
+                keep = int(argument)
+            else:
+                self.add_note("Usage: `/fork [n]`")
+                return
+            await run_in_db_thread(fork_branch, workspace_id, keep)
+        except ValueError as e:
+            self._add_message(f"❌ {e}", "bot", "error")
+            return
+        self._load_active_branch(f"✅ New branch after {keep} messages – your next prompt continues from here")
+
+    async def _list_branches(self) -> None:
+        """Handle `/branches`: show the last message of every branch."""
+        workspace_id = self._require_workspace()
+        if workspace_id is None:
+            return
+        leaves = await run_in_db_thread(list_branches, workspace_id)
+        if not leaves:
+            self.add_note("No stored messages in this workspace yet.")
+            return
+        active_leaf_id = await run_in_db_thread(get_active_leaf_id, workspace_id)
+        lines = ["| ID | Messages | Last message |", "|---|---|---|"]
+        for leaf in leaves:
+            preview = " ".join(leaf.content.split())
+            if len(preview) > 60:
+                preview = preview[:57] + "..."
+            marker = " ◀" if leaf.msg_id == active_leaf_id else ""
+            lines.append(f"| {leaf.msg_id}{marker} | {leaf.msg_depth + 1} | {preview.replace('|', '/')} |")
+        lines.append("\nSwitch with `/branch <id>`.")
+        self._add_message("\n".join(lines), "bot")
+
+    def _session_pane(self, session: ChatSession) -> TabPane:
+        """Create the tab of a chat session."""
+        return TabPane(session.title, VerticalScroll(classes="chat-container"), id=f"session-{session.session_id}")
+
+    def _chat_container(self, session: Optional[ChatSession] = None) -> VerticalScroll:
+        """Return the message container of a session (default: the active one)."""
+        session = session or self.sessions.active_session
+        return self.query_one(f"#session-{session.session_id} .chat-container", VerticalScroll)
+
+    def _set_session_adapter(self, session: ChatSession, adapter: LLMAdapter, provider_id: int,
+                             model_name: str) -> None:
+        """Give the session its adapter and update its tab."""
+        self.sessions.set_adapter(session.session_id, adapter, provider_id, model_name)
+        self.query_one("#sessions", TabbedContent).get_tab(f"session-{session.session_id}").label = session.title
+        self._update_footer_adapter_info()
+
+    async def action_new_session(self) -> None:
+        """Open a new chat tab with the model of the current chat (select its workspace with /workspace)."""
+        current = self.sessions.active_session
+        adapter = None
+        if current.provider_id is not None and current.model_name:
+            # Each session gets its own adapter, so memories never mix
+            adapter = await run_in_db_thread(adapter_manager.build_adapter, current.provider_id, current.model_name)
+        session = self.sessions.create_session(adapter, current.provider_id if adapter else None,
+                                               current.model_name if adapter else None)
+        tabs = self.query_one("#sessions", TabbedContent)
+        await tabs.add_pane(self._session_pane(session))
+        tabs.active = f"session-{session.session_id}"
+        self._add_message(f"💬 New chat {session.session_id}. Type `/sessions` to list all chats.", "bot",
+                          session=session)
+
+    async def action_close_session(self) -> None:
+        """Close the current chat tab (the last one stays open)."""
+        session = self.sessions.active_session
+        if len(self.sessions.list_sessions()) == 1:
+            self.notify("The last chat cannot be closed", severity="warning")
+            return
+        # Stop a response that is still streaming in this chat and a pending model switch
+        self.workers.cancel_group(self, f"session-{session.session_id}")
+        self.workers.cancel_group(self, f"switch-adapter-{session.session_id}")
+        if session.adapter is not None:
+            # Also drops its queued summaries, which do not run in the session's worker
+            session.adapter.cancel_requests()
+        remaining = self.sessions.close_session(session.session_id)
+        tabs = self.query_one("#sessions", TabbedContent)
+        tabs.active = f"session-{remaining.session_id}"
+        await tabs.remove_pane(f"session-{session.session_id}")
+
+    def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        """Route input, settings and footer to the selected chat."""
+        session_id = int(event.pane.id.removeprefix("session-"))
+        session = self.sessions.get_session(session_id)
+        if session is None:
+            return
+        self.sessions.set_active(session_id)
+        settings_resolver.set_active_workspace(session.workspace_id)
+        self._update_footer_adapter_info()
+        self.query_one("#chat-input", Input).focus()
 
     def _add_message(
-        self, message: str, sender: str, style: str = "", streaming: bool = False
+        self, message: str, sender: str, style: str = "", streaming: bool = False,
+        session: Optional[ChatSession] = None
     ) -> ChatBubble:
         """Add a new chat message and scroll immediately.
 
@@ -297,11 +747,12 @@ class ChatApp(App):
             sender (str): The sender of the message ('user' or 'bot').
             style (str, optional): Additional style class for the message. Defaults to "".
             streaming (bool, optional): Enable streaming support for live updates. Defaults to False.
+            session (ChatSession, optional): Chat session to add the message to. Defaults to the active session.
 
         Returns:
             ChatBubble: The chat bubble widget that was added.
         """
-        container = self.query_one("#chat-container", VerticalScroll)
+        container = self._chat_container(session)
 
         # Additional CSS classes based on style
         extra_classes = f" {style}" if style else ""
@@ -318,8 +769,7 @@ class ChatApp(App):
 
     async def action_clear_chat(self) -> None:
         """Clear the chat history."""
-        container = self.query_one("#chat-container", VerticalScroll)
-        await container.remove_children()
+        await self._chat_container().remove_children()
         self._add_message("✨ Chat history has been cleared.", "bot", "success")
 
     def action_focus_input(self) -> None:
@@ -334,20 +784,43 @@ class ChatApp(App):
         """
         self._add_message(message, "bot", "success")
 
+    def _on_download_state_changed(self, progress: DownloadProgress) -> None:
+        """Notifies about finished model downloads, even if the selector was closed."""
+        if progress.state == STATE_DONE:
+            self.notify(f"Model '{progress.model_name}' erfolgreich heruntergeladen!", severity="information")
+        elif progress.state == STATE_FAILED:
+            self.notify(f"Fehler beim Herunterladen von '{progress.model_name}': {progress.error}", severity="error")
+
     def _update_footer_adapter_info(self) -> None:
-        """Update the footer with current adapter information."""
+        """Update the footer with the adapter of the active session (no database access)."""
         try:
             footer = self.query_one(CustomFooter)
-            adapter_info = adapter_manager.get_adapter_info()
-            
-            provider_name = adapter_info.get("provider_name", "")
-            model_name = adapter_info.get("model_name", "")
-            
-            footer.update_adapter_info(provider_name, model_name)
+            session = self.sessions.active_session
+
+            footer.update_adapter_info(session.provider_name or "", session.model_name or "")
         except Exception:
             # Footer might not exist yet or adapter info not available
             pass
 
+    def _update_footer_throughput(self, streaming: bool, session: Optional[ChatSession] = None) -> None:
+        """Update the footer with the throughput of the current request of the active session."""
+        if session is not None and session is not self.sessions.active_session:
+            return
+        span = getattr(self.adapter, "current_span", None)
+        if span is None:
+            return
+        # Throttle live updates to every 8th chunk
+        if streaming and span.chunk_count % 8:
+            return
+        try:
+            footer = self.query_one(CustomFooter)
+            if streaming:
+                footer.update_throughput(span.live_tokens_per_second, streaming=True)
+            else:
+                footer.update_throughput(span.tokens_per_second, streaming=False)
+        except Exception:
+            pass
+
     async def _show_initial_provider_selection(self) -> None:
         """Show provider selection during initial setup."""
 
@@ -357,8 +830,7 @@ class ChatApp(App):
                     f"✅ Provider selected: {result.prov_name}", "bot", "success"
                 )
                 # After provider selection, check if we need model selection
-                if adapter_manager.requires_model_selection():
-                    asyncio.create_task(self._show_initial_model_selection())
+                self._continue_initial_setup()
             else:
                 self._add_message(
                     "❌ Setup cancelled. Please select a provider to continue.",
@@ -370,6 +842,12 @@ class ChatApp(App):
             ProviderSelectorModal(), handle_initial_provider_selection
         )
 
+    @work(exclusive=True, group="initial-setup")
+    async def _continue_initial_setup(self) -> None:
+        """Show the model selection if it is still missing after the provider selection."""
+        if await run_in_db_thread(adapter_manager.requires_model_selection):
+            await self._show_initial_model_selection()
+
     async def _show_initial_model_selection(self) -> None:
         """Show model selection during initial setup."""
 
@@ -379,24 +857,14 @@ class ChatApp(App):
                     f"✅ Model selected: {result.model_name}", "bot", "success"
                 )
                 # Try to create adapter with selected provider and model
-                if adapter_manager.switch_adapter(
-                    adapter_manager.get_current_provider_id()
-                    or result.model_provider_id,
+                session = self.sessions.active_session
+                self._switch_adapter(
+                    session,
+                    session.provider_id or result.model_provider_id,
                     result.model_name,
-                ):
-                    self.adapter = adapter_manager.get_current_adapter()
-                    self._update_footer_adapter_info()
-                    self._add_message(
-                        "🎉 Setup complete! You can now start chatting.",
-                        "bot",
-                        "success",
-                    )
-                else:
-                    self._add_message(
-                        "❌ Failed to initialize adapter. Please check your configuration.",
-                        "bot",
-                        "error",
-                    )
+                    "🎉 Setup complete! You can now start chatting.",
+                    "❌ Failed to initialize adapter. Please check your configuration.",
+                )
             else:
                 self._add_message(
                     "❌ Setup cancelled. Please select a model to continue.",
@@ -407,14 +875,14 @@ class ChatApp(App):
         await self.push_screen(ModelSelectorModal(), handle_initial_model_selection)
 
     async def _handle_provider_change(self) -> None:
-        """Handle provider selection with chat loss warning."""
+        """Handle provider selection of the active chat with chat loss warning."""
+        session = self.sessions.active_session
 
         # Show provider selection first
         def handle_provider_selection(result):
             if result:
                 # Check if user selected a different provider
-                current_provider_id = adapter_manager.get_current_provider_id()
-                if current_provider_id and result.prov_id != current_provider_id:
+                if session.provider_id and result.prov_id != session.provider_id:
                     # Different provider selected, show confirmation for chat loss
 
                     # Show confirmation dialog for chat loss
@@ -423,21 +891,19 @@ class ChatApp(App):
                             return
 
                         # Clear current chat when switching providers
-                        if adapter_manager.has_active_chat():
+                        if session.adapter is not None:
                             asyncio.create_task(self.action_clear_chat())
 
-                        # Update adapter manager and app adapter
-                        if adapter_manager.switch_adapter(
+                        # Update the adapter of this chat
+                        self._switch_adapter(
+                            session,
                             result.prov_id,
-                            adapter_manager.get_current_model_name() or "",
-                        ):
-                            self.adapter = adapter_manager.get_current_adapter()
-                            self._update_footer_adapter_info()
-                            self.add_note(f"✅ Provider gewechselt: {result.prov_name}")
-                        else:
-                            self.add_note("❌ Fehler beim Wechseln des Providers")
-
-                    if adapter_manager.has_active_chat():
+                            session.model_name or "",
+                            f"✅ Provider gewechselt: {result.prov_name}",
+                            "❌ Fehler beim Wechseln des Providers",
+                        )
+
+                    if session.adapter is not None:
                         # Use callback pattern for ConfirmationDialog
                         self.push_screen(
                             ConfirmationDialog(
@@ -451,37 +917,35 @@ class ChatApp(App):
                         )
                     else:
                         # No active chat, switch directly
-                        if adapter_manager.switch_adapter(
+                        self._switch_adapter(
+                            session,
                             result.prov_id,
-                            adapter_manager.get_current_model_name() or "",
-                        ):
-                            self.adapter = adapter_manager.get_current_adapter()
-                            self.add_note(f"✅ Provider gewechselt: {result.prov_name}")
-                        else:
-                            self.add_note("❌ Fehler beim Wechseln des Providers")
+                            session.model_name or "",
+                            f"✅ Provider gewechselt: {result.prov_name}",
+                            "❌ Fehler beim Wechseln des Providers",
+                        )
                 else:
                     # Same provider or no current provider, no confirmation needed
-                    if adapter_manager.switch_adapter(
-                        result.prov_id, adapter_manager.get_current_model_name() or ""
-                    ):
-                        self.adapter = adapter_manager.get_current_adapter()
-                        self._update_footer_adapter_info()
-                        self.add_note(f"✅ Provider ausgewählt: {result.prov_name}")
-                    else:
-                        self.add_note("❌ Fehler beim Auswählen des Providers")
+                    self._switch_adapter(
+                        session,
+                        result.prov_id,
+                        session.model_name or "",
+                        f"✅ Provider ausgewählt: {result.prov_name}",
+                        "❌ Fehler beim Auswählen des Providers",
+                    )
 
         await self.push_screen(ProviderSelectorModal(), handle_provider_selection)
 
     async def _handle_model_change(self) -> None:
-        """Handle model selection with chat loss warning."""
+        """Handle model selection of the active chat with chat loss warning."""
+        session = self.sessions.active_session
 
         def handle_model_selection(selected_model):
             if not selected_model:
                 return
 
             # Check if same model
-            current_model_name = adapter_manager.get_current_model_name()
-            if current_model_name and selected_model.model_name == current_model_name:
+            if session.model_name and selected_model.model_name == session.model_name:
                 self.add_note(f"✅ Modell bereits aktiv: {selected_model.model_name}")
                 return
 
@@ -491,25 +955,19 @@ class ChatApp(App):
                     return
 
                 # Clear current chat when switching models
-                if adapter_manager.has_active_chat():
+                if session.adapter is not None:
                     asyncio.create_task(self.action_clear_chat())
 
                 # Switch model
-                provider_id = (
-                    adapter_manager.get_current_provider_id()
-                    or selected_model.model_provider_id
+                self._switch_adapter(
+                    session,
+                    session.provider_id or selected_model.model_provider_id,
+                    selected_model.model_name,
+                    f"✅ Modell gewechselt: {selected_model.model_name}",
+                    "❌ Fehler beim Wechseln des Modells",
                 )
 
-                if adapter_manager.switch_adapter(
-                    provider_id, selected_model.model_name
-                ):
-                    self.adapter = adapter_manager.get_current_adapter()
-                    self._update_footer_adapter_info()
-                    self.add_note(f"✅ Modell gewechselt: {selected_model.model_name}")
-                else:
-                    self.add_note("❌ Fehler beim Wechseln des Modells")
-
-            if adapter_manager.has_active_chat():
+            if session.adapter is not None:
                 # Use callback pattern for ConfirmationDialog
                 self.push_screen(
                     ConfirmationDialog(
@@ -523,26 +981,61 @@ class ChatApp(App):
                 )
             else:
                 # No active chat, switch directly
-                provider_id = (
-                    adapter_manager.get_current_provider_id()
-                    or selected_model.model_provider_id
+                self._switch_adapter(
+                    session,
+                    session.provider_id or selected_model.model_provider_id,
+                    selected_model.model_name,
+                    f"✅ Modell gewechselt: {selected_model.model_name}",
+                    "❌ Fehler beim Wechseln des Modells",
                 )
 
-                if adapter_manager.switch_adapter(
-                    provider_id, selected_model.model_name
-                ):
-                    self.adapter = adapter_manager.get_current_adapter()
-                    self._update_footer_adapter_info()
-                    self.add_note(f"✅ Modell gewechselt: {selected_model.model_name}")
-                else:
-                    self.add_note("❌ Fehler beim Wechseln des Modells")
-
         await self.push_screen(ModelSelectorModal(), handle_model_selection)
 
+    def _switch_adapter(self, session: ChatSession, provider_id: int, model_name: str,
+                        success_note: str, error_note: str) -> Worker[Optional[LLMAdapter]]:
+        """Switch the adapter of one chat session in a worker.
+
+        A newer switch of the same session replaces a pending one; other
+        sessions keep their adapters.
+
+        Args:
+            session (ChatSession): Chat session to switch.
+            provider_id (int): ID of the provider.
+            model_name (str): Name of the model.
+            success_note (str): Note shown after a successful switch.
+            error_note (str): Note shown if the switch failed.
+
+        Returns:
+            Worker: The worker, its result is the new adapter (None if the switch failed).
+        """
+        # Passed uncalled, so a switch replaced before it started leaves no unawaited coroutine
+        return self.run_worker(
+            partial(self._build_session_adapter, session, provider_id, model_name, success_note, error_note),
+            group=f"switch-adapter-{session.session_id}",
+            exclusive=True,
+        )
+
+    async def _build_session_adapter(self, session: ChatSession, provider_id: int, model_name: str,
+                                     success_note: str, error_note: str) -> Optional[LLMAdapter]:
+        """Build a new adapter in the DB thread, assign it to the session and remember the selection."""
+        try:
+            adapter = await run_in_db_thread(adapter_manager.build_adapter, provider_id, model_name)
+        except ValueError as e:
+            self._add_message(f"{error_note}\n\n{e}", "bot", "error", session=session)
+            return None
+        if adapter is None:
+            self._add_message(error_note, "bot", "error", session=session)
+            return None
+        self._set_session_adapter(session, adapter, provider_id, model_name)
+        # The next start and new chats begin with the last selected model
+        await run_in_db_thread(adapter_manager.save_selection, provider_id, model_name)
+        self._add_message(success_note, "bot", "success", session=session)
+        return adapter
+
     def action_copy_last_bot_message(self) -> None:
         """Copy the last bot message to clipboard."""
         try:
-            container = self.query_one("#chat-container", VerticalScroll)
+            container = self._chat_container()
             # Find the last bot bubble
             bot_bubbles = container.query(".bubble-bot")
             self.notify(f"Debug: Found {len(bot_bubbles)} bot bubbles", severity="information")
@@ -559,7 +1052,7 @@ class ChatApp(App):
 
     def action_copy_last_user_message(self) -> None:
         """Copy the last user message to clipboard."""
-        container = self.query_one("#chat-container", VerticalScroll)
+        container = self._chat_container()
         # Find the last user bubble
         user_bubbles = container.query(".bubble-user")
         if user_bubbles:
@@ -2,15 +2,19 @@ from textual.widgets import Static, DataTable, Button, Input, Label, Header, Foo
 from textual.containers import Vertical, Horizontal
 from textual.screen import Screen, ModalScreen
 from textual.binding import Binding
-from typing import List, Optional
+from textual import work
+from typing import Dict, List, Optional
+from ocht.core.db import run_in_db_thread
 from ocht.core.models import Model, LLMProviderConfig
 from ocht.services.model_manager import (
-    get_models_with_provider_info,
+    get_models_page,
     create_model_with_validation,
     update_model_with_validation,
     delete_model_with_checks
 )
 from ocht.services.provider_manager import get_available_providers
+from ocht.tui.widgets.table_pager import TablePager
+from ocht.tui.widgets.table_sync import sync_table_rows, get_selected_row_key
 
 
 class ModelEditScreen(ModalScreen):
@@ -32,15 +36,6 @@ class ModelEditScreen(ModalScreen):
     def compose(self):
         title = "Edit Model" if self.is_edit_mode else "Create New Model"
 
-        # Load available providers for model assignment
-        try:
-            self.providers = get_available_providers()
-        except Exception as e:
-            self.providers = []
-
-        # Create provider selection options for model assignment
-        provider_options = [(f"{provider.prov_name} (ID: {provider.prov_id})", provider.prov_id) for provider in self.providers]
-
         yield Vertical(
             Static(f"🤖 {title}", classes="modal-title"),
             Horizontal(
@@ -54,9 +49,10 @@ class ModelEditScreen(ModalScreen):
             ),
             Horizontal(
                 Label("Model Provider:", classes="form-label"),
+                # Providers are loaded in the background, see load_providers
                 Select(
-                    options=provider_options,
-                    value=self.model.model_provider_id if self.model else (provider_options[0][1] if provider_options else None),
+                    options=[],
+                    prompt="Loading providers…",
                     id="model-provider"
                 ),
                 classes="form-row"
@@ -96,6 +92,28 @@ class ModelEditScreen(ModalScreen):
             classes="model-edit-modal"
         )
 
+    def on_mount(self):
+        """Load available providers for model assignment."""
+        self.load_providers()
+
+    @work(exclusive=True, group="load-providers")
+    async def load_providers(self):
+        """Load providers in the DB thread and fill the provider selection."""
+        try:
+            self.providers = await run_in_db_thread(get_available_providers)
+        except Exception:
+            self.providers = []
+
+        # Create provider selection options for model assignment
+        provider_options = [(f"{provider.prov_name} (ID: {provider.prov_id})", provider.prov_id) for provider in self.providers]
+        select = self.query_one("#model-provider", Select)
+        select.prompt = "Select"
+        select.set_options(provider_options)
+        if self.model:
+            select.value = self.model.model_provider_id
+        elif provider_options:
+            select.value = provider_options[0][1]
+
     def on_button_pressed(self, event: Button.Pressed):
         if event.button.id == "cancel-btn":
             self.action_cancel()
@@ -110,10 +128,13 @@ class ModelEditScreen(ModalScreen):
         """Save the model."""
         self.save_model()
 
-    def save_model(self):
+    @work(exclusive=True, group="save-model")
+    async def save_model(self):
         """Save the model data."""
         name = self.query_one("#model-name", Input).value.strip()
         selected_provider_id = self.query_one("#model-provider", Select).value
+        if selected_provider_id is Select.BLANK:
+            selected_provider_id = None
         description = self.query_one("#model-description", Input).value.strip() or None
         version = self.query_one("#model-version", Input).value.strip() or None
         params = self.query_one("#model-params", Input).value.strip() or None
@@ -129,7 +150,8 @@ class ModelEditScreen(ModalScreen):
         try:
             if self.is_edit_mode:
                 # Update existing model using service function
-                updated_model = update_model_with_validation(
+                updated_model = await run_in_db_thread(
+                    update_model_with_validation,
                     self.model.model_name,
                     new_name=name,
                     provider_id=selected_provider_id,
@@ -143,7 +165,8 @@ class ModelEditScreen(ModalScreen):
                     self.notify("Failed to update model", severity="error")
             else:
                 # Create new model using service function
-                new_model = create_model_with_validation(
+                new_model = await run_in_db_thread(
+                    create_model_with_validation,
                     name,
                     selected_provider_id,
                     description=description,
@@ -172,7 +195,8 @@ class ModelManagerScreen(Screen):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.models: List[Model] = []
+        # Rows of the current page, keyed by the table row key
+        self.models: Dict[str, Model] = {}
         self.providers: List[LLMProviderConfig] = []
 
     def compose(self):
@@ -180,6 +204,7 @@ class ModelManagerScreen(Screen):
         yield Header(show_clock=True)
         yield Vertical(
             Static("Model Management - Use Ctrl+N to add, Ctrl+E to edit, Ctrl+D to delete, ESC to go back", classes="help-text"),
+            TablePager(placeholder="Filter by model name…", id="model-pager"),
             DataTable(id="model-table"),
             Horizontal(
                 Button("➕ Add Model", variant="primary", id="add-model-btn"),
@@ -204,30 +229,41 @@ class ModelManagerScreen(Screen):
         table = self.query_one("#model-table", DataTable)
         table.add_columns("Name", "Model Provider", "Description", "Version", "Created")
 
-    def load_models(self):
-        """Load models from database and populate the table."""
+    @work(exclusive=True, group="load-models")
+    async def load_models(self):
+        """Load the current page of models and apply the changes to the table."""
+        table = self.query_one("#model-table", DataTable)
+        pager = self.query_one("#model-pager", TablePager)
+        # Loading placeholder only while the table is still empty
+        table.loading = table.row_count == 0
         try:
-            # Get models with provider info using service function
-            model_data = get_models_with_provider_info()
-
-            # Extract models for internal use
-            self.models = [data['model'] for data in model_data]
-
-            table = self.query_one("#model-table", DataTable)
-            table.clear()
-
-            for data in model_data:
-                model = data['model']
-                provider_name = data['provider_name']
-                table.add_row(
-                    model.model_name,
-                    provider_name,
-                    model.model_description or "None",
-                    model.model_version or "None",
-                    model.model_created_at.strftime("%Y-%m-%d %H:%M")
-                )
+            # Get one page of models with provider info using service function
+            model_data, total = await run_in_db_thread(
+                get_models_page, pager.page_offset, pager.page_size, pager.filter_text
+            )
+
+            # Keep the models of the page for edit/delete, keyed like the table rows
+            self.models = {data['model'].model_name: data['model'] for data in model_data}
+
+            sync_table_rows(table, (
+                (data['model'].model_name, (
+                    data['model'].model_name,
+                    data['provider_name'],
+                    data['model'].model_description or "None",
+                    data['model'].model_version or "None",
+                    data['model'].model_created_at.strftime("%Y-%m-%d %H:%M")
+                ))
+                for data in model_data
+            ))
+            pager.set_total(total)
         except Exception as e:
             self.notify(f"Error loading models: {str(e)}", severity="error")
+        finally:
+            table.loading = False
+
+    def on_table_pager_changed(self, event: TablePager.Changed):
+        """Reload the table when the filter or page changes."""
+        self.load_models()
 
     def on_button_pressed(self, event: Button.Pressed):
         """Handle button presses."""
@@ -268,12 +304,11 @@ class ModelManagerScreen(Screen):
     def edit_model(self):
         """Show modal to edit selected model."""
         table = self.query_one("#model-table", DataTable)
-        if table.cursor_row is None:
+        selected_model = self.models.get(get_selected_row_key(table))
+        if selected_model is None:
             self.notify("Please select a model to edit", severity="warning")
             return
 
-        selected_model = self.models[table.cursor_row]
-
         def handle_result(result):
             if result:
                 self.load_models()
@@ -281,18 +316,18 @@ class ModelManagerScreen(Screen):
 
         self.app.push_screen(ModelEditScreen(selected_model), handle_result)
 
-    def delete_model(self):
+    @work(exclusive=True, group="delete-model")
+    async def delete_model(self):
         """Delete selected model."""
         table = self.query_one("#model-table", DataTable)
-        if table.cursor_row is None:
+        selected_model = self.models.get(get_selected_row_key(table))
+        if selected_model is None:
             self.notify("Please select a model to delete", severity="warning")
             return
 
-        selected_model = self.models[table.cursor_row]
-
         # Simple confirmation - in a real app you might want a proper confirmation dialog
         try:
-            if delete_model_with_checks(selected_model.model_name):
+            if await run_in_db_thread(delete_model_with_checks, selected_model.model_name):
                 self.load_models()
                 self.notify(f"Model '{selected_model.model_name}' deleted successfully", severity="information")
             else:
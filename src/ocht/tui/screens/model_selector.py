@@ -1,12 +1,20 @@
-from textual.widgets import Static, ListItem, ListView, Button
+from textual.widgets import Static, ListItem, ListView, Button, Input
 from textual.containers import Vertical, Horizontal
 from textual.screen import ModalScreen
 from textual.binding import Binding
+from textual import work
 from typing import List, Optional
+from ocht.core.db import run_in_db_thread
+from ocht.core.fuzzy import FuzzyIndex
 from ocht.core.models import Model
 from ocht.services.model_manager import list_llm_models
-from ocht.services.model_manager import restore_model
+from ocht.services.model_download import model_download_manager, STATE_DONE
 from ocht.tui.widgets.confirmation_dialog import ConfirmationDialog
+from ocht.tui.widgets.download_progress import DownloadProgressPanel
+
+# Only this many matches are mounted as list items; typing narrows the rest
+MAX_VISIBLE_MATCHES = 50
+
 
 class ModelSelectorModal(ModalScreen):
     """Modal dialog for selecting models."""
@@ -21,12 +29,17 @@ class ModelSelectorModal(ModalScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.models: List[Model] = []
+        # Models currently shown in the list (filtered, at most MAX_VISIBLE_MATCHES)
+        self.visible_models: List[Model] = []
         self.selected_model: Optional[Model] = None
+        self._download_model: Optional[Model] = None
+        self._index: FuzzyIndex[Model] = FuzzyIndex([], key=lambda model: model.model_name)
 
     def compose(self):
         """Compose the model selector modal."""
         yield Vertical(
             Static("🔧 Select a model", classes="modal-title"),
+            Input(placeholder="Type to filter models…", id="model-filter", classes="selector-filter"),
             ListView(id="model-list", classes="selector-list"),
             Horizontal(
                 Button("OK", variant="primary", id="ok-btn"),
@@ -40,69 +53,101 @@ class ModelSelectorModal(ModalScreen):
         """Load models when modal is mounted."""
         try:
             self.load_models()
-            # Set focus on the model list after mounting
-            self.query_one("#model-list", ListView).focus()
+            # Set focus on the filter input, arrow keys move through the list
+            self.query_one("#model-filter", Input).focus()
         except Exception as e:
             self.notify(f"Error loading models: {e}", severity="error")
 
-    def load_models(self):
-        """Load models from database and populate the list."""
+    @work(exclusive=True, group="load-models")
+    async def load_models(self):
+        """Load models from database and build the search index."""
+        model_list = self.query_one("#model-list", ListView)
+        # Placeholder until the DB thread delivers the models
+        model_list.clear()
+        model_list.append(ListItem(Static("⏳ Loading models…")))
         try:
             # Get models using service function
-            self.models = list_llm_models()
-
-            model_list = self.query_one("#model-list", ListView)
-            model_list.clear()
+            self.models = await run_in_db_thread(list_llm_models)
+            self._index = FuzzyIndex(self.models, key=lambda model: model.model_name)
 
             if not self.models:
+                model_list.clear()
                 model_list.append(ListItem(Static("No models found. Use model management to add models.")))
                 return
 
-            for model in self.models:
-                if model.is_available:
-                    item_text = f"🔧 {model.model_name}"
-                else:
-                    item_text = f"❌ {model.model_name} (nicht verfügbar)"
-                model_list.append(ListItem(Static(item_text)))
-
-            # Automatically select the first AVAILABLE model if models exist
-            if self.models:
-                # Find first available model
-                first_available_index = None
-                for i, model in enumerate(self.models):
-                    if model.is_available:
-                        first_available_index = i
-                        break
-                
-                if first_available_index is not None:
-                    model_list.index = first_available_index
-                    self.selected_model = self.models[first_available_index]
-                else:
-                    # No available models, select first one but don't set selected_model
-                    model_list.index = 0
-                    self.selected_model = None
+            self.filter_models(self.query_one("#model-filter", Input).value)
 
         except Exception as e:
-            model_list = self.query_one("#model-list", ListView)
             model_list.clear()
             model_list.append(ListItem(Static(f"❌ Error loading models: {str(e)}")))
 
+    def filter_models(self, query: str):
+        """Show the models matching the query; only the visible matches are mounted."""
+        model_list = self.query_one("#model-list", ListView)
+        matches = self._index.search(query)
+        self.visible_models = matches[:MAX_VISIBLE_MATCHES]
+        hidden_count = len(matches) - len(self.visible_models)
+
+        model_list.clear()
+        items = []
+        for model in self.visible_models:
+            if model.is_available:
+                item_text = f"🔧 {model.model_name}"
+            else:
+                item_text = f"❌ {model.model_name} (nicht verfügbar)"
+            items.append(ListItem(Static(item_text)))
+        if hidden_count > 0:
+            items.append(ListItem(Static(f"… {hidden_count} weitere – Suche verfeinern"), disabled=True))
+        elif not self.visible_models:
+            items.append(ListItem(Static("Keine Treffer"), disabled=True))
+        model_list.extend(items)
+
+        # Automatically select the first AVAILABLE match
+        first_available_index = next(
+            (i for i, model in enumerate(self.visible_models) if model.is_available), None
+        )
+        if first_available_index is not None:
+            model_list.index = first_available_index
+            self.selected_model = self.visible_models[first_available_index]
+        else:
+            # No available match, select the first one but don't set selected_model
+            model_list.index = 0 if self.visible_models else None
+            self.selected_model = None
+
+    def on_input_changed(self, event: Input.Changed):
+        """Filter the list while typing."""
+        if event.input.id == "model-filter" and self.models:
+            self.filter_models(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted):
+        """Select the highlighted model when Enter is pressed in the filter."""
+        if event.input.id == "model-filter":
+            event.stop()
+            self.action_select()
+
     def on_list_view_selected(self, event: ListView.Selected):
         """Handle model selection."""
-        if event.list_view.id == "model-list" and self.models:
+        if event.list_view.id == "model-list" and self.visible_models:
             selected_index = event.list_view.index
-            if 0 <= selected_index < len(self.models):
-                self.selected_model = self.models[selected_index]
+            if selected_index is not None and 0 <= selected_index < len(self.visible_models):
+                self.selected_model = self.visible_models[selected_index]
 
     def on_key(self, event):
-        """Handle key events, specifically Enter key when ListView has focus."""
+        """Handle key events: Enter in the list, arrow keys in the filter input."""
+        model_list = self.query_one("#model-list", ListView)
         if event.key == "enter":
-            model_list = self.query_one("#model-list", ListView)
             if model_list.has_focus:
                 self.action_select()
                 event.prevent_default()
                 event.stop()  # Stop event propagation completely
                 return
+        elif event.key in ("up", "down") and self.query_one("#model-filter", Input).has_focus:
+            if event.key == "down":
+                model_list.action_cursor_down()
+            else:
+                model_list.action_cursor_up()
+            event.prevent_default()
+            event.stop()
 
     def on_button_pressed(self, event: Button.Pressed):
         """Handle button presses."""
@@ -120,8 +165,8 @@ class ModelSelectorModal(ModalScreen):
         model_list = self.query_one("#model-list", ListView)
         current_index = model_list.index
         
-        if current_index is not None and 0 <= current_index < len(self.models):
-            selected_model = self.models[current_index]
+        if current_index is not None and 0 <= current_index < len(self.visible_models):
+            selected_model = self.visible_models[current_index]
             
             if not selected_model.is_available:
                 self._download_and_select_model(selected_model)
@@ -133,6 +178,7 @@ class ModelSelectorModal(ModalScreen):
 
     def _download_and_select_model(self, model: Model):
         """Download unavailable model and select it."""
+        self._download_model = model
         # Show confirmation dialog first
         def show_confirmation():
             dialog = ConfirmationDialog(
@@ -151,25 +197,24 @@ class ModelSelectorModal(ModalScreen):
         if not confirmed:
             return
             
-        # Get the currently selected model for download
-        model = self.selected_model
+        # Get the model the download was requested for
+        model = self._download_model or self.selected_model
         if not model:
             model_list = self.query_one("#model-list", ListView)
-            if model_list.index is not None and 0 <= model_list.index < len(self.models):
-                model = self.models[model_list.index]
+            if model_list.index is not None and 0 <= model_list.index < len(self.visible_models):
+                model = self.visible_models[model_list.index]
             else:
                 return
 
-        try:
-            self.notify(f"Lade Model '{model.model_name}' herunter...", severity="information")
-            result = restore_model(model.model_name)
-            
-            if result['success']:
-                self.notify(f"Model '{model.model_name}' erfolgreich heruntergeladen!", severity="information")
-                # Refresh the model list to update availability status
-                self.load_models()
-                self.dismiss(model)
-            else:
-                self.notify(f"Fehler beim Herunterladen: {result.get('message', 'Unbekannter Fehler')}", severity="error")
-        except Exception as e:
-            self.notify(f"Fehler beim Herunterladen von '{model.model_name}': {str(e)}", severity="error")
\ No newline at end of file
+        self.notify(f"Lade Model '{model.model_name}' herunter...", severity="information")
+        # Show the progress inside the modal; the download keeps running if the modal is closed
+        modal = self.query_one(".selector-modal", Vertical)
+        if not self.query(DownloadProgressPanel):
+            modal.mount(DownloadProgressPanel(), before=modal.query_one(".button-row"))
+        self.run_worker(self._download_and_dismiss(model), exclusive=True, group="model-download")
+
+    async def _download_and_dismiss(self, model: Model) -> None:
+        """Waits for the download without blocking the UI and selects the model when done."""
+        progress = await model_download_manager.download(model.model_name)
+        if progress.state == STATE_DONE and self.is_current:
+            self.dismiss(model)
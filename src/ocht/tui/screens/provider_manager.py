@@ -2,14 +2,18 @@ from textual.widgets import Static, DataTable, Button, Input, Label, Header, Foo
 from textual.containers import Vertical, Horizontal
 from textual.screen import Screen, ModalScreen
 from textual.binding import Binding
-from typing import List, Optional
+from textual import work
+from typing import Dict, Optional
+from ocht.core.db import run_in_db_thread
 from ocht.core.models import LLMProviderConfig
 from ocht.services.provider_manager import (
-    get_providers_with_info,
+    get_providers_page,
     create_provider_with_validation,
     update_provider_with_validation,
     delete_provider_with_checks
 )
+from ocht.tui.widgets.table_pager import TablePager
+from ocht.tui.widgets.table_sync import sync_table_rows, get_selected_row_key
 
 
 class ProviderEditScreen(ModalScreen):
@@ -90,7 +94,8 @@ class ProviderEditScreen(ModalScreen):
         """Save the provider."""
         self.save_provider()
 
-    def save_provider(self):
+    @work(exclusive=True, group="save-provider")
+    async def save_provider(self):
         """Save the provider data."""
         name = self.query_one("#provider-name", Input).value.strip()
         api_key = self.query_one("#provider-api-key", Input).value.strip()
@@ -108,7 +113,8 @@ class ProviderEditScreen(ModalScreen):
         try:
             if self.is_edit_mode:
                 # Update existing provider using service function
-                updated_provider = update_provider_with_validation(
+                updated_provider = await run_in_db_thread(
+                    update_provider_with_validation,
                     self.provider.prov_id,
                     name=name,
                     api_key=api_key,
@@ -121,7 +127,8 @@ class ProviderEditScreen(ModalScreen):
                     self.notify("Failed to update provider", severity="error")
             else:
                 # Create new provider using service function
-                new_provider = create_provider_with_validation(
+                new_provider = await run_in_db_thread(
+                    create_provider_with_validation,
                     name,
                     api_key=api_key,
                     endpoint=endpoint,
@@ -149,13 +156,15 @@ class ProviderManagerScreen(Screen):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.providers: List[LLMProviderConfig] = []
+        # Rows of the current page, keyed by the table row key
+        self.providers: Dict[str, LLMProviderConfig] = {}
 
     def compose(self):
         """Compose the provider manager screen."""
         yield Header(show_clock=True)
         yield Vertical(
             Static("Provider Management - Use Ctrl+N to add, Ctrl+E to edit, Ctrl+D to delete, ESC to go back", classes="help-text"),
+            TablePager(placeholder="Filter by provider name…", id="provider-pager"),
             DataTable(id="provider-table"),
             Horizontal(
                 Button("➕ Add Provider", variant="primary", id="add-provider-btn"),
@@ -180,29 +189,41 @@ class ProviderManagerScreen(Screen):
         table = self.query_one("#provider-table", DataTable)
         table.add_columns("ID", "Name", "Endpoint", "Default Model", "Created")
 
-    def load_providers(self):
-        """Load providers from database and populate the table."""
+    @work(exclusive=True, group="load-providers")
+    async def load_providers(self):
+        """Load the current page of providers and apply the changes to the table."""
+        table = self.query_one("#provider-table", DataTable)
+        pager = self.query_one("#provider-pager", TablePager)
+        # Loading placeholder only while the table is still empty
+        table.loading = table.row_count == 0
         try:
-            # Get providers with info using service function
-            provider_data = get_providers_with_info()
-
-            # Extract providers for internal use
-            self.providers = [data['provider'] for data in provider_data]
-
-            table = self.query_one("#provider-table", DataTable)
-            table.clear()
-
-            for data in provider_data:
-                provider = data['provider']
-                table.add_row(
-                    str(provider.prov_id),
-                    provider.prov_name,
-                    provider.prov_endpoint or "Default",
-                    provider.prov_default_model or "None",
-                    provider.prov_created_at.strftime("%Y-%m-%d %H:%M")
-                )
+            # Get one page of providers with info using service function
+            provider_data, total = await run_in_db_thread(
+                get_providers_page, pager.page_offset, pager.page_size, pager.filter_text
+            )
+
+            # Keep the providers of the page for edit/delete, keyed like the table rows
+            self.providers = {str(data['provider'].prov_id): data['provider'] for data in provider_data}
+
+            sync_table_rows(table, (
+                (data['provider'].prov_id, (
+                    str(data['provider'].prov_id),
+                    data['provider'].prov_name,
+                    data['provider'].prov_endpoint or "Default",
+                    data['provider'].prov_default_model or "None",
+                    data['provider'].prov_created_at.strftime("%Y-%m-%d %H:%M")
+                ))
+                for data in provider_data
+            ))
+            pager.set_total(total)
         except Exception as e:
             self.notify(f"Error loading providers: {str(e)}", severity="error")
+        finally:
+            table.loading = False
+
+    def on_table_pager_changed(self, event: TablePager.Changed):
+        """Reload the table when the filter or page changes."""
+        self.load_providers()
 
     def on_button_pressed(self, event: Button.Pressed):
         """Handle button presses."""
@@ -243,12 +264,11 @@ class ProviderManagerScreen(Screen):
     def edit_provider(self):
         """Show modal to edit selected provider."""
         table = self.query_one("#provider-table", DataTable)
-        if table.cursor_row is None:
+        selected_provider = self.providers.get(get_selected_row_key(table))
+        if selected_provider is None:
             self.notify("Please select a provider to edit", severity="warning")
             return
 
-        selected_provider = self.providers[table.cursor_row]
-
         def handle_result(result):
             if result:
                 self.load_providers()
@@ -256,18 +276,18 @@ class ProviderManagerScreen(Screen):
 
         self.app.push_screen(ProviderEditScreen(selected_provider), handle_result)
 
-    def delete_provider(self):
+    @work(exclusive=True, group="delete-provider")
+    async def delete_provider(self):
         """Delete selected provider."""
         table = self.query_one("#provider-table", DataTable)
-        if table.cursor_row is None:
+        selected_provider = self.providers.get(get_selected_row_key(table))
+        if selected_provider is None:
             self.notify("Please select a provider to delete", severity="warning")
             return
 
-        selected_provider = self.providers[table.cursor_row]
-
         # Simple confirmation - in a real app you might want a proper confirmation dialog
         try:
-            if delete_provider_with_checks(selected_provider.prov_id):
+            if await run_in_db_thread(delete_provider_with_checks, selected_provider.prov_id):
                 self.load_providers()
                 self.notify(f"Provider '{selected_provider.prov_name}' deleted successfully", severity="information")
             else:
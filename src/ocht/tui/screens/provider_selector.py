@@ -2,7 +2,9 @@ from textual.widgets import Static, ListItem, ListView, Button
 from textual.containers import Vertical, Horizontal
 from textual.screen import ModalScreen
 from textual.binding import Binding
+from textual import work
 from typing import List, Optional
+from ocht.core.db import run_in_db_thread
 from ocht.core.models import LLMProviderConfig
 from ocht.services.provider_manager import get_available_providers
 
@@ -44,13 +46,17 @@ class ProviderSelectorModal(ModalScreen):
         except Exception as e:
             self.notify(f"Error loading providers: {e}", severity="error")
 
-    def load_providers(self):
+    @work(exclusive=True, group="load-providers")
+    async def load_providers(self):
         """Load providers from database and populate the list."""
+        provider_list = self.query_one("#provider-list", ListView)
+        # Placeholder until the DB thread delivers the providers
+        provider_list.clear()
+        provider_list.append(ListItem(Static("⏳ Loading providers…")))
         try:
             # Get providers using service function
-            self.providers = get_available_providers()
+            self.providers = await run_in_db_thread(get_available_providers)
 
-            provider_list = self.query_one("#provider-list", ListView)
             provider_list.clear()
 
             if not self.providers:
@@ -70,7 +76,6 @@ class ProviderSelectorModal(ModalScreen):
                 self.selected_provider = self.providers[0]
 
         except Exception as e:
-            provider_list = self.query_one("#provider-list", ListView)
             provider_list.clear()
             provider_list.append(ListItem(Static(f"❌ Error loading providers: {str(e)}")))
 
@@ -1,15 +1,29 @@
-from textual.widgets import Static, DataTable, Button, Input, Label, Header, Footer
+from textual.widgets import Static, DataTable, Button, Input, Label, Header, Footer, Select
 from textual.containers import Vertical, Horizontal
 from textual.screen import Screen, ModalScreen
 from textual.binding import Binding
-from typing import List, Optional
-from ocht.core.models import Setting
+from textual import work
+from typing import Dict, List, Optional
+from ocht.core.db import run_in_db_thread
+from ocht.core.models import GLOBAL_SCOPE_ID, Setting
 from ocht.services.settings_manager import (
-    get_all_settings_with_info,
+    get_settings_page,
     create_setting_with_validation,
     update_setting_with_validation,
     delete_setting_with_checks
 )
+from ocht.services.settings_resolver import settings_resolver
+from ocht.tui.widgets.table_pager import TablePager
+from ocht.tui.widgets.table_sync import sync_table_rows, get_selected_row_key
+
+
+def _row_key(setting: Setting) -> str:
+    """Table row key of a setting; keys are only unique per scope."""
+    return f"{setting.setting_workspace_id}:{setting.setting_key}"
+
+
+def _scope_label(workspace_id: int) -> str:
+    return "Global" if workspace_id == GLOBAL_SCOPE_ID else f"Workspace {workspace_id}"
 
 
 class SettingEditScreen(ModalScreen):
@@ -22,10 +36,16 @@ class SettingEditScreen(ModalScreen):
         Binding("enter", "save", "Save"),
     ]
 
-    def __init__(self, setting: Optional[Setting] = None, **kwargs):
+    def __init__(self, setting: Optional[Setting] = None, workspace_id: Optional[int] = None, **kwargs):
+        """
+        Args:
+            setting: Setting to edit (None: create a new one)
+            workspace_id: Workspace of the current chat, offered as scope of a new setting
+        """
         super().__init__(**kwargs)
         self.setting = setting
         self.is_edit_mode = setting is not None
+        self.workspace_id = workspace_id
 
     def compose(self):
         title = "Edit Setting" if self.is_edit_mode else "Create New Setting"
@@ -41,6 +61,17 @@ class SettingEditScreen(ModalScreen):
                 ),
                 classes="form-row"
             ),
+            Horizontal(
+                Label("Scope:", classes="form-label"),
+                Select(
+                    options=[(_scope_label(scope_id), scope_id) for scope_id in self._scope_options()],
+                    value=self.setting.setting_workspace_id if self.setting else GLOBAL_SCOPE_ID,
+                    allow_blank=False,
+                    id="setting-scope",
+                    disabled=self.is_edit_mode  # The scope is part of the key
+                ),
+                classes="form-row"
+            ),
             Horizontal(
                 Label("Value:", classes="form-label"),
                 Input(
@@ -58,6 +89,14 @@ class SettingEditScreen(ModalScreen):
             classes="setting-edit-modal"
         )
 
+    def _scope_options(self) -> List[int]:
+        """Global and the current workspace (or the scope of the edited setting)."""
+        if self.setting is not None:
+            return [self.setting.setting_workspace_id]
+        if self.workspace_id is None:
+            return [GLOBAL_SCOPE_ID]
+        return [GLOBAL_SCOPE_ID, self.workspace_id]
+
     def on_button_pressed(self, event: Button.Pressed):
         if event.button.id == "cancel-btn":
             self.action_cancel()
@@ -72,7 +111,8 @@ class SettingEditScreen(ModalScreen):
         """Save the setting."""
         self.save_setting()
 
-    def save_setting(self):
+    @work(exclusive=True, group="save-setting")
+    async def save_setting(self):
         """Save the setting data."""
         key = self.query_one("#setting-key", Input).value.strip()
         value = self.query_one("#setting-value", Input).value.strip()
@@ -88,9 +128,11 @@ class SettingEditScreen(ModalScreen):
         try:
             if self.is_edit_mode:
                 # Update existing setting using service function
-                updated_setting = update_setting_with_validation(
+                updated_setting = await run_in_db_thread(
+                    update_setting_with_validation,
                     self.setting.setting_key,
-                    value=value
+                    value=value,
+                    workspace_id=self.setting.setting_workspace_id
                 )
                 if updated_setting:
                     self.dismiss(updated_setting)
@@ -98,7 +140,11 @@ class SettingEditScreen(ModalScreen):
                     self.notify("Failed to update setting", severity="error")
             else:
                 # Create new setting using service function
-                new_setting = create_setting_with_validation(key, value)
+                scope_id = self.query_one("#setting-scope", Select).value
+                new_setting = await run_in_db_thread(
+                    create_setting_with_validation, key, value,
+                    workspace_id=None if scope_id == GLOBAL_SCOPE_ID else scope_id
+                )
                 self.dismiss(new_setting)
         except ValueError as e:
             self.notify(str(e), severity="error")
@@ -121,13 +167,15 @@ class SettingsManagerScreen(Screen):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.settings: List[Setting] = []
+        # Rows of the current page, keyed by the table row key
+        self.settings: Dict[str, Setting] = {}
 
     def compose(self):
         """Compose the settings manager screen."""
         yield Header(show_clock=True)
         yield Vertical(
             Static("Settings Management - Use Ctrl+N to add, Ctrl+E to edit, Ctrl+D to delete, ESC to go back", classes="help-text"),
+            TablePager(placeholder="Filter by key…", id="settings-pager"),
             DataTable(id="settings-table"),
             Horizontal(
                 Button("➕ Add Setting", variant="primary", id="add-setting-btn"),
@@ -150,38 +198,52 @@ class SettingsManagerScreen(Screen):
     def setup_table(self):
         """Setup the data table columns."""
         table = self.query_one("#settings-table", DataTable)
-        table.add_columns("Key", "Value", "Workspace Scoped", "Created", "Updated")
+        table.add_columns("Key", "Value", "Scope", "Created", "Updated")
 
-    def load_settings(self):
-        """Load settings from database and populate the table."""
+    @work(exclusive=True, group="load-settings")
+    async def load_settings(self):
+        """Load the current page of settings and apply the changes to the table."""
+        table = self.query_one("#settings-table", DataTable)
+        pager = self.query_one("#settings-pager", TablePager)
+        # Loading placeholder only while the table is still empty
+        table.loading = table.row_count == 0
         try:
-            # Get settings with info using service function
-            settings_data = get_all_settings_with_info()
-
-            # Extract settings for internal use
-            self.settings = [data['setting'] for data in settings_data]
+            # Get one page of settings with info using service function
+            settings_data, total = await run_in_db_thread(
+                get_settings_page, pager.page_offset, pager.page_size, pager.filter_text
+            )
 
-            table = self.query_one("#settings-table", DataTable)
-            table.clear()
+            # Keep the settings of the page for edit/delete, keyed like the table rows
+            self.settings = {_row_key(data['setting']): data['setting'] for data in settings_data}
 
+            rows = []
             for data in settings_data:
                 setting = data['setting']
-                workspace_scoped = "Yes" if data['workspace_scoped'] else "No"
-                
+                scope = _scope_label(setting.setting_workspace_id) if data['workspace_scoped'] else "Global"
+
                 # Truncate long values for display
                 display_value = setting.setting_value
                 if len(display_value) > 50:
                     display_value = display_value[:47] + "..."
-                
-                table.add_row(
+
+                rows.append((_row_key(setting), (
                     setting.setting_key,
                     display_value,
-                    workspace_scoped,
+                    scope,
                     setting.setting_created_at.strftime("%Y-%m-%d %H:%M"),
                     setting.setting_updated_at.strftime("%Y-%m-%d %H:%M")
-                )
+                )))
+
+            sync_table_rows(table, rows)
+            pager.set_total(total)
         except Exception as e:
             self.notify(f"Error loading settings: {str(e)}", severity="error")
+        finally:
+            table.loading = False
+
+    def on_table_pager_changed(self, event: TablePager.Changed):
+        """Reload the table when the filter or page changes."""
+        self.load_settings()
 
     def on_button_pressed(self, event: Button.Pressed):
         """Handle button presses."""
@@ -217,17 +279,17 @@ class SettingsManagerScreen(Screen):
                 self.load_settings()
                 self.notify(f"Setting '{result.setting_key}' created successfully", severity="information")
 
-        self.app.push_screen(SettingEditScreen(), handle_result)
+        # New settings can be global or belong to the workspace of the current chat
+        self.app.push_screen(SettingEditScreen(workspace_id=settings_resolver.active_workspace_id), handle_result)
 
     def edit_setting(self):
         """Show modal to edit selected setting."""
         table = self.query_one("#settings-table", DataTable)
-        if table.cursor_row is None:
+        selected_setting = self.settings.get(get_selected_row_key(table))
+        if selected_setting is None:
             self.notify("Please select a setting to edit", severity="warning")
             return
 
-        selected_setting = self.settings[table.cursor_row]
-
         def handle_result(result):
             if result:
                 self.load_settings()
@@ -235,17 +297,18 @@ class SettingsManagerScreen(Screen):
 
         self.app.push_screen(SettingEditScreen(selected_setting), handle_result)
 
-    def delete_setting(self):
+    @work(exclusive=True, group="delete-setting")
+    async def delete_setting(self):
         """Delete selected setting."""
         table = self.query_one("#settings-table", DataTable)
-        if table.cursor_row is None:
+        selected_setting = self.settings.get(get_selected_row_key(table))
+        if selected_setting is None:
             self.notify("Please select a setting to delete", severity="warning")
             return
 
-        selected_setting = self.settings[table.cursor_row]
-
         try:
-            if delete_setting_with_checks(selected_setting.setting_key):
+            if await run_in_db_thread(delete_setting_with_checks, selected_setting.setting_key,
+                                      selected_setting.setting_workspace_id):
                 self.load_settings()
                 self.notify(f"Setting '{selected_setting.setting_key}' deleted successfully", severity="information")
             else:
@@ -2,14 +2,18 @@ from textual.widgets import Static, DataTable, Button, Input, Label, Header, Foo
 from textual.containers import Vertical, Horizontal
 from textual.screen import Screen, ModalScreen
 from textual.binding import Binding
-from typing import List, Optional
+from textual import work
+from typing import Dict, Optional
+from ocht.core.db import run_in_db_thread
 from ocht.core.models import Workspace
 from ocht.services.workspace_manager import (
-    get_workspaces_with_info,
+    get_workspaces_page,
     create_workspace_with_validation,
     update_workspace_with_validation,
     delete_workspace_with_checks
 )
+from ocht.tui.widgets.table_pager import TablePager
+from ocht.tui.widgets.table_sync import sync_table_rows, get_selected_row_key
 
 
 class WorkspaceEditScreen(ModalScreen):
@@ -80,7 +84,8 @@ class WorkspaceEditScreen(ModalScreen):
         """Save the workspace."""
         self.save_workspace()
 
-    def save_workspace(self):
+    @work(exclusive=True, group="save-workspace")
+    async def save_workspace(self):
         """Save the workspace data."""
         name = self.query_one("#workspace-name", Input).value.strip()
         default_model = self.query_one("#workspace-default-model", Input).value.strip()
@@ -97,7 +102,8 @@ class WorkspaceEditScreen(ModalScreen):
         try:
             if self.is_edit_mode:
                 # Update existing workspace using service function
-                updated_workspace = update_workspace_with_validation(
+                updated_workspace = await run_in_db_thread(
+                    update_workspace_with_validation,
                     self.workspace.work_id,
                     name=name,
                     default_model=default_model,
@@ -109,7 +115,8 @@ class WorkspaceEditScreen(ModalScreen):
                     self.notify("Failed to update workspace", severity="error")
             else:
                 # Create new workspace using service function
-                new_workspace = create_workspace_with_validation(
+                new_workspace = await run_in_db_thread(
+                    create_workspace_with_validation,
                     name,
                     default_model=default_model,
                     description=description
@@ -136,13 +143,15 @@ class WorkspaceManagerScreen(Screen):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.workspaces: List[Workspace] = []
+        # Rows of the current page, keyed by the table row key
+        self.workspaces: Dict[str, Workspace] = {}
 
     def compose(self):
         """Compose the workspace manager screen."""
         yield Header(show_clock=True)
         yield Vertical(
             Static("Workspace Management - Use Ctrl+N to add, Ctrl+E to edit, Ctrl+D to delete, ESC to go back", classes="help-text"),
+            TablePager(placeholder="Filter by workspace name…", id="workspace-pager"),
             DataTable(id="workspace-table"),
             Horizontal(
                 Button("➕ Add Workspace", variant="primary", id="add-workspace-btn"),
@@ -167,29 +176,41 @@ class WorkspaceManagerScreen(Screen):
         table = self.query_one("#workspace-table", DataTable)
         table.add_columns("ID", "Name", "Default Model", "Description", "Created")
 
-    def load_workspaces(self):
-        """Load workspaces from database and populate the table."""
+    @work(exclusive=True, group="load-workspaces")
+    async def load_workspaces(self):
+        """Load the current page of workspaces and apply the changes to the table."""
+        table = self.query_one("#workspace-table", DataTable)
+        pager = self.query_one("#workspace-pager", TablePager)
+        # Loading placeholder only while the table is still empty
+        table.loading = table.row_count == 0
         try:
-            # Get workspaces with info using service function
-            workspace_data = get_workspaces_with_info()
-
-            # Extract workspaces for internal use
-            self.workspaces = [data['workspace'] for data in workspace_data]
-
-            table = self.query_one("#workspace-table", DataTable)
-            table.clear()
-
-            for data in workspace_data:
-                workspace = data['workspace']
-                table.add_row(
-                    str(workspace.work_id),
-                    workspace.work_name,
-                    workspace.work_default_model,
-                    workspace.work_description or "No description",
-                    workspace.work_created_at.strftime("%Y-%m-%d %H:%M")
-                )
+            # Get one page of workspaces with info using service function
+            workspace_data, total = await run_in_db_thread(
+                get_workspaces_page, pager.page_offset, pager.page_size, pager.filter_text
+            )
+
+            # Keep the workspaces of the page for edit/delete, keyed like the table rows
+            self.workspaces = {str(data['workspace'].work_id): data['workspace'] for data in workspace_data}
+
+            sync_table_rows(table, (
+                (data['workspace'].work_id, (
+                    str(data['workspace'].work_id),
+                    data['workspace'].work_name,
+                    data['workspace'].work_default_model,
+                    data['workspace'].work_description or "No description",
+                    data['workspace'].work_created_at.strftime("%Y-%m-%d %H:%M")
+                ))
+                for data in workspace_data
+            ))
+            pager.set_total(total)
         except Exception as e:
             self.notify(f"Error loading workspaces: {str(e)}", severity="error")
+        finally:
+            table.loading = False
+
+    def on_table_pager_changed(self, event: TablePager.Changed):
+        """Reload the table when the filter or page changes."""
+        self.load_workspaces()
 
     def on_button_pressed(self, event: Button.Pressed):
         """Handle button presses."""
@@ -230,12 +251,11 @@ class WorkspaceManagerScreen(Screen):
     def edit_workspace(self):
         """Show modal to edit selected workspace."""
         table = self.query_one("#workspace-table", DataTable)
-        if table.cursor_row is None:
+        selected_workspace = self.workspaces.get(get_selected_row_key(table))
+        if selected_workspace is None:
             self.notify("Please select a workspace to edit", severity="warning")
             return
 
-        selected_workspace = self.workspaces[table.cursor_row]
-
         def handle_result(result):
             if result:
                 self.load_workspaces()
@@ -243,18 +263,18 @@ class WorkspaceManagerScreen(Screen):
 
         self.app.push_screen(WorkspaceEditScreen(selected_workspace), handle_result)
 
-    def delete_workspace(self):
+    @work(exclusive=True, group="delete-workspace")
+    async def delete_workspace(self):
         """Delete selected workspace."""
         table = self.query_one("#workspace-table", DataTable)
-        if table.cursor_row is None:
+        selected_workspace = self.workspaces.get(get_selected_row_key(table))
+        if selected_workspace is None:
             self.notify("Please select a workspace to delete", severity="warning")
             return
 
-        selected_workspace = self.workspaces[table.cursor_row]
-
         # Simple confirmation - in a real app you might want a proper confirmation dialog
         try:
-            if delete_workspace_with_checks(selected_workspace.work_id):
+            if await run_in_db_thread(delete_workspace_with_checks, selected_workspace.work_id):
                 self.load_workspaces()
                 self.notify(f"Workspace '{selected_workspace.work_name}' deleted successfully", severity="information")
             else:
@@ -1,11 +1,17 @@
-from textual.widgets import Static, ListItem, ListView, Button
+from textual.widgets import Static, ListItem, ListView, Button, Input
 from textual.containers import Vertical, Horizontal
 from textual.screen import ModalScreen
 from textual.binding import Binding
+from textual import work
 from typing import List, Optional
+from ocht.core.db import run_in_db_thread
+from ocht.core.fuzzy import FuzzyIndex
 from ocht.core.models import Workspace
 from ocht.services.workspace_manager import get_available_workspaces
 
+# Only this many matches are mounted as list items; typing narrows the rest
+MAX_VISIBLE_MATCHES = 50
+
 
 class WorkspaceSelectorModal(ModalScreen):
     """Modal dialog for selecting workspaces."""
@@ -20,12 +26,16 @@ class WorkspaceSelectorModal(ModalScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.workspaces: List[Workspace] = []
+        # Workspaces currently shown in the list (filtered, at most MAX_VISIBLE_MATCHES)
+        self.visible_workspaces: List[Workspace] = []
         self.selected_workspace: Optional[Workspace] = None
+        self._index: FuzzyIndex[Workspace] = FuzzyIndex([], key=lambda workspace: workspace.work_name)
 
     def compose(self):
         """Compose the workspace selector modal."""
         yield Vertical(
             Static("📁 Select a Workspace", classes="modal-title"),
+            Input(placeholder="Type to filter workspaces…", id="workspace-filter", classes="selector-filter"),
             ListView(id="workspace-list", classes="selector-list"),
             Horizontal(
                 Button("OK", variant="primary", id="ok-btn"),
@@ -38,58 +48,104 @@ class WorkspaceSelectorModal(ModalScreen):
     def on_mount(self):
         """Load workspaces when modal is mounted."""
         self.load_workspaces()
-        # Set focus on the workspace list after mounting
-        self.query_one("#workspace-list", ListView).focus()
-
-    def load_workspaces(self):
-        """Load workspaces from database and populate the list."""
+        # Set focus on the filter input, arrow keys move through the list
+        self.query_one("#workspace-filter", Input).focus()
+
+    @work(exclusive=True, group="load-workspaces")
+    async def load_workspaces(self):
+        """Load workspaces from database and build the search index."""
+        workspace_list = self.query_one("#workspace-list", ListView)
+        # Placeholder until the DB thread delivers the workspaces
+        workspace_list.clear()
+        workspace_list.append(ListItem(Static("⏳ Loading workspaces…")))
         try:
             # Get workspaces using service function
-            self.workspaces = get_available_workspaces()
-
-            workspace_list = self.query_one("#workspace-list", ListView)
-            workspace_list.clear()
+            self.workspaces = await run_in_db_thread(get_available_workspaces)
+            self._index = FuzzyIndex(self.workspaces, key=lambda workspace: workspace.work_name)
 
             if not self.workspaces:
+                workspace_list.clear()
                 workspace_list.append(ListItem(Static("No workspaces found. Use workspace management to add workspaces.")))
                 return
 
-            for workspace in self.workspaces:
-                item_text = f"📁 {workspace.work_name}"
-                if workspace.work_description:
-                    item_text += f" - {workspace.work_description}"
-                if workspace.work_default_model:
-                    item_text += f" (Model: {workspace.work_default_model})"
-                workspace_list.append(ListItem(Static(item_text)))
-
-            # Automatically select the first element if workspaces exist
-            if self.workspaces:
-                workspace_list.index = 0
-                # Also set the selected_workspace to the first one
-                self.selected_workspace = self.workspaces[0]
+            self.filter_workspaces(self.query_one("#workspace-filter", Input).value)
 
         except Exception as e:
-            workspace_list = self.query_one("#workspace-list", ListView)
             workspace_list.clear()
             workspace_list.append(ListItem(Static(f"❌ Error loading workspaces: {str(e)}")))
 
+    def filter_workspaces(self, query: str):
+        """Show the workspaces matching the query; only the visible matches are mounted."""
+        workspace_list = self.query_one("#workspace-list", ListView)
+        matches = self._index.search(query)
+        self.visible_workspaces = matches[:MAX_VISIBLE_MATCHES]
+        hidden_count = len(matches) - len(self.visible_workspaces)
+
+        workspace_list.clear()
+        items = []
+        for workspace in self.visible_workspaces:
+            item_text = f"📁 {workspace.work_name}"
+            if workspace.work_description:
+                item_text += f" - {workspace.work_description}"
+            if workspace.work_default_model:
+                item_text += f" (Model: {workspace.work_default_model})"
+            items.append(ListItem(Static(item_text)))
+        if hidden_count > 0:
+            items.append(ListItem(Static(f"… {hidden_count} weitere – Suche verfeinern"), disabled=True))
+        elif not self.visible_workspaces:
+            items.append(ListItem(Static("Keine Treffer"), disabled=True))
+        workspace_list.extend(items)
+
+        # Automatically select the best match
+        if self.visible_workspaces:
+            workspace_list.index = 0
+            self.selected_workspace = self.visible_workspaces[0]
+        else:
+            workspace_list.index = None
+            self.selected_workspace = None
+
+    def on_input_changed(self, event: Input.Changed):
+        """Filter the list while typing."""
+        if event.input.id == "workspace-filter" and self.workspaces:
+            self.filter_workspaces(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted):
+        """Select the highlighted workspace when Enter is pressed in the filter."""
+        if event.input.id == "workspace-filter":
+            event.stop()
+            self.action_select()
+
+    def on_list_view_highlighted(self, event: ListView.Highlighted):
+        """Keep the selection in sync with the highlighted workspace."""
+        if event.list_view.id == "workspace-list":
+            index = event.list_view.index
+            if index is not None and 0 <= index < len(self.visible_workspaces):
+                self.selected_workspace = self.visible_workspaces[index]
+
     def on_list_view_selected(self, event: ListView.Selected):
         """Handle workspace selection."""
-        if event.list_view.id == "workspace-list" and self.workspaces:
+        if event.list_view.id == "workspace-list" and self.visible_workspaces:
             selected_index = event.list_view.index
-            if 0 <= selected_index < len(self.workspaces):
-                self.selected_workspace = self.workspaces[selected_index]
+            if selected_index is not None and 0 <= selected_index < len(self.visible_workspaces):
+                self.selected_workspace = self.visible_workspaces[selected_index]
 
     def on_key(self, event):
-        """Handle key events, specifically Enter key when ListView has focus."""
+        """Handle key events: Enter in the list, arrow keys in the filter input."""
+        workspace_list = self.query_one("#workspace-list", ListView)
         if event.key == "enter":
             # Check if the workspace list has focus
-            workspace_list = self.query_one("#workspace-list", ListView)
             if workspace_list.has_focus:
                 # Trigger the select action when Enter is pressed on ListView
                 self.action_select()
                 event.prevent_default()
                 return
+        elif event.key in ("up", "down") and self.query_one("#workspace-filter", Input).has_focus:
+            if event.key == "down":
+                workspace_list.action_cursor_down()
+            else:
+                workspace_list.action_cursor_up()
+            event.prevent_default()
+            event.stop()
         # Let other keys be handled normally by the default behavior
 
     def on_button_pressed(self, event: Button.Pressed):
@@ -110,8 +166,8 @@ class WorkspaceSelectorModal(ModalScreen):
         else:
             # If no workspace is explicitly selected, try to get the highlighted one
             workspace_list = self.query_one("#workspace-list", ListView)
-            if workspace_list.index is not None and 0 <= workspace_list.index < len(self.workspaces):
-                selected_workspace = self.workspaces[workspace_list.index]
+            if workspace_list.index is not None and 0 <= workspace_list.index < len(self.visible_workspaces):
+                selected_workspace = self.visible_workspaces[workspace_list.index]
                 self.dismiss(selected_workspace)
             else:
                 self.notify("Please select a workspace first", severity="warning")
\ No newline at end of file
@@ -3,6 +3,7 @@ from textual.containers import Container
 from textual.binding import Binding
 import re
 import pyperclip
+from ocht.core.profiling import track_awaitable
 
 class ChatBubble(Container):
     """Chat message bubble widget with Markdown rendering AND text selection support."""
@@ -70,7 +71,7 @@ class ChatBubble(Container):
         # Update Markdown content
         try:
             markdown_widget = self.query_one("#bubble-markdown", Markdown)
-            markdown_widget.update(display_content)
+            track_awaitable("tui.markdown_render", markdown_widget.update(display_content))
         except Exception as e:
             # Markdown might not be composed yet
             self._initial_text = display_content
@@ -87,7 +88,7 @@ class ChatBubble(Container):
         # Update Markdown with final content (no cursor indicator)
         try:
             markdown_widget = self.query_one("#bubble-markdown", Markdown)
-            markdown_widget.update(self._content)
+            track_awaitable("tui.markdown_render", markdown_widget.update(self._content))
         except Exception:
             # Markdown might not be composed yet
             self._initial_text = self._content
@@ -1,3 +1,4 @@
+from typing import Optional
 from textual.widgets import Static
 from textual.reactive import reactive
 from textual.app import ComposeResult
@@ -28,6 +29,13 @@ class CustomFooter(Static):
         padding: 0 1;
     }
     
+    CustomFooter .footer-throughput {
+        width: auto;
+        text-align: right;
+        content-align: right middle;
+        padding: 0 1;
+    }
+    
     CustomFooter .footer-adapter {
         width: auto;
         text-align: right;
@@ -37,7 +45,9 @@ class CustomFooter(Static):
     }
     """
     
-    adapter_info = reactive("No adapter configured")
+    # Placeholder until the adapter settings are loaded in the background
+    adapter_info = reactive("⏳ Loading…")
+    throughput_info = reactive("")
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -47,6 +57,8 @@ class CustomFooter(Static):
         with Horizontal():
             # Keybindings on the left
             yield Static("^C Quit  ^L Clear  ESC Focus", classes="footer-keys")
+            # Live throughput of the current/last response
+            yield Static(self.throughput_info, id="footer-throughput", classes="footer-throughput")
             # Adapter info on the right
             yield Static(self.adapter_info, id="footer-adapter", classes="footer-adapter")
     
@@ -103,4 +115,24 @@ class CustomFooter(Static):
             adapter_widget.update(self.adapter_info)
         except Exception:
             # Widget might not exist yet during initialization
-            pass
\ No newline at end of file
+            pass
+    
+    def update_throughput(self, tokens_per_second: Optional[float] = None, streaming: bool = False) -> None:
+        """Update the throughput display.
+        
+        Args:
+            tokens_per_second: Current or final generation speed, None to clear
+            streaming: Whether the response is still streaming
+        """
+        if tokens_per_second is None:
+            self.throughput_info = ""
+        else:
+            marker = "⚡" if streaming else "✓"
+            self.throughput_info = f"{marker} {tokens_per_second:.1f} tok/s"
+        
+        try:
+            throughput_widget = self.query_one("#footer-throughput", Static)
+            throughput_widget.update(self.throughput_info)
+        except Exception:
+            # Widget might not exist yet during initialization
+            pass
@@ -0,0 +1,163 @@
+import time
+from typing import Dict, Optional
+from textual.app import ComposeResult
+from textual.containers import Horizontal, Vertical
+from textual.message import Message
+from textual.widgets import Button, ProgressBar, Static
+from ocht.services.model_download import (
+    DownloadProgress,
+    ModelDownloadManager,
+    STATE_DONE,
+    STATE_FAILED,
+    STATE_CANCELLED,
+    model_download_manager,
+)
+
+# Refresh interval of the panel in seconds
+REFRESH_INTERVAL = 0.25
+# How long finished downloads stay visible
+FINISHED_VISIBLE_SECONDS = 5.0
+
+
+def _format_bytes(value: int) -> str:
+    """Formats a byte count for display."""
+    size = float(value)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class DownloadRow(Horizontal):
+    """One download with label, progress bar and cancel button."""
+
+    def __init__(self, model_name: str, **kwargs):
+        super().__init__(classes="download-row", **kwargs)
+        self.model_name = model_name
+
+    def compose(self) -> ComposeResult:
+        yield Static(self.model_name, classes="download-label")
+        yield ProgressBar(total=None, show_eta=False, classes="download-bar")
+        yield Button("✕", variant="error", classes="download-cancel")
+
+    def refresh_progress(self, progress: DownloadProgress) -> None:
+        """Updates label and progress bar from the download progress."""
+        if progress.state == STATE_DONE:
+            text = f"✅ {progress.model_name}: fertig"
+        elif progress.state == STATE_FAILED:
+            text = f"❌ {progress.model_name}: {progress.error}"
+        elif progress.state == STATE_CANCELLED:
+            text = f"⏹ {progress.model_name}: abgebrochen"
+        elif progress.total:
+            text = (f"⬇ {progress.model_name}: {progress.status} "
+                    f"({_format_bytes(progress.completed)} / {_format_bytes(progress.total)})")
+        else:
+            text = f"⬇ {progress.model_name}: {progress.status or progress.state}"
+        self.query_one(".download-label", Static).update(text)
+
+        bar = self.query_one(".download-bar", ProgressBar)
+        if progress.state == STATE_DONE:
+            bar.update(total=1, progress=1)
+        elif progress.total:
+            bar.update(total=progress.total, progress=progress.completed)
+        self.query_one(".download-cancel", Button).display = not progress.is_finished
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        self.post_message(DownloadProgressPanel.CancelRequested(self.model_name))
+
+
+class DownloadProgressPanel(Vertical):
+    """
+    Shows running model downloads of a ModelDownloadManager.
+
+    Polls the manager periodically instead of reacting to every progress
+    update, so fast progress streams do not flood the UI. Hidden while no
+    downloads are running.
+    """
+
+    DEFAULT_CSS = """
+    DownloadProgressPanel {
+        height: auto;
+        max-height: 8;
+        padding: 0 1;
+        background: $surface-lighten-1;
+    }
+
+    DownloadProgressPanel .download-row {
+        height: 1;
+    }
+
+    DownloadProgressPanel .download-label {
+        width: 1fr;
+        height: 1;
+    }
+
+    DownloadProgressPanel .download-bar {
+        width: 40;
+        height: 1;
+    }
+
+    DownloadProgressPanel .download-cancel {
+        min-width: 5;
+        width: 5;
+        height: 1;
+        border: none;
+    }
+    """
+
+    class CancelRequested(Message):
+        """Posted when the cancel button of a download is pressed."""
+
+        def __init__(self, model_name: str):
+            super().__init__()
+            self.model_name = model_name
+
+    def __init__(self, manager: Optional[ModelDownloadManager] = None, model_name: Optional[str] = None, **kwargs):
+        """
+        Initialize the download panel.
+
+        Args:
+            manager: Download manager to observe (default: global instance)
+            model_name: Only show this model's download (default: all)
+        """
+        super().__init__(**kwargs)
+        self.manager = manager or model_download_manager
+        self.model_name = model_name
+        self._rows: Dict[str, DownloadRow] = {}
+
+    def on_mount(self) -> None:
+        self.display = False
+        self.set_interval(REFRESH_INTERVAL, self.refresh_downloads)
+        self.refresh_downloads()
+
+    def refresh_downloads(self) -> None:
+        """Syncs the rows with the downloads of the manager."""
+        now = time.monotonic()
+        visible = {
+            progress.model_name: progress
+            for progress in self.manager.all_downloads()
+            if (self.model_name is None or progress.model_name == self.model_name)
+            and (not progress.is_finished or now - (progress.finished_at or now) < FINISHED_VISIBLE_SECONDS)
+        }
+
+        for name in list(self._rows):
+            if name not in visible:
+                self._rows.pop(name).remove()
+
+        for name, progress in visible.items():
+            row = self._rows.get(name)
+            if row is None:
+                row = self._rows[name] = DownloadRow(name)
+                self.mount(row)
+                self.call_after_refresh(row.refresh_progress, progress)
+            else:
+                row.refresh_progress(progress)
+
+        self.display = bool(visible)
+
+    def on_download_progress_panel_cancel_requested(self, message: "DownloadProgressPanel.CancelRequested") -> None:
+        message.stop()
+        if self.manager.cancel(message.model_name):
+            self.notify(f"Download von '{message.model_name}' abgebrochen", severity="warning")
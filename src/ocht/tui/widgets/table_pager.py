@@ -0,0 +1,101 @@
+from typing import Optional
+from textual.app import ComposeResult
+from textual.containers import Horizontal
+from textual.message import Message
+from textual.timer import Timer
+from textual.widgets import Button, Input, Static
+
+# Rows per page of the manager tables
+DEFAULT_PAGE_SIZE = 100
+# Wait this long after the last keystroke before filtering (seconds)
+FILTER_DEBOUNCE_SECONDS = 0.3
+
+
+class TablePager(Horizontal):
+    """
+    Filter input and page navigation for a DataTable backed by a paged query.
+
+    The pager only keeps offset, page size and filter text; the owning screen
+    loads the page and reports the total number of matches via ``set_total``.
+    """
+
+    DEFAULT_CSS = """
+    TablePager {
+        height: auto;
+        margin-bottom: 1;
+    }
+
+    TablePager .pager-filter {
+        width: 1fr;
+    }
+
+    TablePager .pager-info {
+        width: auto;
+        min-width: 20;
+        padding: 1 2;
+        text-align: center;
+    }
+
+    TablePager Button {
+        min-width: 5;
+    }
+    """
+
+    class Changed(Message):
+        """Posted when the filter text or the page changes."""
+
+        def __init__(self, pager: "TablePager"):
+            super().__init__()
+            self.pager = pager
+
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE, placeholder: str = "Filter…", **kwargs):
+        super().__init__(**kwargs)
+        self.page_size = page_size
+        self.page_offset = 0
+        self.total_rows = 0
+        self.filter_text: Optional[str] = None
+        self._placeholder = placeholder
+        self._debounce: Optional[Timer] = None
+
+    def compose(self) -> ComposeResult:
+        yield Input(placeholder=self._placeholder, classes="pager-filter")
+        yield Button("◀", classes="pager-prev")
+        yield Static("", classes="pager-info")
+        yield Button("▶", classes="pager-next")
+
+    def set_total(self, total: int) -> None:
+        """Stores the number of matches and updates the page label and buttons."""
+        self.total_rows = total
+        if self.page_offset and self.page_offset >= total:
+            # The last page became empty (e.g. after a delete): go back one page
+            self.page_offset = max(0, (total - 1) // self.page_size * self.page_size)
+            self.post_message(self.Changed(self))
+            return
+        first = self.page_offset + 1 if total else 0
+        last = min(self.page_offset + self.page_size, total)
+        self.query_one(".pager-info", Static).update(f"{first}–{last} of {total}")
+        self.query_one(".pager-prev", Button).disabled = self.page_offset == 0
+        self.query_one(".pager-next", Button).disabled = last >= total
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        event.stop()
+        if self._debounce is not None:
+            self._debounce.stop()
+        self._debounce = self.set_timer(FILTER_DEBOUNCE_SECONDS, lambda: self._apply_filter(event.value))
+
+    def _apply_filter(self, value: str) -> None:
+        filter_text = value.strip() or None
+        if filter_text != self.filter_text:
+            self.filter_text = filter_text
+            self.page_offset = 0
+            self.post_message(self.Changed(self))
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        if event.button.has_class("pager-prev"):
+            self.page_offset = max(0, self.page_offset - self.page_size)
+        elif event.button.has_class("pager-next"):
+            if self.page_offset + self.page_size >= self.total_rows:
+                return
+            self.page_offset += self.page_size
+        self.post_message(self.Changed(self))
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+from textual.widgets import DataTable
+from textual.widgets.data_table import CellDoesNotExist
+
+
+@dataclass
+class TableDiff:
+    """Number of rows changed by sync_table_rows."""
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+def sync_table_rows(table: DataTable, rows: Iterable[Tuple[Hashable, Sequence[Any]]]) -> TableDiff:
+    """
+    Applies row-level changes to a DataTable instead of rebuilding it.
+
+    Rows are identified by their key (usually the primary key). Rows missing
+    from ``rows`` are removed, new rows are added and existing rows only get
+    their changed cells updated, so cursor and scroll position survive a
+    refresh. Afterwards the table has the order of ``rows``.
+
+    Args:
+        table: DataTable whose columns match the cells of ``rows``
+        rows: (key, cells) pairs in display order
+
+    Returns:
+        TableDiff: Number of added, updated and removed rows
+    """
+    new_rows: Dict[str, Tuple[Any, ...]] = {str(key): tuple(cells) for key, cells in rows}
+    existing = {row_key.value for row_key in table.rows}
+    column_keys = list(table.columns)
+    diff = TableDiff()
+
+    for key in existing - new_rows.keys():
+        table.remove_row(key)
+        diff.removed += 1
+
+    for key, cells in new_rows.items():
+        if key not in existing:
+            table.add_row(*cells, key=key)
+            diff.added += 1
+            continue
+        changed = False
+        for column_key, old_value, new_value in zip(column_keys, table.get_row(key), cells):
+            if old_value != new_value:
+                table.update_cell(key, column_key, new_value)
+                changed = True
+        if changed:
+            diff.updated += 1
+
+    # New rows are appended at the end; restore the requested order if needed
+    order = list(new_rows)
+    if [row.key.value for row in table.ordered_rows] != order:
+        position = {cells: index for index, cells in enumerate(new_rows.values())}
+        table.sort(key=lambda cells: position.get(tuple(cells), len(position)))
+
+    return diff
+
+
+def get_selected_row_key(table: DataTable) -> Optional[str]:
+    """Returns the key of the row under the cursor, or None for an empty table."""
+    try:
+        return table.coordinate_to_cell_key(table.cursor_coordinate).row_key.value
+    except CellDoesNotExist:
+        return None
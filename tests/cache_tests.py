@@ -0,0 +1,83 @@
+import pytest
+
+from ocht.core.db import create_db_engine, init_db
+from ocht.services import cache
+from ocht.services.cache import TableCache
+from ocht.services.adapter_manager import AdapterManager
+from ocht.services.provider_manager import create_provider_with_validation, get_available_providers
+from ocht.services.model_manager import create_model_with_validation, list_llm_models, update_model_with_validation
+from ocht.services.settings_manager import create_setting_with_validation, get_all_settings_with_info
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'cache.db'}")
+    init_db(create_db_engine())
+    cache.invalidate_all()
+    yield
+    cache.invalidate_all()
+
+
+def test_table_cache_hits_misses_and_ttl(monkeypatch):
+    loads = []
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+
+    def loader():
+        loads.append(1)
+        return ["a", "b"]
+
+    table = TableCache("letters", loader, key=lambda value: value, ttl=10)
+    assert table.all() == ["a", "b"]
+    assert table.get("b") == "b"
+    assert table.get("missing") is None
+    assert len(loads) == 1
+    assert (table.stats.hits, table.stats.misses) == (2, 1)
+
+    now[0] += 11
+    table.get("a")
+    assert len(loads) == 2
+
+    table.invalidate()
+    table.get("a")
+    assert len(loads) == 3
+    assert table.stats.invalidations == 1
+
+
+def test_service_writes_invalidate_cache(temp_db):
+    provider = create_provider_with_validation("Ollama", api_key="none")
+    assert [p.prov_name for p in get_available_providers()] == ["Ollama"]
+
+    create_model_with_validation("llama3", provider.prov_id)
+    assert [m.model_name for m in list_llm_models()] == ["llama3"]
+    hits = cache.models_cache.stats.hits
+    list_llm_models()
+    assert cache.models_cache.stats.hits == hits + 1
+
+    update_model_with_validation("llama3", description="updated")
+    assert list_llm_models()[0].model_description == "updated"
+
+    create_setting_with_validation("theme", "dark")
+    assert [info['setting'].setting_key for info in get_all_settings_with_info()] == ["theme"]
+
+
+def test_adapter_info_needs_no_queries(temp_db, monkeypatch):
+    provider = create_provider_with_validation("Ollama", api_key="none")
+    create_model_with_validation("llama3", provider.prov_id)
+
+    manager = AdapterManager()
+    assert manager.switch_adapter(provider.prov_id, "llama3")
+    assert not manager.requires_provider_selection()
+
+    # Make any further load fail: adapter info must come from memory
+    def _fail():
+        raise AssertionError("database access")
+
+    for table in (cache.settings_cache, cache.providers_cache, cache.models_cache):
+        monkeypatch.setattr(table, "_loader", _fail)
+        table.invalidate()
+
+    info = manager.get_adapter_info()
+    assert info["provider_name"] == "Ollama"
+    assert info["model_name"] == "llama3"
+    assert info["is_active"]
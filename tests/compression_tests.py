@@ -0,0 +1,119 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+
+from ocht.core import compression
+from ocht.core.db import create_db_engine, get_session, init_db
+from ocht.core.models import MessageBody
+from ocht.repositories.message import (create_message, delete_message, delete_messages_before, get_branch,
+                                       get_message_by_id, update_message)
+from ocht.repositories.workspace import create_workspace
+from ocht.services import cache
+from ocht.services.conversation import append_exchange, load_active_branch
+from ocht.services.transfer import export_data, import_data
+
+CODE_DUMP = "def handler(request):\n    return {'status': 200, 'body': request.body}\n" * 200
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    def use_database(name):
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / name}")
+        init_db(create_db_engine())
+        cache.invalidate_all()
+
+    use_database("ocht.db")
+    yield use_database
+    cache.invalidate_all()
+
+
+def _workspace(name="Main"):
+    with get_session() as db:
+        return create_workspace(db, name, "llama3").work_id
+
+
+def _body_count():
+    with get_session() as db:
+        return db.exec(select(func.count()).select_from(MessageBody)).one()[0]
+
+
+@pytest.mark.parametrize("codec", [compression.CODEC_ZLIB, compression.CODEC_ZSTD])
+def test_codecs_round_trip(codec):
+    if codec == compression.CODEC_ZSTD and compression.zstandard is None:
+        pytest.skip("zstandard is not installed")
+    text = CODE_DUMP + "äöü ✓"
+    assert compression.decompress_text(compression.compress_text(text, codec), codec) == text
+    assert compression.compress_if_large("short", codec) is None
+    assert compression.compress_if_large(CODE_DUMP, codec)[0] == codec
+    with pytest.raises(ValueError, match="not available"):
+        compression.decompress_text(b"", "lz4")
+
+
+def test_large_messages_are_stored_compressed(temp_db, monkeypatch):
+    workspace_id = _workspace()
+    with get_session() as db:
+        large = create_message(db, workspace_id, "assistant", CODE_DUMP)
+        assert large.msg_content == "" and large.msg_body.body_size == len(CODE_DUMP)
+        assert len(large.msg_body.body_data) < len(CODE_DUMP) / 10
+    with get_session() as db:
+        small = create_message(db, workspace_id, "user", "Hi", parent_id=large.msg_id)
+    # Texts that do not compress well enough stay inline (random hex only saves about half)
+    monkeypatch.setattr(compression, "MIN_SAVING", 0.6)
+    with get_session() as db:
+        noise = create_message(db, workspace_id, "user", os.urandom(3000).hex())
+
+    assert large.content == CODE_DUMP and small.content == small.msg_content == "Hi"
+    assert noise.msg_body is None and _body_count() == 1
+
+    statements = []
+    engine = create_db_engine()
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with get_session(engine) as db:
+        assert get_message_by_id(db, small.msg_id).content == "Hi"
+        assert len(statements) == 1  # no body query for inline messages
+        assert get_message_by_id(db, large.msg_id).content == CODE_DUMP
+
+    with get_session() as db:
+        update_message(db, large.msg_id, "now short")
+        assert get_message_by_id(db, large.msg_id).msg_content == "now short"
+    assert _body_count() == 0
+
+
+def test_bodies_are_loaded_only_where_needed_and_deleted_with_their_message(temp_db):
+    workspace_id = _workspace()
+    with get_session() as db:
+        root = create_message(db, workspace_id, "user", "Hi")
+        leaf = create_message(db, workspace_id, "assistant", "Hello", parent_id=root.msg_id)
+        large = create_message(db, workspace_id, "assistant", CODE_DUMP, parent_id=root.msg_id)
+        leaf_id, large_id = leaf.msg_id, large.msg_id
+    assert large.content == CODE_DUMP
+
+    statements = []
+    engine = create_db_engine()
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with get_session(engine) as db:
+        assert [m.content for m in get_branch(db, leaf_id)] == ["Hi", "Hello"]
+        assert not any("messagebody" in statement.lower() for statement in statements)
+
+    with get_session() as db:
+        assert delete_message(db, large_id)
+    assert _body_count() == 0
+
+
+def test_bodies_in_export_import_and_retention(temp_db, tmp_path):
+    workspace_id = _workspace()
+    append_exchange(workspace_id, "Show me the code", CODE_DUMP)
+    path = str(tmp_path / "chat.jsonl")
+    export_data(path)
+    assert CODE_DUMP.splitlines()[0] in open(path).read()
+
+    temp_db("target.db")
+    summary = import_data(path)
+    assert summary.inserted["message"] == 2 and _body_count() == 1
+    assert [m.content for m in load_active_branch(1)] == ["Show me the code", CODE_DUMP]
+
+    with get_session() as db:
+        assert delete_messages_before(db, 1, datetime.now() + timedelta(seconds=1)) == 2
+    assert _body_count() == 0
@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import event
+
+from ocht.core.db import create_db_engine, get_session, init_db
+from ocht.repositories.message import create_message, get_branch, get_descendants, get_leaf_messages
+from ocht.repositories.workspace import create_workspace, get_workspace_by_id
+from ocht.services import cache
+from ocht.services.conversation import append_exchange, fork_branch, get_active_leaf_id, load_active_branch
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'conversation.db'}")
+    engine = create_db_engine()
+    init_db(engine)
+    cache.invalidate_all()
+    yield engine
+    cache.invalidate_all()
+
+
+def test_branch_of_deep_tree_loads_with_constant_queries(temp_db):
+    with get_session(temp_db) as db:
+        workspace = create_workspace(db, "Branches", "llama3")
+        parent_id = None
+        for depth in range(200):
+            parent_id = create_message(db, workspace.work_id, "user", f"m{depth}", parent_id).msg_id
+        fork = create_message(db, workspace.work_id, "assistant", "other answer", 3)
+
+        statements = []
+        event.listen(temp_db, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        branch = get_branch(db, parent_id)
+        assert len(statements) == 2
+        assert [message.msg_content for message in branch] == [f"m{depth}" for depth in range(200)]
+        assert branch[-1].msg_depth == 199
+
+        assert [message.msg_content for message in get_branch(db, fork.msg_id)] == ["m0", "m1", "m2", "other answer"]
+        assert len(get_descendants(db, branch[2])) == 198
+        assert {leaf.msg_id for leaf in get_leaf_messages(db, workspace.work_id)} == {parent_id, fork.msg_id}
+
+        with pytest.raises(ValueError):
+            create_message(db, workspace.work_id + 1, "user", "wrong workspace", parent_id)
+
+
+def test_fork_starts_new_branch_from_kept_messages(temp_db):
+    with get_session(temp_db) as db:
+        workspace_id = create_workspace(db, "Fork", "llama3").work_id
+
+    append_exchange(workspace_id, "Hi", "Hello")
+    append_exchange(workspace_id, "Tell a joke", "Joke A")
+    assert [m.msg_content for m in load_active_branch(workspace_id)] == ["Hi", "Hello", "Tell a joke", "Joke A"]
+
+    fork_branch(workspace_id, 2)
+    user_message, _ = append_exchange(workspace_id, "Tell a better joke", "Joke B")
+    assert [m.msg_content for m in load_active_branch(workspace_id)] == ["Hi", "Hello", "Tell a better joke", "Joke B"]
+    assert user_message.msg_depth == 2
+
+    with get_session(temp_db) as db:
+        assert len(get_leaf_messages(db, workspace_id)) == 2
+
+    assert fork_branch(workspace_id, 0) is None
+    assert get_active_leaf_id(workspace_id) is None
+    with pytest.raises(ValueError):
+        fork_branch(workspace_id, 1)
+
+    append_exchange(workspace_id, "Tell a long story", "Once upon a", partial=True)
+    assert [m.msg_partial for m in load_active_branch(workspace_id)] == [False, True]
+
+
+def test_active_leaf_is_stored_on_the_workspace(temp_db):
+    with get_session(temp_db) as db:
+        workspace_id = create_workspace(db, "Leaf", "llama3").work_id
+    cache.get_cached_settings()
+    invalidations = cache.settings_cache.stats.invalidations
+
+    _, answer = append_exchange(workspace_id, "Hi", "Hello")
+    fork_branch(workspace_id, 0)
+    append_exchange(workspace_id, "Again", "Hello again")
+
+    # Switching branches and storing exchanges leaves the settings cache alone
+    assert cache.settings_cache.stats.invalidations == invalidations
+    assert cache.get_cached_settings() == []
+    with get_session(temp_db) as db:
+        assert get_workspace_by_id(db, workspace_id).work_active_leaf_id == get_active_leaf_id(workspace_id)
+    assert get_active_leaf_id(workspace_id) != answer.msg_id
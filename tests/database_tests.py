@@ -1,4 +1,6 @@
+import asyncio
 import os
+import threading
 from pathlib import Path
 import tempfile
 
@@ -6,7 +8,7 @@ import pytest
 from sqlalchemy.engine import Engine
 from sqlmodel import select
 
-from ocht.core.db import get_database_url, create_db_engine, init_db, get_session
+from ocht.core.db import get_database_url, create_db_engine, init_db, get_session, run_in_db_thread
 from ocht.core.models import Workspace, LLMProviderConfig  # Hinweis: passe den Import-Pfad ggf. an
 
 
@@ -76,4 +78,68 @@ def test_get_session_and_crud(tmp_path, monkeypatch):
     # Query über die Session
     result = session.exec(select(Workspace).where(Workspace.work_name == "TestWS")).one_or_none()
     assert result is not None
-    assert result.work_default_model == str(provider_config.prov_id)
\ No newline at end of file
+    assert result.work_default_model == str(provider_config.prov_id)
+
+
+def test_run_in_db_thread_uses_single_db_thread():
+    def _thread_name(value):
+        return threading.current_thread().name, value
+
+    async def scenario():
+        return await asyncio.gather(*(run_in_db_thread(_thread_name, i) for i in range(5)))
+
+    results = asyncio.run(scenario())
+    assert [value for _, value in results] == list(range(5))
+    assert len({name for name, _ in results}) == 1
+    assert results[0][0].startswith("ocht-db")
+    assert results[0][0] != threading.current_thread().name
+
+
+def test_run_in_db_thread_propagates_errors():
+    def _fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(run_in_db_thread(_fail))
+
+
+def test_name_lookups_use_case_insensitive_unique_index(tmp_path, monkeypatch):
+    from sqlalchemy import text
+    from sqlalchemy.exc import IntegrityError
+    from ocht.repositories.workspace import get_workspace_by_name
+    from ocht.repositories.llm_provider_config import get_llm_provider_config_by_name
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    engine = create_db_engine()
+    init_db(engine)
+    with get_session(engine) as session:
+        session.add(LLMProviderConfig(prov_name="Ollama", prov_api_key="none"))
+        session.add(Workspace(work_name="Research", work_default_model="1"))
+        session.commit()
+
+        assert get_llm_provider_config_by_name(session, "OLLAMA").prov_name == "Ollama"
+        assert get_workspace_by_name(session, "research").work_name == "Research"
+        assert get_workspace_by_name(session, "other") is None
+
+        plan = session.exec(text("EXPLAIN QUERY PLAN SELECT * FROM workspace WHERE lower(work_name) = lower('x')")).all()
+        assert "ix_workspace_work_name_lower" in " ".join(str(row) for row in plan)
+
+        session.add(Workspace(work_name="RESEARCH", work_default_model="1"))
+        with pytest.raises(IntegrityError):
+            session.commit()
+
+
+def test_get_settings_by_workspace(tmp_path, monkeypatch):
+    from ocht.core.models import Setting
+    from ocht.repositories.setting import get_settings_by_workspace
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    engine = create_db_engine()
+    init_db(engine)
+    with get_session(engine) as session:
+        session.add(Setting(setting_key="global", setting_value="1"))
+        session.add(Setting(setting_key="scoped", setting_value="2", setting_workspace_id=7))
+        session.commit()
+
+        assert [s.setting_key for s in get_settings_by_workspace(session, 7)] == ["scoped"]
+        assert [s.setting_key for s in get_settings_by_workspace(session, None)] == ["global"]
@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.fanout import fan_out
+from ocht.adapters.instrumentation import InstrumentedAdapter, MetricsRecorder
+from ocht.adapters.scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from ocht.services import compare
+
+
+class CountingAdapter(LLMAdapter):
+    """Streams three chunks and tracks how many requests run at the same time."""
+
+    running = 0
+    peak = 0
+
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.fail = fail
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        return self.name
+
+    async def send_prompt_stream(self, prompt: str, **kwargs):
+        CountingAdapter.running += 1
+        CountingAdapter.peak = max(CountingAdapter.peak, CountingAdapter.running)
+        try:
+            for index in range(3):
+                await asyncio.sleep(0.01)
+                if self.fail and index == 1:
+                    raise RuntimeError("model crashed")
+                yield f"{self.name}{index}"
+        finally:
+            CountingAdapter.running -= 1
+
+
+def test_fan_out_bounds_concurrency_and_isolates_errors():
+    CountingAdapter.peak = 0
+    recorder = MetricsRecorder()
+    adapters = {
+        name: InstrumentedAdapter(CountingAdapter(name, fail=name == "c"), model_name=name,
+                                  recorder=recorder, span_method="compare")
+        for name in ("a", "b", "c", "d")
+    }
+    chunks = []
+
+    results = asyncio.run(fan_out(adapters, "hi", max_concurrency=2, on_chunk=lambda name, text: chunks.append(name)))
+
+    assert CountingAdapter.peak == 2
+    assert list(results) == ["a", "b", "c", "d"]
+    assert results["a"].text == "a0a1a2"
+    assert (results["c"].text, results["c"].error) == ("c0", "model crashed")
+    assert results["d"].queued_seconds > 0
+    assert results["a"].span.ttft_seconds is not None
+    assert {span.method for span in recorder.recent()} == {"compare"}
+    assert set(chunks) == {"a", "b", "c", "d"}
+
+    with pytest.raises(ValueError):
+        asyncio.run(fan_out(adapters, "hi", max_concurrency=0))
+
+
+def test_compare_models_persists_spans(monkeypatch):
+    persisted = []
+    monkeypatch.setattr(compare, "persist_spans_in_background", persisted.extend)
+    adapters = {name: InstrumentedAdapter(CountingAdapter(name), model_name=name, recorder=MetricsRecorder())
+                for name in ("a", "b")}
+
+    results = asyncio.run(compare.compare_models(adapters, "hi", max_concurrency=1))
+
+    assert [span.model_name for span in persisted] == ["a", "b"]
+    assert results["b"].text == "b0b1b2"
+    assert compare.parse_model_list(" llama3, qwen3,,llama3 ") == ["llama3", "qwen3"]
+    with pytest.raises(ValueError):
+        compare.parse_model_list("llama3")
+
+
+def test_compare_adapters_run_at_batch_priority(monkeypatch):
+    monkeypatch.setattr(compare, "get_cached_model", lambda name: SimpleNamespace(model_provider_id=1))
+    monkeypatch.setattr(compare.adapter_manager, "build_adapter",
+                        lambda provider_id, model_name: InstrumentedAdapter(CountingAdapter(model_name)))
+
+    adapters = compare.build_compare_adapters(["a", "b"])
+
+    assert {adapter.span_method for adapter in adapters.values()} == {compare.COMPARE_METHOD}
+    assert {adapter.inner.request_priority for adapter in adapters.values()} == {PRIORITY_BATCH}
+    assert CountingAdapter("c").request_priority == PRIORITY_INTERACTIVE
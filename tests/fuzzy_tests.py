@@ -0,0 +1,30 @@
+from ocht.core.fuzzy import FuzzyIndex, fuzzy_score
+
+
+def test_fuzzy_score_subsequence():
+    assert fuzzy_score("l3", "llama3:8b") is not None
+    assert fuzzy_score("3l", "llama3") is None
+    # Prefix matches beat matches in the middle of the name
+    assert fuzzy_score("qw", "qwen2.5") > fuzzy_score("qw", "my-qwen")
+
+
+def test_fuzzy_index_ranks_and_filters():
+    names = ["mistral:7b", "llama3:8b", "llama3:70b", "phi3", "codellama"]
+    index = FuzzyIndex(names, key=lambda name: name)
+
+    assert index.search("") == names
+    assert index.search("llama") == ["llama3:8b", "llama3:70b", "codellama"]
+    assert index.search("LLAMA 70") == ["llama3:70b"]
+    assert index.search("xyz") == []
+    assert index.search("llama", limit=1) == ["llama3:8b"]
+
+
+def test_fuzzy_index_incremental_typing_matches_full_search():
+    names = [f"model-{i}" for i in range(200)] + ["qwen2.5:14b"]
+    index = FuzzyIndex(names, key=lambda name: name)
+
+    results = [index.search(query) for query in ("m", "mo", "mod", "model-1", "model-19")]
+    fresh = FuzzyIndex(names, key=lambda name: name)
+    assert results[-1] == fresh.search("model-19")
+    # Deleting characters searches all items again
+    assert index.search("q") == ["qwen2.5:14b"]
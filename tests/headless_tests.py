@@ -0,0 +1,164 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import ocht
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.streaming import StreamLimits
+from ocht.cli import cli
+from ocht.core.db import create_db_engine, get_session, init_db
+from ocht.repositories.workspace import create_workspace
+from ocht.services import cache, headless
+from ocht.services.adapter_manager import adapter_manager
+from ocht.services.conversation import load_active_branch
+
+
+class EchoAdapter(LLMAdapter):
+    """Streams the prompt back word by word and remembers the loaded history."""
+
+    def __init__(self):
+        self.history = []
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        return prompt
+
+    async def send_prompt_stream(self, prompt: str, **kwargs):
+        for word in f"You said: {prompt}".split(" "):
+            yield word + " "
+
+    def load_history(self, messages):
+        self.history = list(messages)
+
+
+@pytest.fixture
+def adapter(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'ocht.db'}")
+    init_db(create_db_engine())
+    cache.invalidate_all()
+    echo = EchoAdapter()
+    monkeypatch.setattr(adapter_manager, "load_settings_on_startup", lambda **kwargs: True)
+    monkeypatch.setattr(adapter_manager, "get_current_adapter", lambda: echo)
+    yield echo
+    cache.invalidate_all()
+
+
+def _workspace():
+    with get_session() as db:
+        return create_workspace(db, "Scripts", "llama3").work_id
+
+
+def test_headless_path_does_not_import_textual_or_langchain():
+    code = ("import sys, ocht.cli, ocht.services.headless; "
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'textual', 'langchain', 'ollama'}))")
+    env = {**os.environ, "PYTHONPATH": str(Path(ocht.__file__).resolve().parents[1])}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+class OllamaStandIn(BaseHTTPRequestHandler):
+    """Answers Ollama's /api/chat with one streamed word."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        lines = [{"message": {"role": "assistant", "content": "Hello"}, "done": False},
+                 {"message": {"role": "assistant", "content": ""}, "done": True}]
+        payload = "".join(json.dumps(line) + "\n" for line in lines).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+ASK_AND_LIST_MODULES = """
+import io, sys
+from ocht.core.db import get_session
+from ocht.core.migration import ensure_schema
+from ocht.repositories.llm_provider_config import create_llm_provider_config
+from ocht.repositories.model import create_model
+from ocht.repositories.setting import create_setting
+from ocht.services import headless
+
+ensure_schema()
+with get_session() as db:
+    provider = create_llm_provider_config(db, "Ollama", "", sys.argv[1])
+    create_model(db, "stub", provider.prov_id)
+    create_setting(db, "current_provider_id", str(provider.prov_id))
+    create_setting(db, "current_model_name", "stub")
+print(headless.ask("Hi", out=io.StringIO()).text)
+print(sorted({m.split('.')[0] for m in sys.modules} & {'textual', 'langchain', 'langchain_ollama', 'ollama'}))
+"""
+
+
+def test_ask_without_backend_setting_does_not_load_langchain(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    env = {**os.environ, "PYTHONPATH": str(Path(ocht.__file__).resolve().parents[1]),
+           "DATABASE_URL": f"sqlite:///{tmp_path / 'ocht.db'}"}
+    try:
+        result = subprocess.run([sys.executable, "-c", ASK_AND_LIST_MODULES,
+                                 f"http://127.0.0.1:{server.server_port}"],
+                                capture_output=True, text=True, env=env, check=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert result.stdout.splitlines() == ["Hello", "[]"]
+
+
+def test_build_prompt():
+    assert headless.build_prompt("Review this", "diff --git a b\n") == "Review this\n\ndiff --git a b"
+    assert headless.build_prompt(None, "only stdin") == "only stdin"
+    assert headless.build_prompt("only argument", "") == "only argument"
+    with pytest.raises(ValueError, match="No prompt"):
+        headless.build_prompt(" ", None)
+
+
+def test_ask_streams_and_continues_the_workspace(adapter):
+    workspace_id = _workspace()
+    out = io.StringIO()
+    reply = headless.ask("Hello there", workspace_id, out)
+    assert out.getvalue() == reply.text + "\n" == "You said: Hello there \n" and not reply.stopped
+
+    # A second run (a new process in practice) continues with the stored exchange as history
+    headless.ask("Again", workspace_id, io.StringIO())
+    assert adapter.history == [("human", "Hello there"), ("ai", "You said: Hello there ")]
+    assert [m.content for m in load_active_branch(workspace_id)][2:] == ["Again", "You said: Again "]
+
+    with pytest.raises(ValueError, match="not found"):
+        headless.ask("Hi", workspace_id + 1, io.StringIO())
+
+
+def test_plain_chat_reads_one_prompt_per_line(adapter, monkeypatch, capsys):
+    workspace_id = _workspace()
+    out = io.StringIO()
+    assert headless.plain_chat(workspace_id, io.StringIO("First\n\nSecond\n/bye\nIgnored\n"), out) == 2
+    assert out.getvalue() == "You said: First \nYou said: Second \n"
+
+    # Answers cut by the stream.* limits are stored as partial, the note goes to stderr
+    monkeypatch.setattr(headless, "get_stream_limits", lambda: StreamLimits(max_tokens=2))
+    assert headless.plain_chat(workspace_id, io.StringIO("Third"), io.StringIO()) == 1
+    assert "token limit" in capsys.readouterr().err
+    last = load_active_branch(workspace_id)[-1]
+    assert (last.content, last.msg_partial) == ("You said: ", True)
+
+
+def test_ask_command_appends_piped_stdin(adapter):
+    result = CliRunner().invoke(cli, ["ask", "Summarize"], input="line one\nline two\n")
+    assert result.exit_code == 0
+    assert result.output == "You said: Summarize\n\nline one\nline two \n"
+
+    result = CliRunner().invoke(cli, ["ask"], input="")
+    assert result.exit_code == 1 and "No prompt given" in result.output
@@ -0,0 +1,68 @@
+import pytest
+from typing import AsyncIterator
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.instrumentation import InstrumentedAdapter, MetricsRecorder, RequestSpan
+from ocht.core.db import create_db_engine, init_db
+from ocht.services.metrics import persist_request_span, get_metrics_summary, span_to_metric
+
+
+class FakeAdapter(LLMAdapter):
+    """Adapter that returns canned chunks and Ollama-like stats."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.last_context_seconds = 0.002
+        self.last_response_stats = {}
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        return "".join(self.chunks)
+
+    async def send_prompt_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        for chunk in self.chunks:
+            yield chunk
+        self.last_response_stats = {"eval_count": 40, "eval_duration": 2_000_000_000, "prompt_eval_count": 12,
+                                    "prompt_eval_duration": 150_000_000}
+
+
+@pytest.mark.asyncio
+async def test_stream_records_span():
+    recorder = MetricsRecorder(size=2)
+    adapter = InstrumentedAdapter(FakeAdapter(["Hel", "lo", "!"]), "ollama", "llama3", recorder=recorder)
+
+    chunks = [chunk async for chunk in adapter.send_prompt_stream("hi")]
+
+    span = recorder.last()
+    assert chunks == ["Hel", "lo", "!"]
+    assert span.chunk_count == 3
+    assert span.ttft_seconds is not None and span.total_seconds >= span.ttft_seconds
+    assert span.context_seconds == 0.002
+    assert span.prompt_eval_count == 12
+    assert span_to_metric(span).metric_prompt_eval_duration_ms == pytest.approx(150.0)
+    assert span.tokens_per_second == pytest.approx(20.0)
+
+
+@pytest.mark.asyncio
+async def test_ring_buffer_keeps_latest_spans():
+    recorder = MetricsRecorder(size=2)
+    adapter = InstrumentedAdapter(FakeAdapter(["a"]), recorder=recorder)
+
+    for _ in range(3):
+        await adapter.send_prompt_async("hi")
+
+    assert len(recorder.recent()) == 2
+    assert all(span.method == "async" for span in recorder.recent())
+
+
+def test_persist_and_summarize(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'metrics.db'}")
+    init_db(create_db_engine())
+
+    for ttft in (0.1, 0.3):
+        persist_request_span(RequestSpan(model_name="llama3", ttft_seconds=ttft, total_seconds=1.0,
+                                         chunk_count=10, output_tokens=10, prompt_eval_duration_ns=80_000_000))
+
+    summary = get_metrics_summary()
+    assert summary["llama3"]["requests"] == 2
+    assert summary["llama3"]["ttft_ms_p50"] == pytest.approx(200.0)
+    assert summary["llama3"]["prompt_eval_ms_p50"] == pytest.approx(80.0)
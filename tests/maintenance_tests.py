@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from ocht.core.db import create_db_engine, get_session, init_db
+from ocht.core.models import Message
+from ocht.repositories.message import get_branch, get_leaf_messages, get_messages_by_workspace
+from ocht.repositories.setting import create_setting
+from ocht.repositories.workspace import create_workspace
+from ocht.services import cache
+from ocht.services.conversation import append_exchange, get_active_leaf_id, load_active_branch
+from ocht.services.maintenance import (
+    MAINTENANCE_INTERVAL_KEY,
+    RETENTION_ARCHIVE_KEY,
+    RETENTION_MAX_AGE_KEY,
+    is_maintenance_due,
+    run_maintenance,
+)
+from ocht.services.transfer import import_data
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    def use_database(name):
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / name}")
+        init_db(create_db_engine())
+        cache.invalidate_all()
+
+    use_database("ocht.db")
+    yield use_database
+    cache.invalidate_all()
+
+
+def _workspace_with_history(name, exchanges, settings=None):
+    with get_session() as db:
+        workspace_id = create_workspace(db, name, "llama3").work_id
+        for key, value in (settings or {}).items():
+            create_setting(db, key, value, workspace_id=workspace_id)
+    cache.invalidate_all()
+    for i in range(exchanges):
+        append_exchange(workspace_id, f"question {i}", f"answer {i}")
+    return workspace_id
+
+
+def _age_messages(workspace_id, count, days):
+    """Moves the creation time of the first messages of a workspace into the past."""
+    with get_session() as db:
+        ids = [m.msg_id for m in get_messages_by_workspace(db, workspace_id)][:count]
+        db.exec(update(Message).where(Message.msg_id.in_(ids))
+                .values(msg_created_at=datetime.now() - timedelta(days=days)))
+        db.commit()
+
+
+def test_retention_archives_and_reroots_branches(temp_db, tmp_path):
+    kept_id = _workspace_with_history("Kept", 2)
+    workspace_id = _workspace_with_history("Short", 5, {RETENTION_MAX_AGE_KEY: "30"})
+    _age_messages(workspace_id, 4, days=60)
+    _age_messages(kept_id, 4, days=60)
+
+    report = run_maintenance(archive_dir=tmp_path / "archive")
+
+    assert report.archived == {"Short": 4} and len(report.archive_files) == 1
+    assert report.auto_vacuum == "incremental" and set(report.timings) == {"retention", "vacuum", "analyze"}
+    branch = load_active_branch(workspace_id)
+    assert [m.msg_content for m in branch] == [f"{kind} {i}" for i in range(2, 5) for kind in ("question", "answer")]
+    assert [(m.msg_parent_id, m.msg_depth) for m in branch[:2]] == [(None, 0), (branch[0].msg_id, 1)]
+    with get_session() as db:
+        assert [m.msg_id for m in get_branch(db, branch[-1].msg_id)] == [m.msg_id for m in branch]
+    assert len(load_active_branch(kept_id)) == 4
+
+    # Restored into the same database, the archived messages return to their workspace as an extra branch
+    with pytest.raises(ValueError, match="already exists"):
+        import_data(report.archive_files[0])
+    summary = import_data(report.archive_files[0], merge=True)
+    assert (summary.inserted["workspace"], summary.inserted["message"], summary.skipped) == (0, 4, 1)
+    assert [m.msg_id for m in load_active_branch(workspace_id)] == [m.msg_id for m in branch]
+    with get_session() as db:
+        leaves = get_leaf_messages(db, workspace_id)
+        restored = get_branch(db, max(leaf.msg_id for leaf in leaves))
+    assert [m.msg_content for m in restored] == ["question 0", "answer 0", "question 1", "answer 1"]
+
+    # The archive restores the removed messages as their own conversation
+    temp_db("restore.db")
+    summary = import_data(report.archive_files[0])
+    assert summary.inserted["workspace"] == 1 and summary.inserted["message"] == 4
+
+
+def test_retention_resets_removed_active_branch(temp_db, tmp_path):
+    workspace_id = _workspace_with_history("Old", 2, {RETENTION_MAX_AGE_KEY: "7", RETENTION_ARCHIVE_KEY: "false"})
+    _age_messages(workspace_id, 4, days=8)
+
+    report = run_maintenance(archive_dir=tmp_path / "archive")
+
+    assert report.archived == {"Old": 4} and report.archive_files == []
+    assert get_active_leaf_id(workspace_id) is None and load_active_branch(workspace_id) == []
+    assert not (tmp_path / "archive").exists()
+
+
+def test_maintenance_schedule(temp_db):
+    assert is_maintenance_due()
+    run_maintenance()
+    assert not is_maintenance_due()
+    assert is_maintenance_due(datetime.now() + timedelta(days=2))
+
+    with get_session() as db:
+        create_setting(db, MAINTENANCE_INTERVAL_KEY, "0")
+    cache.invalidate_all()
+    assert not is_maintenance_due(datetime.now() + timedelta(days=2))
@@ -1,7 +1,9 @@
 import pytest
 import asyncio
+import threading
 from langchain.schema import HumanMessage, AIMessage, SystemMessage
 from ocht.adapters.memory import HybridMemoryStrategy, MemoryConfig
+from ocht.adapters.context import ContextMessage
 
 
 class TestHybridMemoryStrategy:
@@ -130,6 +132,163 @@ class TestHybridMemoryStrategy:
         total_tokens = sum(self.strategy._estimate_tokens(content) for _, content in result)
         assert total_tokens <= self.strategy.config.max_context_tokens
 
+    @pytest.mark.asyncio
+    async def test_optimal_packing_uses_remaining_budget(self):
+        """Test that optimal packing keeps cheap older messages greedy trimming drops."""
+        context = [
+            ("human", "short early question"),
+            ("ai", "z" * 400),  # Too large to fit next to the recent message
+            ("human", "y" * 200),
+            ("human", "final prompt"),
+        ]
+        self.strategy.config.max_context_tokens = 70
+
+        greedy = await self.strategy._trim_to_token_limit(context)
+        self.strategy.config.packing_mode = "optimal"
+        packed = await self.strategy._pack_to_token_limit(context)
+
+        assert packed[-1] == ("human", "final prompt")
+        assert ("human", "short early question") in packed
+        assert len(packed) > len(greedy)
+        # Original order is preserved
+        assert [context.index(entry) for entry in packed] == sorted(context.index(entry) for entry in packed)
+        total_tokens = sum(self.strategy._estimate_tokens(content) for _, content in packed)
+        assert total_tokens <= self.strategy.config.max_context_tokens
+
+    @pytest.mark.asyncio
+    async def test_optimal_packing_falls_back_to_greedy_on_time_budget(self):
+        """Test that packing still respects the limit when the DP time budget is exhausted."""
+        context = [("human", f"message {i} " + "x" * 120) for i in range(50)] + [("human", "final prompt")]
+        self.strategy.config.max_context_tokens = 300
+        self.strategy.config.packing_time_budget_ms = 0.0
+
+        packed = await self.strategy._pack_to_token_limit(context)
+
+        assert packed[-1] == ("human", "final prompt")
+        total_tokens = sum(self.strategy._estimate_tokens(content) for _, content in packed)
+        assert total_tokens <= self.strategy.config.max_context_tokens
+
+    def test_context_message_is_cached_and_immutable(self):
+        """Test that history conversions are computed once and cannot be modified."""
+        message = HumanMessage(content="def add(a, b):\n    return a + b")
+
+        first = self.strategy.to_context_message(message)
+        second = self.strategy.to_context_message(HumanMessage(content=message.content))
+
+        assert first is second
+        assert first.has_code
+        assert first.token_count == self.strategy._estimate_tokens(message.content)
+        with pytest.raises(AttributeError):
+            first.content = "changed"
+
+    @pytest.mark.asyncio
+    async def test_prepare_context_messages_accepts_context_messages(self):
+        """Test that the pipeline works directly on ContextMessage history."""
+        history = [
+            self.strategy.to_context_message(("human", "What is Python?")),
+            self.strategy.to_context_message(("ai", "A programming language.")),
+        ]
+
+        result = await self.strategy.prepare_context_messages(history, "Thanks!")
+
+        assert all(isinstance(msg, ContextMessage) for msg in result)
+        assert result[:2] == history
+        assert result[-1].as_tuple() == ("human", "Thanks!")
+
+    @pytest.mark.asyncio
+    async def test_prefix_stable_mode_only_appends(self):
+        """Test that prefix-stable mode keeps the previously sent context as prefix."""
+        self.strategy.config.context_mode = "prefix_stable"
+        history = [HumanMessage(content=f"Question {i}") if i % 2 == 0 else AIMessage(content=f"Answer {i}")
+                   for i in range(12)]
+
+        first = await self.strategy.prepare_context_messages(history, "Next question")
+        history += [HumanMessage(content="Next question"), AIMessage(content="Next answer")]
+        second = await self.strategy.prepare_context_messages(history, "Follow-up")
+
+        assert second[:len(first)] == first
+        assert second[-1].as_tuple() == ("human", "Follow-up")
+        assert self.strategy.prefix_stats.appended_turns == 1
+        assert self.strategy.prefix_stats.compactions == 1
+
+    @pytest.mark.asyncio
+    async def test_prefix_stable_mode_compacts_when_over_limit(self):
+        """Test that exceeding the token limit triggers a compaction boundary."""
+        self.strategy.config.context_mode = "prefix_stable"
+        self.strategy.config.max_context_tokens = 120
+        history = [HumanMessage(content="short"), AIMessage(content="reply")]
+
+        await self.strategy.prepare_context_messages(history, "prompt one")
+        history += [HumanMessage(content="prompt one"), AIMessage(content="x" * 600)]
+        result = await self.strategy.prepare_context_messages(history, "prompt two")
+
+        assert self.strategy.prefix_stats.compactions == 2
+        assert sum(msg.token_count for msg in result) <= 120
+
+        self.strategy.record_prompt_eval(42)
+        assert self.strategy.prefix_stats.last_prompt_eval_count == 42
+
+    @pytest.mark.asyncio
+    async def test_prefetch_is_reused_by_next_prompt(self):
+        """Test that a prefetched context equals the built one and skips the summary."""
+        history = [HumanMessage(content=f"Question {i}") if i % 2 == 0 else AIMessage(content=f"def f{i}(): pass")
+                   for i in range(30)]
+        expected = await HybridMemoryStrategy(self.config).prepare_context_messages(history, "Next")
+
+        assert await self.strategy.prefetch(history)
+        summaries = self.strategy._last_summarized_count
+        result = await self.strategy.prepare_context_messages(history, "Next")
+
+        assert result == expected
+        assert self.strategy._last_summarized_count == summaries
+        assert (self.strategy.prefetch_stats.runs, self.strategy.prefetch_stats.hits) == (1, 1)
+
+        # A changed history is rebuilt instead of using the stale prefetch
+        assert await self.strategy.prefetch(history)
+        history.append(HumanMessage(content="Next"))
+        await self.strategy.prepare_context_messages(history, "Another")
+        assert self.strategy.prefetch_stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_prefetch_gives_up_after_time_budget(self):
+        """Test that a prefetch over its event loop budget stores nothing."""
+        self.strategy.config.prefetch_slice_ms = 0.0
+        self.strategy.config.prefetch_budget_ms = 0.0001
+        history = [HumanMessage(content=f"Question {i} " * 50) for i in range(200)]
+
+        assert not await self.strategy.prefetch(history)
+        assert self.strategy.prefetch_stats.aborted == 1
+        await self.strategy.prepare_context_messages(history, "Next")
+        assert self.strategy.prefetch_stats.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_prefetch_summary_is_reused_by_next_prompt(self):
+        """Test that the prompt waits for the summary of a cancelled prefetch instead of starting another."""
+        started, release, calls = threading.Event(), threading.Event(), []
+
+        def summarize(messages):
+            calls.append(len(messages))
+            started.set()
+            release.wait(5)
+            return "LLM summary"
+
+        self.strategy._summarizer = self.strategy._llm = object()
+        self.strategy._summarize_with_llm = summarize
+        history = [HumanMessage(content=f"Question {i}") for i in range(30)]
+
+        prefetch = asyncio.create_task(self.strategy.prefetch(history))
+        await asyncio.to_thread(started.wait, 5)
+        prefetch.cancel()
+        prompt = asyncio.create_task(self.strategy.prepare_context_messages(history, "Next"))
+        await asyncio.sleep(0.05)
+        release.set()
+        result = await prompt
+
+        assert calls == [25]
+        assert result[0].content.endswith("LLM summary")
+        with pytest.raises(asyncio.CancelledError):
+            await prefetch
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
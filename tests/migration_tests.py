@@ -0,0 +1,101 @@
+import pytest
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, event, inspect, text
+
+from ocht.core.db import init_db
+from ocht.core.migration import (
+    BASELINE_REVISION,
+    SCHEMA_REVISION,
+    ensure_schema,
+    get_alembic_config,
+    get_current_revision,
+    migrate_to,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ocht.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_schema_revision_is_alembic_head():
+    script = ScriptDirectory.from_config(get_alembic_config("sqlite://"))
+    assert script.get_current_head() == SCHEMA_REVISION
+
+
+def test_startup_check_creates_and_then_only_reads_revision(engine):
+    assert ensure_schema(engine) is False
+    assert get_current_revision(engine) == SCHEMA_REVISION
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert ensure_schema(engine) is True
+    assert statements == ["SELECT version_num FROM alembic_version"]
+
+
+def test_migrate_to_and_upgrade_on_startup(engine):
+    script = ScriptDirectory.from_config(get_alembic_config("sqlite://"))
+    previous = script.get_revision(SCHEMA_REVISION).down_revision
+
+    assert migrate_to("head", engine) == SCHEMA_REVISION
+    assert migrate_to("-1", engine) == previous
+    assert migrate_to(previous[:4], engine) == previous
+
+    assert ensure_schema(engine) is False
+    assert get_current_revision(engine) == SCHEMA_REVISION
+    with pytest.raises(ValueError, match="Can't locate revision"):
+        migrate_to("unknown", engine)
+
+
+def test_unversioned_databases(engine, tmp_path):
+    # Created by init_db before revisions were stored: adopted because it matches the models
+    init_db(engine)
+    assert get_current_revision(engine) is None
+    assert ensure_schema(engine) is False
+    assert get_current_revision(engine) == SCHEMA_REVISION
+
+    other = create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+    with other.begin() as connection:
+        connection.execute(text("CREATE TABLE workspace (work_id INTEGER PRIMARY KEY)"))
+    with pytest.raises(ValueError, match="no schema revision"):
+        migrate_to("head", other)
+    other.dispose()
+
+
+def _baseline_database(engine):
+    """A database as init_db created it before revisions were stored: baseline schema, no version table."""
+    assert migrate_to(BASELINE_REVISION, engine) == BASELINE_REVISION
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+        connection.execute(text("INSERT INTO workspace (work_id, work_name, work_default_model, work_created_at, "
+                                "work_updated_at) VALUES (1, 'Main', 'llama3', '2025-01-01', '2025-01-01')"))
+        connection.execute(text("INSERT INTO message (msg_id, msg_workspace_id, msg_role, msg_content, "
+                                "msg_created_at, msg_updated_at) VALUES (1, 1, 'user', 'Hi', '2025-01-01', "
+                                "'2025-01-01')"))
+
+
+def test_unversioned_baseline_databases_are_upgraded(engine, tmp_path):
+    _baseline_database(engine)
+    assert get_current_revision(engine) is None
+    assert ensure_schema(engine) is False
+    assert get_current_revision(engine) == SCHEMA_REVISION
+    assert "work_active_leaf_id" in {column["name"] for column in inspect(engine).get_columns("workspace")}
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT msg_depth, msg_content FROM message")).one() == (0, "Hi")
+
+    other = create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+    _baseline_database(other)
+    assert migrate_to("head", other) == SCHEMA_REVISION
+    other.dispose()
+
+
+def test_downgrade_to_base_and_upgrade_again(engine):
+    assert migrate_to("head", engine) == SCHEMA_REVISION
+    assert migrate_to("base", engine) is None
+    assert migrate_to("head", engine) == SCHEMA_REVISION
+    with engine.connect() as connection:
+        # Expression indexes are not reflected, so a table rebuild in a downgrade would lose them
+        indexes = set(connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+    assert {"ix_workspace_work_name_lower", "ix_llmproviderconfig_prov_name_lower"} <= indexes
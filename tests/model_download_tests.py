@@ -0,0 +1,148 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import ollama
+import pytest
+
+from ocht.services import model_download
+from ocht.services.model_download import (
+    ModelDownloadManager,
+    STATE_CANCELLED,
+    STATE_DONE,
+    STATE_FAILED,
+)
+
+
+@pytest.fixture
+def marked(monkeypatch):
+    """Replaces the DB access of the download manager."""
+    available = []
+    monkeypatch.setattr(
+        model_download, "prepare_model_download",
+        lambda name: {"model_name": name, "endpoint": "http://ollama.test", "is_available": False},
+    )
+    monkeypatch.setattr(model_download, "mark_model_available", lambda name: available.append(name))
+    return available
+
+
+def _update(status, digest=None, completed=None, total=None):
+    return SimpleNamespace(status=status, digest=digest, completed=completed, total=total)
+
+
+def test_download_aggregates_layers_and_marks_available(marked):
+    async def pull(endpoint, name):
+        yield _update("pulling manifest")
+        yield _update("pulling a", "sha:a", 50, 100)
+        yield _update("pulling b", "sha:b", 10, 20)
+        yield _update("pulling a", "sha:a", 100, 100)
+        yield _update("success")
+
+    manager = ModelDownloadManager(pull=pull)
+    progress = asyncio.run(manager.download("llama3"))
+
+    assert progress.state == STATE_DONE
+    assert progress.total == 120
+    assert progress.completed == 110
+    assert progress.status == "success"
+    assert marked == ["llama3"]
+
+
+def test_download_resumes_after_interruption(marked):
+    calls = []
+
+    async def pull(endpoint, name):
+        calls.append(name)
+        yield _update("pulling a", "sha:a", 40, 100)
+        if len(calls) == 1:
+            raise ConnectionError("connection reset")
+        yield _update("pulling a", "sha:a", 100, 100)
+
+    manager = ModelDownloadManager(pull=pull, retry_delay=0)
+    progress = asyncio.run(manager.download("llama3"))
+
+    assert progress.state == STATE_DONE
+    assert progress.attempts == 2
+    assert progress.completed == 100
+    assert marked == ["llama3"]
+
+
+def test_response_error_is_not_retried(marked):
+    attempts = []
+
+    async def pull(endpoint, name):
+        attempts.append(name)
+        raise ollama.ResponseError("pull model manifest: file does not exist")
+        yield  # pragma: no cover
+
+    manager = ModelDownloadManager(pull=pull, retry_delay=0)
+    progress = asyncio.run(manager.download("missing"))
+
+    assert progress.state == STATE_FAILED
+    assert "does not exist" in progress.error
+    assert len(attempts) == 1
+    assert marked == []
+
+
+def test_cancel_and_concurrency_limit(marked):
+    running = []
+    peak = []
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def pull(endpoint, name):
+            running.append(name)
+            peak.append(len(running))
+            try:
+                yield _update("pulling", "sha:" + name, 1, 10)
+                await gate.wait()
+            finally:
+                running.remove(name)
+
+        manager = ModelDownloadManager(max_concurrent=1, pull=pull)
+        first = manager.start("a")
+        second = manager.start("b")
+        assert manager.start("a") is first  # joins the running download
+        await asyncio.sleep(0.05)
+
+        assert manager.cancel("a")
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.sleep(0.05)
+        gate.set()
+        await second
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert manager.get_progress("a").state == STATE_CANCELLED
+    assert manager.get_progress("b").state == STATE_DONE
+    assert max(peak) == 1
+    assert manager.active_downloads() == []
+    assert marked == ["b"]
+
+
+def test_ollama_pull_streams_over_the_pooled_client(marked, monkeypatch):
+    def handler(request):
+        body = json.loads(request.content)
+        if body["model"] == "missing":
+            return httpx.Response(500, json={"error": "pull model manifest: file does not exist"})
+        lines = [{"status": "pulling manifest"},
+                 {"status": "pulling a", "digest": "sha:a", "completed": 50, "total": 100},
+                 {"status": "pulling a", "digest": "sha:a", "completed": 100, "total": 100},
+                 {"status": "success"}]
+        return httpx.Response(200, text="".join(json.dumps(line) + "\n" for line in lines))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    requested = []
+    monkeypatch.setattr(model_download, "get_async_client", lambda base_url: requested.append(base_url) or client)
+
+    async def scenario():
+        manager = ModelDownloadManager(retry_delay=0)
+        return await manager.download("llama3"), await manager.download("missing")
+
+    done, failed = asyncio.run(scenario())
+    assert (done.state, done.completed, done.total, done.status) == (STATE_DONE, 100, 100, "success")
+    assert failed.state == STATE_FAILED and failed.attempts == 1 and "file does not exist" in failed.error
+    assert requested == ["http://ollama.test", "http://ollama.test"] and not client.is_closed
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ocht.adapters import registry
+from ocht.adapters.instrumentation import InstrumentedAdapter, MetricsRecorder
+from ocht.adapters.ollama_direct import OllamaDirectAdapter
+
+
+class OllamaChatHandler(BaseHTTPRequestHandler):
+    """Stand-in for Ollama's /api/chat: streams the message count as NDJSON, word by word."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        OllamaChatHandler.requests.append((self.path, body))
+        if body["model"] == "missing":
+            payload = json.dumps({"error": "model 'missing' not found"}).encode()
+            self._send(404, payload)
+            return
+        words = [f"reply{len(body['messages'])} ", "from ", body["model"]]
+        lines = [json.dumps({"message": {"role": "assistant", "content": word}, "done": False}) for word in words]
+        lines.append(json.dumps({"message": {"role": "assistant", "content": ""}, "done": True,
+                                 "prompt_eval_count": 12, "eval_count": 3, "eval_duration": 300_000_000}))
+        self._send(200, ("\n".join(lines) + "\n").encode())
+
+    def _send(self, status, payload):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    OllamaChatHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_direct_adapter_streams_ndjson_and_reports_stats(server_url):
+    inner = registry.create_adapter(registry.AdapterSpec(
+        provider_name="Ollama", model_name="tiny", endpoint=server_url, backend="direct",
+        default_params={"temperature": 0.5, "num_ctx": 8192, "keep_alive": "5m"},
+    ))
+    assert isinstance(inner, OllamaDirectAdapter)
+    adapter = InstrumentedAdapter(inner, model_name="tiny", recorder=MetricsRecorder())
+
+    async def run():
+        first = [chunk async for chunk in adapter.send_prompt_stream("hi")]
+        second = await adapter.send_prompt_async("again")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == ["reply1 ", "from ", "tiny"]
+    assert second == "reply3 from tiny"
+    assert adapter.current_span.eval_count == 3
+    assert adapter.current_span.tokens_per_second == pytest.approx(10.0)
+    path, body = OllamaChatHandler.requests[0]
+    assert path == "/api/chat"
+    assert body["options"] == {"temperature": 0.5, "num_ctx": 8192}
+    assert body["keep_alive"] == "5m"
+    assert [message["role"] for message in OllamaChatHandler.requests[1][1]["messages"]] == \
+        ["user", "assistant", "user"]
+
+    missing = OllamaDirectAdapter(model="missing", base_url=server_url)
+    with pytest.raises(RuntimeError, match="404: model 'missing' not found"):
+        asyncio.run(missing.send_prompt_async("hi"))
+
+    with pytest.raises(ValueError):
+        registry.create_adapter(registry.AdapterSpec(provider_name="ollama", model_name="m", backend="grpc"))
+
+    # The LangChain backend talks to the configured endpoint as well
+    langchain = registry.create_adapter(registry.AdapterSpec(provider_name="ollama", model_name="m",
+                                                             endpoint=server_url))
+    assert langchain.base_url == langchain.client.base_url == server_url
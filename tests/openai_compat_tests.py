@@ -0,0 +1,121 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from ocht.adapters import registry
+from ocht.adapters.openai_compat import OpenAICompatAdapter, iter_sse_data
+
+
+class ChatCompletionsHandler(BaseHTTPRequestHandler):
+    """Stand-in for an OpenAI-compatible server: echoes the message count, word by word."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        ChatCompletionsHandler.requests.append((self.path, self.headers.get("Authorization"), body))
+        if body["model"] == "missing":
+            payload = json.dumps({"error": {"message": "model not found"}}).encode()
+            self._send(404, "application/json", payload)
+            return
+        words = [f"reply{len(body['messages'])} ", "from ", body["model"]]
+        if not body["stream"]:
+            payload = json.dumps({
+                "choices": [{"message": {"role": "assistant", "content": "".join(words)}}],
+                "usage": {"prompt_tokens": 7, "completion_tokens": 3},
+            }).encode()
+            self._send(200, "application/json", payload)
+            return
+        events = [": keep-alive\n\n"]
+        events += [f"data: {json.dumps({'choices': [{'delta': {'content': word}}]})}\n\n" for word in words]
+        events.append(f"data: {json.dumps({'choices': [], 'usage': {'prompt_tokens': 7, 'completion_tokens': 3}})}\n\n")
+        events.append("data: [DONE]\n\n")
+        self._send(200, "text/event-stream", "".join(events).encode())
+
+    def _send(self, status, content_type, payload):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    ChatCompletionsHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChatCompletionsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_and_history_against_local_server(server_url):
+    adapter = registry.create_adapter(registry.AdapterSpec(
+        provider_name="openai-compatible", model_name="tiny", endpoint=server_url,
+        api_key="secret", default_params={"temperature": 0.2, "num_ctx": 4096},
+    ))
+    assert isinstance(adapter, OpenAICompatAdapter)
+
+    async def run():
+        first = [chunk async for chunk in adapter.send_prompt_stream("hi")]
+        second = await adapter.send_prompt_async("again")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == ["reply1 ", "from ", "tiny"]
+    assert second == "reply3 from tiny"
+    assert adapter.last_response_stats == {"prompt_eval_count": 7, "eval_count": 3}
+    path, authorization, body = ChatCompletionsHandler.requests[0]
+    assert (path, authorization) == ("/v1/chat/completions", "Bearer secret")
+    assert body["temperature"] == 0.2 and "num_ctx" not in body
+    assert [message["role"] for message in ChatCompletionsHandler.requests[1][2]["messages"]] == \
+        ["user", "assistant", "user"]
+
+    missing = OpenAICompatAdapter(model="missing", base_url=server_url)
+    with pytest.raises(RuntimeError, match="404: model not found"):
+        asyncio.run(missing.send_prompt_async("hi"))
+
+
+@pytest.mark.parametrize("response, detail", [
+    (httpx.Response(400, json={"error": {"message": "bad model"}}), "HTTP 400: bad model"),
+    (httpx.Response(429, json={"error": "rate limited"}), "HTTP 429: rate limited"),
+    (httpx.Response(500, json=["upstream", "failed"]), 'HTTP 500: ["upstream","failed"]'),
+    (httpx.Response(502, text="Bad gateway"), "HTTP 502: Bad gateway"),
+])
+def test_error_responses_keep_their_message(response, detail):
+    with pytest.raises(RuntimeError) as error:
+        OpenAICompatAdapter._raise_for_status(response)
+    assert str(error.value) == detail
+
+
+def test_registry_and_sse_parsing():
+    assert {"ollama", "openai", "openai-compatible"} <= set(registry.available_adapters())
+    assert registry.get_adapter_factory("Claude") is None
+    with pytest.raises(ValueError):
+        registry.create_adapter(registry.AdapterSpec(provider_name="openai-compatible", model_name="m"))
+
+    registry.register_adapter("Custom", lambda spec: spec.model_name)
+    try:
+        assert registry.create_adapter(registry.AdapterSpec(provider_name="custom", model_name="m")) == "m"
+    finally:
+        registry.unregister_adapter("custom")
+
+    async def lines():
+        for line in ["event: message", "data: a", "data:b", "", "", "data: [DONE]", "", "data: after"]:
+            yield line
+
+    async def collect():
+        return [data async for data in iter_sse_data(lines())]
+
+    assert asyncio.run(collect()) == ["a\nb"]
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from ocht.core import profiling
+from ocht.core.profiling import (
+    Profiler,
+    get_active_profiler,
+    profile_span,
+    profiled,
+    start_profiling,
+    stop_profiling,
+    track_awaitable,
+)
+
+
+@pytest.fixture(autouse=True)
+def _stop_profiler():
+    yield
+    stop_profiling()
+
+
+def test_profile_span_is_noop_when_disabled():
+    assert get_active_profiler() is None
+    with profile_span("noop") as span:
+        assert span is profiling._NULL_SPAN
+
+
+def test_invalid_mode_raises():
+    with pytest.raises(ValueError):
+        Profiler("gpu")
+
+
+def test_cpu_report_contains_spans(tmp_path):
+    report = tmp_path / "cpu.txt"
+    start_profiling("cpu", str(report))
+
+    @profiled("test.sync")
+    def work():
+        return sum(range(1000))
+
+    @profiled()
+    async def async_work():
+        await asyncio.sleep(0)
+        return 1
+
+    for _ in range(3):
+        work()
+    asyncio.run(async_work())
+
+    profiler = get_active_profiler()
+    assert profiler.spans["test.sync"].count == 3
+    assert profiler.spans[async_work.__qualname__].count == 1
+
+    path = stop_profiling()
+    assert path == report
+    text = report.read_text(encoding="utf-8")
+    assert "Mode: cpu" in text
+    assert "test.sync" in text
+    assert "cProfile" in text
+    assert get_active_profiler() is None
+
+
+def test_alloc_report_and_tracked_awaitable(tmp_path):
+    report = tmp_path / "alloc.txt"
+    start_profiling("alloc", str(report))
+
+    async def scenario():
+        future = asyncio.get_running_loop().create_future()
+        track_awaitable("test.render", future)
+        blocks = [bytearray(1024) for _ in range(100)]
+        future.set_result(None)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return blocks
+
+    asyncio.run(scenario())
+    assert get_active_profiler().spans["test.render"].count == 1
+
+    stop_profiling()
+    text = report.read_text(encoding="utf-8")
+    assert "tracemalloc" in text
+    assert "test.render" in text
+
+
+def test_start_twice_raises(tmp_path):
+    start_profiling("cpu", str(tmp_path / "a.txt"))
+    with pytest.raises(ValueError):
+        start_profiling("cpu", str(tmp_path / "b.txt"))
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.scheduler import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_SUMMARY,
+    RequestScheduler,
+    RequestSuperseded,
+)
+
+
+async def _request(scheduler, order, name, priority, key=None, hold=0.01):
+    async with scheduler.slot("ollama", priority, key=key):
+        order.append(name)
+        await asyncio.sleep(hold)
+
+
+def test_priority_order_and_interactive_reserve():
+    async def run():
+        scheduler = RequestScheduler(default_limit=1, interactive_reserve=0)
+        order = []
+        blocker = asyncio.create_task(_request(scheduler, order, "running", PRIORITY_BATCH, hold=0.05))
+        await asyncio.sleep(0)
+        queued = [asyncio.create_task(_request(scheduler, order, name, priority)) for name, priority in
+                  [("batch", PRIORITY_BATCH), ("summary", PRIORITY_SUMMARY), ("interactive", PRIORITY_INTERACTIVE)]]
+        await asyncio.sleep(0.01)
+        depth = scheduler.stats()[0].queue_depth
+        await asyncio.gather(blocker, *queued)
+
+        # Two slots, one reserved: background work only gets one of them
+        reserved = RequestScheduler(default_limit=2, interactive_reserve=1)
+        first = asyncio.create_task(_request(reserved, [], "batch1", PRIORITY_BATCH, hold=0.1))
+        second = asyncio.create_task(_request(reserved, [], "batch2", PRIORITY_BATCH, hold=0.1))
+        await asyncio.sleep(0.01)
+        running_background = reserved.stats()[0].running
+        started = asyncio.get_running_loop().time()
+        await _request(reserved, [], "interactive", PRIORITY_INTERACTIVE, hold=0)
+        interactive_wait = asyncio.get_running_loop().time() - started
+        await asyncio.gather(first, second)
+        return order, depth, scheduler.stats()[0], running_background, interactive_wait
+
+    order, depth, stats, running_background, interactive_wait = asyncio.run(run())
+
+    assert order == ["running", "interactive", "summary", "batch"]
+    assert depth == 3 and stats.peak_queued == 3 and stats.queue_depth == 0 and stats.running == 0
+    assert stats.granted == {PRIORITY_BATCH: 2, PRIORITY_SUMMARY: 1, PRIORITY_INTERACTIVE: 1}
+    assert stats.average_wait(PRIORITY_SUMMARY) > stats.average_wait(PRIORITY_INTERACTIVE)
+    assert running_background == 1
+    assert interactive_wait < 0.05
+
+
+def test_superseded_and_cancelled_requests():
+    async def run():
+        scheduler = RequestScheduler(default_limit=1)
+        order = []
+        blocker = asyncio.create_task(_request(scheduler, order, "running", PRIORITY_SUMMARY, key="s", hold=0.05))
+        await asyncio.sleep(0)
+        old = asyncio.create_task(_request(scheduler, order, "old", PRIORITY_SUMMARY, key="s"))
+        await asyncio.sleep(0)
+        new = asyncio.create_task(_request(scheduler, order, "new", PRIORITY_SUMMARY, key="s"))
+        results = await asyncio.gather(blocker, old, new, return_exceptions=True)
+
+        stuck = asyncio.create_task(_request(scheduler, order, "stuck", PRIORITY_INTERACTIVE, key="x", hold=10))
+        await asyncio.sleep(0.01)
+        cancelled = scheduler.cancel("x")
+        with pytest.raises(asyncio.CancelledError):
+            await stuck
+        # The slot of the cancelled request is free again
+        await asyncio.wait_for(_request(scheduler, order, "after", PRIORITY_INTERACTIVE), 1)
+        return order, results, cancelled, scheduler.stats()[0]
+
+    order, results, cancelled, stats = asyncio.run(run())
+
+    assert order == ["running", "new", "stuck", "after"]
+    assert isinstance(results[1], RequestSuperseded)
+    assert cancelled == 1
+    assert (stats.superseded, stats.cancelled, stats.running) == (1, 1, 0)
+    with pytest.raises(ValueError):
+        RequestScheduler().configure("ollama", limit=0)
+
+
+class SlotAdapter(LLMAdapter):
+    """Fake adapter that streams inside its request slot."""
+
+    def __init__(self, name: str, order):
+        self.name = name
+        self.order = order
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        return self.name
+
+    async def send_prompt_stream(self, prompt: str, **kwargs):
+        async with self.request_slot():
+            self.order.append(self.name)
+            await asyncio.sleep(0.02)
+            yield self.name
+
+
+def test_adapters_share_the_endpoint_slots():
+    scheduler = RequestScheduler(default_limit=1)
+    order = []
+    adapters = [SlotAdapter(name, order) for name in ("a", "b")]
+    for adapter in adapters:
+        adapter.attach_scheduler(scheduler, "http://localhost:11434")
+
+    async def consume(adapter):
+        return [chunk async for chunk in adapter.send_prompt_stream("hi")]
+
+    async def run():
+        return await asyncio.gather(*(consume(adapter) for adapter in adapters))
+
+    assert asyncio.run(run()) == [["a"], ["b"]]
+    stats = scheduler.stats()[0]
+    assert stats.endpoint == "http://localhost:11434"
+    assert stats.granted[PRIORITY_INTERACTIVE] == 2 and stats.peak_queued == 1
+
+
+def test_adapter_request_priority_and_cancel_requests():
+    scheduler = RequestScheduler(default_limit=1)
+    order = []
+    batch, stopped, chat = (SlotAdapter(name, order) for name in ("batch", "stopped", "chat"))
+    for adapter in (batch, stopped, chat):
+        adapter.attach_scheduler(scheduler, "ollama")
+    batch.request_priority = PRIORITY_BATCH
+
+    async def consume(adapter):
+        return [chunk async for chunk in adapter.send_prompt_stream("hi")]
+
+    async def run():
+        async with scheduler.slot("ollama"):
+            tasks = [asyncio.create_task(consume(adapter)) for adapter in (batch, stopped, chat)]
+            await asyncio.sleep(0.01)
+            assert stopped.cancel_requests() == 1
+            assert stopped.cancel_requests() == 0
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert order == ["chat", "batch"]
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert scheduler.stats()[0].granted[PRIORITY_BATCH] == 1
+    assert SlotAdapter("unscheduled", order).cancel_requests() == 0
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import pytest
+
+from ocht.adapters.base import LLMAdapter
+from ocht.core.db import create_db_engine, get_session, init_db
+from ocht.repositories.llm_provider_config import create_llm_provider_config
+from ocht.repositories.model import create_model
+from ocht.services import cache
+from ocht.services.adapter_manager import adapter_manager
+from ocht.services.session_manager import SessionManager
+from ocht.tui.app import ChatApp
+from ocht.tui.widgets.chat_bubble import ChatBubble
+
+
+class SlowAdapter(LLMAdapter):
+    """Streams five chunks with a delay, like a local model."""
+
+    def __init__(self, name: str, events=None):
+        self.name = name
+        self.events = events if events is not None else []
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        return self.name
+
+    async def send_prompt_stream(self, prompt: str, **kwargs):
+        self.events.append(("start", self.name))
+        for index in range(5):
+            await asyncio.sleep(0.05)
+            yield f"{self.name}{index} "
+        self.events.append(("end", self.name))
+
+
+def test_sessions_are_independent():
+    manager = SessionManager()
+    first = manager.create_session(SlowAdapter("a"), 1, "llama3", workspace_id=4)
+    second = manager.create_session(SlowAdapter("b"), 1, "llama3")
+
+    assert manager.active_session is second
+    assert first.adapter is not second.adapter
+    assert [session.title for session in manager.list_sessions()] == ["1: llama3", "2: llama3"]
+
+    manager.set_active(first.session_id)
+    assert manager.close_session(first.session_id) is second
+    assert manager.close_session(second.session_id) is None
+    with pytest.raises(ValueError):
+        manager.set_active(first.session_id)
+
+
+def test_sessions_stream_concurrently(monkeypatch):
+    monkeypatch.setattr(ChatApp, "_initialize_adapter", lambda self: None)
+
+    events = []
+
+    async def run():
+        app = ChatApp()
+        async with app.run_test():
+            app.sessions.set_adapter(1, SlowAdapter("a", events), 1, "a")
+            second = app.sessions.create_session(SlowAdapter("b", events), 1, "b")
+            await app.query_one("#sessions").add_pane(app._session_pane(second))
+
+            for session in app.sessions.list_sessions():
+                session.busy = True
+                app.run_worker(app._process_prompt("hi", session), group=f"session-{session.session_id}")
+            await app.workers.wait_for_complete()
+
+            contents = {
+                session.session_id: [bubble._content for bubble in app._chat_container(session).query(ChatBubble)]
+                for session in app.sessions.list_sessions()
+            }
+        return contents
+
+    contents = asyncio.run(run())
+    assert contents[1] == ["hi", "a0 a1 a2 a3 a4 "]
+    assert contents[2] == ["hi", "b0 b1 b2 b3 b4 "]
+    # The second session started streaming before the first one finished
+    assert events.index(("start", "b")) < events.index(("end", "a"))
+
+
+def test_switching_the_model_only_changes_that_session(monkeypatch):
+    monkeypatch.setattr(ChatApp, "_initialize_adapter", lambda self: None)
+    saved = []
+
+    def build_adapter(provider_id, model_name):
+        time.sleep(0.05)
+        return SlowAdapter(model_name)
+
+    monkeypatch.setattr(adapter_manager, "build_adapter", build_adapter)
+    monkeypatch.setattr(adapter_manager, "save_selection", lambda *selection: saved.append(selection))
+
+    async def run():
+        app = ChatApp()
+        async with app.run_test():
+            first = app.sessions.set_adapter(1, SlowAdapter("a"), 1, "a")
+            second = app.sessions.create_session(SlowAdapter("b"), 1, "b")
+            await app.query_one("#sessions").add_pane(app._session_pane(second))
+
+            # A second switch of the same session replaces the pending one
+            app._switch_adapter(second, 1, "c", "switched", "failed")
+            worker = app._switch_adapter(second, 1, "d", "switched", "failed")
+            await worker.wait()
+            assert worker.result is second.adapter
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert (first.adapter.name, first.model_name) == ("a", "a")
+    assert (second.adapter.name, second.model_name, second.title) == ("d", "d", "2: d")
+    assert saved == [(1, "d")]
+    assert adapter_manager.get_current_adapter() is None
+
+
+def test_adapter_configuration_errors_are_shown(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'ocht.db'}")
+    init_db(create_db_engine())
+    cache.invalidate_all()
+    with get_session() as db:
+        # An OpenAI-compatible provider without endpoint cannot be created
+        provider_id = create_llm_provider_config(db, "openai-compatible", "").prov_id
+        create_model(db, "tiny", provider_id)
+    monkeypatch.setattr(ChatApp, "_initialize_adapter", lambda self: None)
+
+    with pytest.raises(ValueError, match="requires an endpoint"):
+        adapter_manager.build_adapter(provider_id, "tiny")
+
+    async def run():
+        app = ChatApp()
+        async with app.run_test():
+            session = app.sessions.set_adapter(1, SlowAdapter("a"), 1, "a")
+            worker = app._switch_adapter(session, provider_id, "tiny", "switched", "failed")
+            await worker.wait()
+            assert worker.result is None
+            return session, [bubble._content for bubble in app._chat_container(session).query(ChatBubble)]
+
+    try:
+        session, messages = asyncio.run(run())
+    finally:
+        cache.invalidate_all()
+    assert session.adapter.name == "a"
+    assert messages[-1] == "failed\n\nProvider 'openai-compatible' requires an endpoint"
@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+import pytest
+from textual.app import App
+from textual.widgets import Input, Select
+
+from ocht.core.db import create_db_engine, init_db
+from ocht.core.models import GLOBAL_SCOPE_ID, Setting
+from ocht.services import cache
+from ocht.services.adapter_manager import get_adapter_params, get_memory_config
+from ocht.services.cache import TableCache
+from ocht.services.settings_manager import (
+    create_setting_with_validation,
+    get_workspace_settings,
+    update_setting_with_validation,
+)
+from ocht.services.settings_resolver import SCOPE_GLOBAL, SCOPE_SESSION, SCOPE_WORKSPACE, SettingsResolver, settings_resolver
+from ocht.services.workspace_manager import create_workspace_with_validation, delete_workspace_with_checks
+from ocht.tui.screens.settings_manager import SettingEditScreen
+
+
+def _static_cache(rows):
+    return TableCache("settings", lambda: list(rows),
+                      key=lambda setting: (setting.setting_key, setting.setting_workspace_id))
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'resolver.db'}")
+    init_db(create_db_engine())
+    cache.invalidate_all()
+    yield
+    settings_resolver.set_active_workspace(None)
+    settings_resolver.clear_session()
+    cache.invalidate_all()
+
+
+def test_layers_override_in_order():
+    resolver = SettingsResolver(_static_cache([
+        Setting(setting_key="theme", setting_value="dark", setting_workspace_id=GLOBAL_SCOPE_ID),
+        Setting(setting_key="lang", setting_value="de", setting_workspace_id=GLOBAL_SCOPE_ID),
+        Setting(setting_key="theme", setting_value="light", setting_workspace_id=7),
+    ]))
+
+    assert resolver.get("theme") == "dark"
+    assert resolver.get_scope("theme") == SCOPE_GLOBAL
+
+    resolver.set_active_workspace(7)
+    assert (resolver.get("theme"), resolver.get("lang")) == ("light", "de")
+    assert resolver.get_scope("theme") == SCOPE_WORKSPACE
+
+    resolver.set_session_value("theme", "solarized")
+    assert resolver.get("theme") == "solarized"
+    assert resolver.get_scope("theme") == SCOPE_SESSION
+
+    assert resolver.clear_session_value("theme")
+    assert resolver.get("theme") == "light"
+    assert resolver.get("missing", "default") == "default"
+    assert resolver.get_scope("missing") is None
+
+
+def test_compiles_once_per_workspace_until_invalidated():
+    table = _static_cache([Setting(setting_key="n", setting_value="1", setting_workspace_id=GLOBAL_SCOPE_ID)])
+    resolver = SettingsResolver(table)
+
+    for _ in range(100):
+        assert resolver.get_int("n", 0) == 1
+    assert resolver.compile_count == 1
+
+    resolver.set_active_workspace(3)
+    resolver.get("n")
+    resolver.set_active_workspace(None)
+    resolver.get("n")
+    assert resolver.compile_count == 2
+
+    table.invalidate()
+    resolver.get("n")
+    assert resolver.compile_count == 3
+
+
+def test_compiled_settings_expire_with_the_cache_ttl():
+    # Rows written by another process only show up after the cache TTL
+    rows = [Setting(setting_key="n", setting_value="1", setting_workspace_id=GLOBAL_SCOPE_ID)]
+    table = TableCache("settings", lambda: list(rows),
+                       key=lambda setting: (setting.setting_key, setting.setting_workspace_id), ttl=0.05)
+    resolver = SettingsResolver(table)
+    assert resolver.get("n") == "1"
+
+    rows[0] = Setting(setting_key="n", setting_value="2", setting_workspace_id=GLOBAL_SCOPE_ID)
+    assert resolver.get("n") == "1"
+    time.sleep(0.06)
+    assert resolver.get("n") == "2"
+    assert (resolver.compile_count, table.stats.loads) == (2, 2)
+
+
+def test_service_writes_reach_hot_path_reads(temp_db):
+    create_setting_with_validation("adapter.temperature", "0.2")
+    create_setting_with_validation("memory.max_context_tokens", "8000")
+    create_setting_with_validation("memory.packing_mode", "optimal", workspace_id=5)
+    create_setting_with_validation("memory.recent_messages_count", "not a number")
+
+    assert get_adapter_params() == {"temperature": 0.2}
+    config = get_memory_config()
+    assert (config.max_context_tokens, config.packing_mode, config.recent_messages_count) == (8000, "greedy", 10)
+
+    settings_resolver.set_active_workspace(5)
+    assert get_memory_config().packing_mode == "optimal"
+
+    update_setting_with_validation("adapter.temperature", value="0.9")
+    assert get_adapter_params()["temperature"] == 0.9
+
+
+def test_deleting_a_workspace_removes_its_settings(temp_db):
+    workspace = create_workspace_with_validation("Project", "llama3")
+    create_setting_with_validation("adapter.temperature", "0.2")
+    create_setting_with_validation("adapter.temperature", "0.7", workspace_id=workspace.work_id)
+    settings_resolver.set_active_workspace(workspace.work_id)
+    assert settings_resolver.get("adapter.temperature") == "0.7"
+
+    assert delete_workspace_with_checks(workspace.work_id)
+    assert settings_resolver.get("adapter.temperature") == "0.2"
+    assert get_workspace_settings(workspace.work_id) == []
+
+
+def test_edit_screen_creates_settings_in_the_selected_scope(temp_db):
+    results = []
+
+    class EditApp(App):
+        def on_mount(self):
+            self.push_screen(SettingEditScreen(workspace_id=4), results.append)
+
+    async def scenario():
+        app = EditApp()
+        async with app.run_test() as pilot:
+            screen = app.screen
+            assert [value for _, value in screen.query_one("#setting-scope", Select)._options] == [GLOBAL_SCOPE_ID, 4]
+            screen.query_one("#setting-key", Input).value = "theme"
+            screen.query_one("#setting-value", Input).value = "dark"
+            screen.query_one("#setting-scope", Select).value = 4
+            screen.action_save()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+
+    asyncio.run(scenario())
+    assert [(setting.setting_key, setting.setting_workspace_id) for setting in results] == [("theme", 4)]
@@ -6,7 +6,8 @@ from ocht.repositories.setting import (
     get_setting_by_key,
     get_all_settings,
     update_setting,
-    delete_setting
+    delete_setting,
+    count_settings
 )
 
 # Use a temporary SQLite database for testing
@@ -78,4 +79,18 @@ def test_delete_setting(db_session):
     db_session.commit()
 
     assert delete_setting(db_session, "test_key") is True
-    assert get_setting_by_key(db_session, "test_key") is None
\ No newline at end of file
+    assert get_setting_by_key(db_session, "test_key") is None
+
+
+def test_get_all_settings_name_filter_and_count(db_session):
+    """Test filtering settings by key and counting the matches."""
+    for key in ("page_beta", "page_alpha", "other_key"):
+        create_setting(db_session, key, "value")
+    db_session.commit()
+
+    settings = get_all_settings(db_session, name_filter="PAGE_")
+    assert [setting.setting_key for setting in settings] == ["page_alpha", "page_beta"]
+    assert count_settings(db_session, name_filter="page_") == 2
+
+    settings = get_all_settings(db_session, limit=1, offset=1, name_filter="page_")
+    assert [setting.setting_key for setting in settings] == ["page_beta"]
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+from ocht.adapters.base import LLMAdapter
+from ocht.adapters.instrumentation import STOPPED_ERROR, InstrumentedAdapter, MetricsRecorder
+from ocht.adapters.ollama_direct import OllamaDirectAdapter
+from ocht.adapters.scheduler import PRIORITY_INTERACTIVE, RequestScheduler
+from ocht.adapters.streaming import (
+    STOP_CANCELLED,
+    STOP_MAX_SECONDS,
+    STOP_MAX_TOKENS,
+    StreamController,
+    StreamLimits,
+)
+
+
+class StallingAdapter(LLMAdapter):
+    """Yields one chunk, then waits a long time for the next one (a stuck model)."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def send_prompt_async(self, prompt: str, **kwargs) -> str:
+        return ""
+
+    async def send_prompt_stream(self, prompt: str, **kwargs):
+        try:
+            async with self.request_slot():
+                yield "first "
+                await asyncio.sleep(10)
+                yield "never"
+        finally:
+            self.closed = True
+
+
+def test_stop_and_time_limit_end_a_stalled_stream():
+    async def consume(controller, adapter, stop_after=None):
+        if stop_after is not None:
+            asyncio.get_running_loop().call_later(stop_after, controller.stop)
+        started = time.perf_counter()
+        chunks = [chunk async for chunk in controller.stream(adapter.send_prompt_stream("hi"))]
+        return chunks, time.perf_counter() - started
+
+    stopped = StallingAdapter()
+    recorder = MetricsRecorder()
+    controller = StreamController()
+    chunks, elapsed = asyncio.run(consume(controller, InstrumentedAdapter(stopped, recorder=recorder), 0.05))
+    assert chunks == ["first "] and elapsed < 1
+    assert (controller.stop_reason, stopped.closed) == (STOP_CANCELLED, True)
+    assert recorder.last().error == STOPPED_ERROR
+
+    timed_out = StallingAdapter()
+    controller = StreamController(StreamLimits(max_seconds=0.05))
+    chunks, elapsed = asyncio.run(consume(controller, timed_out))
+    assert chunks == ["first "] and elapsed < 1
+    assert (controller.stop_reason, timed_out.closed) == (STOP_MAX_SECONDS, True)
+
+
+def test_scheduler_cancel_closes_the_stream_mid_response():
+    adapter = StallingAdapter()
+    scheduler = RequestScheduler(default_limit=1)
+    adapter.attach_scheduler(scheduler, "ollama")
+    controller = StreamController()
+    chunks = []
+
+    async def consume():
+        async for chunk in controller.stream(adapter.send_prompt_stream("hi")):
+            chunks.append(chunk)
+
+    async def run():
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        cancelled = scheduler.cancel((id(adapter), PRIORITY_INTERACTIVE))
+        # The slot belongs to the consuming task, so cancelling it aborts the pending read
+        await asyncio.wait({task}, timeout=1)
+        return cancelled, task.cancelled(), scheduler.stats()[0]
+
+    cancelled, task_cancelled, stats = asyncio.run(run())
+    assert (cancelled, task_cancelled, adapter.closed) == (1, True, True)
+    assert chunks == ["first "] and controller.stop_reason is None
+    assert (stats.running, stats.cancelled) == (0, 1)
+
+
+def test_stop_withdraws_a_prompt_still_waiting_for_a_slot():
+    adapter = StallingAdapter()
+    scheduler = RequestScheduler(default_limit=1)
+    adapter.attach_scheduler(scheduler, "ollama")
+    controller = StreamController()
+
+    async def consume():
+        return [chunk async for chunk in controller.stream(adapter.send_prompt_stream("hi"))]
+
+    async def run():
+        async with scheduler.slot("ollama"):
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.05)
+            assert scheduler.stats()[0].queue_depth == 1
+            # Same order as /stop: stop the stream, then withdraw the queued request
+            controller.stop()
+            withdrawn = adapter.cancel_requests(PRIORITY_INTERACTIVE, running=False)
+            chunks = await asyncio.wait_for(task, timeout=1)
+        return withdrawn, chunks, scheduler.stats()[0]
+
+    withdrawn, chunks, stats = asyncio.run(run())
+    assert (withdrawn, chunks, controller.stop_reason) == (1, [], STOP_CANCELLED)
+    assert (stats.queue_depth, stats.running, stats.cancelled) == (0, 0, 1)
+    assert stats.granted[PRIORITY_INTERACTIVE] == 1
+
+    async def running_stream():
+        stream = adapter.send_prompt_stream("hi")
+        assert await stream.__anext__() == "first "
+        # A request that holds its slot is left to the stream controller
+        assert adapter.cancel_requests(PRIORITY_INTERACTIVE, running=False) == 0
+        await stream.aclose()
+
+    asyncio.run(running_stream())
+
+
+class EndlessOllamaHandler(BaseHTTPRequestHandler):
+    """Stand-in for /api/chat that keeps generating until the client disconnects."""
+
+    disconnected = threading.Event()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for index in range(500):
+                line = json.dumps({"message": {"role": "assistant", "content": f"w{index} "}, "done": False})
+                self.wfile.write(f"{line}\n".encode())
+                self.wfile.flush()
+                time.sleep(0.01)
+        except (BrokenPipeError, ConnectionResetError):
+            EndlessOllamaHandler.disconnected.set()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_token_limit_closes_the_http_stream_and_keeps_the_partial_answer():
+    EndlessOllamaHandler.disconnected.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EndlessOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    adapter = OllamaDirectAdapter(model="tiny", base_url=f"http://127.0.0.1:{server.server_port}")
+    controller = StreamController(StreamLimits(max_tokens=3))
+
+    async def run():
+        return [chunk async for chunk in controller.stream(adapter.send_prompt_stream("hi"))]
+
+    try:
+        assert asyncio.run(run()) == ["w0 ", "w1 ", "w2 "]
+        assert controller.stop_reason == STOP_MAX_TOKENS
+        assert [message.as_tuple() for message in adapter.history] == [("human", "hi"), ("ai", "w0 w1 w2 ")]
+        # The server notices the closed connection and stops generating
+        assert EndlessOllamaHandler.disconnected.wait(5)
+    finally:
+        server.shutdown()
+        server.server_close()
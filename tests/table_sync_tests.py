@@ -0,0 +1,57 @@
+import asyncio
+from textual.app import App
+from textual.widgets import DataTable
+from ocht.tui.widgets.table_sync import sync_table_rows, get_selected_row_key
+
+
+class TableApp(App):
+    def compose(self):
+        yield DataTable()
+
+
+def _run_with_table(check):
+    async def _main():
+        app = TableApp()
+        async with app.run_test():
+            table = app.query_one(DataTable)
+            table.add_columns("Name", "Value")
+            check(table)
+    asyncio.run(_main())
+
+
+def _table_rows(table):
+    return [(row.key.value, tuple(table.get_row(row.key))) for row in table.ordered_rows]
+
+
+def test_sync_table_rows_applies_diff():
+    def check(table):
+        diff = sync_table_rows(table, [("a", ("a", "1")), ("b", ("b", "2")), ("c", ("c", "3"))])
+        assert (diff.added, diff.updated, diff.removed) == (3, 0, 0)
+
+        diff = sync_table_rows(table, [("a", ("a", "1")), ("c", ("c", "30")), ("d", ("d", "4"))])
+        assert (diff.added, diff.updated, diff.removed) == (1, 1, 1)
+        assert _table_rows(table) == [("a", ("a", "1")), ("c", ("c", "30")), ("d", ("d", "4"))]
+
+        diff = sync_table_rows(table, [("a", ("a", "1")), ("c", ("c", "30")), ("d", ("d", "4"))])
+        assert not diff.changed
+
+    _run_with_table(check)
+
+
+def test_sync_table_rows_keeps_requested_order():
+    def check(table):
+        sync_table_rows(table, [("b", ("b", "2")), ("d", ("d", "4"))])
+        sync_table_rows(table, [("a", ("a", "1")), ("b", ("b", "2")), ("c", ("c", "3")), ("d", ("d", "4"))])
+        assert [key for key, _ in _table_rows(table)] == ["a", "b", "c", "d"]
+
+        table.move_cursor(row=2)
+        assert get_selected_row_key(table) == "c"
+
+    _run_with_table(check)
+
+
+def test_get_selected_row_key_empty_table():
+    def check(table):
+        assert get_selected_row_key(table) is None
+
+    _run_with_table(check)
@@ -0,0 +1,126 @@
+import io
+import json
+
+import pytest
+
+from ocht.core.db import create_db_engine, get_session, init_db
+from ocht.core.models import Setting
+from ocht.repositories.bulk import iter_batches
+from ocht.repositories.llm_provider_config import create_llm_provider_config
+from ocht.repositories.model import create_model
+from ocht.repositories.setting import create_setting
+from ocht.repositories.workspace import create_workspace, get_workspace_by_name
+from ocht.services import cache
+from ocht.services.conversation import append_exchange, fork_branch, get_active_leaf_id, load_active_branch
+from ocht.services.transfer import _iter_json_array, export_data, import_data
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    def use_database(name):
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / name}")
+        init_db(create_db_engine())
+        cache.invalidate_all()
+
+    use_database("source.db")
+    yield use_database
+    cache.invalidate_all()
+
+
+def _fill_workspace(name):
+    with get_session() as db:
+        provider = create_llm_provider_config(db, "ollama", "secret", "http://localhost:11434")
+        create_model(db, "llama3", provider.prov_id)
+        workspace_id = create_workspace(db, name, "llama3").work_id
+        create_setting(db, "theme", "dark")
+    for i in range(12):
+        append_exchange(workspace_id, f"question {i}", f"answer {i}", partial=i == 11)
+    return workspace_id
+
+
+def _workspace_id(name):
+    with get_session() as db:
+        return get_workspace_by_name(db, name).work_id
+
+
+def test_export_and_import_keep_message_trees(temp_db, tmp_path):
+    workspace_id = _fill_workspace("Main")
+    fork_branch(workspace_id, load_active_branch(workspace_id)[3].msg_id)
+    append_exchange(workspace_id, "forked question", "forked answer")
+    branch = [(m.msg_role, m.msg_content, m.msg_partial) for m in load_active_branch(workspace_id)]
+
+    jsonl_path, json_path = str(tmp_path / "chat.jsonl"), str(tmp_path / "chat.json.gz")
+    progress = []
+    assert export_data(jsonl_path, batch_size=5, progress=progress.append) == 1 + 1 + 1 + 1 + 26
+    assert progress[-1].records == progress[-1].total == 30
+    assert export_data(json_path, batch_size=5) == 30
+    assert '"prov_api_key": ""' in (tmp_path / "chat.jsonl").read_text()
+
+    # Import next to existing data: IDs are shifted, the existing provider is kept
+    temp_db("target.db")
+    _fill_workspace("Existing")
+    summary = import_data(jsonl_path, batch_size=4)
+    assert summary.inserted["message"] == 26 and summary.inserted["workspace"] == 1
+    assert summary.updated == 1 and summary.skipped == 2
+
+    imported_id = _workspace_id("Main")
+    assert [(m.msg_role, m.msg_content, m.msg_partial) for m in load_active_branch(imported_id)] == branch
+    assert get_active_leaf_id(imported_id) == load_active_branch(imported_id)[-1].msg_id
+
+    # A workspace that already exists aborts the import
+    with pytest.raises(ValueError, match="already exists"):
+        import_data(json_path)
+    temp_db("restore.db")
+    assert import_data(json_path).inserted["message"] == 26
+    assert len(load_active_branch(_workspace_id("Main"))) == len(branch)
+
+    # Older exports kept the active branch in a workspace setting
+    records = [json.loads(line) for line in (tmp_path / "chat.jsonl").read_text().splitlines()]
+    for record in records:
+        if record.get("type") == "workspace":
+            leaf_id = record["data"].pop("work_active_leaf_id")
+            records.append({"type": "setting", "data": {"setting_key": "conversation.active_leaf_id",
+                                                        "setting_value": str(leaf_id),
+                                                        "setting_workspace_id": record["data"]["work_id"]}})
+    (tmp_path / "legacy.jsonl").write_text("".join(json.dumps(record) + "\n" for record in records))
+    temp_db("legacy.db")
+    import_data(str(tmp_path / "legacy.jsonl"))
+    assert [(m.msg_role, m.msg_content, m.msg_partial) for m in load_active_branch(_workspace_id("Main"))] == branch
+    with get_session() as db:
+        assert db.get(Setting, ("conversation.active_leaf_id", _workspace_id("Main"))) is None
+
+
+def test_markdown_transcript_and_invalid_imports(temp_db, tmp_path):
+    workspace_id = _fill_workspace("Notes | 1")
+    export_data(str(tmp_path / "chat.md"), workspace_id=workspace_id)
+    transcript = (tmp_path / "chat.md").read_text()
+
+    assert "## Notes | 1" in transcript and "| theme | 0 | dark |" in transcript
+    assert transcript.count("### 🧑 User") == 12 and transcript.count("_⏹ Stopped_") == 1
+    with pytest.raises(ValueError, match="cannot be imported"):
+        import_data(str(tmp_path / "chat.md"))
+    with pytest.raises(ValueError, match="not found"):
+        export_data(str(tmp_path / "other.jsonl"), workspace_id=999)
+    assert not (tmp_path / "other.jsonl.part").exists()
+
+    (tmp_path / "foreign.jsonl").write_text('{"type": "something"}\n')
+    with pytest.raises(ValueError, match="not an OChaT export"):
+        import_data(str(tmp_path / "foreign.jsonl"))
+
+
+def test_json_array_stream_and_keyset_batches(temp_db):
+    document = json.dumps([{"type": "header", "n": i, "text": "x" * 50} for i in range(20)], indent=2)
+    assert [item["n"] for item in _iter_json_array(io.StringIO(document), chunk_size=7)] == list(range(20))
+    assert list(_iter_json_array(io.StringIO(" [ ] "))) == []
+    with pytest.raises(ValueError):
+        list(_iter_json_array(io.StringIO('[{"a": 1}, {"b":')))
+
+    with get_session() as db:
+        for workspace_id in (0, 2, 1):
+            for key in ("b", "a", "c"):
+                create_setting(db, key, "v", workspace_id=workspace_id)
+        batches = list(iter_batches(db, Setting, [Setting.setting_workspace_id, Setting.setting_key], batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 1]
+    keys = [(row["setting_workspace_id"], row["setting_key"]) for batch in batches for row in batch]
+    assert keys == sorted(keys)